@@ -189,6 +189,52 @@ def test_transient2d():
     assert np.array_equal(m4d, m4d2)
 
 
+def test_transient2d_binary_cache():
+    model_ws = os.path.join(out_dir, "t2d_cache")
+    if os.path.exists(model_ws):
+        shutil.rmtree(model_ws)
+    os.makedirs(model_ws)
+    ml = flopy.modflow.Modflow(model_ws=model_ws)
+    dis = flopy.modflow.ModflowDis(ml, nlay=1, nrow=4, ncol=5, nper=6)
+    a1 = np.arange(20, dtype=np.float32).reshape((4, 5))
+    t2d = Transient2d(ml, (4, 5), np.float32,
+                      {1: a1, 3: 2.5, 4: a1 * 2.}, "rech")
+    m4d = t2d.array
+    assert m4d.shape == (6, 1, 4, 5)
+    assert np.array_equal(m4d[0, 0], np.zeros((4, 5)))
+    assert np.array_equal(m4d[2, 0], a1)
+    assert np.array_equal(m4d[5, 0], a1 * 2.)
+
+    cache = t2d.cache_to_binary()
+    assert os.path.exists(os.path.join(model_ws, "rech.npy"))
+    assert cache.shape == (2, 4, 5)
+    assert np.shares_memory(t2d[2]._array, cache)
+    assert t2d[3].how == "constant"
+    assert np.array_equal(t2d.array, m4d)
+    assert np.array_equal(np.load(os.path.join(model_ws, "rech.npy")),
+                          np.array([a1, a1 * 2.]))
+
+    arr = t2d.array
+    assert isinstance(arr, np.ndarray)
+    arr[2] = -1.
+    assert np.array_equal(t2d.array, m4d)
+
+    # caching again writes a new file, the mapped file is not replaced
+    cache = t2d.cache_to_binary()
+    assert os.path.basename(cache.filename) == "rech_1.npy"
+    assert not os.path.exists(os.path.join(model_ws, "rech.npy"))
+    assert np.array_equal(cache, np.array([a1, a1 * 2.]))
+    assert np.array_equal(t2d.array, m4d)
+    cache = t2d.cache_to_binary()
+    assert os.path.basename(cache.filename) == "rech.npy"
+    assert np.array_equal(t2d.array, m4d)
+
+    t2d.cnstnt = 2.
+    assert np.array_equal(t2d.array, m4d * 2.)
+    t2d[4] = 1.
+    assert np.array_equal(t2d.array[4:, 0], np.ones((2, 4, 5)))
+
+
 def test_transient3d():
     nlay = 3
     nrow = 4
@@ -778,6 +824,57 @@ def test_util3d_reset():
 
 
 
+def test_util2d_lazy_load():
+    model_ws = os.path.join(out_dir, "lazy")
+    if os.path.exists(model_ws):
+        shutil.rmtree(model_ws)
+    os.makedirs(model_ws)
+    ml = flopy.modflow.Modflow(model_ws=model_ws)
+    shape = (3, 4)
+    a = np.arange(12, dtype=np.float32).reshape(shape)
+    Util2d.write_txt(shape, os.path.join(model_ws, "rech_1.ref"), a,
+                     fortran_format="(4E12.4)")
+    Util2d.write_bin(shape, os.path.join(model_ws, "rech_2.bin"), a,
+                     bintype="head")
+
+    # fixed format text array
+    fp = StringIO(u"OPEN/CLOSE rech_1.ref 2.0 (4E12.4) -1\n")
+    u2d = Util2d.load(fp, ml, shape, np.float32, "rech_1", lazy=True)
+    assert u2d.vtype == str
+    assert u2d.format.fortran == "(4E12.4)"
+    np.testing.assert_allclose(u2d.array, a * 2.0)
+
+    # binary array, lazy flag taken from the model
+    ml.lazy_array_load = True
+    fp = StringIO(u"OPEN/CLOSE rech_2.bin 1.0 (BINARY) -1\n")
+    u2d_bin = Util2d.load(fp, ml, shape, np.float32, "rech_2")
+    assert u2d_bin.vtype == str
+    assert u2d_bin.format.binary
+    np.testing.assert_allclose(u2d_bin.array, a)
+
+    # unmodified arrays are written by reference
+    new_ws = os.path.join(model_ws, "copy")
+    os.mkdir(new_ws)
+    ml.change_model_ws(new_ws)
+    cr = u2d.get_file_entry()
+    assert cr.upper().startswith("OPEN/CLOSE")
+    assert "(4E12.4)" in cr
+    with open(os.path.join(model_ws, "rech_1.ref")) as f1, \
+            open(os.path.join(new_ws, "rech_1.ref")) as f2:
+        assert f1.read() == f2.read()
+
+    # writing in place does not remove the source file
+    u2d_bin.get_file_entry()
+    ml.change_model_ws(model_ws)
+    u2d_bin.get_file_entry()
+    assert os.path.exists(os.path.join(model_ws, "rech_2.bin"))
+
+    # modified arrays are no longer lazy
+    u2d[0, 0] = -1.
+    assert u2d.vtype == np.ndarray
+    assert u2d.array[0, 0] == -2.
+
+
 if __name__ == '__main__':
     # test_util3d_reset()
     test_mflist()
@@ -221,6 +221,58 @@ def test_export_output():
     arr_mask = arr.mask[0]
     assert np.array_equal(ibound_mask, arr_mask)
 
+
+def test_output_helper_chunks():
+    # Do not fail if netCDF4 not installed
+    try:
+        import netCDF4
+        import pyproj
+    except:
+        return
+
+    model_ws = os.path.join("..", "examples", "data", "freyberg")
+    ml = flopy.modflow.Modflow.load("freyberg.nam", model_ws=model_ws)
+    hds = flopy.utils.HeadFile(os.path.join(model_ws, "freyberg.githds"))
+
+    out_pth = os.path.join(npth, "freyberg.chunks.nc")
+    nc = flopy.export.utils.output_helper(out_pth, ml,
+                                          {"freyberg.githds": hds},
+                                          complevel=1,
+                                          chunks={'time': 1, 'layer': 1,
+                                                  'y': 20})
+    var = nc.nc.variables.get("head")
+    assert var.chunking() == [1, 1, 20, ml.ncol]
+    assert var.filters()['zlib']
+    assert var.filters()['complevel'] == 1
+    # min and max are set after the time steps are written
+    arr = var[:]
+    assert np.isclose(var.min, arr.min())
+    assert np.isclose(var.max, arr.max())
+    data = hds.get_data(totim=hds.get_times()[-1])
+    assert np.allclose(arr[-1].compressed(), data[~arr[-1].mask])
+
+def test_ensemble_stats():
+    from flopy.export.utils import _EnsembleStats, _ensemble_vdict
+    model_ws = os.path.join("..", "examples", "data", "freyberg")
+    ml = flopy.modflow.Modflow.load("freyberg.nam", model_ws=model_ws,
+                                    load_only=['dis', 'bas6', 'lpf'])
+    vdict = _ensemble_vdict((ml, False, {}))
+    vdicts = []
+    stats = _EnsembleStats()
+    for i in range(5):
+        vd = {vname: a * (i + 1) for vname, a in vdict.items()}
+        stats.add(vd)
+        vdicts.append(vd)
+    mean, stdev = stats.get()
+    assert stats.count == 5
+    for vname in ['hk', 'model_top']:
+        a = np.array([vd[vname] for vd in vdicts], dtype=np.float64)
+        idx = np.isnan(vdict[vname])
+        assert mean[vname].dtype == vdict[vname].dtype
+        assert np.allclose(mean[vname][~idx], a.mean(axis=0)[~idx])
+        assert np.allclose(stdev[vname][~idx], a.std(axis=0)[~idx])
+        assert np.all(mean[vname][idx] == flopy.export.netcdf.FILLVALUE)
+
 def test_write_shapefile():
     from flopy.discretization import StructuredGrid
     from flopy.export.shapefile_utils import shp2recarray
@@ -263,6 +315,47 @@ def test_write_shapefile():
             pass
 
 
+def test_write_grid_shapefile_polygons():
+    import shapefile
+    from flopy.discretization import StructuredGrid, VertexGrid
+    from flopy.export.shapefile_utils import get_grid_polygons
+    from flopy.export.shapefile_utils import write_grid_shapefile, \
+        write_grid_shapefile2
+
+    sg = StructuredGrid(delr=np.arange(1., 4.), delc=np.arange(1., 3.),
+                        xoff=10., yoff=20., angrot=30.)
+    polygons = get_grid_polygons(sg)
+    assert len(polygons) == 6
+    assert np.allclose(polygons[5], sg.get_cell_vertices(1, 2))
+
+    a = np.arange(6, dtype=float).reshape(2, 3)
+    a[0, 1] = np.nan
+    outshp = os.path.join(tpth, 'polygons.shp')
+    write_grid_shapefile2(outshp, sg, {'a': a, 'k': np.ones((2, 3), int)},
+                          nan_val=-999.)
+    sfobj = shapefile.Reader(outshp)
+    recs = [list(r) for r in sfobj.records()]
+    assert recs[1] == [2, 1, 2, -999., 1]
+    assert recs[5] == [6, 2, 3, 5., 1]
+    assert np.allclose(sfobj.shape(5).points[:4], polygons[5])
+    sfobj.close()
+
+    vertices = [[0, 0., 0.], [1, 1., 0.], [2, 1., 1.], [3, 0., 1.],
+                [4, 2., 0.], [5, 2., 1.]]
+    cell2d = [[0, .67, .33, 3, 0, 1, 2],
+              [1, .33, .67, 3, 0, 2, 3],
+              [2, 1.5, .5, 4, 1, 4, 5, 2]]
+    vg = VertexGrid(vertices, cell2d, nlay=1, ncpl=3)
+    polygons = get_grid_polygons(vg)
+    assert [len(p) for p in polygons] == [3, 3, 4]
+    outshp = os.path.join(tpth, 'polygons_vertex.shp')
+    write_grid_shapefile(outshp, vg, {'b': np.array([1., 2., 3.])})
+    sfobj = shapefile.Reader(outshp)
+    assert [list(r) for r in sfobj.records()] == [[1, 1.], [2, 2.], [3, 3.]]
+    assert np.allclose(sfobj.shape(2).points[:4], polygons[2])
+    sfobj.close()
+
+
 def test_export_array():
     from flopy.export import utils
     try:
@@ -295,7 +388,7 @@ def test_export_array():
             if 'yllcorner' in line.lower():
                 val = float(line.strip().split()[-1])
                 if rotate:
-                    assert np.abs(val - m.modelgrid.extent[1]) < 1e-6
+                    assert np.abs(val - m.modelgrid.extent[2]) < 1e-6
                 else:
                     assert np.abs(val - m.modelgrid.yoffset) < 1e-6
             if 'cellsize' in line.lower():
@@ -328,6 +421,49 @@ def test_export_array():
             assert np.abs(src.bounds[1] - m.modelgrid.extent[1]) < 1e-6
 
 
+def test_grid_raster():
+    from flopy.discretization import StructuredGrid
+    from flopy.export.utils import GridRaster, export_array, raster_cache
+
+    # non-uniform grid
+    mg = StructuredGrid(delr=np.array([1., 2.]), delc=np.array([1., 1.]),
+                        xoff=10., yoff=20.)
+    raster = GridRaster(mg)
+    assert (raster.nrow, raster.ncol) == (2, 3)
+    assert (raster.xll, raster.yll, raster.cellsize) == (10., 20., 1.)
+    assert np.array_equal(raster.node, [[0, 1, 1], [2, 3, 3]])
+    a = np.array([[1., np.nan], [3., 4.]])
+    assert np.array_equal(raster.resample(a), [[1., -9999., -9999.],
+                                               [3., 4., 4.]])
+    # stacks of arrays (layers, times) are resampled at once
+    b = raster.resample(np.array([a, 2. * a]), nodata=-1.)
+    assert b.shape == (2, 2, 3)
+    assert np.array_equal(b[1], [[2., -1., -1.], [6., 8., 8.]])
+
+    # the pixel to cell mapping is cached
+    assert GridRaster(mg).node is raster.node
+    nkeys = len(raster_cache)
+    GridRaster(mg, cellsize=0.5)
+    assert len(raster_cache) == nkeys + 1
+
+    # rotated grid
+    mg = StructuredGrid(delr=np.ones(4), delc=np.ones(2), xoff=0., yoff=0.,
+                        angrot=90.)
+    raster = GridRaster(mg)
+    assert (raster.nrow, raster.ncol) == (4, 2)
+    assert np.allclose((raster.xll, raster.yll), (-2., 0.))
+    assert np.array_equal(raster.node, [[3, 7], [2, 6], [1, 5], [0, 4]])
+
+    fname = os.path.join(tpth, 'grid_raster.asc')
+    export_array(mg, fname, np.arange(8.).reshape(2, 4), fmt='%.1f')
+    with open(fname) as f:
+        header = [f.readline().split() for i in range(6)]
+    assert header[0][1] == '2' and header[1][1] == '4'
+    assert np.isclose(float(header[2][1]), -2.)
+    arr = np.loadtxt(fname, skiprows=6)
+    assert np.array_equal(arr, [[3., 7.], [2., 6.], [1., 5.], [0., 4.]])
+
+
 def test_mbase_modelgrid():
     import numpy as np
     import flopy
@@ -903,6 +1039,52 @@ def test_modelgrid_with_PlotMapView():
     plt.close()
 
 
+def test_line_intersect_grid():
+    from flopy.plot import plotutil
+    xedge = np.arange(0., 101., 10.)
+    yedge = np.arange(50., -1., -10.)
+
+    # diagonal line through the cell corners
+    pts = plotutil.line_intersect_grid([(5., 45.), (45., 5.)], xedge, yedge)
+    # start, four crossings on either side and end
+    assert pts.shape == (10, 3)
+    assert np.allclose(pts[[0, -1], :2], [(5., 45.), (45., 5.)])
+    assert np.allclose(pts[-1, 2], np.sqrt(2. * 40. ** 2))
+    irow, jcol = plotutil.findrowcolumn((pts[:, 0], pts[:, 1]), xedge, yedge)
+    assert np.array_equal(irow, np.repeat(np.arange(5), 2))
+    assert np.array_equal(jcol, np.repeat(np.arange(5), 2))
+    assert plotutil.findrowcolumn((105., 25.), xedge, yedge) == (2, -100)
+
+    # points outside of the grid are dropped, consecutive pairs of points
+    # are in the same cell
+    lines = [[(-10., 25.), (55., 25.)],
+             [(5., 45.), (45., 5.)],
+             [(95., 5.), (95., 45.), (65., 45.)]]
+    batch = plotutil.line_intersect_grid_batch(lines, xedge, yedge)
+    assert len(batch) == 3
+    assert batch[0].shape == (12, 3)
+    assert np.allclose(batch[0][0], (1e-4, 25., 10. + 1e-4))
+    assert np.allclose(batch[1], pts)
+    for p in batch:
+        irow, jcol = plotutil.findrowcolumn((p[:, 0], p[:, 1]), xedge, yedge)
+        assert np.all((irow[::2] == irow[1::2]) & (jcol[::2] == jcol[1::2]))
+        assert np.all(np.diff(p[:, 2]) >= 0.)
+        assert np.array_equal(
+            plotutil.cell_value_points(p, xedge, yedge,
+                                       np.arange(50.).reshape(5, 10)),
+            irow * 10 + jcol)
+    assert np.allclose(batch[2][-1], (65., 45., 70.))
+
+    # vertex grid version returns the crossings of each cell
+    xverts = np.array([[0., 10., 10., 0.], [10., 20., 20., 10.]])
+    yverts = np.array([[10., 10., 0., 0.], [10., 10., 0., 0.]])
+    vdict = plotutil.UnstructuredPlotUtilities.line_intersect_grid(
+        [(-5., 5.), (25., 5.)], xverts, yverts)
+    assert sorted(vdict) == [0, 1]
+    assert np.allclose(sorted(vdict[0]), [(0., 5.), (10., 5.)])
+    assert np.allclose(sorted(vdict[1]), [(10., 5.), (20., 5.)])
+
+
 def test_tricontour_NaN():
     from flopy.plot import PlotMapView
     import numpy as np
@@ -967,6 +1149,184 @@ def test_get_vertices():
     assert np.array_equal(a1, a2)
 
 
+def test_vertex_grid_csr_vertices():
+    from flopy.discretization import VertexGrid, UnstructuredGrid
+    # two triangles and a quad, with vertex numbers that are not positions
+    vertices = [[10, 0., 0.], [11, 1., 0.], [12, 1., 1.], [13, 0., 1.],
+                [14, 2., 0.], [15, 2., 1.]]
+    cell2d = [[0, .67, .33, 3, 10, 11, 12],
+              [1, .33, .67, 3, 10, 12, 13],
+              [2, 1.5, .5, 4, 11, 14, 15, 12]]
+    mg = VertexGrid(vertices, cell2d, nlay=1, ncpl=3, xoff=10., yoff=20.,
+                    angrot=30.)
+    offsets, x, y = mg.csr_vertices
+    assert np.array_equal(offsets, [0, 3, 6, 10])
+    xv, yv = mg.get_coords(np.array([0., 1., 1., 0., 1., 0., 1., 2., 2., 1.]),
+                           np.array([0., 0., 1., 0., 1., 1., 0., 0., 1., 1.]))
+    assert np.allclose(x, xv)
+    assert np.allclose(y, yv)
+    # backward compatible lists of vertices
+    assert isinstance(mg.xvertices, list)
+    assert [len(v) for v in mg.xvertices] == [3, 3, 4]
+    assert np.allclose(mg.xvertices[2], x[6:])
+    xvertices = mg.xvertices
+    assert isinstance(xvertices[0], np.ndarray)
+    xvertices[0][0] = -1.
+    assert mg.xvertices[0][0] != -1.
+    assert mg.get_cell_vertices(1) == list(zip(x[3:6], y[3:6]))
+    assert len(mg.grid_lines) == 10
+    assert np.allclose(mg.extent, (x.min(), x.max(), y.min(), y.max()))
+
+    # coordinate changes update the vertices
+    mg.set_coord_info(xoff=0., yoff=0., angrot=0.)
+    offsets, x, y = mg.csr_vertices
+    assert np.allclose(x[6:], [1., 2., 2., 1.])
+    assert np.allclose(mg.xvertices[2], [1., 2., 2., 1.])
+
+    # vertex numbers that are not in vertices
+    for ivert in [9, 16]:
+        bad = [row[:] for row in cell2d]
+        bad[2][5] = ivert
+        try:
+            VertexGrid(vertices, bad, nlay=1, ncpl=3).csr_vertices
+            assert False, 'KeyError not raised'
+        except KeyError as e:
+            assert e.args[0] == ivert
+    bad = [row[:4] + [v - 10 for v in row[4:]] for row in cell2d]
+    bad[0][6] = 6
+    try:
+        VertexGrid([[i] + v[1:] for i, v in enumerate(vertices)], bad,
+                   nlay=1, ncpl=3).csr_vertices
+        assert False, 'KeyError not raised'
+    except KeyError as e:
+        assert e.args[0] == 6
+
+    ug = UnstructuredGrid(vertices=np.array(vertices)[:, 1:],
+                          iverts=[[0, 1, 2], [0, 2, 3], [1, 4, 5, 2]],
+                          xcenters=[.67, .33, 1.5], ycenters=[.33, .67, .5],
+                          ncpl=np.array([3]))
+    assert np.array_equal(ug.csr_vertices[0], [0, 3, 6, 10])
+    assert np.allclose(ug.yvertices[2], [0., 0., 1., 1.])
+
+
+def test_vertex_grid_polygon_plot():
+    import matplotlib.pyplot as plt
+    from flopy.discretization import VertexGrid
+    from flopy.plot import PlotMapView, plotutil
+    vertices = [[0, 0., 0.], [1, 1., 0.], [2, 1., 1.], [3, 0., 1.],
+                [4, 2., 0.], [5, 2., 1.]]
+    cell2d = [[0, .67, .33, 3, 0, 1, 2],
+              [1, .33, .67, 3, 0, 2, 3],
+              [2, 1.5, .5, 4, 1, 4, 5, 2]]
+    mg = VertexGrid(vertices, cell2d, nlay=1, ncpl=3)
+
+    # closed polygons padded with the first vertex
+    polygons = mg.polygon_vertices
+    assert polygons.shape == (3, 5, 2)
+    assert np.allclose(polygons[0], [[0., 0.], [1., 0.], [1., 1.],
+                                     [0., 0.], [0., 0.]])
+    assert np.allclose(polygons[2, :, 0], [1., 2., 2., 1., 1.])
+    assert mg._cache_dict['polygonvertices'] is not None
+
+    # plots share the cached polygons and only set the face colors
+    pmv = PlotMapView(modelgrid=mg)
+    pc = pmv.plot_array(np.array([1., 2., 3.]))
+    assert len(pc.get_paths()) == 3
+    assert np.allclose(pc.get_array(), [1., 2., 3.])
+    assert np.allclose(pc.get_paths()[2].vertices, polygons[2])
+    pc = pmv.plot_array(np.array([1., 2., 3.]), masked_values=[2.])
+    assert pc.get_array().mask[1]
+    lc = pmv.plot_grid()
+    assert len(lc.get_segments()) == 3
+
+    pc = plotutil.cvfd_to_patch_collection(
+        np.array(vertices)[:, 1:], [c[4:] for c in cell2d])
+    assert len(pc.get_paths()) == 3
+    assert np.allclose(pc.get_paths()[2].vertices, polygons[2])
+    plt.close('all')
+
+
+def test_shared_geometry_cache():
+    from flopy.discretization import StructuredGrid
+    from flopy.discretization.grid import geometry_cache
+    geometry_cache.clear()
+    delr = np.arange(1., 5.)
+    delc = np.arange(1., 4.)
+    top = np.full((3, 4), 10.)
+    botm = np.array([np.full((3, 4), 5.), np.zeros((3, 4))])
+    mg = StructuredGrid(delc, delr, top, botm, xoff=10., yoff=20.,
+                        angrot=30.)
+    xc, yc, zc = mg.xyzcellcenters
+    xv, yv, zv = mg.xyzvertices
+
+    # a grid built from the same input shares the geometry
+    mg2 = StructuredGrid(delc, delr, top, botm, xoff=10., yoff=20.,
+                         angrot=30.)
+    assert mg2._get_cache_data('cellcenters') is not None
+    assert mg2._cache_dict['cellcenters'].data_nocopy is \
+        mg._cache_dict['cellcenters'].data_nocopy
+    assert np.allclose(mg2.xcellcenters, xc)
+    assert np.allclose(mg2.zvertices, zv)
+
+    # coordinate changes update the geometry
+    mg2.set_coord_info(xoff=0., yoff=0., angrot=0.)
+    assert mg2._cache_dict['cellcenters'].out_of_date
+    assert np.allclose(mg2.xcellcenters[0], [.5, 2., 4.5, 8.])
+    assert np.allclose(mg.xcellcenters, xc)
+
+    # different input is not shared, neither are equal copies or a
+    # different idomain
+    mg3 = StructuredGrid(delc, delr, top, botm - 1., xoff=10., yoff=20.,
+                         angrot=30.)
+    assert mg3._get_cache_data('cellcenters') is None
+    assert np.allclose(mg3.zcellcenters[1], zc[1] - 1.)
+    assert np.allclose(mg3.xcellcenters, xc)
+    mg4 = StructuredGrid(delc.copy(), delr, top, botm, xoff=10., yoff=20.,
+                         angrot=30.)
+    assert mg4._get_cache_data('cellcenters') is None
+    mg4 = StructuredGrid(delc, delr, top, botm, idomain=np.ones((2, 3, 4)),
+                         xoff=10., yoff=20., angrot=30.)
+    assert mg4._get_cache_data('cellcenters') is None
+
+    # shared entries are read-only, copies returned to the user are not
+    xcenters = mg._cache_dict['cellcenters'].data_nocopy[0]
+    assert not xcenters.flags.writeable
+    xc = mg.xcellcenters
+    xc[0, 0] = -1.
+    assert mg.xcellcenters[0, 0] != -1.
+
+    # entries are not used again after the grid changes
+    mg3._botm[1] = 1.
+    mg3.set_coord_info(xoff=10., yoff=20., angrot=30.)
+    assert np.allclose(mg3.xyzcellcenters[2][1], 2.5)
+
+    # entries are dropped when the input is garbage collected
+    mg5 = StructuredGrid(delc, delr, top, botm * 2.)
+    mg5.xyzcellcenters
+    nentries = len(geometry_cache)
+    key, refs = mg5._geometry_key('cellcenters')
+    del mg5, refs
+    assert geometry_cache.get(key) is None
+    assert len(geometry_cache) == nentries - 1
+
+    # the size of the cache is bounded by the size of the entries
+    assert geometry_cache.nbytes > 0
+    maxbytes = geometry_cache.maxbytes
+    geometry_cache.maxbytes = geometry_cache.nbytes
+    mg6 = StructuredGrid(delc, delr, top, botm + 1.)
+    mg6.xyzcellcenters
+    assert geometry_cache.nbytes <= geometry_cache.maxbytes
+    # entries that are too large are not cached and not read-only
+    geometry_cache.maxbytes = 1
+    mg6 = StructuredGrid(delc, delr, top, botm + 2.)
+    mg6.xyzcellcenters
+    assert mg6._cache_dict['cellcenters'].data_nocopy[0].flags.writeable
+    assert geometry_cache.get(mg6._geometry_key('cellcenters')[0]) is None
+    geometry_cache.maxbytes = maxbytes
+    geometry_cache.clear()
+    assert geometry_cache.nbytes == 0
+
+
 def test_vertex_model_dot_plot():
     # load up the vertex example problem
     sim_name = "mfsim.nam"
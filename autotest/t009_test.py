@@ -252,6 +252,39 @@ def test_sfr_renumbering():
     assert isequal(sfr.reach_data.slope[21], 0.2)
     assert isequal(sfr.reach_data.slope[-1], default_slope)
 
+def test_routing_topology():
+    from flopy.modflow.mfsfr2 import RoutingTopology, find_path
+    # segments 10-12 route in a circle; 14 routes to a lake
+    graph = {1: 4, 2: 0, 3: 6, 4: 8, 5: 3, 6: 8, 7: 1, 8: 2, 9: 8,
+             10: 11, 11: 12, 12: 10, 13: 10, 14: -1}
+    topology = RoutingTopology.from_graph(graph)
+    graph[-1] = 0
+    paths = topology.get_paths()
+    for seg in graph.keys():
+        assert paths[seg] == find_path(graph, seg)
+        assert topology.get_path(seg) == find_path(graph, seg)
+    assert np.array_equal(topology.circular, [10, 11, 12, 13])
+    assert np.array_equal(topology.headwaters, [5, 7, 9, 13, 14])
+    upsegs = topology.get_upstream()
+    assert upsegs[8].tolist() == [1, 3, 4, 5, 6, 7, 9]
+    assert upsegs[-1].tolist() == [14]
+    assert 10 not in upsegs
+    upsegs = topology.get_upstream(direct=True)
+    assert upsegs[8].tolist() == [4, 6, 9]
+    assert upsegs[10].tolist() == [12, 13]
+
+    # routing through the package
+    r, d = create_sfr_data()
+    m = flopy.modflow.Modflow(model_ws=outpath)
+    sfr = flopy.modflow.ModflowSfr2(m, reach_data=r, segment_data={0: d})
+    assert sfr.get_upsegs()[0][8] == [1, 3, 4, 5, 6, 7, 9]
+    chk = sfr.check(verbose=False)
+    assert 'circular routing' in chk.passed
+    d['outseg'][1] = 7
+    sfr = flopy.modflow.ModflowSfr2(m, reach_data=r, segment_data={0: d})
+    chk = sfr.check(verbose=False)
+    assert 'circular routing' in chk.errors
+
 def test_const():
 
     fm = flopy.modflow
@@ -432,6 +465,62 @@ def test_transient_example():
     assert m2.sfr.istcb2 == -49
     assert m2.get_output_attribute(unit=abs(m2.sfr.istcb2), attr='binflag')
 
+def test_sfr_write_load_roundtrip():
+    """Write and reload segment data for several isfropt/icalc settings."""
+    m = fm.Modflow('sfrrt', model_ws=outpath)
+    fm.ModflowDis(m, nlay=1, nrow=1, ncol=6, nper=2)
+    for isfropt in [0, 1, 2, 3]:
+        reach_data = fm.ModflowSfr2.get_empty_reach_data(6)
+        reach_data['j'] = np.arange(6)
+        reach_data['iseg'] = [1, 1, 2, 2, 3, 3]
+        reach_data['ireach'] = [1, 2, 1, 2, 1, 2]
+        reach_data['rchlen'] = 10.
+        reach_data['strtop'] = np.linspace(10., 5., 6)
+        reach_data['slope'] = 0.01
+        reach_data['strthick'] = 1.
+        reach_data['strhc1'] = 0.5
+        segment_data = {}
+        for per in range(2):
+            sd = fm.ModflowSfr2.get_empty_segment_data(3)
+            sd['nseg'] = [1, 2, 3]
+            sd['icalc'] = [1, 2, 0]
+            sd['outseg'] = [2, 3, 0]
+            sd['flow'] = [1.5 + per, 0., 0.]
+            sd['roughch'] = 0.03
+            sd['width1'] = [5., 0., 4.]
+            sd['width2'] = [5., 0., 4.]
+            sd['depth1'] = 1.
+            sd['depth2'] = 1.
+            sd['hcond1'] = 0.25
+            sd['hcond2'] = 0.25
+            sd['elevup'] = [10., 8., 6.]
+            sd['elevdn'] = [8., 6., 5.]
+            sd['thickm1'] = 1.
+            sd['thickm2'] = 1.
+            segment_data[per] = sd
+        cgd = {per: {2: [[0., 10., 20., 30., 40., 50., 60., 70.],
+                         [5., 4., 3., 2., 2., 3., 4., 5.]]}
+               for per in range(2)}
+        sfr = fm.ModflowSfr2(m, nstrm=-6, nss=3, isfropt=isfropt,
+                             reach_data=reach_data,
+                             segment_data=segment_data,
+                             channel_geometry_data=cgd)
+        fname = os.path.join(outpath, 'rt{}.sfr'.format(isfropt))
+        sfr.write_file(fname)
+        m.remove_package('SFR')
+        sfr2 = fm.ModflowSfr2.load(fname, m, nper=2)
+        m.remove_package('SFR')
+        for per in range(2):
+            for n in ['nseg', 'icalc', 'outseg', 'iupseg', 'flow']:
+                assert np.allclose(sfr2.segment_data[per][n],
+                                   sfr.segment_data[per][n])
+            assert np.allclose(sfr2.segment_data[per]['roughch'][:2], 0.03)
+        # with reach input, dataset 6d is only written for the first period
+        assert np.allclose(sfr2.channel_geometry_data[0][2], cgd[0][2])
+        for n in ['k', 'i', 'j', 'iseg', 'ireach', 'rchlen']:
+            assert np.allclose(sfr2.reach_data[n], sfr.reach_data[n])
+
+
 def test_assign_layers():
     m = fm.Modflow()
     m.dis = fm.ModflowDis(nrow=1, ncol=6, nlay=7,
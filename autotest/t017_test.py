@@ -106,6 +106,46 @@ def test_cellbudgetfile_read():
     return
 
 
+def test_binaryfile_plot_frames():
+    import matplotlib
+    from flopy.plot.plotutil import plot_array_frames, FrameRenderer
+
+    h = flopy.utils.HeadFile(
+        os.path.join('..', 'examples', 'data', 'freyberg', 'freyberg.githds'))
+    fnames = h.plot_frames(filename_base=os.path.join(cpth, 'head'),
+                           masked_values=[999.])
+    assert len(fnames) == 1
+    assert os.path.isfile(fnames[0])
+
+    v = flopy.utils.CellBudgetFile(
+        os.path.join('..', 'examples', 'data', 'mf2005_test', 'mnw1.gitcbc'))
+    fnames = v.plot_frames('DRAINS', filename_base=os.path.join(cpth, 'drn'),
+                           nproc=2)
+    assert len(fnames) == 5
+    for fname in fnames:
+        assert os.path.isfile(fname)
+
+    # the figure is built once and the colors follow the first frame
+    mg = h.mg
+    a = h.get_data()
+    renderer = FrameRenderer(mg, masked_values=[999.])
+    fig = renderer.render(a)
+    quadmesh = renderer._artists[2]
+    a2 = np.where(a == 999., a, a + 1.)
+    assert fig is renderer.render(a2, title='frame 2')
+    assert renderer._artists[2] is quadmesh
+    assert np.allclose(quadmesh.get_array().compressed(),
+                       a[0][a[0] != 999.] + 1.)
+    assert quadmesh.get_clim() == (renderer.vmin, renderer.vmax)
+
+    frames = (('frame {}'.format(i), a * (1. + 0.01 * i)) for i in range(4))
+    fname = plot_array_frames(frames, mg,
+                              animation=os.path.join(cpth, 'head.gif'),
+                              masked_values=[999.])
+    assert os.path.isfile(fname)
+    return
+
+
 def test_cellbudgetfile_position():
 
     fpth = os.path.join('..', 'examples', 'data', 'zonbud_examples',
@@ -321,5 +361,6 @@ if __name__ == '__main__':
     test_formattedfile_read()
     test_binaryfile_read()
     test_cellbudgetfile_read()
+    test_binaryfile_plot_frames()
     test_cellbudgetfile_readrecord()
     test_cellbudgetfile_readrecord_waux()
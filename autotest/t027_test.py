@@ -8,6 +8,7 @@ import os
 import flopy
 import numpy as np
 from flopy.utils.flopy_io import line_parse
+from flopy.modflow.mfmnw2 import ItmpError
 
 cpth = os.path.join('temp', 't027')
 # make the directory if it does not exist
@@ -218,6 +219,71 @@ def test_mnw2_create_file():
     mnw2.write_file("./temp/t027/ndata.mnw2")
 
 
+def test_mnw2_write_load_roundtrip():
+    """t027 test MNW2 tables survive a write and load"""
+    m = flopy.modflow.Modflow('mnw2roundtrip', model_ws=cpth)
+    dis = flopy.modflow.ModflowDis(m, nrow=10, ncol=10, nlay=3, nper=3,
+                                   top=30., botm=[20., 10., 0.])
+    nwells = 20
+    nnodes = np.arange(nwells) % 3 + 1
+    wellidx = np.repeat(np.arange(nwells), nnodes)
+    node_data = flopy.modflow.ModflowMnw2.get_empty_node_data(nnodes.sum())
+    node_data['wellid'] = ['well{}'.format(n) for n in wellidx]
+    node_data['k'] = np.concatenate([np.arange(n) for n in nnodes])[::-1]
+    node_data['i'] = wellidx % 10
+    node_data['j'] = wellidx // 2
+    node_data['losstype'] = 'thiem'
+    node_data['rw'] = 0.1 + 0.1 * (wellidx % 2)
+    node_data['qlimit'] = np.where(wellidx % 4 == 0, -1, 0)
+    stress_period_data = {}
+    for per in range(2):
+        spd = flopy.modflow.ModflowMnw2.get_empty_stress_period_data(nwells)
+        spd['wellid'] = ['well{}'.format(n)
+                         for n in np.roll(np.arange(nwells), per)]
+        spd['qdes'] = -100. * (per + 1)
+        spd['hlim'] = 5.
+        spd['qcut'] = np.arange(nwells) % 2
+        spd['qfrcmn'] = 0.1
+        spd['qfrcmx'] = 0.2
+        stress_period_data[per] = spd
+    mnw2 = flopy.modflow.ModflowMnw2(model=m, mnwmax=nwells,
+                                     node_data=node_data,
+                                     stress_period_data=stress_period_data,
+                                     itmp=[nwells, nwells, -1])
+    # nodes are sorted by layer within each well
+    assert np.all(np.diff(mnw2.mnw['well2'].node_data.k) > 0)
+    fn = os.path.join(cpth, 'mnw2roundtrip.mnw2')
+    mnw2.write_file(fn)
+
+    m2 = flopy.modflow.Modflow('mnw2roundtrip2', model_ws=cpth)
+    dis = flopy.modflow.ModflowDis(m2, nrow=10, ncol=10, nlay=3, nper=3,
+                                   top=30., botm=[20., 10., 0.])
+    mnw2_2 = flopy.modflow.ModflowMnw2.load(fn, m2)
+    for n in mnw2.node_data.dtype.names:
+        assert np.array_equal(mnw2.node_data[n], mnw2_2.node_data[n])
+    for per in range(2):
+        spd = mnw2.stress_period_data[per]
+        spd2 = mnw2_2.stress_period_data[per]
+        for n in ['wellid', 'qdes']:
+            assert np.array_equal(spd[n], spd2[n])
+        qlimit = np.array([mnw2.mnw[w].qlimit < 0 for w in spd.wellid])
+        for n in ['hlim', 'qcut']:
+            assert np.array_equal(spd[n][qlimit], spd2[n][qlimit])
+    assert mnw2_2.mnw['well4'].stress_period_data.qdes[2] == -200.
+    fn2 = os.path.join(cpth, 'mnw2roundtrip2.mnw2')
+    mnw2_2.write_file(fn2)
+    assert open(fn).read() == open(fn2).read()
+
+    # itmp must match the number of wells with stress period data
+    try:
+        flopy.modflow.ModflowMnw2(model=m2, mnwmax=nwells, mnw=mnw2_2.mnw,
+                                  itmp=[nwells - 1, nwells, -1])
+        assert False, 'ItmpError not raised'
+    except ItmpError as e:
+        assert e.itmp == nwells - 1
+        assert e.nactivewells == nwells
+
+
 def test_export():
     """t027 test export of MNW2 Package to netcdf files"""
     try:
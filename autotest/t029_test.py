@@ -1,4 +1,5 @@
 import os
+import numpy as np
 import flopy
 
 pthtest = os.path.join('..', 'examples', 'data', 'mfgrd_test')
@@ -56,7 +57,95 @@ def test_mfgrddisu():
     return
 
 
+def test_mfgrd_specific_discharge():
+    from flopy.plot.plotutil import PlotUtilities
+    from flopy.utils.postprocessing import get_specific_discharge
+
+    # structured grid, compare with the centered face flows
+    pth = os.path.join('..', 'examples', 'data', 'mf6-freyberg')
+    grb = flopy.utils.MfGrdFile(os.path.join(pth, 'freyberg.dis.grb'))
+    cbc = flopy.utils.CellBudgetFile(os.path.join(pth, 'freyberg.cbc'),
+                                     precision='double')
+    hds = flopy.utils.HeadFile(os.path.join(pth, 'freyberg.hds'),
+                               precision='double')
+    head = hds.get_data(kstpkper=(0, 0))
+    qx, qy, qz = cbc.get_specific_discharge(kstpkper=(0, 0), grb=grb,
+                                            head=head)
+    assert qx.shape == grb.shape
+    # results with heads are not cached
+    assert not np.array_equal(cbc.get_specific_discharge(
+        kstpkper=(0, 0), grb=grb, head=head + 1.)[0], qx)
+    assert len(cbc._spdis) == 0
+    # results without heads are cached, the cache returns copies
+    qx0 = cbc.get_specific_discharge(kstpkper=(0, 0), grb=grb)[0]
+    qx0[:] = 0.
+    qx1 = cbc.get_specific_discharge(kstpkper=(0, 0), grb=grb)[0]
+    assert qx1 is not qx0
+    assert np.any(qx1 != 0.)
+
+    flowja = cbc.get_data(kstpkper=(0, 0), text='FLOW-JA-FACE')[0].ravel()
+    geom = grb.get_connection_geometry()
+    nlay, nrow, ncol = grb.shape
+    frf = np.zeros(grb.shape).ravel()
+    fff = np.zeros(grb.shape).ravel()
+    idx = geom.conn == geom.node + 1
+    frf[geom.node[idx]] = -flowja[geom.ipos[idx]]
+    idx = geom.conn == geom.node + ncol
+    fff[geom.node[idx]] = -flowja[geom.ipos[idx]]
+    top, botm = grb.get_cell_top_bottom()
+    laytyp = grb._datadict['ICELLTYPE'].reshape(grb.shape)
+    sat_thk = PlotUtilities.saturated_thickness(
+        head, top[:nrow * ncol], botm, laytyp, [1e30, -1e30])
+    sqx, sqy, sqz = PlotUtilities.centered_specific_discharge(
+        frf.reshape(grb.shape), fff.reshape(grb.shape), None,
+        grb._datadict['DELR'], grb._datadict['DELC'], sat_thk)
+    # interior cells with four active neighbors
+    nconn = np.bincount(geom.node, minlength=grb.nodes).reshape(grb.shape)
+    interior = nconn == 4
+    interior[:, [0, -1], :] = False
+    interior[:, :, [0, -1]] = False
+    assert interior.sum() > 0
+    assert np.allclose(qx[interior], sqx[interior], rtol=0., atol=1e-15)
+    assert np.allclose(qy[interior], sqy[interior], rtol=0., atol=1e-15)
+
+    # a uniform flow field on a triangular grid is reproduced in cells
+    # with at least two horizontal connections
+    pth = os.path.join('..', 'examples', 'data', 'mf6',
+                       'test003_gwftri_disv')
+    grb = flopy.utils.MfGrdFile(os.path.join(pth, 'tri_model.disv.grb'))
+    geom = grb.get_connection_geometry()
+    top, botm = grb.get_cell_top_bottom()
+    thk = top - botm
+    horizontal = geom.ihc != 0
+    area = np.where(horizontal,
+                    geom.hwva * 0.5 * (thk[geom.node] + thk[geom.conn]),
+                    geom.hwva)
+    flowja = np.zeros(grb.ja.shape)
+    flowja[geom.ipos] = -(2. * geom.ux - 1. * geom.uy + 0.5 * geom.uz) * area
+    qx, qy, qz = get_specific_discharge(flowja, grb)
+    assert qx.shape == grb.shape
+    nhor = np.bincount(geom.node[horizontal], minlength=grb.nodes)
+    idx = nhor >= 2
+    assert np.allclose(qx.ravel()[idx], 2.)
+    assert np.allclose(qy.ravel()[idx], -1.)
+    idx = np.bincount(geom.node[~horizontal], minlength=grb.nodes) > 0
+    assert np.allclose(qz.ravel()[idx], 0.5)
+
+    # specific discharge saved by MODFLOW 6
+    cbc = flopy.utils.CellBudgetFile(os.path.join(pth, 'tri_model.cbc'),
+                                     precision='double')
+    spdis = cbc.get_data(text='DATA-SPDIS')[0]
+    # a call without the grid does not change the result with the grid
+    assert cbc.get_specific_discharge()[0].ndim == 1
+    qx, qy, qz = cbc.get_specific_discharge(grb=grb)
+    assert qx.shape == grb.shape
+    assert np.array_equal(qx.ravel()[spdis['node'] - 1], spdis['qx'])
+    assert np.array_equal(qz.ravel()[spdis['node'] - 1], spdis['qz'])
+    return
+
+
 if __name__ == '__main__':
     test_mfgrddis()
     test_mfgrddisv()
     test_mfgrddisu()
+    test_mfgrd_specific_discharge()
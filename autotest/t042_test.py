@@ -2,12 +2,15 @@
 Test postprocessing utilities
 """
 
+import os
 import sys
 sys.path.append('/Users/aleaf/Documents/GitHub/flopy3')
 import numpy as np
 import flopy
 from flopy.utils.postprocessing import get_transmissivities, get_water_table, \
-    get_gradients, get_saturated_thickness
+    get_gradients, get_saturated_thickness, get_transmissivities_batch, \
+    iter_water_table, iter_saturated_thickness, iter_gradients, \
+    get_summary_statistics
 
 mf = flopy.modflow
 
@@ -44,6 +47,46 @@ def test_get_transmissivities():
                           [0.2, 2., 2., 2., 2., 2., 2., 2.],
                           [2., 2., 2., 1.2, 2., 2., 2., 2.]])).sum() < 1e-3
 
+def test_get_transmissivities_batch():
+    pth = os.path.join('..', 'examples', 'data', 'mf6', 'create_tests',
+                       'test005_advgw_tidal', 'expected_output')
+    hdobj = flopy.utils.HeadFile(os.path.join(pth, 'AdvGW_tidal.hds'))
+    heads = hdobj.get_memmap()
+    nt, nl, nr, nc = heads.shape
+    assert np.array_equal(heads[-1], hdobj.get_data(totim=hdobj.times[-1]))
+
+    m = mf.Modflow('junk', model_ws='temp')
+    dis = mf.ModflowDis(m, nlay=nl, nrow=nr, ncol=nc, top=50.,
+                        botm=[5., -10., -50.])
+    lpf = mf.ModflowLpf(m, hk=[5., 10., 2.])
+
+    # wells above, below and across the layers
+    np.random.seed(0)
+    r = np.random.randint(0, nr, 50)
+    c = np.random.randint(0, nc, 50)
+    sctop = np.random.rand(50) * 120. - 60.
+    scbot = sctop - 10.
+    T = get_transmissivities_batch(heads, m, r=r, c=c, sctop=sctop,
+                                   scbot=scbot)
+    assert T.shape == (nt, nl, 50)
+    for i in [0, 100, nt - 1]:
+        Ti = get_transmissivities(hdobj.get_data(totim=hdobj.times[i]), m,
+                                  r=r, c=c, sctop=sctop, scbot=scbot)
+        assert np.array_equal(T[i], Ti)
+
+    # heads at the locations and selected times
+    T2 = get_transmissivities_batch(heads[:, :, r, c], m, r=r, c=c,
+                                    sctop=sctop, scbot=scbot,
+                                    per_idx=[5, 10])
+    assert np.array_equal(T2, T[[5, 10]])
+
+    # transmissivity fractions
+    F = get_transmissivities_batch(heads, m, r=r, c=c, sctop=sctop,
+                                   scbot=scbot, fractions=True)
+    total = T.sum(axis=1)
+    assert np.allclose(F.sum(axis=1)[total > 0.], 1.)
+    assert np.allclose(F * total[:, None, :], T)
+
 def test_get_water_table():
     nodata = -9999.
     hds = np.ones ((3, 3, 3), dtype=float) * nodata
@@ -94,6 +137,48 @@ def test_get_sat_thickness_gradients():
     sat_thick = get_saturated_thickness(hds, m, nodata)
     assert np.abs(np.sum(sat_thick[:, 1, 1] - np.array([0.2, 1., 1.]))) < 1e-6
 
+def test_iter_head_results():
+    pth = os.path.join('..', 'examples', 'data', 'mf6', 'create_tests',
+                       'test005_advgw_tidal', 'expected_output')
+    hdobj = flopy.utils.HeadFile(os.path.join(pth, 'AdvGW_tidal.hds'))
+    nodata = 1e30
+    heads = hdobj.get_alldata(nodata=nodata)
+    nt, nl, nr, nc = heads.shape
+
+    m = mf.Modflow('junk', model_ws='temp')
+    dis = mf.ModflowDis(m, nlay=nl, nrow=nr, ncol=nc, top=50.,
+                        botm=[5., -10., -50.])
+
+    per_idx = [0, 10, nt - 1]
+    for nproc in [None, 2]:
+        results = list(iter_water_table(hdobj, nodata, per_idx=per_idx,
+                                        nproc=nproc))
+        assert [r[0] for r in results] == [hdobj.times[i] for i in per_idx]
+        assert np.array_equal([r[1] for r in results],
+                              get_water_table(heads, nodata,
+                                              per_idx=per_idx))
+    results = iter_saturated_thickness(hdobj, m, nodata, per_idx=per_idx)
+    assert np.array_equal([r[1] for r in results],
+                          get_saturated_thickness(heads, m, nodata,
+                                                  per_idx=per_idx))
+    results = iter_gradients(hdobj, m, nodata, per_idx=per_idx, nproc=2)
+    assert np.array_equal([r[1] for r in results],
+                          get_gradients(heads, m, nodata, per_idx=per_idx))
+
+    # summary statistics
+    stats = get_summary_statistics(iter_water_table(hdobj, nodata))
+    wt = get_water_table(heads, nodata)
+    assert np.all(stats['count'] == nt)
+    assert np.allclose(stats['mean'], wt.mean(axis=0))
+    assert np.allclose(stats['std'], wt.std(axis=0))
+    assert np.array_equal(stats['min'], wt.min(axis=0))
+    assert np.array_equal(stats['max'], wt.max(axis=0))
+    a = np.array([[1., -999., np.nan], [3., -999., 2.]])
+    stats = get_summary_statistics(a, nodata=-999.)
+    assert np.array_equal(stats['count'], [2, 0, 1])
+    assert np.allclose(stats['mean'], [2., np.nan, 2.], equal_nan=True)
+    assert np.allclose(stats['std'], [1., np.nan, 0.], equal_nan=True)
+
 if __name__ == '__main__':
     #test_get_transmissivities()
     #test_get_water_table()
@@ -295,6 +295,47 @@ def test_mp5_load():
     return
 
 
+def test_pathline_plot_recarray():
+    # plot all of the pathlines from a single recarray
+    fpth = os.path.join('..', 'examples', 'data', 'mp5', 'm.ptl')
+    pthobj = flopy.utils.PathlineFile(fpth)
+    plines = pthobj.get_alldata()
+    pall = pthobj.get_alldata(to_recarray=True)
+    assert isinstance(pall, np.recarray)
+    assert pall.shape[0] == sum([p.shape[0] for p in plines])
+    for p in plines[:5]:
+        assert np.array_equal(p, pthobj.get_data(partid=p['particleid'][0]))
+
+    mg = flopy.discretization.StructuredGrid(delc=np.ones(40) * 250.,
+                                             delr=np.ones(20) * 250.)
+    mm = flopy.plot.PlotMapView(modelgrid=mg)
+    lc = mm.plot_pathline(plines, layer='all')
+    lc_all = mm.plot_pathline(pall, layer='all')
+    segs = lc.get_segments()
+    assert len(segs) == pthobj.nid.shape[0]
+    assert len(segs) == len(lc_all.get_segments())
+    for s0, s1 in zip(segs, lc_all.get_segments()):
+        assert np.allclose(s0, s1)
+
+    # pathline pieces in layer 0 and travel time selection
+    lc = mm.plot_pathline(pall, layer=0, travel_time='< 1e6')
+    pts = np.concatenate(lc.get_segments())
+    idx = (pall['k'] == 0) & (pall['time'] < 1e6)
+    assert pts.shape[0] <= idx.sum()
+
+    # decimation keeps the end points of the pathlines
+    lc = mm.plot_pathline(pall, layer='all', decimate=1000.)
+    for s0, s1 in zip(segs, lc.get_segments()):
+        assert s1.shape[0] <= s0.shape[0]
+        assert np.allclose(s0[[0, -1]], s1[[0, -1]])
+
+    # all of the timeseries are drawn with one line
+    lo = mm.plot_timeseries(pall, layer='all')
+    assert len(lo) == 1
+    plt.close()
+    return
+
+
 def test_mp5_timeseries_load():
     pth = os.path.join('..', 'examples', 'data', 'mp5')
     files = [os.path.join(pth, name) for name in sorted(os.listdir(pth))
@@ -395,5 +436,6 @@ if __name__ == '__main__':
     test_modpath()
     test_pathline_plot()
     test_mp5_load()
+    test_pathline_plot_recarray()
     test_mp5_timeseries_load()
     test_mp6_timeseries_load()
@@ -1,5 +1,6 @@
 import shutil
 import os
+import re
 import numpy as np
 import flopy
 from flopy.export.vtk import Vtk
@@ -67,9 +68,88 @@ def test_vtkoutput_mf6():
     return
 
 
+def _read_appended(fname):
+    """Read the arrays of a vtk file with raw appended data."""
+    with open(fname, 'rb') as f:
+        b = f.read()
+    data = b[b.index(b'<AppendedData encoding="raw">'):]
+    data = data[data.index(b'_') + 1:]
+    dtypes = {'Float64': '<f8', 'Int32': '<i4', 'Int64': '<i8', 'UInt8': 'u1'}
+    arrays = {}
+    for vtype, name, offset in re.findall(
+            r'<DataArray type="(\w+)"(?: Name="(\w+)")?[^>]*'
+            r'format="appended" offset="(\d+)"/>', b.decode('latin-1')):
+        offset = int(offset)
+        nbytes = int(np.frombuffer(data[offset:offset + 8], dtype='<u8')[0])
+        arrays[name or 'points'] = np.frombuffer(
+            data[offset + 8:offset + 8 + nbytes], dtype=dtypes[vtype])
+    return arrays
+
+
+def test_vtkoutput_binary():
+    """Make binary vtk and a vtk collection of heads"""
+    nlay = 3
+    nrow = 3
+    ncol = 4
+    ml = flopy.modflow.Modflow()
+    dis = flopy.modflow.ModflowDis(ml, nlay=nlay, nrow=nrow, ncol=ncol, top=0,
+                                   botm=[-1., -2., -3.])
+    ibound = np.ones((nlay, nrow, ncol), dtype=np.int)
+    ibound[0, 1, 1] = 0
+    bas = flopy.modflow.ModflowBas(ml, ibound=ibound)
+
+    fvtkout = os.path.join(cpth, 'test_binary.vtu')
+    vtkfile = Vtk(fvtkout, ml)
+    a = np.arange(nlay * nrow * ncol).reshape((nlay, nrow, ncol))
+    vtkfile.add_array('testarray', a)
+    vtkfile.write(ibound_filter=True, binary=True)
+
+    arrays = _read_appended(fvtkout)
+    verts, iverts = Vtk.get_3d_vertex_connectivity(ml.modelgrid)
+    assert len(iverts) == 35
+    assert np.allclose(arrays['points'], verts.ravel())
+    assert np.array_equal(arrays['connectivity'], np.arange(35 * 8))
+    assert np.array_equal(arrays['offsets'], 8 * np.arange(1, 36))
+    assert np.all(arrays['types'] == 11)
+    assert np.allclose(arrays['testarray'], a[ibound != 0])
+
+    # time series of heads reusing the geometry
+    heads = [a * 0.5, a * 1.5]
+    files = vtkfile.write_pvd(heads, times=[1., 10.], ibound_filter=True)
+    assert len(files) == 2
+    arrays = _read_appended(files[1])
+    assert np.allclose(arrays['head'], heads[1][ibound != 0])
+    assert np.allclose(arrays['testarray'], a[ibound != 0])
+    with open(os.path.join(cpth, 'test_binary.pvd')) as f:
+        pvd = f.read()
+    assert 'timestep="10.0" file="test_binary_000002.vtu"' in pvd
+    return
+
+
+def test_vtk_connectivity():
+    """Shared and separate vertex connectivity"""
+    mg = flopy.discretization.StructuredGrid(
+        delc=np.ones(2), delr=np.ones(3), top=np.zeros((2, 3)),
+        botm=np.array([np.full((2, 3), -1.), np.full((2, 3), -3.)]),
+        idomain=np.array([[[1, 0, 1], [1, 1, 1]], [[1, 1, 1], [1, 1, 1]]]))
+    verts, iverts = Vtk.get_3d_vertex_connectivity(mg)
+    assert verts.shape == (11 * 8, 3)
+    # second cell is row 0, column 2 of layer 1
+    assert np.allclose(verts[8:16, 0], [2., 3., 2., 3., 2., 3., 2., 3.])
+    assert np.allclose(verts[8:16, 1], [1., 1., 2., 2., 1., 1., 2., 2.])
+    assert np.allclose(verts[8:16, 2], [-1.] * 4 + [0.] * 4)
+
+    verts, iverts = Vtk.get_3d_shared_vertex_connectivity(mg)
+    assert verts.shape == (3 * 12, 3)
+    assert iverts.shape == (11, 8)
+    assert iverts[1].tolist() == [18, 19, 14, 15, 6, 7, 2, 3]
+    assert np.allclose(verts[12:24, 2], -1.)
+    return
 
 
 if __name__ == '__main__':
     test_vtkoutput()
     test_vtkoutput_noibound()
-    test_vtkoutput_mf6()
\ No newline at end of file
+    test_vtkoutput_mf6()
+    test_vtkoutput_binary()
+    test_vtk_connectivity()
\ No newline at end of file
@@ -106,5 +106,242 @@ def test_gridgen():
     return
 
 
+def test_to_cvfd():
+    from flopy.utils.cvfdutil import to_cvfd
+
+    # a 2 x 2 grid with the upper left cell refined, and the lower right
+    # quarter of that cell refined again, so that the edges of the larger
+    # cells have up to two hanging nodes
+    def square(x, y, d):
+        return [(x, y), (x + d, y), (x + d, y - d), (x, y - d), (x, y)]
+
+    vertdict = {}
+    for (x, y) in [(0., 2.), (0.5, 2.), (0., 1.5)]:
+        vertdict[len(vertdict)] = square(x, y, 0.5)
+    for (x, y) in [(0.5, 1.5), (0.75, 1.5), (0.5, 1.25), (0.75, 1.25)]:
+        vertdict[len(vertdict)] = square(x, y, 0.25)
+    for (x, y) in [(1., 2.), (0., 1.), (1., 1.)]:
+        vertdict[len(vertdict)] = square(x, y, 1.)
+    verts, iverts = to_cvfd(vertdict)
+
+    # shared vertices are merged and numbered in the order they are used
+    assert verts.shape == (19, 2)
+    assert np.allclose(verts[:5], [(0., 2.), (0.5, 2.), (0.5, 1.5),
+                                   (0., 1.5), (1., 2.)])
+    assert iverts[0] == [0, 1, 2, 3, 0]
+
+    # cell to the right of the refined cell
+    ivs = iverts[7]
+    assert ivs[0] == ivs[-1]
+    assert np.allclose(verts[ivs], [(1., 2.), (2., 2.), (2., 1.), (1., 1.),
+                                    (1., 1.25), (1., 1.5), (1., 2.)])
+    # cell below the refined cell
+    ivs = iverts[8]
+    assert np.allclose(verts[ivs], [(0., 1.), (0.5, 1.), (0.75, 1.),
+                                    (1., 1.), (1., 0.), (0., 0.), (0., 1.)])
+    assert sum(len(ivs) for ivs in iverts) == 56
+
+    # without the hanging node check
+    verts, iverts = to_cvfd(vertdict, skip_hanging_node_check=True)
+    assert len(iverts[7]) == 5
+
+
+def _write_gridgen_output(ws):
+    """
+    Write the grid files of a two layer quadtree grid, a 2 x 2 grid with
+    the upper left cell refined once, as gridgen writes them. Returns the
+    cell polygons.
+    """
+    import stat
+    import sys
+    import shapefile
+
+    # cells of a layer: x0, y0, size
+    cells = [(0., 200., 50.), (50., 200., 50.), (0., 150., 50.),
+             (50., 150., 50.), (100., 200., 100.), (0., 100., 100.),
+             (100., 100., 100.)]
+    ncpl = len(cells)
+    nlay = 2
+    nodes = nlay * ncpl
+    top1 = 10. + np.arange(ncpl)
+    bot1 = 5. - 0.5 * np.arange(ncpl)
+    bot2 = np.zeros(ncpl)
+    top = np.concatenate((top1, bot1))
+    bot = np.concatenate((bot1, bot2))
+
+    iac, ja, fldr, cl12, fahl = [], [], [], [], []
+    for n in range(nodes):
+        k, i = divmod(n, ncpl)
+        x0, y0, d = cells[i]
+        conn = [(n, 0, 0., 0.)]
+        for m in range(k * ncpl, (k + 1) * ncpl):
+            x1, y1, d1 = cells[m - k * ncpl]
+            xo = min(x0 + d, x1 + d1) - max(x0, x1)
+            yo = min(y0, y1) - max(y0 - d, y1 - d1)
+            if x1 == x0 + d and yo > 0:
+                conn.append((m, 1, 0.5 * d, yo))
+            elif x1 + d1 == x0 and yo > 0:
+                conn.append((m, -1, 0.5 * d, yo))
+            elif y1 - d1 == y0 and xo > 0:
+                conn.append((m, 2, 0.5 * d, xo))
+            elif y1 == y0 - d and xo > 0:
+                conn.append((m, -2, 0.5 * d, xo))
+        for m, idir in [(n - ncpl, 3), (n + ncpl, -3)]:
+            if 0 <= m < nodes:
+                conn.append((m, idir, 0.5 * (top[n] - bot[n]), d * d))
+        conn = [conn[0]] + sorted(conn[1:])
+        iac.append(len(conn))
+        for m, idir, c, f in conn:
+            ja.append(m + 1)
+            fldr.append(idir)
+            cl12.append(c)
+            fahl.append(f)
+
+    def write(fname, a, fmt='{}'):
+        with open(os.path.join(ws, fname), 'w') as f:
+            for i in range(0, len(a), 5):
+                f.write(' '.join(fmt.format(v) for v in a[i:i + 5]) + '\n')
+
+    area = [cells[n % ncpl][2] ** 2 for n in range(nodes)]
+    with open(os.path.join(ws, 'qtg.nod'), 'w') as f:
+        f.write('{} {}\n'.format(nodes, nlay))
+        for n in range(nodes):
+            k, i = divmod(n, ncpl)
+            x0, y0, d = cells[i]
+            f.write('{} {} {} {} {} {} {} {}\n'.format(
+                n + 1, k + 1, x0 + 0.5 * d, y0 - 0.5 * d,
+                0.5 * (top[n] + bot[n]), d, d, top[n] - bot[n]))
+    write('qtg.nodesperlay.dat', [ncpl] * nlay)
+    for k in range(nlay):
+        write('quadtreegrid.top{}.dat'.format(k + 1),
+              top[k * ncpl:(k + 1) * ncpl], '{:.7E}')
+        write('quadtreegrid.bot{}.dat'.format(k + 1),
+              bot[k * ncpl:(k + 1) * ncpl], '{:.7E}')
+    write('qtg.area.dat', area, '{:.7E}')
+    write('qtg.iac.dat', iac)
+    write('qtg.ja.dat', ja)
+    write('qtg.fldr.dat', fldr)
+    write('qtg.c1.dat', cl12, '{:.7E}')
+    write('qtg.fahl.dat', fahl, '{:.7E}')
+
+    # cell polygons, clockwise from the upper left corner
+    polygons = []
+    for x0, y0, d in cells:
+        polygons.append([(x0, y0), (x0 + d, y0), (x0 + d, y0 - d),
+                         (x0, y0 - d), (x0, y0)])
+    w = shapefile.Writer(os.path.join(ws, 'qtgrid'),
+                         shapeType=shapefile.POLYGON)
+    w.field('nodenumber', 'N', 10, 0)
+    w.field('layer', 'N', 10, 0)
+    for n in range(nodes):
+        w.poly([polygons[n % ncpl]])
+        w.record(n + 1, n // ncpl + 1)
+    w.close()
+
+    # stand-in for the gridgen executable, the grid files exist already,
+    # the other output files are left empty
+    exe = os.path.join(ws, 'gridgen_output')
+    with open(exe, 'w') as f:
+        f.write('#!{}\n'.format(sys.executable))
+        f.write('import os, sys\n')
+        f.write("fnames = {'quadtreebuilder': 'quadtreegrid.dfn',\n"
+                "          'grid_to_shapefile_point': 'qtgrid_pt.shp',\n"
+                "          'grid_to_vtk': 'qtg.vtu',\n"
+                "          'grid_to_vtk_sv': 'qtg_sv.vtu'}\n")
+        f.write("fname = fnames.get(sys.argv[1])\n")
+        f.write("if fname is not None and not os.path.isfile(fname):\n")
+        f.write("    open(fname, 'w').close()\n")
+    os.chmod(exe, os.stat(exe).st_mode | stat.S_IEXEC)
+    return exe, polygons
+
+
+def test_gridgen_output_files():
+    # the stand-in for gridgen is a python script
+    if os.name == 'nt':
+        return
+    ws = os.path.join(cpth, 'output_files')
+    os.makedirs(ws)
+    exe, polygons = _write_gridgen_output(ws)
+
+    ms = flopy.modflow.Modflow()
+    dis = flopy.modflow.ModflowDis(ms, nlay=2, nrow=2, ncol=2, delr=100.,
+                                   delc=100., top=10., botm=[5., 0.])
+    g = Gridgen(dis, model_ws=ws, exe_name=os.path.abspath(exe))
+    g.build()
+
+    # the arrays are the same as read from each file
+    def read(fname, dtype):
+        with open(os.path.join(ws, fname)) as f:
+            return np.array([dtype(v) for v in f.read().split()],
+                            dtype=dtype)
+
+    nodelay = read('qtg.nodesperlay.dat', int)
+    top = np.concatenate([read('quadtreegrid.top{}.dat'.format(k + 1),
+                               np.float32) for k in range(2)])
+    bot = np.concatenate([read('quadtreegrid.bot{}.dat'.format(k + 1),
+                               np.float32) for k in range(2)])
+    iac = read('qtg.iac.dat', int)
+    ja = read('qtg.ja.dat', int)
+    fldr = read('qtg.fldr.dat', int)
+    fahl = read('qtg.fahl.dat', np.float32)
+    nodes = top.shape[0]
+    assert g.get_nodes() == nodes
+    assert np.array_equal(g.get_nodelay(), nodelay)
+    assert np.array_equal(g.get_top(), top)
+    assert np.array_equal(g.get_bot(), bot)
+    assert np.array_equal(g.get_area(), read('qtg.area.dat', np.float32))
+    assert np.array_equal(g.get_iac(), iac)
+    assert np.array_equal(g.get_ja(), ja)
+    assert np.array_equal(g.get_fldr(), fldr)
+    assert np.array_equal(g.get_cl12(), read('qtg.c1.dat', np.float32))
+    assert np.array_equal(g.get_fahl(), fahl)
+    assert g.get_top().dtype == np.float32
+
+    # hwva of the horizontal connections is divided by the average
+    # thickness of the two cells
+    hwva = fahl.copy()
+    ipos = 0
+    for n in range(nodes):
+        for j in range(iac[n]):
+            if j > 0 and abs(fldr[ipos]) != 3:
+                m = ja[ipos] - 1
+                hwva[ipos] /= 0.5 * (top[n] - bot[n] + top[m] - bot[m])
+            ipos += 1
+    assert np.array_equal(g.get_hwva(), hwva)
+
+    # gridprops dictionaries
+    gridprops = g.get_gridprops()
+    assert gridprops['nja'] == ja.shape[0]
+    for name, a in [('nodelay', nodelay), ('top', top), ('bot', bot),
+                    ('iac', iac), ('ja', ja), ('fldr', fldr),
+                    ('fahl', fahl), ('ivc', abs(fldr) == 3)]:
+        assert np.array_equal(gridprops[name], a)
+    gridprops = g.get_gridprops_disu6()
+    assert np.array_equal(gridprops['hwva'], hwva)
+    assert np.array_equal(gridprops['ihc'], (abs(fldr) % 3 != 0) * 1)
+    assert gridprops['nvert'] == 4 * nodes
+    assert np.allclose([v[1:] for v in gridprops['vertices'][:4]],
+                       polygons[0][:4])
+    assert np.allclose(gridprops['cell2d'][4][:4], [4, 150., 150., 4])
+    assert gridprops['cell2d'][4][4:] == [17, 18, 19, 20]
+    gridprops = g.get_gridprops_disv()
+    ncpl = nodelay[0]
+    assert gridprops['ncpl'] == ncpl
+    assert np.array_equal(gridprops['top'], top[:ncpl])
+    assert np.array_equal(gridprops['botm'], bot.reshape(2, ncpl))
+    # the larger cell right of the refined cell has a hanging vertex
+    assert gridprops['cell2d'][4][3] == 6
+
+    # the properties are read again after the grid is rebuilt
+    area = g.get_area()
+    with open(os.path.join(ws, 'qtg.area.dat'), 'w') as f:
+        f.write(' '.join(str(2. * v) for v in area))
+    assert np.array_equal(g.get_area(), area)
+    g.build()
+    assert np.array_equal(g.get_area(), 2. * area)
+
+
 if __name__ == '__main__':
     test_gridgen()
+    test_to_cvfd()
+    test_gridgen_output_files()
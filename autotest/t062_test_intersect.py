@@ -142,5 +142,135 @@ def test_intersection():
             assert all(np.isnan([row, col, cell2d_disv]))
 
 
+def test_intersection_arrays():
+    ml_dis = dis_model()
+    ml_disv = disv_model()
+    dis_grid = ml_dis.modelgrid
+    disv_grid = ml_disv.modelgrid
+
+    # cell centers and random points inside the grid, in local coordinates
+    np.random.seed(0)
+    x = np.concatenate((np.arange(ncol) * delr + 1.,
+                        np.random.rand(200) * delr * ncol))
+    y = np.concatenate((np.arange(ncol) * delc + 1.,
+                        np.random.rand(200) * delc * nrow))
+    icell = disv_grid.intersect(x, y, local=True)
+    assert icell.shape == x.shape
+    for xi, yi, ic in zip(x, y, icell):
+        row, col = dis_grid.intersect(xi, yi, local=True)
+        assert ic == row * ncol + col
+        assert ic == disv_grid.intersect(xi, yi, local=True)
+
+    # points outside of the grid
+    x = np.array([1., -1.])
+    y = np.array([1., 1.])
+    try:
+        disv_grid.intersect(x, y, local=True)
+        raise AssertionError('point outside of the grid was not detected')
+    except Exception as e:
+        assert 'outside of the model area' in e.args[0]
+    icell = disv_grid.intersect(x, y, local=True, forgive=True)
+    assert icell[0] == (nrow - 1) * ncol
+    assert np.isnan(icell[1])
+
+    # unstructured grid with the same cells
+    verts = [list(v)[1:] for v in ml_disv.disv.vertices.array]
+    cell2d = [list(c) for c in ml_disv.disv.cell2d.array]
+    iverts = [c[4:] for c in cell2d]
+    xc = [c[1] for c in cell2d]
+    yc = [c[2] for c in cell2d]
+    usg_grid = flopy.discretization.UnstructuredGrid(
+        vertices=verts, iverts=iverts, xcenters=xc, ycenters=yc,
+        ncpl=np.array([len(iverts)]))
+    icell = usg_grid.intersect(np.array(xc), np.array(yc))
+    assert np.array_equal(icell, np.arange(nrow * ncol))
+    assert usg_grid.intersect(xc[5], yc[5]) == 5
+
+def test_structured_intersection_arrays():
+    ml_dis = dis_model()
+    grid = ml_dis.modelgrid
+
+    # random points inside the grid and on the cell edges, in world
+    # coordinates
+    np.random.seed(0)
+    xl = np.concatenate((np.random.rand(500) * delr * ncol,
+                         np.arange(1, ncol) * delr))
+    yl = np.concatenate((np.random.rand(500) * delc * nrow,
+                         np.arange(1, ncol) * delc))
+    x, y = grid.get_coords(xl, yl)
+    row, col = grid.intersect(x, y)
+    assert row.shape == x.shape
+    for xi, yi, r, c in zip(x, y, row, col):
+        assert (r, c) == grid.intersect(xi, yi)
+
+    # layer lookup by elevation
+    z = np.array([top, botm[0], botm[0] - 1., botm[1] - 1., botm[2]])
+    lay, row, col = grid.intersect(xl[:5], yl[:5], local=True, z=z)
+    assert np.array_equal(lay, [0, 0, 1, 2, 2])
+    lay, row, col = grid.intersect(xl[:2], yl[:2], local=True,
+                                   z=[top + 1., botm[1]], forgive=True)
+    assert np.isnan(lay[0]) and np.isnan(row[0]) and np.isnan(col[0])
+    assert lay[1] == 1
+
+def test_gridintersect_features():
+    from flopy.utils.gridintersect import GridIntersect
+    dis_grid = dis_model().modelgrid
+    disv_grid = disv_model().modelgrid
+    ix_dis = GridIntersect(dis_grid)
+    ix_disv = GridIntersect(disv_grid)
+
+    # points, in local coordinates of the grid
+    np.random.seed(0)
+    xl = np.append(np.random.rand(50) * delr * ncol, -10.)
+    yl = np.append(np.random.rand(50) * delc * nrow, 10.)
+    x, y = dis_grid.get_coords(xl, yl)
+    pts = ix_dis.intersect(list(zip(x, y)), 'point')
+    assert np.array_equal(pts.pointid, np.arange(50))
+    row, col = dis_grid.intersect(x[:50], y[:50])
+    assert np.array_equal(pts.nodenumber, row * ncol + col)
+    assert np.array_equal(pts.nodenumber,
+                          ix_disv.intersect_point(list(zip(x, y))).nodenumber)
+
+    # a line along a row of cell centers and a line on a cell edge
+    xl = np.array([0.5 * delr, 3.5 * delr, 3.5 * delr])
+    yl = np.array([2.5 * delc, 2.5 * delc, 0.])
+    line1 = list(zip(*dis_grid.get_coords(xl, yl)))
+    xl = np.array([2. * delr, 2. * delr])
+    yl = np.array([nrow * delc, (nrow - 2) * delc])
+    line2 = list(zip(*dis_grid.get_coords(xl, yl)))
+    lines = ix_dis.intersect([line1, [line2]], 'line')
+    assert np.allclose(lines.length[lines.arcid == 0].sum(),
+                       3. * delr + 2.5 * delc)
+    assert np.allclose(lines.ending_distance - lines.starting_distance,
+                       lines.length)
+    row = nrow - 3
+    assert np.array_equal(lines.nodenumber[:5],
+                          [row * ncol, row * ncol + 1, row * ncol + 2,
+                           row * ncol + 3, (row + 1) * ncol + 3])
+    # the cells left of the line on the edge
+    assert np.array_equal(lines.nodenumber[lines.arcid == 1], [2, ncol + 2])
+    assert np.allclose(lines.length[lines.arcid == 1], delc)
+
+    # a triangle with a hole, compare with the structured grid
+    xl = np.array([100., 7100., 100.])
+    yl = np.array([100., 100., 9100.])
+    ring = list(zip(*dis_grid.get_coords(xl, yl)))
+    xl = np.array([1000., 2000., 2000., 1000.])
+    yl = np.array([1000., 1000., 2000., 2000.])
+    hole = list(zip(*dis_grid.get_coords(xl, yl)))
+    polys = ix_disv.intersect([[ring, hole]], 'polygon')
+    assert np.allclose(polys.totalarea.sum(), 0.5 * 7000. * 9000. - 1000. ** 2)
+    assert np.all(polys.totalarea <= delr * delc * (1. + 1e-9))
+    polys_dis = ix_dis.intersect_polygon([[ring, hole]])
+    assert np.array_equal(polys.nodenumber, polys_dis.nodenumber)
+    assert np.allclose(polys.totalarea, polys_dis.totalarea)
+    # cells in the hole are not in the result
+    row, col = dis_grid.intersect(*dis_grid.get_coords(1500., 1500.))
+    assert row * ncol + col not in polys.nodenumber
+
+
 if __name__ == '__main__':
-    test_intersection()
\ No newline at end of file
+    test_intersection()
+    test_intersection_arrays()
+    test_structured_intersection_arrays()
+    test_gridintersect_features()
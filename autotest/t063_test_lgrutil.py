@@ -62,6 +62,14 @@ def test_lgrutil():
     assert exchange_data[-1] == ans2
     assert len(exchange_data) == 72
 
+    # exchange data as a recarray
+    exgdata = lgr.get_exchange_data(angldegx=True, cdist=True,
+                                    recarray=True)
+    assert isinstance(exgdata, np.recarray)
+    assert exgdata.dtype.names == ('cellidm1', 'cellidm2', 'ihc', 'cl1',
+                                   'cl2', 'hwva', 'angldegx', 'cdist')
+    assert [list(exg) for exg in exgdata.tolist()] == exchange_data
+
     # list of parent cells connected to a child cell
     assert lgr.get_parent_connections(0, 0, 0) == [((0, 1, 0), -1),
                                                    ((0, 0, 1), 2)]
@@ -1,6 +1,8 @@
 import numpy as np
-import copy, os
+import copy, os, sys
 import warnings
+import weakref
+from collections import OrderedDict
 from ..utils import geometry
 
 
@@ -22,6 +24,409 @@ class CachedData(object):
         self.out_of_date = False
 
 
+class GeometryCache(object):
+    """
+    Least recently used cache of grid geometry (cell centers, vertices,
+    z-coordinates, ...) shared by all grid objects.
+
+    Entries are keyed on the identity of the arrays that define the grid
+    (delr, delc, vertices, cell2d, top, botm, idomain, ...) and, for
+    real-world coordinates, on the offsets and the rotation. Grids built
+    from the same arrays therefore compute their geometry only once. Weak
+    references to the arrays are kept with an entry, so that an entry is
+    dropped once an array is garbage collected and its id may be reused.
+
+    Entries are shared by all grids with the same key, so the arrays of
+    an entry are stored read-only. Data larger than maxbytes is not cached
+    (and not made read-only).
+
+    Parameters
+    ----------
+    maxsize : int
+        maximum number of cached entries (default is 64)
+    maxbytes : int
+        maximum total size of the cached entries in bytes (default is
+        256 MB)
+
+    Examples
+    --------
+    >>> from flopy.discretization.grid import geometry_cache
+    >>> geometry_cache.clear()
+    """
+    def __init__(self, maxsize=64, maxbytes=256 * 2 ** 20):
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        self.nbytes = 0
+        self._data = OrderedDict()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key):
+        """Return the cached data for key or None."""
+        if key not in self._data:
+            return None
+        data, nbytes, refs = self._data.pop(key)
+        if any(ref() is None for ref in refs):
+            # an input of the entry was garbage collected
+            self.nbytes -= nbytes
+            return None
+        self._data[key] = data, nbytes, refs
+        return data
+
+    def set(self, key, data, refs=()):
+        """
+        Store data for key, dropping the least recently used entries, and
+        return the data. Stored data is returned read-only, data larger
+        than maxbytes is returned unchanged. refs are weak references to
+        the objects the key was built from.
+        """
+        self.pop(key)
+        nbytes = _nbytes(data)
+        if nbytes > self.maxbytes:
+            return data
+        data = _read_only(data)
+        self._data[key] = data, nbytes, tuple(refs)
+        self.nbytes += nbytes
+        while len(self._data) > self.maxsize or self.nbytes > self.maxbytes:
+            self.nbytes -= self._data.popitem(last=False)[1][1]
+        return data
+
+    def pop(self, key):
+        """Remove the entry for key, if there is one."""
+        if key in self._data:
+            self.nbytes -= self._data.pop(key)[1]
+
+    def clear(self):
+        """Remove all entries."""
+        self._data.clear()
+        self.nbytes = 0
+
+
+geometry_cache = GeometryCache()
+
+
+def _read_only(data):
+    """
+    Read-only version of the arrays in data (an array, a list or tuple of
+    arrays or an object with array attributes). Views of other arrays are
+    copied, so the data can not be changed through the base array either.
+    """
+    if isinstance(data, np.ndarray):
+        if data.base is not None:
+            data = data.copy()
+        data.setflags(write=False)
+    elif isinstance(data, tuple):
+        data = tuple(_read_only(item) for item in data)
+    elif isinstance(data, list):
+        data = [_read_only(item) for item in data]
+    elif hasattr(data, '__dict__'):
+        for name, value in vars(data).items():
+            setattr(data, name, _read_only(value))
+    return data
+
+
+def _nbytes(data):
+    """Size of the arrays and objects in data in bytes."""
+    if isinstance(data, np.ndarray):
+        return data.nbytes
+    if isinstance(data, (tuple, list)):
+        return sys.getsizeof(data) + sum(_nbytes(item) for item in data)
+    if hasattr(data, '__dict__'):
+        return sum(_nbytes(value) for value in vars(data).values())
+    return sys.getsizeof(data)
+
+
+class CellIndex(object):
+    """
+    Spatial index of cell polygons for locating points in a grid.
+
+    The bounding boxes of the cells are binned into a uniform grid of
+    buckets, so that only the cells sharing a bucket with a point have to
+    be tested with a (vectorized) point in polygon test.
+
+    Parameters
+    ----------
+    xvertices : list of lists or ndarray
+        x-coordinates of the vertices of each cell
+    yvertices : list of lists or ndarray
+        y-coordinates of the vertices of each cell
+    tolerance : float
+        points within tolerance of a cell edge are considered to be
+        inside of the cell (default is 1e-9)
+    offsets : ndarray
+        if specified, xvertices and yvertices are flat arrays of the
+        vertices of all cells, and the vertices of cell n are
+        xvertices[offsets[n]:offsets[n + 1]] (default is None)
+
+    """
+    def __init__(self, xvertices, yvertices, tolerance=1e-9, offsets=None):
+        self.tolerance = tolerance
+        self.xv, self.yv = self._pad_vertices(xvertices, yvertices, offsets)
+        ncells = self.xv.shape[0]
+        self.ncells = ncells
+        self.xmin = self.xv.min(axis=1)
+        self.xmax = self.xv.max(axis=1)
+        self.ymin = self.yv.min(axis=1)
+        self.ymax = self.yv.max(axis=1)
+        if ncells == 0:
+            self.extent = (0., 0., 0., 0.)
+            self.nbx = self.nby = 1
+            self.dx = self.dy = 1.
+            self.indptr = np.zeros(2, dtype=int)
+            self.indices = np.zeros(0, dtype=int)
+            return
+
+        # bucket grid with about one cell per bucket
+        x0, x1 = self.xmin.min(), self.xmax.max()
+        y0, y1 = self.ymin.min(), self.ymax.max()
+        self.extent = (x0, x1, y0, y1)
+        width = max(x1 - x0, tolerance)
+        height = max(y1 - y0, tolerance)
+        nbx = int(np.clip(np.sqrt(ncells * width / height), 1, ncells))
+        nby = int(np.clip(ncells // nbx, 1, ncells))
+        self.nbx, self.nby = nbx, nby
+        self.dx = width / nbx
+        self.dy = height / nby
+
+        # (bucket, cell) pairs for all buckets overlapped by a bounding box
+        ix0, iy0 = self._get_buckets(self.xmin - tolerance,
+                                     self.ymin - tolerance)
+        ix1, iy1 = self._get_buckets(self.xmax + tolerance,
+                                     self.ymax + tolerance)
+        nx = ix1 - ix0 + 1
+        ny = iy1 - iy0 + 1
+        counts = nx * ny
+        cells = np.repeat(np.arange(ncells), counts)
+        offset = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) -
+                                                     counts, counts)
+        bx = ix0[cells] + offset % nx[cells]
+        by = iy0[cells] + offset // nx[cells]
+        buckets = by * nbx + bx
+        # stable sort keeps the cells of a bucket in ascending order
+        order = np.argsort(buckets, kind='mergesort')
+        self.indices = cells[order]
+        self.indptr = np.zeros(nbx * nby + 1, dtype=int)
+        np.cumsum(np.bincount(buckets, minlength=nbx * nby),
+                  out=self.indptr[1:])
+
+    @staticmethod
+    def _pad_vertices(xvertices, yvertices, offsets=None):
+        """
+        Store the vertices of all cells in two (ncells, nvert + 1) arrays,
+        closing each polygon by repeating its first vertex to the end of the
+        row; repeated vertices make zero-length edges, which are ignored.
+        """
+        if offsets is None:
+            nverts = np.array([len(xv) for xv in xvertices], dtype=int)
+        else:
+            nverts = np.diff(offsets)
+        ncells = len(nverts)
+        maxverts = nverts.max() + 1 if ncells > 0 else 1
+        xv = np.empty((ncells, maxverts), dtype=float)
+        yv = np.empty((ncells, maxverts), dtype=float)
+        if ncells == 0:
+            return xv, yv
+        if offsets is None:
+            x = np.concatenate([np.asarray(v, dtype=float).ravel()
+                                for v in xvertices])
+            y = np.concatenate([np.asarray(v, dtype=float).ravel()
+                                for v in yvertices])
+        else:
+            x = np.asarray(xvertices, dtype=float)
+            y = np.asarray(yvertices, dtype=float)
+        start = np.cumsum(nverts) - nverts
+        xv[:] = x[start][:, np.newaxis]
+        yv[:] = y[start][:, np.newaxis]
+        rows = np.repeat(np.arange(ncells), nverts)
+        cols = np.arange(len(x)) - np.repeat(start, nverts)
+        xv[rows, cols] = x
+        yv[rows, cols] = y
+        return xv, yv
+
+    def _get_buckets(self, x, y):
+        """Bucket column and row of x, y, clipped to the bucket grid."""
+        ix = np.floor((x - self.extent[0]) / self.dx).astype(int)
+        iy = np.floor((y - self.extent[2]) / self.dy).astype(int)
+        return np.clip(ix, 0, self.nbx - 1), np.clip(iy, 0, self.nby - 1)
+
+    def get_candidates(self, x, y):
+        """
+        Get (point, cell) pairs for the cells whose bounding box contains
+        a point.
+
+        Parameters
+        ----------
+        x : ndarray
+            x-coordinates of the points
+        y : ndarray
+            y-coordinates of the points
+
+        Returns
+        -------
+        ipt : ndarray
+            point index of each pair, in ascending order
+        icell : ndarray
+            cell number of each pair, ascending for each point
+
+        """
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        tol = self.tolerance
+        x0, x1, y0, y1 = self.extent
+        inside = (x >= x0 - tol) & (x <= x1 + tol) & \
+                 (y >= y0 - tol) & (y <= y1 + tol)
+        pts = np.where(inside)[0]
+        ix, iy = self._get_buckets(x[pts], y[pts])
+        buckets = iy * self.nbx + ix
+        start = self.indptr[buckets]
+        counts = self.indptr[buckets + 1] - start
+        ipt = np.repeat(pts, counts)
+        offset = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) -
+                                                     counts, counts)
+        icell = self.indices[np.repeat(start, counts) + offset]
+        # bounding box test
+        xp, yp = x[ipt], y[ipt]
+        keep = (xp >= self.xmin[icell] - tol) & \
+               (xp <= self.xmax[icell] + tol) & \
+               (yp >= self.ymin[icell] - tol) & \
+               (yp <= self.ymax[icell] + tol)
+        return ipt[keep], icell[keep]
+
+    def get_box_candidates(self, xmin, xmax, ymin, ymax):
+        """
+        Get (box, cell) pairs for the cells whose bounding box overlaps a
+        box.
+
+        Parameters
+        ----------
+        xmin, xmax, ymin, ymax : ndarray
+            bounds of the boxes
+
+        Returns
+        -------
+        ibox : ndarray
+            box index of each pair, in ascending order
+        icell : ndarray
+            cell number of each pair, ascending for each box
+
+        """
+        xmin = np.atleast_1d(np.asarray(xmin, dtype=float))
+        xmax = np.atleast_1d(np.asarray(xmax, dtype=float))
+        ymin = np.atleast_1d(np.asarray(ymin, dtype=float))
+        ymax = np.atleast_1d(np.asarray(ymax, dtype=float))
+        tol = self.tolerance
+        x0, x1, y0, y1 = self.extent
+        inside = (xmax >= x0 - tol) & (xmin <= x1 + tol) & \
+                 (ymax >= y0 - tol) & (ymin <= y1 + tol)
+        boxes = np.where(inside)[0]
+        ix0, iy0 = self._get_buckets(xmin[boxes], ymin[boxes])
+        ix1, iy1 = self._get_buckets(xmax[boxes], ymax[boxes])
+        nx = ix1 - ix0 + 1
+        ny = iy1 - iy0 + 1
+        counts = nx * ny
+        ib = np.repeat(np.arange(len(boxes)), counts)
+        offset = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) -
+                                                     counts, counts)
+        buckets = (iy0[ib] + offset // nx[ib]) * self.nbx + \
+                  ix0[ib] + offset % nx[ib]
+        start = self.indptr[buckets]
+        counts = self.indptr[buckets + 1] - start
+        ib = np.repeat(ib, counts)
+        offset = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) -
+                                                     counts, counts)
+        icell = self.indices[np.repeat(start, counts) + offset]
+        # a cell can be in several of the buckets of a box
+        key = np.unique(ib * self.ncells + icell)
+        ibox, icell = key // self.ncells, key % self.ncells
+        keep = (xmax[boxes[ibox]] >= self.xmin[icell] - tol) & \
+               (xmin[boxes[ibox]] <= self.xmax[icell] + tol) & \
+               (ymax[boxes[ibox]] >= self.ymin[icell] - tol) & \
+               (ymin[boxes[ibox]] <= self.ymax[icell] + tol)
+        return boxes[ibox[keep]], icell[keep]
+
+    def contains(self, icell, x, y):
+        """
+        Vectorized point in polygon test of points x, y against cells
+        icell. Points on (or within tolerance of) a cell edge are
+        considered to be inside the cell.
+
+        Parameters
+        ----------
+        icell : ndarray
+            cell numbers
+        x : ndarray
+            x-coordinates of the points (same length as icell)
+        y : ndarray
+            y-coordinates of the points (same length as icell)
+
+        Returns
+        -------
+        inside : ndarray of bool
+
+        """
+        inside = np.zeros(len(icell), dtype=bool)
+        # limit the size of the (points, edges) work arrays
+        chunk = max(1, 2 ** 20 // self.xv.shape[1])
+        for i0 in range(0, len(icell), chunk):
+            sl = slice(i0, i0 + chunk)
+            inside[sl] = self._contains(icell[sl], x[sl], y[sl])
+        return inside
+
+    def _contains(self, icell, x, y):
+        px = x[:, np.newaxis]
+        py = y[:, np.newaxis]
+        xv, yv = self.xv[icell], self.yv[icell]
+        xa, xb = xv[:, :-1], xv[:, 1:]
+        ya, yb = yv[:, :-1], yv[:, 1:]
+        dx, dy = xb - xa, yb - ya
+        # crossing number (ray casting in the +x direction)
+        crosses = (ya > py) != (yb > py)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            xcross = xa + dx * (py - ya) / dy
+        crosses &= px < xcross
+        inside = np.sum(crosses, axis=1) % 2 == 1
+        # distance to the edges, to include points on the cell boundary
+        len2 = dx * dx + dy * dy
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t = ((px - xa) * dx + (py - ya) * dy) / len2
+        t = np.where(len2 > 0., np.clip(t, 0., 1.), 0.)
+        ex = xa + t * dx - px
+        ey = ya + t * dy - py
+        onedge = np.any(ex * ex + ey * ey <= self.tolerance ** 2, axis=1)
+        return inside | onedge
+
+    def intersect(self, x, y):
+        """
+        Get the cell number of each point x, y. When a point is on the edge
+        of two cells, the lowest cell number is returned.
+
+        Parameters
+        ----------
+        x : ndarray
+            x-coordinates of the points
+        y : ndarray
+            y-coordinates of the points
+
+        Returns
+        -------
+        icell : ndarray
+            cell number of each point (-1 for points outside of all cells)
+
+        """
+        x = np.atleast_1d(np.asarray(x, dtype=float))
+        y = np.atleast_1d(np.asarray(y, dtype=float))
+        ipt, icell = self.get_candidates(x, y)
+        hit = self.contains(icell, x[ipt], y[ipt])
+        ipt, icell = ipt[hit], icell[hit]
+        # candidates are sorted by point and cell number, so the first
+        # hit of a point is the lowest cell number
+        result = np.full(len(x), -1, dtype=int)
+        pts, first = np.unique(ipt, return_index=True)
+        result[pts] = icell[first]
+        return result
+
+
 class Grid(object):
     """
     Base class for a structured or unstructured model grid
@@ -129,6 +534,10 @@ class Grid(object):
     Examples
     --------
     """
+    # geometry cache entries in model coordinates, these do not depend on
+    # the offsets and the rotation of the grid
+    _local_cache = ('xyedges', 'zcoords')
+
     def __init__(self, grid_type=None, top=None, botm=None, idomain=None,
                  lenuni=None, epsg=None, proj4=None, prj=None, xoff=0.0, yoff=0.0,
                  angrot=0.0):
@@ -157,6 +566,7 @@ class Grid(object):
         self._angrot = angrot
         self._cache_dict = {}
         self._copy_cache = True
+        self._geometry_version = 0
 
     ###################################
     # access to basic grid properties
@@ -353,6 +763,249 @@ class Grid(object):
         else:
             return x, y
 
+    @property
+    def cell_index(self):
+        """
+        Spatial index (CellIndex) of the cell polygons of one layer,
+        built on first use and cached with the grid geometry.
+        """
+        cache_index = 'cellindex'
+        cache_data = self._get_cache_data(cache_index)
+        if cache_data is None:
+            self._copy_cache = False
+            offsets, xvertices, yvertices = self.csr_vertices
+            self._copy_cache = True
+            cache_data = self._set_cache_data(
+                cache_index, CellIndex(xvertices, yvertices, offsets=offsets))
+        return cache_data.data_nocopy
+
+    @property
+    def csr_vertices(self):
+        """
+        Cell vertices in compressed sparse row form: a tuple of offsets
+        and flat x and y vertex arrays, where the vertices of cell n are
+        x[offsets[n]:offsets[n + 1]] and y[offsets[n]:offsets[n + 1]].
+        """
+        cache_index = 'cellvertices'
+        if self._get_cache_data(cache_index) is None:
+            self._build_grid_geometry_info()
+        offsets, xvertices, yvertices, zvertices = \
+            self._cache_dict[cache_index].data_nocopy
+        if self._copy_cache:
+            return offsets.copy(), xvertices.copy(), yvertices.copy()
+        else:
+            return offsets, xvertices, yvertices
+
+    @property
+    def polygon_vertices(self):
+        """
+        Closed cell polygons of one layer in a (ncells, nvert + 1, 2) array
+        of x, y vertices. Cells with fewer vertices are padded with their
+        first vertex, so the array can be passed directly to a matplotlib
+        PolyCollection or LineCollection.
+        """
+        cache_index = 'polygonvertices'
+        cache_data = self._get_cache_data(cache_index)
+        if cache_data is None:
+            copy_cache = self._copy_cache
+            self._copy_cache = False
+            offsets, xvertices, yvertices = self.csr_vertices
+            self._copy_cache = copy_cache
+            xv, yv = CellIndex._pad_vertices(xvertices, yvertices, offsets)
+            cache_data = self._set_cache_data(cache_index,
+                                              np.stack((xv, yv), axis=-1))
+        if self._copy_cache:
+            return cache_data.data_nocopy.copy()
+        else:
+            return cache_data.data_nocopy
+
+    def _build_grid_geometry_info(self):
+        raise NotImplementedError(
+            'must define _build_grid_geometry_info in child '
+            'class to use this base class')
+
+    def _geometry_inputs(self):
+        """
+        Arrays that define the geometry of the grid, used to key the
+        shared geometry cache.
+        """
+        return [self._top, self._botm]
+
+    def _geometry_key(self, cache_index):
+        """
+        Key of a geometry cache entry in the shared geometry cache and weak
+        references to the inputs of the grid, or None if an input can not
+        be referenced weakly (a list for example). The key holds the ids of
+        the inputs and the geometry version of the grid, which is increased
+        when the grid changes. Entries that are not in model coordinates
+        also depend on the offsets and the rotation of the grid.
+        """
+        key = [type(self).__name__, self._geometry_version, cache_index]
+        refs = []
+        for value in self._geometry_inputs() + [self._idomain]:
+            if value is None or np.isscalar(value):
+                key.append(value)
+                continue
+            try:
+                refs.append(weakref.ref(value))
+            except TypeError:
+                return None, None
+            key.append(id(value))
+        if cache_index not in self._local_cache:
+            key += [self._xoff, self._yoff, self._angrot]
+        return tuple(key), refs
+
+    def _get_cache_data(self, cache_index):
+        """
+        Get the CachedData of a geometry cache entry or None if the entry
+        has to be built. Entries that are missing or out of date in the
+        cache of the grid are looked up in the shared geometry cache.
+        """
+        cache_data = self._cache_dict.get(cache_index)
+        if cache_data is not None and not cache_data.out_of_date:
+            return cache_data
+        key, refs = self._geometry_key(cache_index)
+        if key is None:
+            return None
+        data = geometry_cache.get(key)
+        if data is None:
+            return None
+        cache_data = CachedData(data)
+        self._cache_dict[cache_index] = cache_data
+        return cache_data
+
+    def _set_cache_data(self, cache_index, data, shared=True):
+        """
+        Store a geometry cache entry in the cache of the grid and, if
+        shared is True, in the shared geometry cache. Shared entries are
+        read-only.
+        """
+        if shared:
+            key, refs = self._geometry_key(cache_index)
+            if key is not None:
+                data = geometry_cache.set(key, data, refs)
+        cache_data = CachedData(data)
+        self._cache_dict[cache_index] = cache_data
+        return cache_data
+
+    @staticmethod
+    def _get_csr(lists):
+        """
+        Convert a list of lists of vertex numbers to offsets and a flat
+        array of vertex numbers.
+        """
+        counts = np.array([len(l) for l in lists], dtype=int)
+        offsets = np.zeros(len(counts) + 1, dtype=int)
+        np.cumsum(counts, out=offsets[1:])
+        if offsets[-1] == 0:
+            return offsets, np.zeros(0, dtype=int)
+        return offsets, np.concatenate(lists).astype(int)
+
+    def _set_vertex_geometry(self, xverts, yverts, offsets, iverts,
+                             xcenters, ycenters):
+        """
+        Store the cell centers and the cell vertices in compressed sparse
+        row form in the geometry cache. xverts and yverts are the vertex
+        coordinates, iverts are the (flat) vertex numbers of all cells and
+        the coordinate transform is applied to all vertices at once.
+        """
+        xverts = np.asarray(xverts, dtype=float)
+        yverts = np.asarray(yverts, dtype=float)
+        if xcenters is not None:
+            xcenters = np.asarray(xcenters, dtype=float)
+            ycenters = np.asarray(ycenters, dtype=float)
+
+        # build z cell centers
+        zvertices, zcenters = self._zcoords()
+
+        if self._has_ref_coordinates:
+            # transform x and y
+            if xcenters is not None:
+                xcenters, ycenters = self.get_coords(xcenters, ycenters)
+            xverts, yverts = self.get_coords(xverts, yverts)
+
+        self._set_cache_data('cellcenters', [xcenters, ycenters, zcenters])
+        self._set_cache_data('cellvertices', [offsets, xverts[iverts],
+                                              yverts[iverts], zvertices])
+
+    def _get_xyzvertices(self):
+        """
+        Get the cell vertices as lists with an array of vertex coordinates
+        for each cell, for backward compatibility. The arrays are views of
+        (copies of) the compressed sparse row arrays of the vertices.
+        """
+        cache_data = self._get_cache_data('cellvertices')
+        if cache_data is None:
+            self._build_grid_geometry_info()
+            cache_data = self._cache_dict['cellvertices']
+        offsets, xvertices, yvertices, zvertices = cache_data.data_nocopy
+        if self._copy_cache:
+            xvertices = xvertices.copy()
+            yvertices = yvertices.copy()
+            zvertices = copy.deepcopy(zvertices)
+        bounds = list(zip(offsets[:-1].tolist(), offsets[1:].tolist()))
+        return [[xvertices[i0:i1] for i0, i1 in bounds],
+                [yvertices[i0:i1] for i0, i1 in bounds], zvertices]
+
+    def _get_vertex_extent(self):
+        """Extent of the grid from the cell vertex arrays."""
+        self._copy_cache = False
+        offsets, xvertices, yvertices = self.csr_vertices
+        self._copy_cache = True
+        return (np.min(xvertices),
+                np.max(xvertices),
+                np.min(yvertices),
+                np.max(yvertices))
+
+    def _get_vertex_grid_lines(self):
+        """Grid lines (the edges of all cells) from the cell vertex arrays."""
+        self._copy_cache = False
+        offsets, xvertices, yvertices = self.csr_vertices
+        self._copy_cache = True
+        # each vertex is connected to the previous vertex of the cell, the
+        # first vertex to the last one
+        previous = np.arange(len(xvertices)) - 1
+        previous[offsets[:-1][np.diff(offsets) > 0]] = \
+            offsets[1:][np.diff(offsets) > 0] - 1
+        x0 = xvertices[previous].tolist()
+        y0 = yvertices[previous].tolist()
+        x1 = xvertices.tolist()
+        y1 = yvertices.tolist()
+        return [[(x0[i], y0[i]), (x1[i], y1[i])] for i in range(len(x1))]
+
+    def _get_csr_cell_vertices(self, cellid):
+        """List of x, y vertices of one cell from the cell vertex arrays."""
+        self._copy_cache = False
+        offsets, xvertices, yvertices = self.csr_vertices
+        self._copy_cache = True
+        i0, i1 = offsets[cellid], offsets[cellid + 1]
+        return list(zip(xvertices[i0:i1].tolist(),
+                        yvertices[i0:i1].tolist()))
+
+    def _intersect_cells(self, x, y, local=False, forgive=False):
+        """
+        Locate one point or arrays of points in the cell polygons using the
+        cached cell index. Returns the cell number (or an array of cell
+        numbers); points outside of the grid are NaN if forgive is True.
+        """
+        if local:
+            # transform x and y to real-world coordinates
+            x, y = self.get_coords(x, y)
+        scalar = np.isscalar(x)
+        icell = self.cell_index.intersect(x, y)
+        outside = icell < 0
+        if np.any(outside) and not forgive:
+            raise Exception('x, y point given is outside of the model area')
+        if scalar:
+            if outside[0]:
+                return np.nan
+            return int(icell[0])
+        icell = icell.reshape(np.shape(x))
+        if np.any(outside):
+            icell = icell.astype(float)
+            icell[outside.reshape(icell.shape)] = np.nan
+        return icell
+
     def set_coord_info(self, xoff=0.0, yoff=0.0, angrot=0.0, epsg=None,
                        proj4=None, merge_coord_info=True):
         if merge_coord_info:
@@ -513,6 +1166,9 @@ class Grid(object):
         self._require_cache_updates()
 
     def _require_cache_updates(self):
+        # the input arrays may have been changed in place, entries of the
+        # previous version are not used again
+        self._geometry_version += 1
         for cache_data in self._cache_dict.values():
             cache_data.out_of_date = True
 
@@ -524,6 +1180,9 @@ class Grid(object):
         self._xoff = d.xul
 
     def _zcoords(self):
+        cache_data = self._get_cache_data('zcoords')
+        if cache_data is not None:
+            return cache_data.data_nocopy
         if self.top is not None and self.botm is not None:
             zcenters = []
             top_3d = np.expand_dims(self.top, 0)
@@ -534,4 +1193,5 @@ class Grid(object):
         else:
             zbdryelevs = None
             zcenters = None
+        self._set_cache_data('zcoords', (zbdryelevs, zcenters))
         return zbdryelevs, zcenters
\ No newline at end of file
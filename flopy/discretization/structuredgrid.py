@@ -98,12 +98,11 @@ class StructuredGrid(Grid):
         """
         """
         cache_index = 'xyzgrid'
-        if cache_index not in self._cache_dict or \
-                self._cache_dict[cache_index].out_of_date:
-            xedge = np.concatenate(([0.], np.add.accumulate(self.__delr)))
-            length_y = np.add.reduce(self.__delc)
-            yedge = np.concatenate(([length_y], length_y -
-                                    np.add.accumulate(self.delc)))
+        cache_data = self._get_cache_data(cache_index)
+        if cache_data is None:
+            self._copy_cache = False
+            xedge, yedge = self.xyedges
+            self._copy_cache = True
             xgrid, ygrid = np.meshgrid(xedge, yedge)
             zgrid, zcenter = self._zcoords()
             if self._has_ref_coordinates:
@@ -111,32 +110,31 @@ class StructuredGrid(Grid):
                 pass
             xgrid, ygrid = self.get_coords(xgrid, ygrid)
             if zgrid is not None:
-                self._cache_dict[cache_index] = \
-                    CachedData([xgrid, ygrid, zgrid])
+                cache_data = self._set_cache_data(cache_index,
+                                                  [xgrid, ygrid, zgrid])
             else:
-                self._cache_dict[cache_index] = \
-                    CachedData([xgrid, ygrid])
+                cache_data = self._set_cache_data(cache_index,
+                                                  [xgrid, ygrid])
 
         if self._copy_cache:
-            return self._cache_dict[cache_index].data
+            return cache_data.data
         else:
-            return self._cache_dict[cache_index].data_nocopy
+            return cache_data.data_nocopy
 
     @property
     def xyedges(self):
         cache_index = 'xyedges'
-        if cache_index not in self._cache_dict or \
-                self._cache_dict[cache_index].out_of_date:
+        cache_data = self._get_cache_data(cache_index)
+        if cache_data is None:
             xedge = np.concatenate(([0.], np.add.accumulate(self.__delr)))
             length_y = np.add.reduce(self.__delc)
             yedge = np.concatenate(([length_y], length_y -
                                     np.add.accumulate(self.delc)))
-            self._cache_dict[cache_index] = \
-                CachedData([xedge, yedge])
+            cache_data = self._set_cache_data(cache_index, [xedge, yedge])
         if self._copy_cache:
-            return self._cache_dict[cache_index].data
+            return cache_data.data
         else:
-            return self._cache_dict[cache_index].data_nocopy
+            return cache_data.data_nocopy
 
     @property
     def xyzcellcenters(self):
@@ -147,8 +145,8 @@ class StructuredGrid(Grid):
         not offset of rotated, with the cell center y coordinate.
         """
         cache_index = 'cellcenters'
-        if cache_index not in self._cache_dict or \
-                self._cache_dict[cache_index].out_of_date:
+        cache_data = self._get_cache_data(cache_index)
+        if cache_data is None:
             # get x centers
             x = np.add.accumulate(self.__delr) - 0.5 * self.delr
             # get y centers
@@ -169,11 +167,12 @@ class StructuredGrid(Grid):
                 # transform x and y
                 x_mesh, y_mesh = self.get_coords(x_mesh, y_mesh)
             # store in cache
-            self._cache_dict[cache_index] = CachedData([x_mesh, y_mesh, z])
+            cache_data = self._set_cache_data(cache_index,
+                                              [x_mesh, y_mesh, z])
         if self._copy_cache:
-            return self._cache_dict[cache_index].data
+            return cache_data.data
         else:
-            return self._cache_dict[cache_index].data_nocopy
+            return cache_data.data_nocopy
 
     @property
     def grid_lines(self):
@@ -216,33 +215,62 @@ class StructuredGrid(Grid):
             return lines_trans
         return lines
 
+    @property
+    def csr_vertices(self):
+        """
+        Cell vertices in compressed sparse row form (see
+        Grid.csr_vertices): the four corners of each cell, clockwise from
+        the upper left corner, row by row.
+        """
+        self._copy_cache = False
+        xgrid, ygrid = self.xyzvertices[:2]
+        self._copy_cache = True
+        x = np.stack((xgrid[:-1, :-1], xgrid[:-1, 1:], xgrid[1:, 1:],
+                      xgrid[1:, :-1]), axis=-1).ravel()
+        y = np.stack((ygrid[:-1, :-1], ygrid[:-1, 1:], ygrid[1:, 1:],
+                      ygrid[1:, :-1]), axis=-1).ravel()
+        offsets = np.arange(0, len(x) + 1, 4)
+        return offsets, x, y
+
     ###############
     ### Methods ###
     ###############
-    def intersect(self, x, y, local=False, forgive=False):
+    def _geometry_inputs(self):
+        return [self.__delr, self.__delc, self._top, self._botm]
+
+    def intersect(self, x, y, local=False, forgive=False, z=None):
         """
         Get the row and column of a point with coordinates x and y
 
         When the point is on the edge of two cells, the cell with the lowest
         row or column is returned.
 
+        x and y can also be arrays of coordinates, in which case arrays of
+        rows and columns are returned.
+
         Parameters
         ----------
-        x : float
-            The x-coordinate of the requested point
-        y : float
-            The y-coordinate of the requested point
+        x : float or array_like
+            The x-coordinate of the requested point(s)
+        y : float or array_like
+            The y-coordinate of the requested point(s)
         local: bool (optional)
             If True, x and y are in local coordinates (defaults to False)
         forgive: bool (optional)
             Forgive x,y arguments that fall outside the model grid and
             return NaNs instead (defaults to False - will throw exception)
+        z : float or array_like (optional)
+            Elevation of the requested point(s). If z is specified, the
+            layer is also returned; a point on the boundary of two layers
+            is in the upper layer (defaults to None)
 
         Returns
         -------
-        row : int
+        lay : int or ndarray
+            The layer number (only returned if z is specified)
+        row : int or ndarray
             The row number
-        col : int
+        col : int or ndarray
             The column number
 
         """
@@ -250,30 +278,44 @@ class StructuredGrid(Grid):
         x, y = super(StructuredGrid, self).intersect(x, y, local, forgive)
 
         # get the cell edges in local coordinates
+        self._copy_cache = False
         xe, ye = self.xyedges
+        self._copy_cache = True
 
-        xcomp = x > xe
-        if np.all(xcomp) or not np.any(xcomp):
-            if forgive:
-                col = np.nan
-            else:
-                raise Exception(
-                    'x, y point given is outside of the model area')
-        else:
-            col = np.where(xcomp)[0][-1]
-
-        ycomp = y < ye
-        if np.all(ycomp) or not np.any(ycomp):
-            if forgive:
-                row = np.nan
-            else:
+        shape = np.shape(x)
+        x = np.atleast_1d(x).ravel()
+        y = np.atleast_1d(y).ravel()
+        # number of x edges left of x (x edges are increasing)
+        col = np.searchsorted(xe, x, side='left') - 1
+        # number of y edges above y (y edges are decreasing)
+        row = len(ye) - np.searchsorted(ye[::-1], y, side='right') - 1
+        outside = (col < 0) | (col >= self.ncol) | \
+                  (row < 0) | (row >= self.nrow)
+        idx = [row, col]
+
+        if z is not None:
+            z = np.atleast_1d(z).ravel() * np.ones(len(x))
+            lay = np.zeros(len(x), dtype=int)
+            inside = ~outside
+            top_botm = self.top_botm[:, row[inside], col[inside]]
+            zi = z[inside]
+            # number of layer bottoms above z
+            lay[inside] = np.sum(top_botm[1:] > zi, axis=0)
+            outside[inside] = (zi > top_botm[0]) | (lay[inside] >= self.nlay)
+            idx = [lay] + idx
+
+        if np.any(outside):
+            if not forgive:
                 raise Exception(
                     'x, y point given is outside of the model area')
+            idx = [i.astype(float) for i in idx]
+            for i in idx:
+                i[outside] = np.nan
+        if len(shape) == 0:
+            idx = [i[0] for i in idx]
         else:
-            row = np.where(ycomp)[0][-1]
-        if np.any(np.isnan([row, col])):
-            row = col = np.nan
-        return row, col
+            idx = [i.reshape(shape) for i in idx]
+        return tuple(idx)
 
     def _cell_vert_list(self, i, j):
         """Get vertices for a single cell or sequence of i, j locations."""
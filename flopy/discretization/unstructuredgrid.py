@@ -96,14 +96,7 @@ class UnstructuredGrid(Grid):
 
     @property
     def extent(self):
-        self._copy_cache = False
-        xvertices = np.hstack(self.xvertices)
-        yvertices = np.hstack(self.yvertices)
-        self._copy_cache = True
-        return (np.min(xvertices),
-                np.max(xvertices),
-                np.min(yvertices),
-                np.max(yvertices))
+        return self._get_vertex_extent()
 
     @property
     def grid_lines(self):
@@ -114,17 +107,7 @@ class UnstructuredGrid(Grid):
         Returns:
             list: grid line vertices
         """
-        self._copy_cache = False
-        xgrid = self.xvertices
-        ygrid = self.yvertices
-
-        lines = []
-        for ncell, verts in enumerate(xgrid):
-            for ix, vert in enumerate(verts):
-                lines.append([(xgrid[ncell][ix - 1], ygrid[ncell][ix - 1]),
-                              (xgrid[ncell][ix], ygrid[ncell][ix])])
-        self._copy_cache = True
-        return lines
+        return self._get_vertex_grid_lines()
 
     @property
     def xyzcellcenters(self):
@@ -132,8 +115,7 @@ class UnstructuredGrid(Grid):
         Internal method to get cell centers and set to grid
         """
         cache_index = 'cellcenters'
-        if cache_index not in self._cache_dict or \
-                self._cache_dict[cache_index].out_of_date:
+        if self._get_cache_data(cache_index) is None:
             self._build_grid_geometry_info()
         if self._copy_cache:
             return self._cache_dict[cache_index].data
@@ -148,18 +130,36 @@ class UnstructuredGrid(Grid):
         Returns:
             list of dimension ncpl by nvertices
         """
-        cache_index = 'xyzgrid'
-        if cache_index not in self._cache_dict or \
-                self._cache_dict[cache_index].out_of_date:
-            self._build_grid_geometry_info()
-        if self._copy_cache:
-            return self._cache_dict[cache_index].data
-        else:
-            return self._cache_dict[cache_index].data_nocopy
+        return self._get_xyzvertices()
 
     def intersect(self, x, y, local=False, forgive=False):
-        x, y = super(UnstructuredGrid, self).intersect(x, y, local, forgive)
-        raise Exception('Not implemented yet')
+        """
+        Get the cell number (in the cell2d/iverts list) of a point with
+        coordinates x and y
+
+        When the point is on the edge of two cells, the cell with the lowest
+        number is returned. x and y can also be arrays of coordinates, in
+        which case an array of cell numbers is returned.
+
+        Parameters
+        ----------
+        x : float or array_like
+            The x-coordinate of the requested point(s)
+        y : float or array_like
+            The y-coordinate of the requested point(s)
+        local: bool (optional)
+            If True, x and y are in local coordinates (defaults to False)
+        forgive: bool (optional)
+            Forgive x,y arguments that fall outside the model grid and
+            return NaNs instead (defaults to False - will throw exception)
+
+        Returns
+        -------
+        icell : int or ndarray
+            The cell number(s)
+
+        """
+        return self._intersect_cells(x, y, local=local, forgive=forgive)
 
     def get_cell_vertices(self, cellid):
         """
@@ -168,58 +168,26 @@ class UnstructuredGrid(Grid):
         :param cellid: (int) cellid number
         :return: list of x,y cell vertices
         """
-        self._copy_cache = False
-        cell_vert = list(zip(self.xvertices[cellid],
-                             self.yvertices[cellid]))
-        self._copy_cache = True
-        return cell_vert
+        return self._get_csr_cell_vertices(cellid)
+
+    def _geometry_inputs(self):
+        return [self._vertices, self._iverts, self._xc, self._yc,
+                self._ncpl, self._top, self._botm]
 
     def _build_grid_geometry_info(self):
-        cache_index_cc = 'cellcenters'
-        cache_index_vert = 'xyzgrid'
-
-        vertexdict = {ix: list(v[-2:])
-                      for ix, v in enumerate(self._vertices)}
-
-        xcenters = self._xc
-        ycenters = self._yc
-        xvertices = []
-        yvertices = []
-
-        # build xy vertex and cell center info
-        for iverts in self._iverts:
-
-            xcellvert = []
-            ycellvert = []
-            for ix in iverts:
-                xcellvert.append(vertexdict[ix][0])
-                ycellvert.append(vertexdict[ix][1])
-
-            xvertices.append(xcellvert)
-            yvertices.append(ycellvert)
-
-        zvertices, zcenters = self._zcoords()
-
-        if self._has_ref_coordinates:
-            # transform x and y
-            xcenters, ycenters = self.get_coords(xcenters, ycenters)
-            xvertxform = []
-            yvertxform = []
-            # vertices are a list within a list
-            for xcellvertices, ycellvertices in zip(xvertices, yvertices):
-                xcellvertices, \
-                ycellvertices = self.get_coords(xcellvertices, ycellvertices)
-                xvertxform.append(xcellvertices)
-                yvertxform.append(ycellvertices)
-            xvertices = xvertxform
-            yvertices = yvertxform
-
-        self._cache_dict[cache_index_cc] = CachedData([xcenters,
-                                                       ycenters,
-                                                       zcenters])
-        self._cache_dict[cache_index_vert] = CachedData([xvertices,
-                                                         yvertices,
-                                                         zvertices])
+        vertices = self._vertices
+        if isinstance(vertices, np.ndarray) and vertices.ndim == 2 and \
+                vertices.dtype.names is None:
+            vertices = vertices[:, -2:].astype(float)
+        else:
+            vertices = np.array([list(v)[-2:] for v in vertices],
+                                dtype=float).reshape(-1, 2)
+
+        # vertex numbers of each cell
+        offsets, iverts = self._get_csr(self._iverts)
+
+        self._set_vertex_geometry(vertices[:, 0], vertices[:, 1], offsets,
+                                  iverts, self._xc, self._yc)
 
     @classmethod
     def from_argus_export(cls, fname, nlay=1):
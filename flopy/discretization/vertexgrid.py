@@ -1,11 +1,6 @@
 import numpy as np
-try:
-    from matplotlib.path import Path
-except ImportError:
-    Path = None
 
 from .grid import Grid, CachedData
-from ..utils.geometry import is_clockwise
 
 
 class VertexGrid(Grid):
@@ -70,14 +65,7 @@ class VertexGrid(Grid):
 
     @property
     def extent(self):
-        self._copy_cache = False
-        xvertices = np.hstack(self.xvertices)
-        yvertices = np.hstack(self.yvertices)
-        self._copy_cache = True
-        return (np.min(xvertices),
-                np.max(xvertices),
-                np.min(yvertices),
-                np.max(yvertices))
+        return self._get_vertex_extent()
 
     @property
     def grid_lines(self):
@@ -88,17 +76,7 @@ class VertexGrid(Grid):
         Returns:
             list: grid line vertices
         """
-        self._copy_cache = False
-        xgrid = self.xvertices
-        ygrid = self.yvertices
-
-        lines = []
-        for ncell, verts in enumerate(xgrid):
-            for ix, vert in enumerate(verts):
-                lines.append([(xgrid[ncell][ix - 1], ygrid[ncell][ix - 1]),
-                              (xgrid[ncell][ix], ygrid[ncell][ix])])
-        self._copy_cache = True
-        return lines
+        return self._get_vertex_grid_lines()
 
     @property
     def xyzcellcenters(self):
@@ -106,8 +84,7 @@ class VertexGrid(Grid):
         Internal method to get cell centers and set to grid
         """
         cache_index = 'cellcenters'
-        if cache_index not in self._cache_dict or \
-                self._cache_dict[cache_index].out_of_date:
+        if self._get_cache_data(cache_index) is None:
             self._build_grid_geometry_info()
         if self._copy_cache:
             return self._cache_dict[cache_index].data
@@ -122,14 +99,7 @@ class VertexGrid(Grid):
         Returns:
             list of dimension ncpl by nvertices
         """
-        cache_index = 'xyzgrid'
-        if cache_index not in self._cache_dict or \
-                self._cache_dict[cache_index].out_of_date:
-            self._build_grid_geometry_info()
-        if self._copy_cache:
-            return self._cache_dict[cache_index].data
-        else:
-            return self._cache_dict[cache_index].data_nocopy
+        return self._get_xyzvertices()
 
     def intersect(self, x, y, local=False, forgive=False):
         """
@@ -137,13 +107,18 @@ class VertexGrid(Grid):
         
         When the point is on the edge of two cells, the cell with the lowest
         CELL2D number is returned.
+
+        x and y can also be arrays of coordinates, in which case an array of
+        CELL2D numbers is returned. Points are located with a spatial index
+        of the cells that is built on the first call and cached with the
+        grid geometry.
         
         Parameters
         ----------
-        x : float
-            The x-coordinate of the requested point
-        y : float
-            The y-coordinate of the requested point
+        x : float or array_like
+            The x-coordinate of the requested point(s)
+        y : float or array_like
+            The y-coordinate of the requested point(s)
         local: bool (optional)
             If True, x and y are in local coordinates (defaults to False)
         forgive: bool (optional)
@@ -152,37 +127,11 @@ class VertexGrid(Grid):
     
         Returns
         -------
-        icell2d : int
-            The CELL2D number
+        icell2d : int or ndarray
+            The CELL2D number(s)
         
         """
-        if Path is None:
-            s = 'Could not import matplotlib.  Must install matplotlib ' + \
-                ' in order to use VertexGrid.intersect() method'
-            raise ImportError(s)
-
-        if local:
-            # transform x and y to real-world coordinates
-            x, y = super(VertexGrid, self).get_coords(x,y)
-        xv, yv, zv = self.xyzvertices
-        for icell2d in range(self.ncpl):
-            xa = np.array(xv[icell2d])
-            ya = np.array(yv[icell2d])
-            # x and y at least have to be within the bounding box of the cell
-            if np.any(x <= xa) and np.any(x >= xa) and \
-                    np.any(y <= ya) and np.any(y >= ya):
-                path = Path(np.stack((xa, ya)).transpose())
-                # use a small radius, so that the edge of the cell is included
-                if is_clockwise(xa, ya):
-                    radius = -1e-9
-                else:
-                    radius = 1e-9
-                if path.contains_point((x, y), radius=radius):
-                    return icell2d
-        if forgive:
-            icell2d = np.nan
-            return icell2d
-        raise Exception('x, y point given is outside of the model area')
+        return self._intersect_cells(x, y, local=local, forgive=forgive)
 
     def get_cell_vertices(self, cellid):
         """
@@ -191,11 +140,7 @@ class VertexGrid(Grid):
         :param cellid: (int) cellid number
         :return: list of x,y cell vertices
         """
-        self._copy_cache = False
-        cell_verts = list(zip(self.xvertices[cellid],
-                              self.yvertices[cellid]))
-        self._copy_cache = True
-        return cell_verts
+        return self._get_csr_cell_vertices(cellid)
 
     def plot(self, **kwargs):
         """
@@ -216,59 +161,69 @@ class VertexGrid(Grid):
         mm = PlotMapView(modelgrid=self)
         return mm.plot_grid(**kwargs)
 
-    def _build_grid_geometry_info(self):
-        cache_index_cc = 'cellcenters'
-        cache_index_vert = 'xyzgrid'
-
-        vertexdict = {v[0]: [v[1], v[2]]
-                      for v in self._vertices}
-        xcenters = []
-        ycenters = []
-        xvertices = []
-        yvertices = []
-
-        # build xy vertex and cell center info
-        for cell2d in self._cell2d:
-            cell2d = tuple(cell2d)
-            xcenters.append(cell2d[1])
-            ycenters.append(cell2d[2])
+    def _geometry_inputs(self):
+        return [self._vertices, self._cell2d, self._top, self._botm]
 
+    def _build_grid_geometry_info(self):
+        vertices = self._vertices
+        cell2d = self._cell2d
+
+        # vertex numbers and coordinates
+        if isinstance(vertices, np.ndarray) and \
+                vertices.dtype.names is not None:
+            names = vertices.dtype.names
+            ivert = vertices[names[0]].astype(int)
+            xverts = vertices[names[1]]
+            yverts = vertices[names[2]]
+        else:
+            vertices = np.array([tuple(v)[:3] for v in vertices],
+                                dtype=float).reshape(-1, 3)
+            ivert = vertices[:, 0].astype(int)
+            xverts = vertices[:, 1]
+            yverts = vertices[:, 2]
+
+        # cell centers and vertex numbers of each cell
+        names = None
+        if isinstance(cell2d, np.ndarray) and cell2d.dtype.names is not None:
+            names = cell2d.dtype.names
+        if names is not None and \
+                all(cell2d.dtype[n].kind in 'iu' for n in names[4:]):
+            xcenters = cell2d[names[1]]
+            ycenters = cell2d[names[2]]
+            icvert = np.stack([cell2d[n] for n in names[4:]], axis=-1)
+            ncvert = icvert.shape[1]
+            offsets = np.arange(len(cell2d) + 1) * ncvert
+            iverts = icvert.ravel().astype(int)
+        else:
+            xcenters = []
+            ycenters = []
             vert_number = []
-            for i in cell2d[4:]:
-                if i is not None:
-                    vert_number.append(int(i))
-
-            xcellvert = []
-            ycellvert = []
-            for ix in vert_number:
-                xcellvert.append(vertexdict[ix][0])
-                ycellvert.append(vertexdict[ix][1])
-            xvertices.append(xcellvert)
-            yvertices.append(ycellvert)
-
-        # build z cell centers
-        zvertices, zcenters = self._zcoords()
-
-        if self._has_ref_coordinates:
-            # transform x and y
-            xcenters, ycenters = self.get_coords(xcenters, ycenters)
-            xvertxform = []
-            yvertxform = []
-            # vertices are a list within a list
-            for xcellvertices, ycellvertices in zip(xvertices, yvertices):
-                xcellvertices, \
-                ycellvertices = self.get_coords(xcellvertices, ycellvertices)
-                xvertxform.append(xcellvertices)
-                yvertxform.append(ycellvertices)
-            xvertices = xvertxform
-            yvertices = yvertxform
-
-        self._cache_dict[cache_index_cc] = CachedData([xcenters,
-                                                       ycenters,
-                                                       zcenters])
-        self._cache_dict[cache_index_vert] = CachedData([xvertices,
-                                                         yvertices,
-                                                         zvertices])
+            for cell2d in self._cell2d:
+                cell2d = tuple(cell2d)
+                xcenters.append(cell2d[1])
+                ycenters.append(cell2d[2])
+                vert_number.append([int(i) for i in cell2d[4:]
+                                    if i is not None])
+            offsets, iverts = self._get_csr(vert_number)
+
+        # map vertex numbers to positions in the vertex arrays
+        if np.array_equal(ivert, np.arange(len(ivert))):
+            pos = iverts
+            missing = (iverts < 0) | (iverts >= len(ivert))
+        else:
+            sorter = np.argsort(ivert, kind='mergesort')
+            pos = np.searchsorted(ivert, iverts, sorter=sorter)
+            missing = pos == len(ivert)
+            if not np.any(missing):
+                pos = sorter[pos]
+                missing = ivert[pos] != iverts
+        if np.any(missing):
+            # vertex numbers that are not in vertices
+            raise KeyError(int(iverts[np.argmax(missing)]))
+        iverts = pos
+
+        self._set_vertex_geometry(xverts, yverts, offsets, iverts,
+                                  xcenters, ycenters)
 
 
 if __name__ == "__main__":
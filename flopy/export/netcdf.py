@@ -125,6 +125,15 @@ class NetCdf(object):
     forgive: what to do if a duplicate variable name is being created.  If
         True, then the newly requested var is skipped.  If False, then
         an exception is raised.
+    zlib : bool
+        if True, variables are compressed with zlib (default True)
+    complevel : int
+        zlib compression level between 1 and 9 (default 4)
+    chunks : dict
+        chunk sizes of the dimensions of multi-dimensional variables, e.g.
+        {'time': 1, 'layer': 1}.  Dimensions that are not listed are not
+        split into chunks.  The default is one time step and one layer per
+        chunk, so that a variable can be written one time step at a time.
 
     Notes
     -----
@@ -136,7 +145,7 @@ class NetCdf(object):
 
     def __init__(self, output_filename, model, time_values=None,
                  z_positive='up', verbose=None, prj=None, logger=None,
-                 forgive=False):
+                 forgive=False, zlib=True, complevel=4, chunks=None):
 
         assert output_filename.lower().endswith(".nc")
         if verbose is None:
@@ -153,6 +162,11 @@ class NetCdf(object):
         self.output_filename = output_filename
 
         self.forgive = bool(forgive)
+        self.zlib = bool(zlib)
+        self.complevel = complevel
+        if chunks is None:
+            chunks = {'time': 1, 'layer': 1}
+        self.chunks = chunks
 
         self.model = model
         self.model_grid = model.modelgrid
@@ -386,7 +400,8 @@ class NetCdf(object):
 
         new_net = cls(output_filename, other.model,
                       time_values=other.time_values_arg, verbose=verbose,
-                      logger=logger)
+                      logger=logger, zlib=other.zlib,
+                      complevel=other.complevel, chunks=other.chunks)
         return new_net
 
     def difference(self, other, minuend="self", mask_zero_diff=True,
@@ -932,22 +947,26 @@ class NetCdf(object):
             self.initialize_file()
 
         # check that the requested dimension exists and
-        # build up the chuck sizes
-        # chunks = []
-        # for dimension in dimensions:
-        #    assert self.nc.dimensions.get(dimension) is not None, \
-        #        "netcdf.create_variable() dimension not found:" + dimension
-        #    chunk = self.chunks[dimension]
-        #    assert chunk is not None, \
-        #        "netcdf.create_variable() chunk size of {0} is None in self.chunks". \
-        #            format(dimension)
-        #    chunks.append(chunk)
+        # build up the chunk sizes of multi-dimensional variables
+        chunks = None
+        if len(dimensions) > 1:
+            chunks = []
+            for dimension in dimensions:
+                assert self.nc.dimensions.get(dimension) is not None, \
+                    "netcdf.create_variable() dimension not found:" + \
+                    dimension
+                size = len(self.nc.dimensions[dimension])
+                chunks.append(max(1, min(self.chunks.get(dimension, size),
+                                         size)))
+            chunks = tuple(chunks)
 
         self.var_attr_dict[name] = attributes
 
         var = self.nc.createVariable(name, precision_str, dimensions,
-                                     fill_value=self.fillvalue, zlib=True)  # ,
-        # chunksizes=tuple(chunks))
+                                     fill_value=self.fillvalue,
+                                     zlib=self.zlib,
+                                     complevel=self.complevel,
+                                     chunksizes=chunks)
         for k, v in attributes.items():
             try:
                 var.setncattr(k, v)
@@ -128,11 +128,11 @@ def write_grid_shapefile(filename, mg, array_dict, nan_val=None):  # -1.0e9):
         if array.ndim == 3:
             assert array.shape[0] == 1
             array = array[0, :, :]
-        assert array.shape == (mg.nrow, mg.ncol)
-        if array.dtype in [np.float, np.float32, np.float64]:
-            array[np.where(np.isnan(array))] = nan_val
+        if isinstance(mg, SpatialReference) or \
+                mg.grid_type == 'structured':
+            assert array.shape == (mg.nrow, mg.ncol)
         else:
-            j = 2
+            assert array.size == mg.ncpl
         # if array.dtype in [np.int, np.int32, np.int64]:
         #    wr.field(name, "N", 18, 0)
         # else:
@@ -141,28 +141,11 @@ def write_grid_shapefile(filename, mg, array_dict, nan_val=None):  # -1.0e9):
         arrays.append(array)
 
     if isinstance(mg, SpatialReference) or mg.grid_type == 'structured':
-        for i in range(mg.nrow):
-            for j in range(mg.ncol):
-                try:
-                    pts = mg.get_cell_vertices(i, j)
-                except AttributeError:
-                    # support old style SR object
-                    pts = mg.get_vertices(i, j)
-
-                wr.poly([pts])
-                rec = [i + 1, j + 1]
-                for array in arrays:
-                    rec.append(array[i, j])
-                wr.record(*rec)
-    elif mg.grid_type == 'vertex':
-        for i in range(mg.ncpl):
-            pts = mg.get_cell_vertices(i)
-
-            wr.poly([pts])
-            rec = [i + 1]
-            for array in arrays:
-                rec.append(array[i])
-            wr.record(*rec)
+        row, col = np.indices((mg.nrow, mg.ncol)) + 1
+        columns = [row, col] + arrays
+    else:
+        columns = [np.arange(1, mg.ncpl + 1)] + arrays
+    _write_grid_polygons(wr, get_grid_polygons(mg), columns, nan_val)
 
     # close or write the file
     if sfv < 2:
@@ -184,20 +167,13 @@ def write_grid_shapefile2(filename, mg, array_dict, nan_val=np.nan,  # -1.0e9,
     w.autoBalance = 1
 
     if isinstance(mg, SpatialReference):
-        verts = copy.deepcopy(mg.vertices)
         warnings.warn(
             "SpatialReference has been deprecated. Use StructuredGrid"
             " instead.",
             category=DeprecationWarning)
-    elif mg.grid_type == 'structured':
-        verts = [mg.get_cell_vertices(i, j)
-                 for i in range(mg.nrow)
-                 for j in range(mg.ncol)]
-    elif mg.grid_type == 'vertex':
-        verts = [mg.get_cell_vertices(cellid)
-                 for cellid in range(mg.ncpl)]
-    else:
+    elif mg.grid_type not in ('structured', 'vertex'):
         raise Exception('Grid type {} not supported.'.format(mg.grid_type))
+    verts = get_grid_polygons(mg)
 
     # set up the attribute fields
     if isinstance(mg, SpatialReference) or mg.grid_type == 'structured':
@@ -221,27 +197,16 @@ def write_grid_shapefile2(filename, mg, array_dict, nan_val=np.nan,  # -1.0e9,
         w.field(n, *fieldinfo[n])
 
     if isinstance(mg, SpatialReference) or mg.grid_type == 'structured':
-        # set-up array of attributes of shape ncells x nattributes
-        node = list(range(1, mg.ncol * mg.nrow + 1))
-        col = list(range(1, mg.ncol + 1)) * mg.nrow
-        row = sorted(list(range(1, mg.nrow + 1)) * mg.ncol)
-        at = np.vstack(
-            [node, row, col] +
-            [arr.ravel() for arr in array_dict.values()]).transpose()
-        if at.dtype in [np.float, np.float32, np.float64]:
-            at[np.isnan(at)] = nan_val
+        # attribute columns of length ncells
+        node = np.arange(1, mg.ncol * mg.nrow + 1)
+        row, col = np.indices((mg.nrow, mg.ncol)) + 1
+        columns = [node, row, col] + list(array_dict.values())
     elif mg.grid_type == 'vertex':
-        # set-up array of attributes of shape ncells x nattributes
-        node = list(range(1, mg.ncpl + 1))
-        at = np.vstack(
-            [node] +
-            [arr.ravel() for arr in array_dict.values()]).transpose()
-    if at.dtype in [np.float, np.float32, np.float64]:
-        at[np.isnan(at)] = nan_val
-
-    for i, r in enumerate(at):
-        w.poly([verts[i]])
-        w.record(*r)
+        # attribute columns of length ncells
+        node = np.arange(1, mg.ncpl + 1)
+        columns = [node] + list(array_dict.values())
+
+    _write_grid_polygons(w, verts, columns, nan_val)
 
     # close
     if sfv < 2:
@@ -254,6 +219,58 @@ def write_grid_shapefile2(filename, mg, array_dict, nan_val=np.nan,  # -1.0e9,
     return
 
 
+def get_grid_polygons(mg):
+    """
+    Get the polygons of all cells of a model grid, computed from the vertex
+    arrays of the grid at once.
+
+    Parameters
+    ----------
+    mg : model grid instance
+        structured or vertex model grid (or SpatialReference)
+
+    Returns
+    -------
+    list
+        list of [x, y] vertex lists, one for every cell in node order
+
+    """
+    if isinstance(mg, SpatialReference):
+        return copy.deepcopy(mg.vertices)
+    elif mg.grid_type == 'structured':
+        xgrid, ygrid = mg.xvertices, mg.yvertices
+        # same vertex order as StructuredGrid.get_cell_vertices()
+        x = np.stack((xgrid[:-1, :-1], xgrid[:-1, 1:],
+                      xgrid[1:, 1:], xgrid[1:, :-1]), axis=-1)
+        y = np.stack((ygrid[:-1, :-1], ygrid[:-1, 1:],
+                      ygrid[1:, 1:], ygrid[1:, :-1]), axis=-1)
+        return np.stack((x, y), axis=-1).reshape(-1, 4, 2).tolist()
+    elif mg.grid_type == 'vertex':
+        offsets, x, y = mg.csr_vertices
+        xy = np.column_stack((x, y)).tolist()
+        return [xy[i0:i1] for i0, i1 in zip(offsets[:-1].tolist(),
+                                            offsets[1:].tolist())]
+    else:
+        raise Exception('Grid type {} not supported.'.format(mg.grid_type))
+
+
+def _write_grid_polygons(wr, polygons, columns, nan_val=None):
+    """
+    Write cell polygons and attribute records to a pyshp writer. The
+    attribute columns are converted to python values for all cells at once,
+    NaN values in float columns are replaced by nan_val.
+    """
+    values = []
+    for array in columns:
+        array = np.ravel(array)
+        if array.dtype.kind == 'f' and nan_val is not None:
+            array = np.where(np.isnan(array), nan_val, array)
+        values.append(array.tolist())
+    for pts, rec in zip(polygons, zip(*values)):
+        wr.poly([pts])
+        wr.record(*rec)
+
+
 def model_attributes_to_shapefile(filename, ml, package_names=None,
                                   array_dict=None,
                                   **kwargs):
@@ -1,11 +1,14 @@
 from __future__ import print_function
 import json
 import os
+import hashlib
 import numpy as np
 from ..utils import HeadFile, CellBudgetFile, UcnFile, FormattedHeadFile
 from ..mbase import BaseModel, ModelInterface
 from ..pakbase import PackageInterface
 from ..datbase import DataType, DataInterface, DataListInterface
+from ..discretization.grid import GeometryCache
+from ..utils.utils_def import RunningStats, pool_imap
 from . import NetCdf, netcdf
 from . import shapefile_utils
 
@@ -20,97 +23,179 @@ with open(path + '/unitsformat.json') as f:
     NC_UNITS_FORMAT = json.load(f)
 
 
+class _EnsembleStats(object):
+    """
+    Streaming mean and (population) standard deviation of the variables of
+    an ensemble, accumulated one realization at a time so that the
+    realizations never need to be held in memory together. No-data and nan
+    values are left out of the statistics.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self._stats = {}
+        self._last = None
+
+    def add(self, vdict):
+        """
+        Add the variables of one realization to the statistics
+
+        Parameters
+        ----------
+        vdict : dict
+            variable name : array dictionary of a realization
+
+        """
+        self.count += 1
+        for vname, a in vdict.items():
+            if vname not in self._stats:
+                self._stats[vname] = RunningStats(nodata=netcdf.FILLVALUE)
+            self._stats[vname].add(a)
+        self._last = vdict
+
+    def get(self):
+        """
+        Get the mean and standard deviation dictionaries.  Cells that are
+        no-data or nan in the last realization are set to netcdf.FILLVALUE.
+
+        Returns
+        -------
+        mean, stdev : dict
+
+        """
+        mean, stdev = {}, {}
+        for vname, a in self._last.items():
+            a = np.asarray(a)
+            dtype = a.dtype if np.issubdtype(a.dtype, np.floating) \
+                else np.float64
+            stats = self._stats[vname]
+            mean[vname] = stats.mean.astype(dtype)
+            stdev[vname] = stats.std.astype(dtype)
+            idx = (a == netcdf.FILLVALUE) | np.isnan(a) | (stats.count == 0)
+            mean[vname][idx] = netcdf.FILLVALUE
+            stdev[vname][idx] = netcdf.FILLVALUE
+        return mean, stdev
+
+
+def _ensemble_vdict(args):
+    """
+    Export the inputs or outputs of a realization to a variable dictionary.
+    Module level so it can be used by worker processes.
+    """
+    m, outputs, kwargs = args
+    vdict = {}
+    if outputs:
+        output_helper(vdict, m, m.load_results(as_dict=True), **kwargs)
+    else:
+        m.export(vdict, **kwargs)
+    return vdict
+
+
+def _ensemble_export(filename, models, outputs, add_reals, nproc, kwargs):
+    """
+    Export the inputs (or outputs) of an ensemble to a NetCdf file along
+    with the ensemble mean and standard deviation.
+    """
+    m0 = models[0]
+    if outputs:
+        f = output_helper(filename, m0, m0.load_results(as_dict=True),
+                          **kwargs)
+    else:
+        f = m0.export(filename, **kwargs)
+    stats = _EnsembleStats()
+    stats.add(_ensemble_vdict((m0, outputs, kwargs)))
+
+    args = ((m, outputs, kwargs) for m in models[1:])
+    if nproc is not None and nproc > 1 and len(models) > 2:
+        vdicts = pool_imap(_ensemble_vdict, args,
+                           min(nproc, len(models) - 1))
+    else:
+        vdicts = (_ensemble_vdict(arg) for arg in args)
+    for i, vdict in enumerate(vdicts):
+        if add_reals:
+            suffix = models[i + 1].name.split('.')[0].split('_')[-1]
+            f.append(vdict, suffix=suffix)
+        stats.add(vdict)
+
+    if stats.count >= 2:
+        mean, stdev = stats.get()
+        if not add_reals:
+            f.write()
+            f = NetCdf.empty_like(mean, output_filename=filename)
+        f.append(mean, suffix="**mean**")
+        f.append(stdev, suffix="**stdev**")
+    f.add_global_attributes({"namefile": ''})
+    return f
+
+
 def ensemble_helper(inputs_filename, outputs_filename, models, add_reals=True,
-                    **kwargs):
+                    nproc=None, **kwargs):
     """
     Helper to export an ensemble of model instances.  Assumes
     all models have same dis and reference information, only difference is
     properties and boundary conditions.  Assumes model.nam.split('_')[-1] is
     the realization suffix to use in the netcdf variable names
+
+    The ensemble mean and standard deviation are accumulated one
+    realization at a time.  If nproc is greater than one, the realizations
+    are exported in nproc worker processes (the models must be picklable)
+    while the NetCdf files are written by the calling process.
     """
     f_in, f_out = None, None
     for m in models[1:]:
         assert m.get_nrow_ncol_nlay_nper() == models[
             0].get_nrow_ncol_nlay_nper()
     if inputs_filename is not None:
-        f_in = models[0].export(inputs_filename, **kwargs)
-        vdict = {}
-        vdicts = [models[0].export(vdict, **kwargs)]
-        i = 1
-        for m in models[1:]:
-            suffix = m.name.split('.')[0].split('_')[-1]
-            vdict = {}
-            m.export(vdict, **kwargs)
-            vdicts.append(vdict)
-            if add_reals:
-                f_in.append(vdict, suffix=suffix)
-            i += 1
-        mean, stdev = {}, {}
-        for vname in vdict.keys():
-            alist = []
-            for vd in vdicts:
-                alist.append(vd[vname])
-            alist = np.array(alist)
-            mean[vname] = alist.mean(axis=0)
-            stdev[vname] = alist.std(axis=0)
-            mean[vname][vdict[vname] == netcdf.FILLVALUE] = netcdf.FILLVALUE
-            stdev[vname][vdict[vname] == netcdf.FILLVALUE] = netcdf.FILLVALUE
-            mean[vname][np.isnan(vdict[vname])] = netcdf.FILLVALUE
-            stdev[vname][np.isnan(vdict[vname])] = netcdf.FILLVALUE
-
-        if i >= 2:
-            if not add_reals:
-                f_in.write()
-                f_in = NetCdf.empty_like(mean, output_filename=inputs_filename)
-                f_in.append(mean, suffix="**mean**")
-                f_in.append(stdev, suffix="**stdev**")
-            else:
-                f_in.append(mean, suffix="**mean**")
-                f_in.append(stdev, suffix="**stdev**")
-        f_in.add_global_attributes({"namefile": ''})
-
+        f_in = _ensemble_export(inputs_filename, models, False, add_reals,
+                                nproc, kwargs)
     if outputs_filename is not None:
-        f_out = output_helper(outputs_filename, models[0], models[0]. \
-                              load_results(as_dict=True), **kwargs)
-        vdict = {}
-        vdicts = [output_helper(vdict, models[0], models[0]. \
-                                load_results(as_dict=True), **kwargs)]
-        i = 1
-        for m in models[1:]:
-            suffix = m.name.split('.')[0].split('_')[-1]
-            oudic = m.load_results(as_dict=True)
-            vdict = {}
-            output_helper(vdict, m, oudic, **kwargs)
-            vdicts.append(vdict)
-            if add_reals:
-                f_out.append(vdict, suffix=suffix)
-            i += 1
+        f_out = _ensemble_export(outputs_filename, models, True, add_reals,
+                                 nproc, kwargs)
+    return f_in, f_out
 
-        mean, stdev = {}, {}
-        for vname in vdict.keys():
-            alist = []
-            for vd in vdicts:
-                alist.append(vd[vname])
-            alist = np.array(alist)
-            mean[vname] = alist.mean(axis=0)
-            stdev[vname] = alist.std(axis=0)
-            mean[vname][np.isnan(vdict[vname])] = netcdf.FILLVALUE
-            stdev[vname][np.isnan(vdict[vname])] = netcdf.FILLVALUE
-            mean[vname][vdict[vname] == netcdf.FILLVALUE] = netcdf.FILLVALUE
-            stdev[vname][vdict[vname] == netcdf.FILLVALUE] = netcdf.FILLVALUE
-        if i >= 2:
-            if not add_reals:
-                f_out.write()
-                f_out = NetCdf.empty_like(mean,
-                                          output_filename=outputs_filename)
-                f_out.append(mean, suffix="**mean**")
-                f_out.append(stdev, suffix="**stdev**")
 
+def _get_output_arrays(times, shape3d, out_obj, var_name, logger=None,
+                       text='', mask_vals=(), mask_array3d=None):
+    """
+    Generator of the (masked) float32 arrays of an output file, one time
+    step at a time. Yields the index of the time and the array; times that
+    are not in the output file are skipped.
+    """
+    totims = set(out_obj.recordarray["totim"].tolist())
+    for i, t in enumerate(times):
+        if t not in totims:
+            continue
+        try:
+            if text:
+                a = out_obj.get_data(totim=t, full3D=True, text=text)
+                if isinstance(a, list):
+                    a = a[0]
             else:
-                f_out.append(mean, suffix="**mean**")
-                f_out.append(stdev, suffix="**stdev**")
-        f_out.add_global_attributes({"namefile": ''})
-    return f_in, f_out
+                a = out_obj.get_data(totim=t)
+        except Exception as e:
+            estr = "error getting data for {0} at time {1}:{2}".format(
+                var_name + text.decode().strip().lower(), t, str(e))
+            if logger:
+                logger.warn(estr)
+            else:
+                print(estr)
+            continue
+        if mask_array3d is not None and a.shape == mask_array3d.shape:
+            a[mask_array3d] = np.NaN
+        try:
+            array = np.empty(shape3d, dtype=np.float32)
+            array[:, :, :] = a.astype(np.float32)
+        except Exception as e:
+            estr = "error assigning {0} data to array for time {1}:{2}".format(
+                var_name + text.decode().strip().lower(), t, str(e))
+            if logger:
+                logger.warn(estr)
+            else:
+                print(estr)
+            continue
+        for mask_val in mask_vals:
+            array[np.where(array == mask_val)] = np.NaN
+        yield i, array
 
 
 def _add_output_nc_variable(f, times, shape3d, out_obj, var_name, logger=None,
@@ -119,49 +204,20 @@ def _add_output_nc_variable(f, times, shape3d, out_obj, var_name, logger=None,
         logger.log("creating array for {0}".format(
             var_name))
 
-    array = np.zeros((len(times), shape3d[0], shape3d[1], shape3d[2]),
-                     dtype=np.float32)
-    array[:] = np.NaN
-    for i, t in enumerate(times):
-        if t in out_obj.recordarray["totim"]:
-            try:
-                if text:
-                    a = out_obj.get_data(totim=t, full3D=True, text=text)
-                    if isinstance(a, list):
-                        a = a[0]
-                else:
-                    a = out_obj.get_data(totim=t)
-            except Exception as e:
-                estr = "error getting data for {0} at time {1}:{2}".format(
-                    var_name + text.decode().strip().lower(), t, str(e))
-                if logger:
-                    logger.warn(estr)
-                else:
-                    print(estr)
-                continue
-            if mask_array3d is not None and a.shape == mask_array3d.shape:
-                a[mask_array3d] = np.NaN
-            try:
-                array[i, :, :, :] = a.astype(np.float32)
-            except Exception as e:
-                estr = "error assigning {0} data to array for time {1}:{2}".format(
-                    var_name + text.decode().strip().lower(), t, str(e))
-                if logger:
-                    logger.warn(estr)
-                else:
-                    print(estr)
-                continue
-
-    if logger:
-        logger.log("creating array for {0}".format(
-            var_name))
-
-    for mask_val in mask_vals:
-        array[np.where(array == mask_val)] = np.NaN
-    mx, mn = np.nanmax(array), np.nanmin(array)
-    array[np.isnan(array)] = netcdf.FILLVALUE
+    arrays = _get_output_arrays(times, shape3d, out_obj, var_name,
+                                logger=logger, text=text, mask_vals=mask_vals,
+                                mask_array3d=mask_array3d)
 
     if isinstance(f, dict):
+        array = np.zeros((len(times), shape3d[0], shape3d[1], shape3d[2]),
+                         dtype=np.float32)
+        array[:] = np.NaN
+        for i, a in arrays:
+            array[i] = a
+        if logger:
+            logger.log("creating array for {0}".format(
+                var_name))
+        array[np.isnan(array)] = netcdf.FILLVALUE
         if text:
             var_name = text.decode().strip().lower()
         f[var_name] = array
@@ -177,8 +233,8 @@ def _add_output_nc_variable(f, times, shape3d, out_obj, var_name, logger=None,
         var_name = text.decode().strip().lower()
     attribs = {"long_name": var_name}
     attribs["coordinates"] = "time layer latitude longitude"
-    attribs["min"] = mn
-    attribs["max"] = mx
+    attribs["min"] = np.NaN
+    attribs["max"] = np.NaN
     if units is not None:
         attribs["units"] = units
     try:
@@ -194,8 +250,16 @@ def _add_output_nc_variable(f, times, shape3d, out_obj, var_name, logger=None,
         else:
             raise Exception(estr)
 
+    # write one time step at a time; times without data keep the fill value
+    mxs, mns = [], []
     try:
-        var[:] = array
+        for i, a in arrays:
+            isnan = np.isnan(a)
+            if not np.all(isnan):
+                mxs.append(np.nanmax(a))
+                mns.append(np.nanmin(a))
+            a[isnan] = netcdf.FILLVALUE
+            var[i] = a
     except Exception as e:
         estr = "error setting array to variable {0}:\n{1}".format(
             var_name, str(e))
@@ -203,6 +267,14 @@ def _add_output_nc_variable(f, times, shape3d, out_obj, var_name, logger=None,
             logger.lraise(estr)
         else:
             raise Exception(estr)
+    if logger:
+        logger.log("creating array for {0}".format(
+            var_name))
+    # min and max are known after all time steps have been written
+    attribs["min"] = np.min(mns) if mns else np.float32(np.NaN)
+    attribs["max"] = np.max(mxs) if mxs else np.float32(np.NaN)
+    var.setncattr("min", attribs["min"])
+    var.setncattr("max", attribs["max"])
 
 
 def output_helper(f, ml, oudic, **kwargs):
@@ -214,13 +286,17 @@ def output_helper(f, ml, oudic, **kwargs):
         f : filename for output - must have .shp or .nc extension
         ml : BaseModel derived type
         oudic : dict {output_filename,flopy datafile/cellbudgetfile instance}
+        **kwargs : keyword arguments
+            logger, stride, forgive and the zlib, complevel and chunks
+            arguments of NetCdf
 
     Returns
     -------
         None
     Note:
     ----
-        casts down double precision to single precision for netCDF files
+        casts down double precision to single precision for netCDF files.
+        The output is written to a netCDF file one time step at a time.
 
     """
     assert isinstance(ml, BaseModel)
@@ -229,6 +305,8 @@ def output_helper(f, ml, oudic, **kwargs):
     stride = kwargs.pop("stride", 1)
     forgive = kwargs.pop("forgive", False)
     kwargs.pop("suffix", None)
+    nc_kwargs = {k: kwargs.pop(k) for k in ("zlib", "complevel", "chunks")
+                 if k in kwargs}
     if len(kwargs) > 0 and logger is not None:
         str_args = ','.join(kwargs)
         logger.warn("unused kwargs: " + str_args)
@@ -240,24 +318,16 @@ def output_helper(f, ml, oudic, **kwargs):
                  out.recordarray["totim"]]
         out.recordarray["totim"] = times
 
-    times = []
-    for filename, df in oudic.items():
-        for t in df.recordarray["totim"]:
-            if t not in times:
-                times.append(t)
+    totims = [set(df.recordarray["totim"].tolist())
+              for df in oudic.values()]
+    times = sorted(set.union(*totims))
     assert len(times) > 0
-    times.sort()
 
     # rectify times - only use times that are common to every output file
     common_times = []
     skipped_times = []
     for t in times:
-        keep = True
-        for filename, df in oudic.items():
-            if t not in df.recordarray["totim"]:
-                keep = False
-                break
-        if keep:
+        if all(t in df_totims for df_totims in totims):
             common_times.append(t)
         else:
             skipped_times.append(t)
@@ -274,7 +344,7 @@ def output_helper(f, ml, oudic, **kwargs):
     times = [t for t in common_times[::stride]]
     if isinstance(f, str) and f.lower().endswith(".nc"):
         f = NetCdf(f, ml, time_values=times, logger=logger,
-                   forgive=forgive)
+                   forgive=forgive, **nc_kwargs)
     elif isinstance(f, NetCdf):
         otimes = list(f.nc.variables["time"][:])
         assert otimes == times
@@ -919,6 +989,169 @@ def array2d_export(f, u2d, **kwargs):
         raise NotImplementedError("unrecognized export argument:{0}".format(f))
 
 
+raster_cache = GeometryCache(maxsize=16)
+
+
+class GridRaster(object):
+    """
+    Resample arrays of a structured model grid to a north-up raster with
+    square pixels.
+
+    The model cell containing the center of each pixel is found once for
+    a model grid and raster specification and cached, so resampling many
+    arrays (for example all layers and time steps of a model) is a gather
+    of the array values.
+
+    Parameters
+    ----------
+    modelgrid : flopy.discretization.StructuredGrid or
+                flopy.utils.reference.SpatialReference
+        structured model grid
+    cellsize : float
+        pixel size (default is the smallest row or column width)
+    xll, yll : float
+        lower left corner of the raster (default is the lower left corner
+        of the extent of the model grid)
+    nrow, ncol : int
+        number of rows and columns of the raster (default covers the
+        extent of the model grid)
+
+    Attributes
+    ----------
+    node : numpy.ndarray
+        (nrow, ncol) array of the zero-based node number of the model cell
+        containing each pixel center, -1 for pixels outside of the grid
+
+    Examples
+    --------
+    >>> from flopy.export.utils import GridRaster
+    >>> raster = GridRaster(m.modelgrid)
+    >>> heads = [raster.resample(h) for h in hds.get_alldata()]
+
+    """
+
+    def __init__(self, modelgrid, cellsize=None, xll=None, yll=None,
+                 nrow=None, ncol=None):
+        delr, delc, xoff, yoff, angrot, mult = _grid_reference(modelgrid)
+        self.grid_shape = (len(delc), len(delr))
+        if cellsize is None:
+            cellsize = min(delr.min(), delc.min()) * mult
+
+        # model coordinates of the cell edges
+        xedge = np.append(0., np.cumsum(delr)) * mult
+        yedge = np.append(0., np.cumsum(delc)) * mult
+
+        if hasattr(modelgrid, 'length_multiplier'):
+            xmin, ymin, xmax, ymax = modelgrid.bounds
+        else:
+            xmin, xmax, ymin, ymax = modelgrid.extent
+        if xll is None:
+            xll = xmin
+        if yll is None:
+            yll = ymin
+        if ncol is None:
+            ncol = max(int(np.ceil((xmax - xll) / cellsize - 1e-6)), 1)
+        if nrow is None:
+            nrow = max(int(np.ceil((ymax - yll) / cellsize - 1e-6)), 1)
+        self.cellsize = cellsize
+        self.xll = xll
+        self.yll = yll
+        self.nrow = nrow
+        self.ncol = ncol
+
+        h = hashlib.md5(np.ascontiguousarray(delr, dtype=np.float64))
+        h.update(np.ascontiguousarray(delc, dtype=np.float64))
+        h.update(repr((xoff, yoff, angrot, mult, cellsize, xll, yll,
+                       nrow, ncol)).encode())
+        key = h.hexdigest()
+        node = raster_cache.get(key)
+        if node is None:
+            node = self._get_node(xedge, yedge, xoff, yoff, angrot)
+            raster_cache.set(key, node)
+        self.node = node
+
+    def _get_node(self, xedge, yedge, xoff, yoff, angrot):
+        # pixel centers in model coordinates
+        x = self.xll + (np.arange(self.ncol) + 0.5) * self.cellsize
+        y = self.yll + (np.arange(self.nrow)[::-1] + 0.5) * self.cellsize
+        x, y = np.meshgrid(x, y)
+        x, y = _local_coords(x, y, xoff, yoff, angrot)
+
+        # rows are numbered from the top of the grid
+        nrow, ncol = self.grid_shape
+        j = np.searchsorted(xedge, x, side='right') - 1
+        i = np.searchsorted(yedge, yedge[-1] - y, side='right') - 1
+        inside = (i >= 0) & (i < nrow) & (j >= 0) & (j < ncol)
+        return np.where(inside, i * ncol + j, -1)
+
+    def resample(self, a, nodata=-9999):
+        """
+        Resample a model array to the raster
+
+        Parameters
+        ----------
+        a : numpy.ndarray
+            (nrow, ncol) model array, or a (n, nrow, ncol) stack of arrays
+            (layers, time steps, ...)
+        nodata : scalar
+            value of pixels outside of the grid and of nan cells
+            (default is -9999)
+
+        Returns
+        -------
+        b : numpy.ndarray
+            (nrow, ncol) raster, or (n, nrow, ncol) rasters
+
+        """
+        a = np.asarray(a)
+        shape = a.shape[:-2]
+        if a.shape[-2:] != self.grid_shape:
+            raise ValueError('array shape {} does not match the model '
+                             'grid {}'.format(a.shape, self.grid_shape))
+        a = a.reshape(shape + (-1,))
+        inside = self.node >= 0
+        b = np.empty(shape + self.node.shape, dtype=a.dtype)
+        b[..., ~inside] = nodata
+        b[..., inside] = a[..., self.node[inside]]
+        if np.issubdtype(b.dtype, np.floating):
+            b[np.isnan(b)] = nodata
+        return b
+
+
+def _grid_reference(modelgrid):
+    """
+    Row and column widths, origin, rotation and length multiplier of a
+    structured model grid or a SpatialReference.
+    """
+    delr = np.atleast_1d(np.asarray(modelgrid.delr, dtype=np.float64))
+    delc = np.atleast_1d(np.asarray(modelgrid.delc, dtype=np.float64))
+    if hasattr(modelgrid, 'length_multiplier'):
+        return (delr, delc, modelgrid.xll, modelgrid.yll,
+                modelgrid.rotation, modelgrid.length_multiplier)
+    return (delr, delc, modelgrid.xoffset, modelgrid.yoffset,
+            modelgrid.angrot, 1.)
+
+
+def _local_coords(x, y, xoff, yoff, angrot):
+    """
+    Convert real-world coordinates to (scaled) model coordinates.
+    """
+    theta = np.radians(angrot)
+    cos, sin = np.cos(theta), np.sin(theta)
+    dx, dy = x - xoff, y - yoff
+    return dx * cos + dy * sin, -dx * sin + dy * cos
+
+
+def _is_uniform(modelgrid):
+    """
+    True if all of the rows and columns of a structured grid have the
+    same width.
+    """
+    delr = np.atleast_1d(modelgrid.delr)
+    delc = np.atleast_1d(modelgrid.delc)
+    return bool(np.all(delr == delr[0]) and np.all(delc == delr[0]))
+
+
 def export_array(modelgrid, filename, a, nodata=-9999,
                  fieldname='value',
                  **kwargs):
@@ -945,43 +1178,36 @@ def export_array(modelgrid, filename, a, nodata=-9999,
         keyword arguments to np.savetxt (ascii)
         rasterio.open (GeoTIFF)
         or flopy.export.shapefile_utils.write_grid_shapefile2
+        cellsize : pixel size of resampled Arc Ascii and GeoTIFF rasters
 
     Notes
     -----
-    Rotated grids will be either be unrotated prior to export,
-    using scipy.ndimage.rotate (Arc Ascii format) or rotation will be
-    included in their transform property (GeoTiff format). In either case
-    the pixels will be displayed in the (unrotated) projected geographic
-    coordinate system, so the pixels will no longer align exactly with the
-    model grid (as displayed from a shapefile, for example). A key difference
-    between Arc Ascii and GeoTiff (besides disk usage) is that the
-    unrotated Arc Ascii will have a different grid size, whereas the GeoTiff
-    will have the same number of rows and pixels as the original.
+    Rotated and non-uniform grids are resampled to a north-up raster
+    (Arc Ascii format), taking the value of the model cell containing
+    the center of each pixel (see GridRaster). Rotation of uniform grids is
+    included in the transform property of GeoTiffs, non-uniform grids are
+    resampled. The pixel to cell mapping is cached, so exporting many
+    arrays of the same grid only resamples the values. Resampled pixels
+    are displayed in the (unrotated) projected geographic coordinate
+    system, so they will no longer align exactly with the model grid (as
+    displayed from a shapefile, for example) and the raster will have a
+    different size than the grid.
 
     """
 
     if filename.lower().endswith(".asc"):
-        if len(np.unique(modelgrid.delr)) != len(np.unique(modelgrid.delc)) != 1 \
-                or modelgrid.delr[0] != modelgrid.delc[0]:
-            raise ValueError('Arc ascii arrays require a uniform grid.')
-
         xoffset, yoffset = modelgrid.xoffset, modelgrid.yoffset
         cellsize = modelgrid.delr[0] # * self.length_multiplier
         fmt = kwargs.get('fmt', '%.18e')
         a = a.copy()
         a[np.isnan(a)] = nodata
-        if modelgrid.angrot != 0:
-            try:
-                from scipy.ndimage import rotate
-                a = rotate(a, modelgrid.angrot, cval=nodata)
-                height_rot, width_rot = a.shape
-                xmin, ymin, xmax, ymax = modelgrid.extent
-                dx = (xmax - xmin) / width_rot
-                dy = (ymax - ymin) / height_rot
-                cellsize = np.max((dx, dy))
-                xoffset, yoffset = xmin, ymin
-            except ImportError:
-                print('scipy package required to export rotated grid.')
+        pixelsize = kwargs.pop('cellsize', None)
+        if modelgrid.angrot != 0 or not _is_uniform(modelgrid) or \
+                pixelsize is not None:
+            raster = GridRaster(modelgrid, cellsize=pixelsize)
+            a = raster.resample(a, nodata=nodata)
+            cellsize = raster.cellsize
+            xoffset, yoffset = raster.xll, raster.yll
 
         filename = '.'.join(
             filename.split('.')[:-1]) + '.asc'  # enforce .asc ending
@@ -1001,22 +1227,28 @@ def export_array(modelgrid, filename, a, nodata=-9999,
         print('wrote {}'.format(filename))
 
     elif filename.lower().endswith(".tif"):
-        if len(np.unique(modelgrid.delr)) != len(np.unique(modelgrid.delc)) != 1 \
-                or modelgrid.delr[0] != modelgrid.delc[0]:
-            raise ValueError('GeoTIFF export require a uniform grid.')
+        pixelsize = kwargs.pop('cellsize', None)
         try:
             import rasterio
             from rasterio import Affine
         except ImportError:
             print('GeoTIFF export requires the rasterio package.')
             return
-        dxdy = modelgrid.delc[0] # * self.length_multiplier
-        trans = Affine.translation(modelgrid.xoffset, modelgrid.yoffset) * \
-                Affine.rotation(modelgrid.angrot) * \
-                Affine.scale(dxdy, -dxdy)
+        if _is_uniform(modelgrid) and pixelsize is None:
+            dxdy = modelgrid.delc[0] # * self.length_multiplier
+            trans = Affine.translation(modelgrid.xoffset,
+                                       modelgrid.yoffset) * \
+                    Affine.rotation(modelgrid.angrot) * \
+                    Affine.scale(dxdy, -dxdy)
+            a = a.copy()
+        else:
+            raster = GridRaster(modelgrid, cellsize=pixelsize)
+            a = raster.resample(a, nodata=nodata)
+            trans = Affine.translation(raster.xll, raster.yll +
+                                       raster.nrow * raster.cellsize) * \
+                    Affine.scale(raster.cellsize, -raster.cellsize)
 
         # third dimension is the number of bands
-        a = a.copy()
         if len(a.shape) == 2:
             a = np.reshape(a, (1, a.shape[0], a.shape[1]))
         if a.dtype.name == 'int64':
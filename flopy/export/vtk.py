@@ -1,4 +1,5 @@
 from __future__ import print_function, division
+import io
 import os
 import numpy as np
 from ..discretization import StructuredGrid
@@ -18,6 +19,31 @@ def end_tag(f, tag, indent_level, indent_char='  '):
     return indent_level
 
 
+class _BytesWriter(object):
+    """
+    Buffer for the binary vtk files: text, such as the xml tags, is
+    encoded and written as bytes, so the raw data can be appended.
+    """
+
+    def __init__(self):
+        self.buffer = io.BytesIO()
+
+    def write(self, s):
+        if not isinstance(s, bytes):
+            s = s.encode()
+        self.buffer.write(s)
+
+    def getvalue(self):
+        return self.buffer.getvalue()
+
+    def close(self):
+        self.buffer.close()
+
+
+# vtk cell type of the hexahedral cells
+VTK_VOXEL = 11
+
+
 class Vtk(object):
     """
     Support for writing a model to a vtk file
@@ -51,7 +77,8 @@ class Vtk(object):
         self.arrays[name] = a
         return
 
-    def write(self, shared_vertex=False, ibound_filter=False, htop=None):
+    def write(self, shared_vertex=False, ibound_filter=False, htop=None,
+              binary=False):
         """
 
         Parameters
@@ -73,48 +100,184 @@ class Vtk(object):
             minimum of the cell top and the head and the maximum of the cell
             bottom and the head.
 
+        binary : bool
+            Write the points, cells and data arrays as raw binary data in
+            the appended data section of the vtk file instead of as ascii
+            text (default is False).
+
         """
 
-        indent_level = 0
         if self.verbose:
             print('writing vtk file')
-        f = open(self.output_filename, 'w')
+        verts, iverts, ibound = self._get_geometry(shared_vertex,
+                                                   ibound_filter, htop)
+        arrays = [(name,) + self._get_cell_values(a, ibound)
+                  for name, a in self._get_cell_arrays()]
+        self._write_vtu(self.output_filename, verts, iverts, arrays, binary)
+        return
+
+    def write_pvd(self, arrays, name='head', times=None, shared_vertex=False,
+                  ibound_filter=False, htop=None, binary=True):
+        """
+        Write a time series of arrays (for example heads or concentrations)
+        as a collection of vtk files, one for every time, and a ParaView
+        data (.pvd) file that references them. The points and cells are
+        built once and reused for all files; the arrays added with
+        add_array() are written to every file.
 
-        ibound = None
+        Parameters
+        ----------
+        arrays : list of ndarrays or dict
+            Arrays of shape (nlay, nrow, ncol), or a dictionary of times and
+            arrays.
+        name : str
+            Name of the data array in the vtk files (default is 'head').
+        times : list of floats
+            Times of the arrays, if arrays is a list. If times is None the
+            array index is used.
+        shared_vertex : bool
+            See write().
+        ibound_filter : bool
+            See write().
+        htop : ndarray
+            See write().
+        binary : bool
+            See write() (default is True).
+
+        Returns
+        -------
+        filenames : list of str
+            Names of the vtk files
+
+        Examples
+        --------
+        >>> hds = flopy.utils.HeadFile('model.hds')
+        >>> vtkfile = Vtk('model.vtu', ml)
+        >>> vtkfile.write_pvd(hds.get_alldata(), times=hds.get_times())
+
+        """
+        if isinstance(arrays, dict):
+            times = list(arrays.keys())
+            arrays = list(arrays.values())
+        elif times is None:
+            times = list(range(len(arrays)))
+        assert len(times) == len(arrays)
+
+        verts, iverts, ibound = self._get_geometry(shared_vertex,
+                                                   ibound_filter, htop)
+        static = [(aname,) + self._get_cell_values(a, ibound)
+                  for aname, a in self._get_cell_arrays()]
+
+        base = os.path.splitext(self.output_filename)[0]
+        pvd_filename = base + '.pvd'
+        if self.verbose:
+            print('writing vtk collection ' + pvd_filename)
+        filenames = []
+        for idx, a in enumerate(arrays):
+            a = np.asarray(a)
+            assert a.shape == self.shape
+            filename = '{}_{:06d}.vtu'.format(base, idx + 1)
+            self._write_vtu(filename, verts, iverts,
+                            static + [(name,) +
+                                      self._get_cell_values(a, ibound)],
+                            binary)
+            filenames.append(filename)
+
+        indent_level = 0
+        with open(pvd_filename, 'w') as f:
+            f.write('<?xml version="1.0"?>\n')
+            indent_level = start_tag(f, '<VTKFile type="Collection">',
+                                     indent_level)
+            indent_level = start_tag(f, '<Collection>', indent_level)
+            for t, filename in zip(times, filenames):
+                s = '<DataSet timestep="{}" file="{}"/>'.format(
+                    t, os.path.basename(filename))
+                f.write(indent_level * '  ' + s + '\n')
+            indent_level = end_tag(f, '</Collection>', indent_level)
+            indent_level = end_tag(f, '</VTKFile>', indent_level)
+        return filenames
+
+    def _get_geometry(self, shared_vertex, ibound_filter, htop):
+        """
+        Get the points and the cells of the vtk grid and the ibound array
+        used to filter the cells (None if all cells are written).
+        """
+        assert (isinstance(self.modelgrid, StructuredGrid))
         if ibound_filter:
             ibound = self.modelgrid.idomain
-
-        dis = self.model.dis
-        z = np.vstack([dis.top.array.reshape(1, self.modelgrid.nrow,
-                                             self.modelgrid.ncol),
-                       dis.botm.array])
+        else:
+            ibound = None
+        cells = ibound
+        if cells is None:
+            cells = np.ones(self.shape, dtype=int)
         if shared_vertex:
             verts, iverts = self.get_3d_shared_vertex_connectivity(
-                self.modelgrid)
-            #verts, iverts = dis.sr.get_3d_shared_vertex_connectivity(nlay,
-            #                                                         z,
-            #                                                   ibound=ibound)
+                self.modelgrid, ibound=cells)
         else:
-            top = z[:-1]
-            bot = z[1:]
-            if htop is not None:
-                top = htop
-            verts, iverts = self.get_3d_vertex_connectivity(self.modelgrid)
-            #verts, iverts = dis.sr.get_3d_vertex_connectivity(nlay, top,
-            #                                                  bot,
-            #                                                  ibound=ibound)
-        ncells = len(iverts)
-        npoints = verts.shape[0]
+            verts, iverts = self.get_3d_vertex_connectivity(
+                self.modelgrid, ibound=cells, htop=htop)
         if self.verbose:
             s = 'Number of point is {}\n ' \
-                'Number of cells is {}\n'.format(npoints, ncells)
+                'Number of cells is {}\n'.format(verts.shape[0], len(iverts))
             print(s)
+        return verts, iverts, ibound
+
+    def _get_cell_arrays(self):
+        """
+        Names and arrays of the cell data: the cell tops and the arrays
+        added with add_array().
+        """
+        arrays = [('top', self.modelgrid.top_botm[:-1])]
+        arrays += list(self.arrays.items())
+        return arrays
+
+    def _get_cell_values(self, a, ibound):
+        """
+        Flat array of the values of the cells written to the vtk file and
+        the end of every layer in the flat array.
+
+        """
+        a = np.asarray(a)
+        if ibound is None:
+            ncpl = a[0].size
+            return a.ravel(), ncpl * np.arange(1, a.shape[0] + 1)
+
+        # combine ibound with laycbd when model supports laycbd
+        if hasattr(self.model, 'dis') and \
+                hasattr(self.model.dis, 'laycbd'):
+            cbd = np.where(self.model.dis.laycbd.array > 0)
+            ibound = np.insert(ibound, cbd[0] + 1, ibound[cbd[0], :, :],
+                               axis=0)
+        idx = ibound[:a.shape[0]] != 0
+        return a[idx], np.cumsum(idx.sum(axis=(1, 2)))
+
+    def _write_vtu(self, filename, verts, iverts, arrays, binary):
+        """
+        Write the points, the cells and the cell data arrays to a vtk
+        unstructured grid file.
+
+        """
+        ncells = len(iverts)
+        npoints = verts.shape[0]
+        nvert = iverts.shape[1]
+        offsets = nvert * np.arange(1, ncells + 1)
+        types = np.full(ncells, VTK_VOXEL, dtype=np.uint8)
+        if binary:
+            f = _BytesWriter()
+        else:
+            f = open(filename, 'w')
+        appended = []
 
+        indent_level = 0
         # xml
         s = '<?xml version="1.0"?>'
         f.write(s + '\n')
-        indent_level = start_tag(f, '<VTKFile type="UnstructuredGrid">',
-                                 indent_level)
+        if binary:
+            s = '<VTKFile type="UnstructuredGrid" version="1.0" ' \
+                'byte_order="LittleEndian" header_type="UInt64">'
+        else:
+            s = '<VTKFile type="UnstructuredGrid">'
+        indent_level = start_tag(f, s, indent_level)
 
         # unstructured grid
         indent_level = start_tag(f, '<UnstructuredGrid>', indent_level)
@@ -127,24 +290,16 @@ class Vtk(object):
         # points
         s = '<Points>'
         indent_level = start_tag(f, s, indent_level)
-
-        s = '<DataArray type="Float64" NumberOfComponents="3">'
-        indent_level = start_tag(f, s, indent_level)
-        assert (isinstance(self.modelgrid, StructuredGrid))
-        z = np.vstack([self.modelgrid.top.reshape(1, self.modelgrid.nrow,
-                                                  self.modelgrid.ncol),
-                       self.modelgrid.botm])
-        if shared_vertex:
-            verts, iverts = self.get_3d_shared_vertex_connectivity(
-                self.modelgrid)
+        s = '<DataArray type="Float64" NumberOfComponents="3"'
+        if binary:
+            self._write_appended(f, indent_level, s, verts, '<f8', appended)
         else:
-            verts, iverts = self.get_3d_vertex_connectivity(self.modelgrid)
-
-        for row in verts:
-            s = indent_level * '  ' + '{} {} {} \n'.format(*row)
-            f.write(s)
-        s = '</DataArray>'
-        indent_level = end_tag(f, s, indent_level)
+            indent_level = start_tag(f, s + '>', indent_level)
+            indent = indent_level * '  '
+            f.writelines([indent + '{} {} {} \n'.format(*row)
+                          for row in verts.tolist()])
+            s = '</DataArray>'
+            indent_level = end_tag(f, s, indent_level)
 
         s = '</Points>'
         indent_level = end_tag(f, s, indent_level)
@@ -153,31 +308,28 @@ class Vtk(object):
         s = '<Cells>'
         indent_level = start_tag(f, s, indent_level)
 
-        s = '<DataArray type="Int32" Name="connectivity">'
-        indent_level = start_tag(f, s, indent_level)
-        for row in iverts:
-            s = indent_level * '  ' + ' '.join([str(i) for i in row]) + '\n'
-            f.write(s)
-        s = '</DataArray>'
-        indent_level = end_tag(f, s, indent_level)
-
-        s = '<DataArray type="Int32" Name="offsets">'
-        indent_level = start_tag(f, s, indent_level)
-        icount = 0
-        for row in iverts:
-            icount += len(row)
-            s = indent_level * '  ' + '{} \n'.format(icount)
-            f.write(s)
-        s = '</DataArray>'
-        indent_level = end_tag(f, s, indent_level)
-
-        s = '<DataArray type="UInt8" Name="types">'
-        indent_level = start_tag(f, s, indent_level)
-        for row in iverts:
-            s = indent_level * '  ' + '{} \n'.format(11)
-            f.write(s)
-        s = '</DataArray>'
-        indent_level = end_tag(f, s, indent_level)
+        if npoints > np.iinfo(np.int32).max:
+            itype, idtype = 'Int64', '<i8'
+        else:
+            itype, idtype = 'Int32', '<i4'
+        for name, a, vtype, dtype in (
+                ('connectivity', iverts, itype, idtype),
+                ('offsets', offsets, itype, idtype),
+                ('types', types, 'UInt8', 'u1')):
+            s = '<DataArray type="{}" Name="{}"'.format(vtype, name)
+            if binary:
+                self._write_appended(f, indent_level, s, a, dtype, appended)
+                continue
+            indent_level = start_tag(f, s + '>', indent_level)
+            indent = indent_level * '  '
+            if a.ndim == 2:
+                f.writelines([indent + ' '.join(row) + '\n'
+                              for row in a.astype(str).tolist()])
+            else:
+                f.writelines([indent + '{} \n'.format(v)
+                              for v in a.tolist()])
+            s = '</DataArray>'
+            indent_level = end_tag(f, s, indent_level)
 
         s = '</Cells>'
         indent_level = end_tag(f, s, indent_level)
@@ -186,10 +338,12 @@ class Vtk(object):
         s = '<CellData Scalars="scalars">'
         indent_level = start_tag(f, s, indent_level)
 
-        self._write_data_array(f, indent_level, 'top', z[0:-1], ibound)
-
-        for name, a in self.arrays.items():
-            self._write_data_array(f, indent_level, name, a, ibound)
+        for name, a, bounds in arrays:
+            if binary:
+                s = '<DataArray type="Float64" Name="{}"'.format(name)
+                self._write_appended(f, indent_level, s, a, '<f8', appended)
+            else:
+                self._write_data_array(f, indent_level, name, a, bounds)
 
         s = '</CellData>'
         indent_level = end_tag(f, s, indent_level)
@@ -200,6 +354,19 @@ class Vtk(object):
         # end unstructured grid
         indent_level = end_tag(f, '</UnstructuredGrid>', indent_level)
 
+        if binary:
+            # appended data: each block is the number of bytes (UInt64)
+            # followed by the raw data
+            f.write(b'  <AppendedData encoding="raw">\n   _')
+            for a in appended:
+                f.write(np.array(a.nbytes, dtype='<u8').tobytes())
+                f.write(a.tobytes())
+            f.write(b'\n  </AppendedData>\n</VTKFile>\n')
+            with open(filename, 'wb') as fb:
+                fb.write(f.getvalue())
+            f.close()
+            return
+
         # end xml
         indent_level = end_tag(f, '</VTKFile>', indent_level)
 
@@ -207,9 +374,20 @@ class Vtk(object):
         f.close()
         return
 
-    def _write_data_array(self, f, indent_level, name, a, ibound):
+    @staticmethod
+    def _write_appended(f, indent_level, tag, a, dtype, appended):
         """
-        Write a numpy array to the vtk file
+        Write the tag of a data array in the appended data section and add
+        the array to the list of appended arrays.
+        """
+        offset = sum(8 + b.nbytes for b in appended)
+        s = '{} format="appended" offset="{}"/>'.format(tag, offset)
+        f.write(indent_level * '  ' + s + '\n')
+        appended.append(np.ascontiguousarray(a, dtype=dtype))
+
+    def _write_data_array(self, f, indent_level, name, a, bounds):
+        """
+        Write a flat numpy array to the vtk file, one line for each bound
 
         """
 
@@ -218,27 +396,16 @@ class Vtk(object):
         indent_level = start_tag(f, s, indent_level)
 
         # data
-        nlay = a.shape[0]
-
-        # combine ibound with laycbd when model supports laycbd
-        if ibound is not None and hasattr(self.model, 'dis') and \
-                hasattr(self.model.dis, 'laycbd'):
-            cbd = np.where(self.model.dis.laycbd.array > 0)
-            ibound = np.insert(ibound, cbd[0] + 1, ibound[cbd[0], :, :],
-                               axis=0)
-
-        for k in range(nlay):
+        if a.dtype.kind == 'f':
+            a = a.astype(np.float64)
+        i0 = 0
+        for i1 in bounds:
             s = indent_level * '  '
             f.write(s)
-            if ibound is None:
-                ak = a[k].flatten()
-            else:
-                idx = (ibound[k] != 0)
-                ak = a[k][idx].flatten()
-            for v in ak:
-                s = ' {}'.format(v)
-                f.write(s)
+            if i1 > i0:
+                f.write(' ' + ' '.join(a[i0:i1].astype(str).tolist()))
             f.write('\n')
+            i0 = i1
 
         # ending tag
         s = '</DataArray>'
@@ -246,7 +413,36 @@ class Vtk(object):
         return
 
     @staticmethod
-    def get_3d_shared_vertex_connectivity(mg):
+    def _get_cells(mg, ibound=None):
+        """Layer, row and column of the cells with a nonzero ibound."""
+        if ibound is None:
+            ibound = mg.idomain
+        if ibound is None:
+            ibound = np.ones((mg.nlay, mg.nrow, mg.ncol), dtype=int)
+        return np.nonzero(ibound)
+
+    @staticmethod
+    def get_3d_shared_vertex_connectivity(mg, ibound=None):
+        """
+        Get the points and the cells of a vtk grid of the model grid with
+        shared vertices. The z value of a vertex is the average of the
+        elevations of the adjacent cells.
+
+        Parameters
+        ----------
+        mg : StructuredGrid
+        ibound : ndarray
+            Cells with an ibound value of zero are excluded. If ibound is
+            None the idomain of the model grid is used.
+
+        Returns
+        -------
+        verts : ndarray
+            (npoints, 3) array of points
+        iverts : ndarray
+            (ncells, 8) array of the point numbers of the cells
+
+        """
 
         # get the x and y points for the grid
         x, y = mg.xyzvertices[0:2]
@@ -260,110 +456,77 @@ class Vtk(object):
         nrvncv = nrowvert * ncolvert
         npoints = nrvncv * nlayvert
 
-        # create and fill a 3d points array for the grid
-        verts = np.empty((npoints, 3), dtype=np.float)
+        # create and fill a 3d points array for the grid, the elevation of
+        # a vertex is the average of the (up to four) adjacent cells
+        verts = np.empty((npoints, 3), dtype=float)
         verts[:, 0] = np.tile(x, nlayvert)
         verts[:, 1] = np.tile(y, nlayvert)
-        istart = 0
-        istop = nrvncv
-        top_botm = mg.top_botm
-        for k in range(mg.nlay + 1):
-            verts[istart:istop, 2] = mg.interpolate(top_botm[k],
-                                                    verts[istart:istop, :2],
-                                                    method='linear')
-            istart = istop
-            istop = istart + nrvncv
-
-        # create the list of points comprising each cell. points must be
+        top_botm = np.pad(mg.top_botm, ((0, 0), (1, 1), (1, 1)),
+                          mode='edge')
+        z = (top_botm[:, :-1, :-1] + top_botm[:, :-1, 1:] +
+             top_botm[:, 1:, :-1] + top_botm[:, 1:, 1:]) / 4.
+        verts[:, 2] = z[:nlayvert].ravel()
+
+        # create the points comprising each cell. points must be
         # listed a specific way according to vtk requirements.
-        iverts = []
-        for k in range(mg.nlay):
-            koffset = k * nrvncv
-            for i in range(mg.nrow):
-                for j in range(mg.ncol):
-                    if mg._idomain is not None:
-                        if mg._idomain[k, i, j] == 0:
-                            continue
-                    iv1 = i * ncolvert + j + koffset
-                    iv2 = iv1 + 1
-                    iv4 = (i + 1) * ncolvert + j + koffset
-                    iv3 = iv4 + 1
-                    iverts.append([iv4 + nrvncv, iv3 + nrvncv,
-                                   iv1 + nrvncv, iv2 + nrvncv,
-                                   iv4, iv3, iv1, iv2])
+        k, i, j = Vtk._get_cells(mg, ibound)
+        iv1 = i * ncolvert + j + k * nrvncv
+        iv2 = iv1 + 1
+        iv4 = (i + 1) * ncolvert + j + k * nrvncv
+        iv3 = iv4 + 1
+        iverts = np.column_stack((iv4 + nrvncv, iv3 + nrvncv,
+                                  iv1 + nrvncv, iv2 + nrvncv,
+                                  iv4, iv3, iv1, iv2))
 
         return verts, iverts
 
     @staticmethod
-    def get_3d_vertex_connectivity(mg):
-        if mg.idomain is None:
-            ncells = mg.nlay * mg.nrow * mg.ncol
-            ibound = np.ones((mg.nlay, mg.nrow, mg.ncol), dtype=np.int)
-        else:
-            ncells = (mg.idomain != 0).sum()
-            ibound = mg.idomain
-        npoints = ncells * 8
-        verts = np.empty((npoints, 3), dtype=np.float)
-        iverts = []
-        ipoint = 0
-        top_botm = mg.top_botm
-        for k in range(mg.nlay):
-            for i in range(mg.nrow):
-                for j in range(mg.ncol):
-                    if ibound[k, i, j] == 0:
-                        continue
-
-                    ivert = []
-                    pts = mg._cell_vert_list(i, j)
-                    pt0, pt1, pt2, pt3, pt0 = pts
-
-                    z = top_botm[k + 1, i, j]
-
-                    verts[ipoint, 0:2] = np.array(pt1)
-                    verts[ipoint, 2] = z
-                    ivert.append(ipoint)
-                    ipoint += 1
-
-                    verts[ipoint, 0:2] = np.array(pt2)
-                    verts[ipoint, 2] = z
-                    ivert.append(ipoint)
-                    ipoint += 1
-
-                    verts[ipoint, 0:2] = np.array(pt0)
-                    verts[ipoint, 2] = z
-                    ivert.append(ipoint)
-                    ipoint += 1
-
-                    verts[ipoint, 0:2] = np.array(pt3)
-                    verts[ipoint, 2] = z
-                    ivert.append(ipoint)
-                    ipoint += 1
-
-                    z = top_botm[k, i, j]
-
-                    verts[ipoint, 0:2] = np.array(pt1)
-                    verts[ipoint, 2] = z
-                    ivert.append(ipoint)
-                    ipoint += 1
-
-                    verts[ipoint, 0:2] = np.array(pt2)
-                    verts[ipoint, 2] = z
-                    ivert.append(ipoint)
-                    ipoint += 1
-
-                    verts[ipoint, 0:2] = np.array(pt0)
-                    verts[ipoint, 2] = z
-                    ivert.append(ipoint)
-                    ipoint += 1
-
-                    verts[ipoint, 0:2] = np.array(pt3)
-                    verts[ipoint, 2] = z
-                    ivert.append(ipoint)
-                    ipoint += 1
-
-                    iverts.append(ivert)
+    def get_3d_vertex_connectivity(mg, ibound=None, htop=None):
+        """
+        Get the points and the cells of a vtk grid of the model grid, with
+        eight separate points for every cell.
 
-        return verts, iverts
+        Parameters
+        ----------
+        mg : StructuredGrid
+        ibound : ndarray
+            Cells with an ibound value of zero are excluded. If ibound is
+            None the idomain of the model grid is used.
+        htop : ndarray
+            Elevations of the cell tops of shape (nlay, nrow, ncol). If htop
+            is None the cell tops of the model grid are used.
+
+        Returns
+        -------
+        verts : ndarray
+            (npoints, 3) array of points
+        iverts : ndarray
+            (ncells, 8) array of the point numbers of the cells
+
+        """
+        k, i, j = Vtk._get_cells(mg, ibound)
+        ncells = len(k)
+        top_botm = mg.top_botm
+        if htop is None:
+            ztop = top_botm[k, i, j]
+        else:
+            ztop = np.asarray(htop)[k, i, j]
+        zbot = top_botm[k + 1, i, j]
+
+        # cell corners in the order of the vtk voxel:
+        # (i + 1, j), (i + 1, j + 1), (i, j), (i, j + 1)
+        xgrid, ygrid = mg.xvertices, mg.yvertices
+        ci = i[:, None] + np.array([1, 1, 0, 0])
+        cj = j[:, None] + np.array([0, 1, 0, 1])
+
+        verts = np.empty((ncells, 8, 3), dtype=float)
+        verts[:, :4, 0] = verts[:, 4:, 0] = xgrid[ci, cj]
+        verts[:, :4, 1] = verts[:, 4:, 1] = ygrid[ci, cj]
+        verts[:, :4, 2] = zbot[:, None]
+        verts[:, 4:, 2] = ztop[:, None]
+        iverts = np.arange(ncells * 8).reshape(ncells, 8)
+
+        return verts.reshape(-1, 3), iverts
 
 
 if __name__ == '__main__':
@@ -236,6 +236,7 @@ class BaseModel(ModelInterface):
         self.free_format_input = True
         self.parameter_load = False
         self.array_format = None
+        self.lazy_array_load = False
         self.external_fnames = []
         self.external_units = []
         self.external_binflag = []
@@ -485,6 +486,10 @@ class BaseModel(ModelInterface):
         using self.dis.delr, self.dis.delc, and self.dis.lenuni before being
         returned
         """
+        if item.startswith('__') and item.endswith('__'):
+            # special attributes (e.g. __setstate__ when a model is
+            # unpickled) are never packages
+            raise AttributeError(item)
         if item == 'sr':
             if self.dis is not None:
                 return self.dis.sr
@@ -598,7 +598,8 @@ class Modflow(BaseModel):
 
     @staticmethod
     def load(f, version='mf2005', exe_name='mf2005.exe', verbose=False,
-             model_ws='.', load_only=None, forgive=True, check=True):
+             model_ws='.', load_only=None, forgive=True, check=True,
+             lazy_load=False):
         """
         Load an existing MODFLOW model.
 
@@ -626,6 +627,11 @@ class Modflow(BaseModel):
             useful for debugging. Default False.
         check : boolean, optional
             Check model input for common errors. Default True.
+        lazy_load : boolean, optional
+            Defer reading OPEN/CLOSE (and single-array EXTERNAL binary)
+            arrays until they are first accessed. Unmodified arrays are
+            copied rather than reformatted when the model is written.
+            Default False.
 
         Returns
         -------
@@ -661,6 +667,7 @@ class Modflow(BaseModel):
 
         ml = Modflow(modelname, version=version, exe_name=exe_name,
                      verbose=verbose, model_ws=model_ws, **attribs)
+        ml.lazy_array_load = lazy_load
 
         files_successfully_loaded = []
         files_not_loaded = []
@@ -460,12 +460,8 @@ class ModflowDis(Package):
         if np.isscalar(x):
             r, c = mg.intersect(x, y, local=local)
         else:
-            r = []
-            c = []
-            for xx, yy in zip(x, y):
-                rr, cc = mg.intersect(xx, yy, local=local)
-                r.append(rr)
-                c.append(cc)
+            r, c = mg.intersect(np.asarray(x), np.asarray(y), local=local)
+            r, c = list(r), list(c)
         return r, c
 
     def get_lrc(self, nodes):
@@ -407,15 +407,13 @@ class Mnw(object):
         # does this need to be Mflist?
         self.stress_period_data = self.get_empty_stress_period_data(nper)
         if stress_period_data is not None:
-            for n in stress_period_data.dtype.names:
-                self.stress_period_data[n] = stress_period_data[n]
+            _assign_records(self.stress_period_data, stress_period_data)
 
         # accept node data from structured array
         self.node_data = ModflowMnw2.get_empty_node_data(np.abs(nnodes),
                                                          aux_names=self.aux)
         if node_data is not None:
-            for n in node_data.dtype.names:
-                self.node_data[n] = node_data[n]
+            _assign_records(self.node_data, node_data)
 
         # build recarray of node data from MNW2 input file
         if node_data is None:
@@ -468,7 +466,7 @@ class Mnw(object):
         """
         #
         dtype = Mnw.get_default_spd_dtype(structured=structured)
-        if aux_names is not None:
+        if aux_names:
             dtype = Package.add_to_dtype(dtype, aux_names, np.float32)
         return create_empty_recarray(nper, dtype, default_value=default_value)
 
@@ -527,12 +525,13 @@ class Mnw(object):
 
         if node_data is not None:
             nnodes = Mnw.get_nnodes(node_data)
-            losstype = node_data.losstype[0]
-            ppflag = node_data.ppflag[0]
-            pumploc = node_data.pumploc[0]
-            qlimit = node_data.qlimit[0]
-            pumpcap = node_data.pumpcap[0]
-            qcut = node_data.qcut[0]
+            rec = node_data[0]
+            losstype = rec['losstype']
+            ppflag = rec['ppflag']
+            pumploc = rec['pumploc']
+            qlimit = rec['qlimit']
+            pumpcap = rec['pumpcap']
+            qcut = rec['qcut']
         # get names based on mnw2obj attribute values
         else:
             nnodes = mnw2obj.nnodes
@@ -593,7 +592,7 @@ class Mnw(object):
         nnodes = len(node_data)
         # check if ztop and zbotm were entered,
         # flip nnodes for format 2
-        if np.sum(node_data.ztop - node_data.zbotm) > 0:
+        if np.sum(node_data['ztop'] - node_data['zbotm']) > 0:
             nnodes *= -1
         return nnodes
 
@@ -645,12 +644,14 @@ class Mnw(object):
         Populates the Mnw object attributes with values from node_data table.
         """
         names = Mnw.get_item2_names(node_data=self.node_data)
+        # plain ndarray field access avoids the recarray view overhead
+        node_data = self.node_data.view(np.ndarray)
         for n in names:
             # assign by node variables as lists if they are being included
             if n in self.by_node_variables:  # and len(np.unique(self.node_data[n])) > 1:
-                self.__dict__[n] = list(self.node_data[n])
+                self.__dict__[n] = list(node_data[n])
             else:
-                self.__dict__[n] = self.node_data[n][0]
+                self.__dict__[n] = node_data[n][0]
 
     def _write_2(self, f_mnw, float_format=' {:15.7E}', indent=12):
         """
@@ -728,18 +729,19 @@ class Mnw(object):
                                   self.node_data.zbotm[n],
                                   self.node_data.i[n] + 1,
                                   self.node_data.j[n] + 1)
+        # only write variables by node if they are unique lists > length 1
+        by_node = [var for var in ['rw', 'rskin', 'kskin', 'B', 'C', 'P',
+                                   'cwc', 'pp']
+                   if self.__dict__[var] is not None and
+                   len(np.unique(self.__dict__[var])) > 1]
+        fmt = ' ' + float_format
+        columns = [self.node_data[var] for var in by_node]
+        lines = []
         for n in range(np.abs(self.nnodes)):
-            f_mnw.write(_getloc(n))
-            for var in ['rw', 'rskin', 'kskin', 'B', 'C', 'P', 'cwc', 'pp']:
-                val = self.__dict__[var]
-                if val is None:
-                    continue
-                # only write variables by node if they are unique lists > length 1
-                if len(np.unique(val)) > 1:
-                    # if isinstance(val, list) or val < 0:
-                    fmt = ' ' + float_format
-                    f_mnw.write(fmt.format(self.node_data[var][n]))
-            f_mnw.write('\n')
+            lines.append(_getloc(n) +
+                         ''.join([fmt.format(c[n]) for c in columns]) +
+                         '\n')
+        f_mnw.write(''.join(lines))
         # dataset 2e
         if self.pumploc != 0:
             if self.pumploc > 0:
@@ -1015,13 +1017,22 @@ class ModflowMnw2(Package):
     def _sort_node_data(self):
 
         node_data = self.node_data
-        node_data_list = []
-        wells = sorted(np.unique(node_data['wellid']).tolist())
-        for wellid in wells:
-            nd = node_data[node_data['wellid'] == wellid]
-            nd = Mnw.sort_node_data(nd)
-            node_data_list.append(nd)
-        node_data = np.concatenate(node_data_list, axis=0)
+        if len(node_data) == 0:
+            return
+        wellids, order, bounds = _group_by_wellid(node_data['wellid'])
+        node_data = node_data[order]
+
+        # only wells with nodes out of order need to be sorted individually
+        first = np.zeros(len(node_data), dtype=bool)
+        first[bounds[:-1]] = True
+        unsorted = (np.diff(node_data['k']) < 0) | \
+                   (np.diff(node_data['ztop']) > 0)
+        unsorted = unsorted & ~first[1:]
+        wells = np.unique(np.searchsorted(bounds, np.where(unsorted)[0] + 1,
+                                          side='right') - 1)
+        for n in wells:
+            start, end = bounds[n], bounds[n + 1]
+            node_data[start:end] = Mnw.sort_node_data(node_data[start:end])
         self.node_data = node_data.view(np.recarray)
 
     @staticmethod
@@ -1048,7 +1059,7 @@ class ModflowMnw2(Package):
             Recarray of default dtype of shape maxnode
         """
         dtype = ModflowMnw2.get_default_node_dtype(structured=structured)
-        if aux_names is not None:
+        if aux_names:
             dtype = Package.add_to_dtype(dtype, aux_names, np.float32)
         return create_empty_recarray(maxnodes, dtype,
                                      default_value=default_value)
@@ -1133,7 +1144,7 @@ class ModflowMnw2(Package):
 
         """
         dtype = ModflowMnw2.get_default_spd_dtype(structured=structured)
-        if aux_names is not None:
+        if aux_names:
             dtype = Package.add_to_dtype(dtype, aux_names, np.float32)
         return create_empty_recarray(itmp, dtype, default_value=default_value)
 
@@ -1217,7 +1228,6 @@ class ModflowMnw2(Package):
         # dataset 1
         mnwmax, nodtot, ipakcb, mnwprint, option = _parse_1(line)
         # dataset 2
-        node_data = ModflowMnw2.get_empty_node_data(0)
         mnw = {}
         for i in range(mnwmax):
             # create a Mnw object by parsing dataset 2
@@ -1227,9 +1237,17 @@ class ModflowMnw2(Package):
             mnwobj.stress_period_data = Mnw.get_empty_stress_period_data(nper,
                                                                          aux_names=option)
             mnw[mnwobj.wellid] = mnwobj
-            # master table with all node data
-            node_data = np.append(node_data, mnwobj.node_data).view(
-                np.recarray)
+        # master table with all node data
+        node_data = _concatenate_records(
+            [mnwobj.node_data for mnwobj in mnw.values()],
+            ModflowMnw2.get_empty_node_data(0).dtype)
+        # location of the first node of each well
+        kij = {}
+        for wellid, k, i, j in zip(node_data.wellid[::-1].tolist(),
+                                   node_data.k[::-1].tolist(),
+                                   node_data.i[::-1].tolist(),
+                                   node_data.j[::-1].tolist()):
+            kij[wellid] = [k, i, j]
 
         stress_period_data = {}  # stress period data table for package (flopy convention)
         itmp = []
@@ -1249,22 +1267,23 @@ class ModflowMnw2(Package):
                     if mnw[wellid].qlimit < 0:
                         hlim, qcut, qfrcmn, qfrcmx = _parse_4b(next(f))
                     # update package stress period data table
-                    ndw = node_data[node_data.wellid == wellid]
-                    kij = [ndw.k[0], ndw.i[0], ndw.j[0]]
-                    current_4[i] = tuple(kij + [wellid, qdes, capmult, cprime,
-                                                hlim, qcut, qfrcmn,
-                                                qfrcmx] + xyz)
+                    current_4[i] = tuple(kij[wellid] +
+                                         [wellid, qdes, capmult, cprime,
+                                          hlim, qcut, qfrcmn,
+                                          qfrcmx] + xyz)
                     # update well stress period data table
                     mnw[wellid].stress_period_data[per] = tuple(
-                        kij + [per] + [qdes, capmult, cprime,
-                                       hlim, qcut, qfrcmn, qfrcmx] + xyz)
+                        kij[wellid] + [per] + [qdes, capmult, cprime,
+                                               hlim, qcut, qfrcmn,
+                                               qfrcmx] + xyz)
                 stress_period_data[per] = current_4
             elif itmp_per == 0:  # no active mnws this stress period
                 continue
             else:
                 # copy pumping rates from previous stress period
-                mnw[wellid].stress_period_data[per] = \
-                    mnw[wellid].stress_period_data[per - 1]
+                for mnwobj in mnw.values():
+                    mnwobj.stress_period_data[per] = \
+                        mnwobj.stress_period_data[per - 1]
             itmp.append(itmp_per)
         f.close()
 
@@ -1387,35 +1406,42 @@ class ModflowMnw2(Package):
         node_data = self.node_data
         stress_period_data = self.stress_period_data
         self.mnw = {}
-        mnws = np.unique(node_data['wellid'])
-        for wellid in mnws:
-            nd = node_data[node_data.wellid == wellid]
+        mnws, order, bounds = _group_by_wellid(node_data['wellid'])
+
+        # reshape stress period data to well (one row per well and period)
+        mnwspd = Mnw.get_empty_stress_period_data(len(mnws) * self.nper,
+                                                  aux_names=self.aux)
+        mnwspd = mnwspd.reshape(len(mnws), self.nper)
+        for per, itmp in enumerate(self.itmp):
+            if itmp > 0:
+                spd = stress_period_data[per]
+                # assign in reverse, so that the first entry for a well
+                # takes precedence
+                spd = spd[::-1]
+                idx = np.searchsorted(mnws, spd['wellid'])
+                idx[idx == len(mnws)] = 0
+                inds = mnws[idx] == spd['wellid'] if len(mnws) > 0 else idx
+                names = [n for n in spd.dtype.names
+                         if n in mnwspd.dtype.names]
+                mnwspd['per'][idx[inds], per] = per
+                for n in names:
+                    mnwspd[n][idx[inds], per] = spd[n][inds]
+            elif itmp == 0:
+                continue
+            elif itmp < 0:
+                mnwspd[:, per] = mnwspd[:, per - 1]
+
+        for n, wellid in enumerate(mnws):
+            nd = node_data[order[bounds[n]:bounds[n + 1]]]
             nnodes = Mnw.get_nnodes(nd)
             # if tops and bottoms are specified, flip nnodes
             # maxtop = np.max(nd.ztop)
             # minbot = np.min(nd.zbotm)
             # if maxtop - minbot > 0 and nnodes > 0:
             #    nnodes *= -1
-            # reshape stress period data to well
-            mnwspd = Mnw.get_empty_stress_period_data(self.nper,
-                                                      aux_names=self.aux)
-            for per, itmp in enumerate(self.itmp):
-                inds = stress_period_data[0].wellid == wellid
-                if itmp > 0 and np.any(inds):
-                    names = [n for n in
-                             stress_period_data[per][inds].dtype.names if
-                             n in mnwspd.dtype.names]
-                    mnwspd[per]['per'] = per
-                    for n in names:
-                        mnwspd[per][n] = stress_period_data[per][inds][n][0]
-                elif itmp == 0:
-                    continue
-                elif itmp < 0:
-                    mnwspd[per] = mnwspd[per - 1]
-
             self.mnw[wellid] = Mnw(wellid,
                                    nnodes=nnodes, nper=self.nper,
-                                   node_data=nd, stress_period_data=mnwspd,
+                                   node_data=nd, stress_period_data=mnwspd[n],
                                    mnwpackage=self)
 
     def make_node_data(self, mnwobjs):
@@ -1436,16 +1462,9 @@ class ModflowMnw2(Package):
         elif isinstance(mnwobjs, Mnw):
             mnwobjs = [mnwobjs]
 
-        mnwobj_node_data = []
-        for mnwobj in mnwobjs:
-            for rec in mnwobj.node_data:
-                mnwobj_node_data.append(rec)
-        node_data = ModflowMnw2.get_empty_node_data(len(mnwobj_node_data))
-
-        for ix, node in enumerate(mnwobj_node_data):
-            node_data[ix] = node
-
-        self.node_data = node_data
+        dtype = ModflowMnw2.get_empty_node_data(0).dtype
+        self.node_data = _concatenate_records(
+            [mnwobj.node_data for mnwobj in mnwobjs], dtype)
 
     def make_stress_period_data(self, mnwobjs):
         """
@@ -1464,27 +1483,37 @@ class ModflowMnw2(Package):
             mnwobjs = list(mnwobjs.values())
         elif isinstance(mnwobjs, Mnw):
             mnwobjs = [mnwobjs]
+        # stress period data of all wells in one table
+        spd_dtype = Mnw.get_empty_stress_period_data(0,
+                                                     aux_names=self.aux).dtype
+        mnwspd = _concatenate_records(
+            [mnw.stress_period_data for mnw in mnwobjs], spd_dtype)
+        nrows = np.array([len(mnw.stress_period_data) for mnw in mnwobjs],
+                         dtype=int)
+        start = np.cumsum(nrows) - nrows
+        wellidx = np.repeat(np.arange(len(mnwobjs)), nrows)
+        wellids = np.empty(len(mnwobjs), dtype=object)
+        wellids[:] = [mnw.wellid for mnw in mnwobjs]
+
         stress_period_data = {}
         for per, itmp in enumerate(self.itmp):
             if itmp > 0:
                 stress_period_data[
                     per] = ModflowMnw2.get_empty_stress_period_data(itmp,
                                                                     aux_names=self.aux)
-                i = 0
-                for mnw in mnwobjs:
-                    if per in mnw.stress_period_data.per:
-                        i += 1
-                        if i > itmp:
-                            raise ItmpError(itmp, i)
-                        names = [n for n in mnw.stress_period_data.dtype.names
-                                 if n in stress_period_data[per].dtype.names]
-                        stress_period_data[per]['wellid'][i - 1] = mnw.wellid
-                        for n in names:
-                            stress_period_data[per][n][i - 1] = \
-                                mnw.stress_period_data[n][per]
+                # wells with stress period data for this period
+                active = np.zeros(len(mnwobjs), dtype=bool)
+                active[wellidx[mnwspd['per'] == per]] = True
+                nactive = active.sum()
+                if nactive != itmp:
+                    raise ItmpError(itmp, nactive)
+                rows = start[active] + per
+                names = [n for n in spd_dtype.names
+                         if n in stress_period_data[per].dtype.names]
+                stress_period_data[per]['wellid'] = wellids[active]
+                for n in names:
+                    stress_period_data[per][n] = mnwspd[n][rows]
                 stress_period_data[per].sort(order='wellid')
-                if i < itmp:
-                    raise ItmpError(itmp, i)
             elif itmp == 0:
                 continue
             else:  # itmp < 0
@@ -1613,38 +1642,61 @@ class ModflowMnw2(Package):
             f_mnw.write('{:.0f}  Stress Period {:.0f}\n'.format(self.itmp[per],
                                                                 per + 1))
             if self.itmp[per] > 0:
-
-                for n in range(self.itmp[per]):
-                    # dataset 4
-                    wellid = self.stress_period_data[per].wellid[n]
-                    qdes = self.stress_period_data[per].qdes[n]
-                    fmt = '{} ' + float_format
-                    f_mnw.write(fmt.format(wellid, qdes))
-                    if self.mnw[wellid].pumpcap > 0:
-                        fmt = ' ' + float_format
-                        f_mnw.write(fmt.format(
-                            *self.stress_period_data[per].capmult[n]))
-                    if qdes > 0 and self.gwt:
-                        f_mnw.write(fmt.format(
-                            *self.stress_period_data[per].cprime[n]))
-                    if len(self.aux) > 0:
-                        for var in self.aux:
-                            fmt = ' ' + float_format
-                            f_mnw.write(fmt.format(
-                                *self.stress_period_data[per][var][n]))
-                    f_mnw.write('\n')
-                    if self.mnw[wellid].qlimit < 0:
-                        hlim, qcut = \
-                            self.stress_period_data[per][['hlim', 'qcut']][n]
-                        fmt = float_format + ' {:.0f}'
-                        f_mnw.write(fmt.format(hlim, qcut))
-                        if qcut != 0:
-                            fmt = ' {} {}'.format(float_format)
-                            f_mnw.write(fmt.format(*self.stress_period_data[
-                                per][['qfrcmn', 'qfrcmx']][n]))
-                        f_mnw.write('\n')
+                # dataset 4
+                spd = self.stress_period_data[per][:self.itmp[per]]
+                f_mnw.write(self._get_dataset4_lines(spd, float_format))
         f_mnw.close()
 
+    def _get_dataset4_lines(self, spd, float_format=' {:15.7E}'):
+        """
+        Format dataset 4 (4a and 4b) for one stress period.
+
+        Parameters
+        ----------
+        spd : np.recarray
+            stress period data for the wells active in the stress period
+        float_format : str
+            python format statement for floats (default is ' {:15.7E}').
+
+        Returns
+        -------
+        lines : str
+
+        """
+        wellid = spd['wellid']
+        pumpcap = np.array([self.mnw[w].pumpcap > 0 for w in wellid],
+                           dtype=bool)
+        qlimit = np.array([self.mnw[w].qlimit < 0 for w in wellid],
+                          dtype=bool)
+
+        def _format(fmt, values, mask=None):
+            """Format a column of values, blank where mask is False."""
+            if mask is None:
+                return [fmt.format(v) for v in values]
+            return [fmt.format(v) if m else ''
+                    for v, m in zip(values, mask)]
+
+        fmt = ' ' + float_format
+        # dataset 4a
+        columns = [_format('{} ', wellid),
+                   _format(float_format, spd['qdes'])]
+        if np.any(pumpcap):
+            columns.append(_format(fmt, spd['capmult'], pumpcap))
+        if self.gwt:
+            columns.append(_format(fmt, spd['cprime'], spd['qdes'] > 0))
+        for var in self.aux:
+            columns.append(_format(fmt, spd[var]))
+        columns.append(['\n'] * len(spd))
+        # dataset 4b
+        if np.any(qlimit):
+            qcut = spd['qcut'] != 0
+            columns.append(_format(float_format, spd['hlim'], qlimit))
+            columns.append(_format(' {:.0f}', spd['qcut'], qlimit))
+            columns.append(_format(fmt, spd['qfrcmn'], qlimit & qcut))
+            columns.append(_format(fmt, spd['qfrcmx'], qlimit & qcut))
+            columns.append(_format('\n', wellid, qlimit))
+        return ''.join([''.join(line) for line in zip(*columns)])
+
     @staticmethod
     def ftype():
         return 'MNW2'
@@ -1904,6 +1956,88 @@ def _parse_4b(line):
     return hlim, qcut, qfrcmn, qfrcmx
 
 
+def _assign_records(ra, data):
+    """
+    Assign the fields of the structured array data to the recarray ra,
+    in one block if the dtypes and shapes agree, otherwise field by field.
+    """
+    if data.dtype == ra.dtype and data.shape == ra.shape:
+        ra[:] = data
+    else:
+        data = data.view(np.ndarray)
+        for n in data.dtype.names:
+            ra[n] = data[n]
+
+
+def _concatenate_records(arrays, dtype):
+    """
+    Concatenate a list of structured arrays into a single recarray of dtype.
+    Fields are matched by name; fields in dtype that are missing from an
+    array are left at zero.
+
+    Parameters
+    ----------
+    arrays : list of np.ndarray
+        One-dimensional structured arrays (e.g. node_data of Mnw objects).
+    dtype : np.dtype
+        dtype of the output recarray.
+
+    Returns
+    -------
+    ra : np.recarray
+    """
+    arrays = [np.asarray(a) for a in arrays]
+    nrows = np.sum([len(a) for a in arrays], dtype=int)
+    ra = create_empty_recarray(nrows, dtype, default_value=0)
+    if nrows == 0:
+        return ra
+    dtypes = set(a.dtype for a in arrays)
+    if len(dtypes) == 1:
+        # all arrays have the same fields; concatenate in one block
+        data = np.concatenate(arrays)
+        for n in dtype.names:
+            if n in data.dtype.names:
+                ra[n] = data[n]
+    else:
+        for n in dtype.names:
+            if np.all([n in a.dtype.names for a in arrays]):
+                ra[n] = np.concatenate([a[n] for a in arrays])
+            else:
+                i = 0
+                for a in arrays:
+                    if n in a.dtype.names:
+                        ra[n][i:i + len(a)] = a[n]
+                    i += len(a)
+    return ra
+
+
+def _group_by_wellid(wellid):
+    """
+    Group rows of a table by wellid.
+
+    Parameters
+    ----------
+    wellid : np.ndarray
+        Well identifiers for each row.
+
+    Returns
+    -------
+    wellids : np.ndarray
+        Sorted unique well identifiers.
+    order : np.ndarray
+        Indices that sort the rows by wellid (stable, so that the original
+        order within each well is retained).
+    bounds : np.ndarray
+        Start of the rows for each well in order; the rows for well n are
+        order[bounds[n]:bounds[n + 1]].
+    """
+    wellids, inverse = np.unique(wellid, return_inverse=True)
+    order = np.argsort(inverse, kind='mergesort')
+    bounds = np.append(0, np.cumsum(np.bincount(inverse,
+                                                minlength=len(wellids))))
+    return wellids, order, bounds
+
+
 class ItmpError(Exception):
     def __init__(self, itmp, nactivewells):
         self.itmp = itmp
@@ -371,6 +371,7 @@ class ModflowSfr2(Package):
 
         self.url = 'sfr2.htm'
         self._graph = None # dict of routing connections
+        self._topology = None # RoutingTopology instance made from graph
 
         # Dataset 0
         self.heading = '# {} package for '.format(self.name[0]) + \
@@ -588,8 +589,21 @@ class ModflowSfr2(Package):
         """Dictionary of routing connections between segments."""
         if self._graph is None:
             self._graph = self._make_graph()
+            self._topology = None
         return self._graph
 
+    @property
+    def topology(self):
+        """
+        RoutingTopology instance with the upstream connections (CSR),
+        breadth-first order and distance to outlet of each segment in graph.
+        Remade whenever the routing graph is reset.
+        """
+        graph = self.graph
+        if self._topology is None:
+            self._topology = RoutingTopology.from_graph(graph)
+        return self._topology
+
     @property
     def paths(self):
         if self._paths is None:
@@ -626,8 +640,7 @@ class ModflowSfr2(Package):
         return graph
 
     def _set_paths(self):
-        graph = self.graph
-        self._paths = {seg: find_path(graph, seg) for seg in graph.keys()}
+        self._paths = self.topology.get_paths()
 
     def _get_flag(self, flagname):
         """
@@ -800,19 +813,13 @@ class ModflowSfr2(Package):
         dtypes = [d for d in ModflowSfr2.get_default_reach_dtype().descr
                   if d[0] in names]
 
-        lines = []
-        for i in range(abs(nstrm)):
-            line = f.readline()
-            line = line_parse(line)
-            ireach = tuple(map(float, line[:len(dtypes)]))
-            lines.append(ireach)
-
-        tmp = np.array(lines, dtype=dtypes)
+        # parse all of the reach lines at once
+        lines = [line_parse(f.readline()) for i in range(abs(nstrm))]
+        tmp = _tokens_to_array(lines, ncol=len(dtypes))
         # initialize full reach_data array with all possible columns
         reach_data = ModflowSfr2.get_empty_reach_data(len(lines))
-        for n in names:
-            reach_data[n] = tmp[
-                n]  # not sure if there's a way to assign multiple columns
+        for idx, (n, dtype) in enumerate(dtypes):
+            reach_data[n] = tmp[:, idx]
 
         # zero-based convention
         inds = ['k', 'i', 'j'] if structured else ['node']
@@ -829,7 +836,17 @@ class ModflowSfr2(Package):
             # Dataset 5
             dataset_5[i] = _get_dataset(f.readline(), [-1, 0, 0, 0])
             itmp = dataset_5[i][0]
-            if itmp > 0:
+            if itmp > 0 and len(option) == 0:
+                # Item 6 - datasets 6a-6c parsed for all segments at once
+                current, current_6d, current_6e = \
+                    _read_6_period(f, itmp, nstrm, isfropt, reachinput,
+                                   per=i)
+                segment_data[i] = current
+                if len(current_6d) > 0:
+                    channel_geometry_data[i] = current_6d
+                if len(current_6e) > 0:
+                    channel_flow_data[i] = current_6e
+            elif itmp > 0:
                 # Item 6
                 current = ModflowSfr2.get_empty_segment_data(nsegments=itmp,
                                                              aux_names=option)
@@ -1134,14 +1151,14 @@ class ModflowSfr2(Package):
             # # such as plotting elevation profiles
             # self.outsegs[per] = all_outsegs
             #
-            # use graph instead of above loop
-            nrow = len(self.segment_data[per].nseg)
-            ncol = np.max(
-                [len(v) if v is not None else 0 for v in self.paths.values()])
-            all_outsegs = np.zeros((nrow, ncol), dtype=int)
-            for i, (k, v) in enumerate(self.paths.items()):
-                if k > 0:
-                    all_outsegs[i, :len(v)] = v
+            # use routing topology instead of above loop
+            topology = self.topology
+            paths = topology.get_path_array()
+            paths = paths[topology.nodes > 0]
+            paths[topology.distance[topology.nodes > 0] < 0] = 0
+            nrow = max(len(self.segment_data[per].nseg), len(paths))
+            all_outsegs = np.zeros((nrow, paths.shape[1]), dtype=int)
+            all_outsegs[:len(paths)] = paths
             all_outsegs.sort(axis=0)
             self.outsegs[per] = all_outsegs
             # create a dictionary listing outlets associated with each segment
@@ -1150,20 +1167,22 @@ class ModflowSfr2(Package):
             # if len(r[(r != 0) & (r != 999999)]) > 0
             # else i + 1
             #                     for i, r in enumerate(all_outsegs.T)}
-            self.outlets[per] = {k: self.paths[k][-1] if k in self.paths
-            else k for k in self.segment_data[per].nseg}
+            nseg = self.segment_data[per].nseg
+            idx = topology.get_index(nseg)
+            outlets = np.where(idx >= 0, 0, nseg).tolist()
+            circular = (idx >= 0) & (topology.distance[idx] < 0)
+            self.outlets[per] = {k: None if c else o for k, o, c in
+                                 zip(nseg.tolist(), outlets, circular)}
         return txt
 
     def reset_reaches(self):
         self.reach_data.sort(order=['iseg', 'ireach'])
-        reach_data = self.reach_data
-        segment_data = list(set(self.reach_data.iseg))# self.segment_data[0]
-        reach_counts = np.bincount(reach_data.iseg)[1:]
-        reach_counts = dict(zip(range(1, len(reach_counts) + 1),
-                                reach_counts))
-        ireach = [list(range(1, reach_counts[s] + 1))
-                  for s in segment_data]
-        ireach = np.concatenate(ireach)
+        iseg = self.reach_data.iseg
+        # number reaches consecutively from the start of each segment
+        segment_start = np.unique(iseg, return_index=True)[1]
+        reach_counts = np.diff(np.append(segment_start, len(iseg)))
+        ireach = np.arange(len(iseg)) - np.repeat(segment_start,
+                                                  reach_counts) + 1
         self.reach_data['ireach'] = ireach
 
     def set_outreaches(self):
@@ -1178,22 +1197,26 @@ class ModflowSfr2(Package):
         # ensure that all outsegs are segments, outlets, or negative (lakes)
         self.repair_outsegs()
         rd = self.reach_data
-        outseg = self.graph
-        reach1IDs = dict(zip(rd[rd.ireach == 1].iseg,
-                             rd[rd.ireach == 1].reachID))
-        outreach = []
-        for i in range(len(rd)):
-            # if at the end of reach data or current segment
-            if i + 1 == len(rd) or rd.ireach[i + 1] == 1:
-                nextseg = outseg[rd.iseg[i]]  # get next segment
-                if nextseg > 0:  # current reach is not an outlet
-                    nextrchid = reach1IDs[
-                        nextseg]  # get reach 1 of next segment
-                else:
-                    nextrchid = 0
-            else:  # otherwise, it's the next reachID
-                nextrchid = rd.reachID[i + 1]
-            outreach.append(nextrchid)
+        topology = self.topology
+        # within a segment, the outreach is the next reachID
+        outreach = np.append(rd.reachID[1:], 0)
+        # the last reach in each segment routes to reach 1 of the next segment
+        islast = np.append(rd.ireach[1:] == 1, True)
+        idx = topology.get_index(rd.iseg[islast])
+        if np.any(idx < 0):
+            raise KeyError(rd.iseg[islast][idx < 0][0])
+        nextseg = topology.tonodes[idx]
+        reach1 = rd.ireach == 1
+        reach1_iseg, first = np.unique(rd.iseg[reach1], return_index=True)
+        reach1IDs = rd.reachID[reach1][first]
+        nextidx = np.searchsorted(reach1_iseg, nextseg)
+        nextidx[nextidx == len(reach1_iseg)] = 0
+        isrouted = nextseg > 0  # current reach is not an outlet
+        if np.any(reach1_iseg[nextidx[isrouted]] != nextseg[isrouted]):
+            missing = nextseg[isrouted][
+                reach1_iseg[nextidx[isrouted]] != nextseg[isrouted]]
+            raise KeyError(missing[0])
+        outreach[islast] = np.where(isrouted, reach1IDs[nextidx], 0)
         self.reach_data['outreach'] = outreach
 
     def get_slopes(self, default_slope=0.001, minimum_slope=0.0001,
@@ -1225,13 +1248,14 @@ class ModflowSfr2(Package):
         if np.diff(self.reach_data.outreach).max() == 0:
             self.set_outreaches()
         rd = self.reach_data
-        elev = dict(zip(rd.reachID, rd.strtop))
-        dist = dict(zip(rd.reachID, rd.rchlen))
-        dnelev = {rid: elev[rd.outreach[i]] if rd.outreach[i] != 0
-        else -9999 for i, rid in enumerate(rd.reachID)}
-        slopes = np.array(
-            [(elev[i] - dnelev[i]) / dist[i] if dnelev[i] != -9999
-             else default_slope for i in rd.reachID])
+        outidx = _get_outreach_index(rd)
+        dnelev = rd.strtop[outidx]
+        dnelev[outidx < 0] = -9999
+        isoutlet = dnelev == -9999
+        slopes = np.empty(len(rd), dtype=float)
+        slopes[isoutlet] = default_slope
+        slopes[~isoutlet] = (rd.strtop[~isoutlet] - dnelev[~isoutlet]) / \
+                            rd.rchlen[~isoutlet]
         slopes[slopes < minimum_slope] = minimum_slope
         slopes[slopes > maximum_slope] = maximum_slope
         self.reach_data['slope'] = slopes
@@ -1249,7 +1273,7 @@ class ModflowSfr2(Package):
 
         Notes
         -----
-        This method will not work if there are instances of circular routing.
+        Segments with circular routing are not included.
 
         """
         all_upsegs = {}
@@ -1258,35 +1282,11 @@ class ModflowSfr2(Package):
                 0]:  # skip stress periods where seg data not defined
                 continue
             segment_data = self.segment_data[per]
+            topology = RoutingTopology(segment_data.nseg, segment_data.outseg)
 
-            # make a list of adjacent upsegments keyed to outseg list in Mat2
-            upsegs = {o: segment_data.nseg[segment_data.outseg == o].tolist()
-                      for o in np.unique(segment_data.outseg)}
-
-            outsegs = [k for k in list(upsegs.keys()) if
-                       k > 0]  # exclude 0, which is the outlet designator
-
-            # for each outseg key, for each upseg, check for more upsegs,
-            # append until headwaters has been reached
-            for outseg in outsegs:
-
-                up = True
-                upsegslist = upsegs[outseg]
-                while up:
-                    added_upsegs = []
-                    for us in upsegslist:
-                        if us in outsegs:
-                            added_upsegs += upsegs[us]
-                    if len(added_upsegs) == 0:
-                        up = False
-                        break
-                    else:
-                        upsegslist = added_upsegs
-                        upsegs[outseg] += added_upsegs
-
-            # the above algorithm is recursive, so lower order streams
-            # get duplicated many times use a set to get unique upsegs
-            all_upsegs[per] = {u: list(set(upsegs[u])) for u in outsegs}
+            # exclude 0, which is the outlet designator, and lakes
+            all_upsegs[per] = {k: v.tolist() for k, v in
+                               topology.get_upstream().items() if k > 0}
         return all_upsegs
 
     def get_variable_by_stress_period(self, varname):
@@ -1327,48 +1327,41 @@ class ModflowSfr2(Package):
         r : dictionary mapping old segment numbers to new
         """
 
-        nseg = sorted(list(self.graph.keys()))
-        outseg = [self.graph[k] for k in nseg]
+        topology = self.topology
+        nseg = topology.nodes.tolist()
 
         # explicitly fix any gaps in the numbering
         # (i.e. from removing segments)
         nseg2 = np.arange(1, len(nseg) + 1)
         # intermediate mapping that
-        r1 = dict(zip(nseg, nseg2))
+        r1 = dict(zip(nseg, nseg2.tolist()))
         r1[0] = 0
-        outseg2 = np.array([r1[s] for s in outseg])
-
-        # function re-assigning upseg numbers consecutively at one level
-        # relative to outlet(s).  Counts down from the number of segments
-        def reassign_upsegs(r, nexts, upsegs):
-            nextupsegs = []
-            for u in upsegs:
-                r[u] = nexts if u > 0 else u  # handle lakes
-                nexts -= 1
-                nextupsegs += list(nseg2[outseg2 == u])
-            return r, nexts, nextupsegs
 
         ns = len(nseg)
 
         # start at outlets with nss;
         # renumber upsegs consecutively at each level
+        # (breadth-first order of the routing topology)
         # until all headwaters have been reached
-        nexts = ns
-        r2 = {0: 0}
-        nextupsegs = nseg2[outseg2 == 0]
-        for _ in range(ns):
-            r2, nexts, nextupsegs = reassign_upsegs(r2, nexts, nextupsegs)
-            if len(nextupsegs) == 0:
-                break
+        order = topology.order
+        r2 = dict(zip(nseg2[order].tolist(),
+                      (ns - np.arange(len(order))).tolist()))
+        r2[0] = 0
         # map original segment numbers to new numbers
         r = {k: r2.get(v, v) for k, v in r1.items()}
 
+        def renumber(a):
+            a = np.asarray(a)
+            old, inv = np.unique(a, return_inverse=True)
+            new = np.array([r.get(s, s) for s in old.tolist()], dtype=int)
+            return new[inv]
+
         # renumber segments in all stress period data
         for per in self.segment_data.keys():
-            self.segment_data[per]['nseg'] = [r.get(s, s) for s in
-                                              self.segment_data[per].nseg]
-            self.segment_data[per]['outseg'] = [r.get(s, s) for s in
-                                                self.segment_data[per].outseg]
+            self.segment_data[per]['nseg'] = renumber(
+                self.segment_data[per].nseg)
+            self.segment_data[per]['outseg'] = renumber(
+                self.segment_data[per].outseg)
             self.segment_data[per].sort(order='nseg')
             nseg = self.segment_data[per].nseg
             outseg = self.segment_data[per].outseg
@@ -1379,7 +1372,7 @@ class ModflowSfr2(Package):
         self._graph = None # reset routing dict
 
         # renumber segments in reach_data
-        self.reach_data['iseg'] = [r.get(s, s) for s in self.reach_data.iseg]
+        self.reach_data['iseg'] = renumber(self.reach_data.iseg)
         self.reach_data.sort(order=['iseg', 'ireach'])
         self.reach_data['reachID'] = np.arange(1, len(self.reach_data) + 1)
         self.set_outreaches()  # reset the outreaches to ensure continuity
@@ -1432,7 +1425,7 @@ class ModflowSfr2(Package):
         to_miles = {'feet': 1 / 5280., 'meters': 1 / (.3048 * 5280.)}
 
         # slice the path
-        path = np.array(self.paths[start_seg])
+        path = np.array(self.topology.get_path(start_seg))
         endidx = np.where(path == end_seg)[0]
         endidx = endidx if len(endidx) > 0 else None
         path = path[:np.squeeze(endidx)]
@@ -1490,11 +1483,9 @@ class ModflowSfr2(Package):
         headwaters : np.ndarray (1-D)
             One dimensional array listing all headwater segments.
         """
-        upsegs = [self.segment_data[per].nseg[
-                      self.segment_data[per].outseg == s].tolist()
-                  for s in self.segment_data[0].nseg]
-        return self.segment_data[per].nseg[
-            np.array([i for i, u in enumerate(upsegs) if len(u) == 0])]
+        segment_data = self.segment_data[per]
+        hasupsegs = np.in1d(self.segment_data[0].nseg, segment_data.outseg)
+        return segment_data.nseg[np.where(~hasupsegs)[0]]
 
     def _interpolate_to_reaches(self, segvar1, segvar2, per=0):
         """
@@ -1530,30 +1521,61 @@ class ModflowSfr2(Package):
         segment_data = self.segment_data[per]
         segment_data.sort(order='nseg')
         reach_data.sort(order=['iseg', 'ireach'])
-        reach_values = []
-        for seg in segment_data.nseg:
-            reaches = reach_data[reach_data.iseg == seg]
-            dist = np.cumsum(reaches.rchlen) - 0.5 * reaches.rchlen
-            icalc = segment_data.icalc[segment_data.nseg == seg]
-            # get width from channel cross section length
-            if 'width' in segvar1 and icalc == 2:
-                channel_geometry_data = self.channel_geometry_data[per]
-                reach_values += list(
-                    np.ones(len(reaches)) * channel_geometry_data[seg][0][-1])
-            # assign arbitrary width since width is based on flow
-            elif 'width' in segvar1 and icalc == 3:
-                reach_values += list(np.ones(len(reaches)) * 5)
-            # assume width to be mean from streamflow width/flow table
-            elif 'width' in segvar1 and icalc == 4:
-                channel_flow_data = self.channel_flow_data[per]
-                reach_values += list(
-                    np.ones(len(reaches)) * np.mean(channel_flow_data[seg][2]))
-            else:
-                fp = [segment_data[segment_data['nseg'] == seg][segvar1][0],
-                      segment_data[segment_data['nseg'] == seg][segvar2][0]]
-                xp = [dist[0], dist[-1]]
-                reach_values += np.interp(dist, xp, fp).tolist()
-        return np.array(reach_values)
+        # rows of reach_data for each segment
+        nseg = segment_data['nseg']
+        start = np.searchsorted(reach_data['iseg'], nseg, side='left')
+        end = np.searchsorted(reach_data['iseg'], nseg, side='right')
+        counts = end - start
+        rows = np.repeat(start - np.cumsum(counts) + counts, counts) + \
+               np.arange(counts.sum())
+        segidx = np.repeat(np.arange(len(nseg)), counts)
+        rchlen = reach_data['rchlen'][rows]
+
+        # distance to the center of each reach from the start of its
+        # segment: a global cumsum minus the length of the preceding
+        # segments. The distances may differ from a cumsum per segment by
+        # round-off of the order of the total reach length times the machine
+        # epsilon, which is negligible for the interpolated values.
+        first = np.cumsum(counts) - counts
+        last = first + counts - 1
+        nonempty = counts > 0
+        cumlen = np.cumsum(rchlen, dtype=float)
+        offset = np.zeros(len(nseg))
+        offset[nonempty] = cumlen[first[nonempty]] - rchlen[first[nonempty]]
+        dist = cumlen - np.repeat(offset, counts) - 0.5 * rchlen
+
+        # linear interpolation between the centers of the first and the last
+        # reach of each segment; a segment with one reach gets segvar2, as
+        # with np.interp
+        x0 = np.zeros(len(nseg))
+        x1 = np.zeros(len(nseg))
+        x0[nonempty] = dist[first[nonempty]]
+        x1[nonempty] = dist[last[nonempty]]
+        length = (x1 - x0)[segidx]
+        frac = np.ones(len(dist))
+        np.divide(dist - x0[segidx], length, out=frac, where=length > 0)
+        frac = np.clip(frac, 0., 1.)
+        y0 = segment_data[segvar1].astype(float)[segidx]
+        y1 = segment_data[segvar2].astype(float)[segidx]
+        reach_values = y0 + frac * (y1 - y0)
+
+        if 'width' in segvar1:
+            icalc = segment_data['icalc']
+            for i in np.where(np.in1d(icalc, [2, 3, 4]) & nonempty)[0]:
+                seg = nseg[i]
+                # get width from channel cross section length
+                if icalc[i] == 2:
+                    channel_geometry_data = self.channel_geometry_data[per]
+                    width = channel_geometry_data[seg][0][-1]
+                # assign arbitrary width since width is based on flow
+                elif icalc[i] == 3:
+                    width = 5
+                # assume width to be mean from streamflow width/flow table
+                else:
+                    channel_flow_data = self.channel_flow_data[per]
+                    width = np.mean(channel_flow_data[seg][2])
+                reach_values[first[i]:last[i] + 1] = width
+        return reach_values
 
     def _write_1c(self, f_sfr):
 
@@ -1597,121 +1619,112 @@ class ModflowSfr2(Package):
                                    structured=self.parent.structured)
 
         # Add one to the kij indices
-        # names = self.reach_data.dtype.names
-        # lnames = []
-        # [lnames.append(name.lower()) for name in names]
         # --make copy of data for multiple calls
         d = np.array(self.reach_data)
         for idx in ['k', 'i', 'j', 'node']:
             if (idx in columns):
                 d[idx] += 1
         d = d[columns]
-        formats = _fmt_string(d)[:-1] + '\n'
-        for rec in d:
-            f_sfr.write(formats.format(*rec))
-
-    def _write_segment_data(self, i, j, f_sfr):
-        cols = ['nseg', 'icalc', 'outseg', 'iupseg', 'iprior', 'nstrpts',
-                'flow', 'runoff',
-                'etsw', 'pptsw', 'roughch', 'roughbk', 'cdpth', 'fdpth',
-                'awdth', 'bwdth']
-        seg_dat = np.array(self.segment_data[i])[cols][j]
-        fmts = _fmt_string_list(seg_dat)
-
-        nseg, icalc, outseg, iupseg, iprior, nstrpts, flow, runoff, etsw, \
-        pptsw, roughch, roughbk, cdpth, fdpth, awdth, bwdth = \
-            [0 if v == self.default_value else v for v in seg_dat]
-
-        f_sfr.write(
-            ' '.join(fmts[0:4]).format(nseg, icalc, outseg, iupseg) + ' ')
-
-        if iupseg > 0:
-            f_sfr.write(fmts[4].format(iprior) + ' ')
-        if icalc == 4:
-            f_sfr.write(fmts[5].format(nstrpts) + ' ')
-
-        f_sfr.write(
-            ' '.join(fmts[6:10]).format(flow, runoff, etsw, pptsw) + ' ')
-
-        if icalc in [1, 2]:
-            f_sfr.write(fmts[10].format(roughch) + ' ')
-        if icalc == 2:
-            f_sfr.write(fmts[11].format(roughbk) + ' ')
-
-        if icalc == 3:
-            f_sfr.write(
-                ' '.join(fmts[12:16]).format(cdpth, fdpth, awdth, bwdth) + ' ')
-        f_sfr.write('\n')
-
-        self._write_6bc(i, j, f_sfr,
-                        cols=['hcond1', 'thickm1', 'elevup', 'width1',
-                              'depth1', 'thts1', 'thti1',
-                              'eps1', 'uhc1'])
-        self._write_6bc(i, j, f_sfr,
-                        cols=['hcond2', 'thickm2', 'elevdn', 'width2',
-                              'depth2', 'thts2', 'thti2',
-                              'eps2', 'uhc2'])
-
-    def _write_6bc(self, i, j, f_sfr, cols=()):
-        cols = list(cols)
-        icalc = self.segment_data[i][j][1]
-        seg_dat = np.array(self.segment_data[i])[cols][j]
-        fmts = _fmt_string_list(seg_dat)
-        hcond, thickm, elevupdn, width, depth, thts, thti, eps, uhc = \
-            [0 if v == self.default_value else v for v in seg_dat]
-
-        if self.isfropt in [0, 4, 5] and icalc <= 0:
-            f_sfr.write(
-                ' '.join(fmts[0:5]).format(hcond, thickm, elevupdn, width,
-                                           depth) + ' ')
-
-        elif self.isfropt in [0, 4, 5] and icalc == 1:
-            f_sfr.write(fmts[0].format(hcond) + ' ')
-
-            if i == 0:
-                f_sfr.write(
-                    ' '.join(fmts[1:4]).format(thickm, elevupdn, width) + ' ')
-                if self.isfropt in [4, 5]:
-                    f_sfr.write(
-                        ' '.join(fmts[5:8]).format(thts, thti, eps) + ' ')
-
-                if self.isfropt == 5:
-                    f_sfr.write(fmts[8].format(uhc) + ' ')
-
-            elif i > 0 and self.isfropt == 0:
-                f_sfr.write(
-                    ' '.join(fmts[1:4]).format(thickm, elevupdn, width) + ' ')
-
-        elif self.isfropt in [0, 4, 5] and icalc >= 2:
-            f_sfr.write(fmts[0].format(hcond) + ' ')
-
-            if self.isfropt in [4, 5] and i > 0 and icalc == 2:
-                pass
+        if len(d) == 0:
+            return
+        # format all of the reaches at once
+        txt = _fmt_string_array(d)
+        lines = txt[columns[0]]
+        for c in columns[1:]:
+            lines = _char_cat(lines, ' ', txt[c])
+        f_sfr.write('\n'.join(lines.tolist()) + '\n')
+
+    def _write_segment_data(self, i, f_sfr):
+        """
+        Write datasets 6a-6e for all of the segments in stress period i.
+        Datasets 6a-6c are formatted for all segments at once.
+        """
+        seg_dat = np.array(self.segment_data[i])
+        txt = _fmt_string_array(seg_dat, zero_value=self.default_value)
+        icalc = np.where(seg_dat['icalc'] == self.default_value, 0,
+                         seg_dat['icalc'])
+        iupseg = np.where(seg_dat['iupseg'] == self.default_value, 0,
+                          seg_dat['iupseg'])
+        all_segs = np.ones(len(seg_dat), dtype=bool)
+
+        # dataset 6a
+        item_6a = [('nseg', all_segs), ('icalc', all_segs),
+                   ('outseg', all_segs), ('iupseg', all_segs),
+                   ('iprior', iupseg > 0), ('nstrpts', icalc == 4),
+                   ('flow', all_segs), ('runoff', all_segs),
+                   ('etsw', all_segs), ('pptsw', all_segs),
+                   ('roughch', np.in1d(icalc, [1, 2])),
+                   ('roughbk', icalc == 2),
+                   ('cdpth', icalc == 3), ('fdpth', icalc == 3),
+                   ('awdth', icalc == 3), ('bwdth', icalc == 3)]
+        lines = _get_item_lines(txt, item_6a)
+
+        # datasets 6b and 6c
+        for cols in [['hcond1', 'thickm1', 'elevup', 'width1', 'depth1',
+                      'thts1', 'thti1', 'eps1', 'uhc1'],
+                     ['hcond2', 'thickm2', 'elevdn', 'width2', 'depth2',
+                      'thts2', 'thti2', 'eps2', 'uhc2']]:
+            item_6bc = list(zip(cols, self._get_6bc_masks(i, icalc)))
+            lines = _char_cat(lines, _get_item_lines(txt, item_6bc))
+        lines = lines.tolist()
+
+        # datasets 6d and 6e, only needed for icalc 2 and 4 segments
+        if i == 0 or self.nstrm > 0 and not self.reachinput:
+            icalc_6d = [2, 4]
+        else:
+            icalc_6d = [4]
+        for j in np.where(np.in1d(icalc, icalc_6d))[0]:
+            nseg = self.segment_data[i].nseg[j]
+            if icalc[j] == 2:
+                rows = self.channel_geometry_data[i][nseg][:2]
             else:
-                f_sfr.write(' '.join(fmts[1:3]).format(thickm, elevupdn) + ' ')
-
-                if self.isfropt in [4, 5] and icalc == 2 and i == 0:
-                    f_sfr.write(
-                        ' '.join(fmts[3:6]).format(thts, thti, eps) + ' ')
+                rows = self.channel_flow_data[i][nseg][:3]
+            lines[j] += ''.join([''.join(['{:.2f} '.format(d) for d in row])
+                                 + '\n' for row in rows])
+        f_sfr.write(''.join(lines))
 
-                    if self.isfropt == 5:
-                        f_sfr.write(fmts[8].format(uhc) + ' ')
-                else:
-                    pass
-        elif self.isfropt == 1 and icalc <= 1:
-            f_sfr.write(fmts[3].format(width) + ' ')
-            if icalc <= 0:
-                f_sfr.write(fmts[4].format(depth) + ' ')
-        elif self.isfropt in [2, 3] and icalc <= 1:
-            if i > 0:
-                pass
+    def _get_6bc_masks(self, i, icalc):
+        """
+        Get boolean arrays (one per segment) indicating which of the
+        hcond, thickm, elevupdn, width, depth, thts, thti, eps and uhc
+        variables are written to dataset 6b or 6c in stress period i.
+        """
+        isfropt = self.isfropt
+        nseg = len(icalc)
+        a = np.zeros(nseg, dtype=bool)
+        b = np.zeros(nseg, dtype=bool)
+        c = np.zeros(nseg, dtype=bool)
+        c2 = np.zeros(nseg, dtype=bool)
+        c3 = np.zeros(nseg, dtype=bool)
+        d = np.zeros(nseg, dtype=bool)
+        if isfropt in [0, 4, 5]:
+            a = icalc <= 0
+            b = icalc == 1
+            c = icalc >= 2
+            if isfropt in [4, 5] and i > 0:
+                c2 = c & (icalc != 2)
             else:
-                f_sfr.write(fmts[3].format(width) + ' ')
-                if icalc <= 0:
-                    f_sfr.write(fmts[4].format(depth) + ' ')
-        else:
-            pass
-        f_sfr.write('\n')
+                c2 = c
+            if isfropt in [4, 5] and i == 0:
+                c3 = c2 & (icalc == 2)
+        elif isfropt == 1 or (isfropt in [2, 3] and i == 0):
+            d = icalc <= 1
+        # icalc 1 segments only repeat thickm, elevupdn and width in
+        # later stress periods if isfropt is 0
+        b_geom = b if i == 0 or isfropt == 0 else np.zeros(nseg, dtype=bool)
+        b_unsat = b if i == 0 and isfropt in [4, 5] \
+            else np.zeros(nseg, dtype=bool)
+        unsat = b_unsat | c3
+        uhc = unsat if isfropt == 5 else np.zeros(nseg, dtype=bool)
+        return [a | b | c,  # hcond
+                a | b_geom | c2,  # thickm
+                a | b_geom | c2,  # elevupdn
+                a | b_geom | d,  # width
+                a | (d & (icalc <= 0)),  # depth
+                unsat,  # thts
+                unsat,  # thti
+                unsat,  # eps
+                uhc]
 
     def write_file(self, filename=None):
         """
@@ -1761,29 +1774,8 @@ class ModflowSfr2(Package):
             f_sfr.write(' '.join(map(str, self.dataset_5[i])) + '\n')
             if itmp > 0:
 
-                # Item 6
-                for j in range(itmp):
-
-                    # write datasets 6a, 6b and 6c
-                    self._write_segment_data(i, j, f_sfr)
-
-                    icalc = self.segment_data[i].icalc[j]
-                    nseg = self.segment_data[i].nseg[j]
-                    if icalc == 2:
-                        # or isfropt <= 1:
-                        if i == 0 or self.nstrm > 0 and not self.reachinput:
-                            for k in range(2):
-                                for d in self.channel_geometry_data[i][nseg][
-                                    k]:
-                                    f_sfr.write('{:.2f} '.format(d))
-                                f_sfr.write('\n')
-
-                    if icalc == 4:
-                        # nstrpts = self.segment_data[i][j][5]
-                        for k in range(3):
-                            for d in self.channel_flow_data[i][nseg][k]:
-                                f_sfr.write('{:.2f} '.format(d))
-                            f_sfr.write('\n')
+                # Item 6 - write datasets 6a-6e
+                self._write_segment_data(i, f_sfr)
             if self.tabfiles and i == 0:
                 for j in sorted(self.tabfiles_dict.keys()):
                     f_sfr.write('{:.0f} {:.0f} {:.0f}\n'.format(j,
@@ -2008,22 +2000,22 @@ class check:
         txt = ''
         array = array.view(np.recarray).copy()
         if isinstance(col1, np.ndarray):
-            array = recfunctions.append_fields(array, names='tmp1', data=col1,
-                                               asrecarray=True)
+            array = _append_fields(array, names='tmp1', data=col1,
+                                   asrecarray=True)
             col1 = 'tmp1'
         if isinstance(col2, np.ndarray):
-            array = recfunctions.append_fields(array, names='tmp2', data=col2,
-                                               asrecarray=True)
+            array = _append_fields(array, names='tmp2', data=col2,
+                                   asrecarray=True)
             col2 = 'tmp2'
         if isinstance(col1, tuple):
-            array = recfunctions.append_fields(array, names=col1[0],
-                                               data=col1[1],
-                                               asrecarray=True)
+            array = _append_fields(array, names=col1[0],
+                                   data=col1[1],
+                                   asrecarray=True)
             col1 = col1[0]
         if isinstance(col2, tuple):
-            array = recfunctions.append_fields(array, names=col2[0],
-                                               data=col2[1],
-                                               asrecarray=True)
+            array = _append_fields(array, names=col2[0],
+                                   data=col2[1],
+                                   asrecarray=True)
             col2 = col2[0]
 
         failed = array[col1] > array[col2]
@@ -2036,9 +2028,9 @@ class check:
                         failed_info[c].sum() != 0
                         and c != 'diff'
                         and 'tmp' not in c]
-                failed_info = recfunctions.append_fields(
+                failed_info = _append_fields(
                     failed_info[cols].copy(), names='diff', data=diff,
-                    usemask=False, asrecarray=False)
+                    asrecarray=False)
                 failed_info.sort(order='diff', axis=0)
                 if not sort_ascending:
                     failed_info = failed_info[::-1]
@@ -2109,8 +2101,25 @@ class check:
                               datatype='segment')
 
         # check reach numbering
+        # (group reaches by segment, only segments with reach numbers
+        # that aren't 1, 2, 3... need to be checked individually)
+        iseg = self.reach_data.iseg
+        idx = np.argsort(iseg, kind='mergesort')
+        ireach = self.reach_data.ireach[idx]
+        segments, start, counts = np.unique(iseg[idx], return_index=True,
+                                            return_counts=True)
+        expected = np.arange(len(ireach)) - np.repeat(start, counts) + 1
+        invalid = set(iseg[idx][ireach != expected].tolist())
+        t = ''
         for segment in np.arange(1, self.sfr.nss + 1):
-            reaches = self.reach_data.ireach[self.reach_data.iseg == segment]
+            i = np.searchsorted(segments, segment)
+            if i < len(segments) and segments[i] == segment:
+                if segment not in invalid:
+                    t = ''
+                    continue
+                reaches = ireach[start[i]:start[i] + counts[i]]
+            else:
+                reaches = ireach[:0]
             t = _check_numbers(len(reaches),
                                reaches,
                                level=self.level,
@@ -2160,7 +2169,7 @@ class check:
 
         # txt += self.sfr.get_outlets(level=self.level, verbose=False)  # will print twice if verbose=True
         # simpler check method using paths from routing graph
-        circular_segs = [k for k, v in self.sfr.paths.items() if v is None]
+        circular_segs = self.sfr.topology.circular.tolist()
         if len(circular_segs) > 0:
             txt += '{0} instances where an outlet was not found after {1} consecutive segments!\n' \
                 .format(len(circular_segs), self.sfr.nss)
@@ -2189,23 +2198,17 @@ class check:
 
             x0 = xcentergrid[rd.i, rd.j]
             y0 = ycentergrid[rd.i, rd.j]
-            loc = dict(zip(rd.reachID, zip(x0, y0)))
 
             # compute distances between node centers of connected reaches
             headertxt = 'Checking reach connections for proximity...\n'
             txt = ''
             if self.verbose:
                 print(headertxt.strip())
-            dist = []
-            for r in rd.reachID:
-                x0, y0 = loc[r]
-                outreach = rd.outreach[r - 1]
-                if outreach == 0:
-                    dist.append(0)
-                else:
-                    x1, y1 = loc[outreach]
-                    dist.append(np.sqrt((x1 - x0) ** 2 + (y1 - y0) ** 2))
-            dist = np.array(dist)
+            outidx = _get_outreach_index(rd)
+            x1 = x0[outidx]
+            y1 = y0[outidx]
+            dist = np.sqrt((x1 - x0) ** 2 + (y1 - y0) ** 2)
+            dist[outidx < 0] = 0
 
             # compute max width of reach nodes (hypotenuse for rectangular nodes)
             delr = self.mg.delr
@@ -2310,10 +2313,10 @@ class check:
                         ['k', 'i', 'j', 'iseg', 'ireach', 'rchlen', 'strthick',
                          'strhc1', 'width', 'conductance']]
 
-                reach_data = recfunctions.append_fields(
+                reach_data = _append_fields(
                     reach_data,
                     names=['width', 'conductance'], data=[w, Cond],
-                    usemask=False, asrecarray=False)
+                    asrecarray=False)
                 has_multiple = np.array(
                     [True if n in nodes_with_multiple_conductance
                      else False for n in reach_data['node']])
@@ -2411,10 +2414,10 @@ class check:
 
                 # first check for segments where elevdn > elevup
                 d_elev = segment_data.elevdn - segment_data.elevup
-                segment_data = recfunctions.append_fields(segment_data,
-                                                          names='d_elev',
-                                                          data=d_elev,
-                                                          asrecarray=True)
+                segment_data = _append_fields(segment_data,
+                                              names='d_elev',
+                                              data=d_elev,
+                                              asrecarray=True)
                 txt += self._boolean_compare(
                     np.array(segment_data)[['nseg', 'outseg', 'elevup',
                                             'elevdn', 'd_elev']],
@@ -2428,15 +2431,14 @@ class check:
                 non_outlets = segment_data.outseg > 0
                 non_outlets_seg_data = segment_data[
                     non_outlets]  # lake outsegs are < 0
-                outseg_elevup = np.array(
-                    [segment_data.elevup[o - 1] for o in segment_data.outseg if
-                     o > 0])
+                outseg_elevup = segment_data.elevup[
+                    segment_data.outseg[non_outlets] - 1]
                 d_elev2 = outseg_elevup - segment_data.elevdn[non_outlets]
-                non_outlets_seg_data = recfunctions.append_fields(
+                non_outlets_seg_data = _append_fields(
                     non_outlets_seg_data,
                     names=['outseg_elevup', 'd_elev2'],
                     data=[outseg_elevup, d_elev2],
-                    usemask=False, asrecarray=False)
+                    asrecarray=False)
 
                 txt += self._boolean_compare(
                     non_outlets_seg_data[['nseg', 'outseg', 'elevdn',
@@ -2473,12 +2475,13 @@ class check:
 
             # compute changes in elevation
             rd = self.reach_data.copy()
-            elev = dict(zip(rd.reachID, rd.strtop))
-            dnelev = {rid: elev[rd.outreach[i]] if rd.outreach[i] != 0
-            else -9999 for i, rid in enumerate(rd.reachID)}
-            strtopdn = np.array([dnelev[r] for r in rd.reachID])
-            diffs = np.array([(dnelev[i] - elev[i]) if dnelev[i] != -9999
-                              else -.001 for i in rd.reachID])
+            outidx = _get_outreach_index(rd)
+            dnelev = rd.strtop[outidx]
+            dnelev[outidx < 0] = -9999
+            isoutlet = dnelev == -9999
+            strtopdn = dnelev.astype(float)
+            diffs = (dnelev - rd.strtop).astype(float)
+            diffs[isoutlet] = -.001
 
             reach_data = self.sfr.reach_data  # inconsistent with other checks that work with
             # reach_data attribute of check class. Want to have get_outreaches as a method of sfr class
@@ -2489,9 +2492,9 @@ class check:
             # non_outlets = reach_data[reach_data.outreach != 0]
             # outreach_elevdn = np.array([reach_data.strtop[o - 1] for o in reach_data.outreach])
             # d_strtop = outreach_elevdn[reach_data.outreach != 0] - non_outlets.strtop
-            rd = recfunctions.append_fields(
+            rd = _append_fields(
                 rd, names=['strtopdn', 'd_strtop'], data=[strtopdn, diffs],
-                usemask=False, asrecarray=False)
+                asrecarray=False)
 
             txt += self._boolean_compare(
                 rd[['k', 'i', 'j', 'iseg', 'ireach', 'strtop', 'strtopdn',
@@ -2526,9 +2529,9 @@ class check:
             # check streambed bottoms in relation to respective cell bottoms
             bots = self.sfr.parent.dis.botm.array[k, i, j]
             streambed_bots = reach_data['strtop'] - reach_data['strthick']
-            reach_data = recfunctions.append_fields(
+            reach_data = _append_fields(
                 reach_data, names=['layerbot', 'strbot'],
-                data=[bots, streambed_bots], usemask=False, asrecarray=False)
+                data=[bots, streambed_bots], asrecarray=False)
 
             txt += self._boolean_compare(
                 reach_data[['k', 'i', 'j', 'iseg', 'ireach', 'strtop',
@@ -2541,9 +2544,9 @@ class check:
                 warning = False  # this constitutes an error (MODFLOW won't run)
             # check streambed elevations in relation to model top
             tops = self.sfr.parent.dis.top.array[i, j]
-            reach_data = recfunctions.append_fields(
+            reach_data = _append_fields(
                 reach_data, names='modeltop', data=tops,
-                usemask=False, asrecarray=False)
+                asrecarray=False)
 
             txt += self._boolean_compare(
                 reach_data[['k', 'i', 'j', 'iseg', 'ireach',
@@ -2598,10 +2601,10 @@ class check:
             i, j = segment_ends.i, segment_ends.j
             tops = self.sfr.parent.dis.top.array[i, j]
             diff = tops - segment_ends.strtop
-            segment_ends = recfunctions.append_fields(
+            segment_ends = _append_fields(
                 segment_ends,
                 names=['modeltop', 'diff'], data=[tops, diff],
-                usemask=False, asrecarray=False)
+                asrecarray=False)
 
             txt += self._boolean_compare(segment_ends[['k', 'i', 'j', 'iseg',
                                                        'strtop', 'modeltop',
@@ -2716,6 +2719,48 @@ def _check_numbers(n, numbers, level=1, datatype='reach'):
     return txt
 
 
+def _get_outreach_index(reach_data):
+    """
+    Get the index (row) in reach_data of the outreach of each reach,
+    matched by reachID; -1 for outlet reaches (outreach of 0).
+    """
+    reachID = reach_data['reachID']
+    outreach = reach_data['outreach']
+    sorter = np.argsort(reachID, kind='mergesort')
+    idx = np.searchsorted(reachID, outreach, sorter=sorter)
+    idx[idx == len(reachID)] = 0
+    idx = sorter[idx] if len(reachID) > 0 else idx
+    isoutlet = outreach == 0
+    notfound = (reachID[idx] != outreach) & ~isoutlet
+    if np.any(notfound):
+        raise KeyError(outreach[notfound][0])
+    idx[isoutlet] = -1
+    return idx
+
+
+def _append_fields(array, names, data, asrecarray=False):
+    """
+    Return a new structured array with the fields in names (with values
+    in data) added to array. Equivalent to numpy.lib.recfunctions.append_fields
+    with usemask=False, but copies whole columns instead of iterating over
+    records.
+    """
+    if isinstance(names, str):
+        names = [names]
+        data = [data]
+    data = [np.asarray(d) for d in data]
+    dtype = np.dtype([(n, array.dtype[n]) for n in array.dtype.names] +
+                     [(n, d.dtype) for n, d in zip(names, data)])
+    newarray = np.empty(len(array), dtype=dtype)
+    for n in array.dtype.names:
+        newarray[n] = array[n]
+    for n, d in zip(names, data):
+        newarray[n] = d
+    if asrecarray:
+        return newarray.view(np.recarray)
+    return newarray
+
+
 def _isnumeric(s):
     try:
         float(s)
@@ -2847,6 +2892,70 @@ def _fmt_string_list(array, float_format='{!s}'):
     return fmt_string
 
 
+def _fmt_string_array(array, zero_value=None):
+    """
+    Vectorized version of _fmt_string_list. Format every column of a
+    record array as an array of strings; integers are written as
+    '{:.0f}' and floats as '{!s}'.
+
+    Parameters
+    ----------
+    array : np.recarray
+    zero_value : scalar
+        Values equal to zero_value are written as '0'. (default is None)
+
+    Returns
+    -------
+    txt : dict
+        Dictionary of string arrays keyed by column name.
+
+    """
+    txt = {}
+    for name in array.dtype.names:
+        vtype = array.dtype[name].kind
+        if vtype == 'S' or vtype == 'U':
+            raise Exception("MfList error: '\str\' type found it dtype." + \
+                            " This gives unpredictable results when " + \
+                            "recarray to file - change to \'object\' type")
+        elif vtype not in ['i', 'u', 'f', 'O']:
+            raise Exception("MfList.fmt_string error: unknown vtype " + \
+                            "in dtype:" + vtype)
+        values = array[name]
+        # object arrays of str support element-wise concatenation with +
+        col = values.astype(str).astype(object)
+        if zero_value is not None:
+            col[values == zero_value] = '0'
+        txt[name] = col
+    return txt
+
+
+def _char_cat(*arrays):
+    """
+    Element-wise concatenation of object arrays of strings (or strings).
+    """
+    out = arrays[0]
+    for a in arrays[1:]:
+        out = out + a
+    return out
+
+
+def _get_item_lines(txt, items):
+    """
+    Build the text of one dataset line for every row from a list of
+    (column name, boolean array) pairs; each column is written (followed
+    by a space) in the rows where its array is True.
+    """
+    nrow = len(items[0][1])
+    lines = np.full(nrow, '', dtype=object)
+    for name, write in items:
+        if write.all():
+            lines = _char_cat(lines, txt[name], ' ')
+        elif write.any():
+            lines = _char_cat(lines,
+                              np.where(write, _char_cat(txt[name], ' '), ''))
+    return _char_cat(lines, '\n')
+
+
 def _print_rec_array(array, cols=None, delimiter=' ', float_format='{:.6f}'):
     """
     Print out a numpy record array to string, with column names.
@@ -3070,6 +3179,183 @@ def _parse_6bc(line, icalc, nstrm, isfropt, reachinput, per=0):
     return hcond, thickm, elevupdn, width, depth, thts, thti, eps, uhc
 
 
+def _tokens_to_array(tokens, ncol=None):
+    """
+    Convert a list of lists of numeric strings (one list per line) into a
+    2-D float array, filling missing values at the end of a line with zero.
+
+    Parameters
+    ----------
+    tokens : list of lists of str
+    ncol : int
+        Number of columns to keep. If None, the length of the longest
+        line is used. (default is None)
+
+    Returns
+    -------
+    a : 2-D np.ndarray
+
+    """
+    lengths = np.array([len(t) for t in tokens], dtype=int)
+    if ncol is None:
+        ncol = lengths.max() if len(lengths) > 0 else 0
+    lengths = np.minimum(lengths, ncol)
+    values = np.array([v for t in tokens for v in t[:ncol]], dtype=float)
+    a = np.zeros((len(tokens), ncol), dtype=float)
+    rows = np.repeat(np.arange(len(tokens)), lengths)
+    start = np.cumsum(lengths) - lengths
+    cols = np.arange(len(values)) - np.repeat(start, lengths)
+    a[rows, cols] = values
+    return a
+
+
+def _read_6_period(f, itmp, nstrm, isfropt, reachinput, per=0):
+    """
+    Read datasets 6a-6e for one stress period (without auxiliary
+    variables). The lines of datasets 6a-6c are parsed for all segments
+    at once; datasets 6d and 6e are read for the segments that have them.
+
+    Returns
+    -------
+    segment_data : np.recarray
+    channel_geometry_data : dict
+    channel_flow_data : dict
+
+    """
+    lines_6a, lines_6b, lines_6c = [], [], []
+    current_6d, current_6e = {}, {}
+    for j in range(itmp):
+        line = line_parse(f.readline())
+        lines_6a.append(line)
+        lines_6b.append(line_parse(f.readline()))
+        lines_6c.append(line_parse(f.readline()))
+        # only nseg, icalc and nstrpts are needed to read 6d and 6e
+        nseg = int(_pop_item(line[0:1]))
+        icalc = int(_pop_item(line[1:2]))
+        if icalc == 2:
+            if per == 0 or nstrm > 0 and not reachinput:
+                current_6d[nseg] = [_get_dataset(f.readline(), [0.0] * 8)
+                                    for _ in range(2)]
+        if icalc == 4:
+            iprior = 1 if int(_pop_item(line[3:4])) > 0 else 0
+            nstrpts = int(_pop_item(line[4 + iprior:5 + iprior]))
+            current_6e[nseg] = [_get_dataset(f.readline(), [0.0] * nstrpts)
+                                for _ in range(3)]
+
+    current = ModflowSfr2.get_empty_segment_data(nsegments=itmp)
+    try:
+        a = _tokens_to_array(lines_6a)
+        b = _tokens_to_array(lines_6b)
+        c = _tokens_to_array(lines_6c)
+    except ValueError:
+        # non-numeric values; parse one segment at a time
+        for j in range(itmp):
+            icalc = _parse_6a(' '.join(lines_6a[j]), [])[1]
+            current[j] = _parse_6a(' '.join(lines_6a[j]), [])[:-1] + \
+                         _parse_6bc(' '.join(lines_6b[j]), icalc, nstrm,
+                                    isfropt, reachinput, per=per) + \
+                         _parse_6bc(' '.join(lines_6c[j]), icalc, nstrm,
+                                    isfropt, reachinput, per=per)
+        return current, current_6d, current_6e
+
+    for name, values in _parse_6a_array(a).items():
+        current[name] = values
+    icalc = current['icalc']
+    for cols, values in zip([['hcond1', 'thickm1', 'elevup', 'width1',
+                              'depth1', 'thts1', 'thti1', 'eps1', 'uhc1'],
+                             ['hcond2', 'thickm2', 'elevdn', 'width2',
+                              'depth2', 'thts2', 'thti2', 'eps2', 'uhc2']],
+                            [b, c]):
+        values = _parse_6bc_array(values, icalc, isfropt, per=per)
+        for idx, name in enumerate(cols):
+            current[name] = values[:, idx]
+    return current, current_6d, current_6e
+
+
+def _parse_6a_array(a):
+    """
+    Vectorized version of _parse_6a for Data Set 6a values of all segments
+    in a stress period (a 2-D array with one row per segment).
+
+    Returns
+    -------
+        a dictionary of the Data Set 6a variables
+
+    """
+    nseg = a.shape[0]
+    # pad so optional values past the end of a row read as zero
+    a = np.hstack([a, np.zeros((nseg, 16))])
+    rows = np.arange(nseg)
+    d = OrderedDict()
+    for idx, name in enumerate(['nseg', 'icalc', 'outseg', 'iupseg']):
+        d[name] = a[:, idx].astype(int)
+    icalc, iupseg = d['icalc'], d['iupseg']
+    pos = np.full(nseg, 4, dtype=int)
+    for name, read in [('iprior', iupseg > 0), ('nstrpts', icalc == 4)]:
+        d[name] = np.where(read, a[rows, pos], 0).astype(int)
+        pos += read
+    for name in ['flow', 'runoff', 'etsw', 'pptsw']:
+        d[name] = a[rows, pos]
+        pos += 1
+    for name, read in [('roughch', np.in1d(icalc, [1, 2])),
+                       ('roughbk', icalc == 2)]:
+        d[name] = np.where(read, a[rows, pos], 0.)
+        pos += read
+    for name in ['cdpth', 'fdpth', 'awdth', 'bwdth']:
+        d[name] = np.where(icalc == 3, a[rows, pos], 0.)
+        pos += 1
+    return d
+
+
+def _parse_6bc_array(b, icalc, isfropt, per=0):
+    """
+    Vectorized version of _parse_6bc for Data Set 6b (or 6c) values of all
+    segments in a stress period (a 2-D array with one row per segment).
+
+    Returns
+    -------
+        a 2-D array with columns hcond, thickm, elevupdn, width, depth,
+        thts, thti, eps and uhc
+
+    """
+    nseg = b.shape[0]
+    # pad so optional values past the end of a row read as zero
+    b = np.hstack([b, np.zeros((nseg, 9))])
+    v = np.zeros((nseg, 9), dtype=float)
+    if isfropt in [0, 4, 5]:
+        m = icalc <= 0
+        v[m, 0:5] = b[m, 0:5]
+        m = icalc == 1
+        if isfropt in [4, 5] and per > 0:
+            # hcond, width, thts, thti, eps, uhc
+            v[m, 0] = b[m, 0]
+            v[m, 3] = b[m, 1]
+            v[m, 5:8] = b[m, 2:5]
+            if isfropt == 5:
+                v[m, 8] = b[m, 5]
+        else:
+            # hcond, thickm, elevupdn, width, thts, thti, eps, uhc
+            v[m, 0:4] = b[m, 0:4]
+            v[m, 5:8] = b[m, 4:7]
+            if isfropt == 5:
+                v[m, 8] = b[m, 7]
+        m = icalc >= 2
+        v[m, 0] = b[m, 0]
+        if isfropt in [4, 5] and per > 0:
+            m = m & (icalc != 2)
+        v[m, 1:3] = b[m, 1:3]
+        if isfropt in [4, 5] and per == 0:
+            v[m, 5:8] = b[m, 3:6]
+            if isfropt == 5:
+                v[m, 8] = b[m, 6]
+    elif isfropt == 1 or (isfropt in [2, 3] and per == 0):
+        m = icalc <= 1
+        v[m, 3] = b[m, 0]
+        m = icalc <= 0
+        v[m, 4] = b[m, 1]
+    return v
+
+
 def find_path(graph, start, end=0, path=()):
 
     graph = graph.copy()
@@ -3085,3 +3371,209 @@ def find_path(graph, start, end=0, path=()):
             newpath = find_path(graph, node, end, path)
             if newpath: return newpath
     return None
+
+
+class RoutingTopology(object):
+    """
+    Routing topology of a network of stream segments, computed once from
+    the segment (or reach) connections and reused by the routing methods
+    and checks in ModflowSfr2.
+
+    Parameters
+    ----------
+    nodes : array of ints
+        Segment (or reach) numbers.
+    tonodes : array of ints
+        Number of the downstream segment for each node; 0 indicates an
+        outlet. Downstream numbers that are not in nodes (for example,
+        lakes) are added as outlet nodes.
+
+    Attributes
+    ----------
+    nodes : np.ndarray
+        Sorted, unique node numbers.
+    tonodes : np.ndarray
+        Downstream node number for each node.
+    downstream : np.ndarray
+        Index of the downstream node for each node, -1 for outlets.
+    indptr, indices : np.ndarray
+        Compressed sparse row (CSR) adjacency of the upstream connections;
+        the indices of the nodes directly upstream of node n are
+        indices[indptr[n]:indptr[n + 1]], in increasing order.
+    order : np.ndarray
+        Indices of all nodes that route to an outlet, in breadth-first
+        order from the outlets upstream. Reversing order gives a
+        topological sort (upstream to downstream) of the network.
+    distance : np.ndarray
+        Number of connections between each node and its outlet; -1 for
+        nodes that are part of (or route into) a circular connection.
+
+    """
+
+    def __init__(self, nodes, tonodes):
+        nodes = np.asarray(nodes, dtype=int)
+        tonodes = np.asarray(tonodes, dtype=int)
+        # later duplicates take precedence, consistent with dict.update
+        nodes, first = np.unique(nodes[::-1], return_index=True)
+        tonodes = tonodes[::-1][first]
+        outlets = np.setdiff1d(tonodes, nodes)
+        outlets = outlets[outlets != 0]
+        if len(outlets) > 0:
+            nodes = np.append(nodes, outlets)
+            tonodes = np.append(tonodes, np.zeros(len(outlets), dtype=int))
+            idx = np.argsort(nodes)
+            nodes, tonodes = nodes[idx], tonodes[idx]
+        self.nodes = nodes
+        self.tonodes = tonodes
+        n = len(nodes)
+
+        downstream = np.searchsorted(nodes, tonodes)
+        downstream[(tonodes == 0) | (nodes == 0)] = -1
+        self.downstream = downstream
+
+        # upstream connections in CSR format
+        isconnected = downstream >= 0
+        indices = np.where(isconnected)[0]
+        indices = indices[np.argsort(downstream[indices], kind='mergesort')]
+        counts = np.bincount(downstream[isconnected], minlength=n)
+        self.indptr = np.append(0, np.cumsum(counts))
+        self.indices = indices
+
+        # breadth-first traversal from the outlets
+        distance = -np.ones(n, dtype=int)
+        frontier = np.where(~isconnected)[0]
+        levels = []
+        level = 0
+        while len(frontier) > 0:
+            distance[frontier] = level
+            levels.append(frontier)
+            frontier = self._get_upstream_indices(frontier)
+            level += 1
+        self.order = np.concatenate(levels) if len(levels) > 0 \
+            else np.array([], dtype=int)
+        self.distance = distance
+
+    @staticmethod
+    def from_graph(graph):
+        """
+        Make a RoutingTopology instance from a dictionary of routing
+        connections (see ModflowSfr2.graph).
+        """
+        return RoutingTopology(list(graph.keys()), list(graph.values()))
+
+    def _get_upstream_indices(self, idx):
+        """Indices of the nodes directly upstream of the nodes in idx."""
+        start = self.indptr[idx]
+        counts = self.indptr[idx + 1] - start
+        offsets = np.repeat(start - np.cumsum(counts) + counts, counts)
+        return self.indices[offsets + np.arange(counts.sum())]
+
+    def get_index(self, nodes):
+        """Indices of node numbers in nodes; -1 if not in the network."""
+        nodes = np.atleast_1d(np.asarray(nodes, dtype=int))
+        idx = np.searchsorted(self.nodes, nodes)
+        idx[idx == len(self.nodes)] = 0
+        idx[self.nodes[idx] != nodes] = -1
+        return idx
+
+    @property
+    def circular(self):
+        """Nodes that do not route to an outlet (circular routing)."""
+        return self.nodes[self.distance < 0]
+
+    @property
+    def headwaters(self):
+        """Nodes with no other nodes upstream."""
+        return self.nodes[np.diff(self.indptr) == 0]
+
+    def get_path(self, node):
+        """
+        List of nodes from node to the outlet (0), or None if node does not
+        route to an outlet or is not in the network.
+        """
+        idx = self.get_index(node)[0]
+        if idx < 0 or self.distance[idx] < 0:
+            return None
+        path = [self.nodes[idx]]
+        while self.downstream[idx] >= 0:
+            idx = self.downstream[idx]
+            path.append(self.nodes[idx])
+        if path[-1] != 0:
+            path.append(0)
+        return [int(p) for p in path]
+
+    def get_paths(self):
+        """
+        Dictionary of paths from each node to its outlet (see get_path).
+        Paths are built from the outlets upstream so that each node's path
+        extends the path of its downstream node.
+        """
+        nodes = self.nodes.tolist()
+        downstream = self.downstream.tolist()
+        paths = dict.fromkeys(nodes)
+        for i in self.order.tolist():
+            d = downstream[i]
+            if d < 0:
+                paths[nodes[i]] = [nodes[i], 0] if nodes[i] != 0 else [0]
+            else:
+                paths[nodes[i]] = [nodes[i]] + paths[nodes[d]]
+        return paths
+
+    def get_path_array(self):
+        """
+        Two-dimensional array of the paths to the outlet, with one row per
+        node; rows are padded with zeros past the outlet. Rows for nodes
+        with circular routing only contain the node number.
+        """
+        ncol = self.distance.max() + 2 if len(self.nodes) > 0 else 1
+        paths = np.zeros((len(self.nodes), ncol), dtype=int)
+        paths[:, 0] = self.nodes
+        rows = np.where(self.distance > 0)[0]
+        idx = self.downstream[rows]
+        for col in range(1, ncol):
+            valid = idx >= 0
+            rows, idx = rows[valid], idx[valid]
+            if len(rows) == 0:
+                break
+            paths[rows, col] = self.nodes[idx]
+            idx = self.downstream[idx]
+        return paths
+
+    def get_upstream(self, direct=False):
+        """
+        Dictionary of the nodes upstream of each node that has at least
+        one upstream connection.
+
+        Parameters
+        ----------
+        direct : bool
+            If True, only list the nodes directly upstream of each node;
+            otherwise list all nodes in the upstream network (default False).
+
+        Returns
+        -------
+        upstream : dict
+            {node: np.ndarray of upstream nodes}
+        """
+        if direct:
+            down = self.downstream[self.indices]
+            up = self.indices
+        else:
+            # walk downstream from every routed node, recording each
+            # (downstream node, upstream node) pair along the way
+            up = np.where(self.distance > 0)[0]
+            down = self.downstream[up]
+            ups, downs = [up], [down]
+            while len(up) > 0:
+                valid = self.downstream[down] >= 0
+                up, down = up[valid], self.downstream[down[valid]]
+                ups.append(up)
+                downs.append(down)
+            up = np.concatenate(ups)
+            down = np.concatenate(downs)
+            idx = np.lexsort((up, down))
+            up, down = up[idx], down[idx]
+        nodes, start = np.unique(down, return_index=True)
+        groups = np.split(self.nodes[up], start[1:])
+        return dict(zip(self.nodes[nodes].tolist(), groups)) \
+            if len(up) > 0 else {}
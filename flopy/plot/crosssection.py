@@ -194,44 +194,22 @@ class _StructuredCrossSection(_CrossSection):
         self.layer0 = 0
         self.layer1 = self.mg.nlay + self.ncb + 1
 
-        zpts = []
-        for k in range(self.layer0, self.layer1):
-            zpts.append(plotutil.cell_value_points(self.xpts, self.mg.xyedges[0],
-                                                   self.mg.xyedges[1],
-                                                   self.elev[k, :, :]))
-        self.zpts = np.array(zpts)
-
-        xcentergrid = []
-        zcentergrid = []
-        nz = 0
+        # cells of the points along the line
+        irow, jcol = plotutil.findrowcolumn((self.xpts[:, 0],
+                                             self.xpts[:, 1]),
+                                            self.mg.xyedges[0],
+                                            self.mg.xyedges[1])
+        self.zpts = self.elev[self.layer0:self.layer1, irow, jcol]
+
+        # cell centers from the pairs of points in each cell
+        i = np.arange(0, 2 * (self.xpts.shape[0] // 2), 2)
+        xp = 0.5 * (self.xpts[i, 2] + self.xpts[i + 1, 2])
         if self.mg.nlay == 1:
-            for k in range(0, self.zpts.shape[0]):
-                nz += 1
-                nx = 0
-                for i in range(0, self.xpts.shape[0], 2):
-                    try:
-                        xp = 0.5 * (self.xpts[i][2] + self.xpts[i + 1][2])
-                        zp = self.zpts[k, i]
-                        xcentergrid.append(xp)
-                        zcentergrid.append(zp)
-                        nx += 1
-                    except:
-                        break
+            zcentergrid = self.zpts[:, i]
         else:
-            for k in range(0, self.zpts.shape[0] - 1):
-                nz += 1
-                nx = 0
-                for i in range(0, self.xpts.shape[0], 2):
-                    try:
-                        xp = 0.5 * (self.xpts[i][2] + self.xpts[i + 1][2])
-                        zp = 0.5 * (self.zpts[k, i] + self.zpts[k + 1, i + 1])
-                        xcentergrid.append(xp)
-                        zcentergrid.append(zp)
-                        nx += 1
-                    except:
-                        break
-        self.xcentergrid = np.array(xcentergrid).reshape((nz, nx))
-        self.zcentergrid = np.array(zcentergrid).reshape((nz, nx))
+            zcentergrid = 0.5 * (self.zpts[:-1, i] + self.zpts[1:, i + 1])
+        self.zcentergrid = zcentergrid
+        self.xcentergrid = np.tile(xp, (zcentergrid.shape[0], 1))
 
         # Create cross-section extent
         if extent is None:
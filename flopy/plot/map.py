@@ -6,8 +6,7 @@ from ..utils import geometry
 try:
     import matplotlib.pyplot as plt
     import matplotlib.colors
-    from matplotlib.collections import PatchCollection
-    from matplotlib.patches import Polygon
+    from matplotlib.collections import PolyCollection
 except ImportError:
     plt = None
 
@@ -108,7 +107,88 @@ class PlotMapView(object):
         Returns
         -------
         quadmesh : matplotlib.collections.QuadMesh or
-            matplotlib.collections.PatchCollection
+            matplotlib.collections.PolyCollection
+
+        """
+        plotarray = self._get_plotarray(a, masked_values)
+
+        if 'ax' in kwargs:
+            ax = kwargs.pop('ax')
+        else:
+            ax = self.ax
+
+        if self.mg.grid_type == "structured":
+            xgrid = np.array(self.mg.xvertices)
+            ygrid = np.array(self.mg.yvertices)
+            quadmesh = ax.pcolormesh(xgrid, ygrid, plotarray)
+
+        else:
+            # the cell polygons are cached with the grid geometry, only the
+            # face colors change from plot to plot
+            polygons = self.mg.polygon_vertices
+            quadmesh = PolyCollection(polygons, closed=False)
+            quadmesh.set_array(plotarray[:polygons.shape[0]])
+
+        # set max and min
+        if 'vmin' in kwargs:
+            vmin = kwargs.pop('vmin')
+        else:
+            vmin = None
+
+        if 'vmax' in kwargs:
+            vmax = kwargs.pop('vmax')
+        else:
+            vmax = None
+
+        quadmesh.set_clim(vmin=vmin, vmax=vmax)
+
+        # send rest of kwargs to quadmesh
+        quadmesh.set(**kwargs)
+
+        # add collection to axis
+        ax.add_collection(quadmesh)
+
+        # set limits
+        ax.set_xlim(self.extent[0], self.extent[1])
+        ax.set_ylim(self.extent[2], self.extent[3])
+        return quadmesh
+
+    def update_array(self, quadmesh, a, masked_values=None):
+        """
+        Update the values of a collection created by plot_array, without
+        building the grid again. This is much faster than calling
+        plot_array for every time step of a model.
+
+        Parameters
+        ----------
+        quadmesh : matplotlib.collections.QuadMesh or
+            matplotlib.collections.PolyCollection
+            collection returned by plot_array
+        a : numpy.ndarray
+            Array to plot.  If the array is three-dimensional, the layer
+            tied to this class (self.layer) is plotted.
+        masked_values : iterable of floats, ints
+            Values to mask.
+
+        Returns
+        -------
+        quadmesh : matplotlib.collections.QuadMesh or
+            matplotlib.collections.PolyCollection
+
+        """
+        plotarray = self._get_plotarray(a, masked_values)
+        current = quadmesh.get_array()
+        if current is not None and current.ndim == 1:
+            plotarray = np.ma.ravel(plotarray)
+        if self.mg.grid_type != "structured":
+            plotarray = plotarray[:len(quadmesh.get_paths())]
+        quadmesh.set_array(plotarray)
+        return quadmesh
+
+    def _get_plotarray(self, a, masked_values=None):
+        """
+        Get the values of the layer tied to this class (self.layer) from
+        an array and mask masked_values.
 
         """
         if not isinstance(a, np.ndarray):
@@ -148,53 +228,7 @@ class PlotMapView(object):
         if masked_values is not None:
             for mval in masked_values:
                 plotarray = np.ma.masked_equal(plotarray, mval)
-
-        if 'ax' in kwargs:
-            ax = kwargs.pop('ax')
-        else:
-            ax = self.ax
-
-        if self.mg.grid_type in ("structured", "vertex"):
-            xgrid = np.array(self.mg.xvertices)
-            ygrid = np.array(self.mg.yvertices)
-
-            if self.mg.grid_type == "structured":
-                quadmesh = ax.pcolormesh(xgrid, ygrid, plotarray)
-
-            else:
-                patches = [Polygon(list(zip(xgrid[i], ygrid[i])), closed=True)
-                           for i in range(xgrid.shape[0])]
-
-                quadmesh = PatchCollection(patches)
-                quadmesh.set_array(plotarray)
-
-        else:
-            quadmesh = plotutil.plot_cvfd(self.mg._vertices, self.mg._iverts,
-                                          a=a, ax=ax)
-
-        # set max and min
-        if 'vmin' in kwargs:
-            vmin = kwargs.pop('vmin')
-        else:
-            vmin = None
-
-        if 'vmax' in kwargs:
-            vmax = kwargs.pop('vmax')
-        else:
-            vmax = None
-
-        quadmesh.set_clim(vmin=vmin, vmax=vmax)
-
-        # send rest of kwargs to quadmesh
-        quadmesh.set(**kwargs)
-
-        # add collection to axis
-        ax.add_collection(quadmesh)
-
-        # set limits
-        ax.set_xlim(self.extent[0], self.extent[1])
-        ax.set_ylim(self.extent[2], self.extent[3])
-        return quadmesh
+        return plotarray
 
     def contour_array(self, a, masked_values=None, **kwargs):
         """
@@ -439,7 +473,11 @@ class PlotMapView(object):
         if 'colors' not in kwargs:
             kwargs['colors'] = '0.5'
 
-        lc = LineCollection(self.mg.grid_lines, **kwargs)
+        if self.mg.grid_type == "structured":
+            lc = LineCollection(self.mg.grid_lines, **kwargs)
+        else:
+            # one closed polyline per cell
+            lc = LineCollection(self.mg.polygon_vertices, **kwargs)
 
         ax.add_collection(lc)
         ax.set_xlim(self.extent[0], self.extent[1])
@@ -681,8 +719,10 @@ class PlotMapView(object):
 
         Parameters
         ----------
-        spdis : np.recarray
-            specific discharge recarray from cbc file
+        spdis : np.recarray or tuple
+            specific discharge recarray from cbc file, or a (qx, qy, qz)
+            tuple of arrays as returned by
+            CellBudgetFile.get_specific_discharge
         istep : int
             row frequency to plot. (Default is 1.)
         jstep : int
@@ -719,12 +759,16 @@ class PlotMapView(object):
 
         nlay = self.mg.nlay
 
-        qx = np.zeros((nlay * ncpl))
-        qy = np.zeros((nlay * ncpl))
+        if isinstance(spdis, tuple):
+            qx = np.array(spdis[0], dtype=float).ravel()
+            qy = np.array(spdis[1], dtype=float).ravel()
+        else:
+            qx = np.zeros((nlay * ncpl))
+            qy = np.zeros((nlay * ncpl))
 
-        idx = np.array(spdis['node']) - 1
-        qx[idx] = spdis['qx']
-        qy[idx] = spdis["qy"]
+            idx = np.array(spdis['node']) - 1
+            qx[idx] = spdis['qx']
+            qy[idx] = spdis["qy"]
 
         if self.mg.grid_type == "structured":
             qx.shape = (self.mg.nlay, self.mg.nrow, self.mg.ncol)
@@ -872,7 +916,10 @@ class PlotMapView(object):
             rec array or list of rec arrays is data returned from
             modpathfile PathlineFile get_data() or get_alldata()
             methods. Data in rec array is 'x', 'y', 'z', 'time',
-            'k', and 'particleid'.
+            'k', and 'particleid'. A single rec array can contain
+            many pathlines (for example, the rec array returned by
+            get_alldata(to_recarray=True)) if the points of each
+            particle are contiguous.
         travel_time : float or str
             travel_time is a travel time selection for the displayed
             pathlines. If a float is passed then pathlines with times
@@ -883,9 +930,12 @@ class PlotMapView(object):
             >. For example, to select all pathlines less than 10000 days
             travel_time='< 10000' would be passed to plot_pathline.
             (default is None)
-        kwargs : layer, ax, colors.  The remaining kwargs are passed
-            into the LineCollection constructor. If layer='all',
-            pathlines are output for all layers
+        kwargs : layer, ax, colors, decimate.  The remaining kwargs are
+            passed into the LineCollection constructor. If layer='all',
+            pathlines are output for all layers. If decimate is True,
+            consecutive pathline points that fall in the same screen pixel
+            are not drawn. If decimate is a float, it is used as the pixel
+            size in model units.
 
         Returns
         -------
@@ -893,22 +943,8 @@ class PlotMapView(object):
 
         """
         from matplotlib.collections import LineCollection
-        # make sure pathlines is a list
-        if not isinstance(pl, list):
-            pl = [pl]
 
-        if 'layer' in kwargs:
-            kon = kwargs.pop('layer')
-            if sys.version_info[0] > 2:
-                if isinstance(kon, bytes):
-                    kon = kon.decode()
-            if isinstance(kon, str):
-                if kon.lower() == 'all':
-                    kon = -1
-                else:
-                    kon = self.layer
-        else:
-            kon = self.layer
+        kon = self._particle_layer(kwargs)
 
         if 'marker' in kwargs:
             marker = kwargs.pop('marker')
@@ -937,74 +973,28 @@ class PlotMapView(object):
         else:
             ax = self.ax
 
+        decimate = self._particle_decimate(kwargs.pop('decimate', None), ax)
+
         if 'colors' not in kwargs:
             kwargs['colors'] = '0.5'
 
-        linecol = []
-        markers = []
-        for p in pl:
-            if travel_time is None:
-                tp = p.copy()
-            else:
-                if isinstance(travel_time, str):
-                    if '<=' in travel_time:
-                        time = float(travel_time.replace('<=', ''))
-                        idx = (p['time'] <= time)
-                    elif '<' in travel_time:
-                        time = float(travel_time.replace('<', ''))
-                        idx = (p['time'] < time)
-                    elif '>=' in travel_time:
-                        time = float(travel_time.replace('>=', ''))
-                        idx = (p['time'] >= time)
-                    elif '<' in travel_time:
-                        time = float(travel_time.replace('>', ''))
-                        idx = (p['time'] > time)
-                    else:
-                        try:
-                            time = float(travel_time)
-                            idx = (p['time'] <= time)
-                        except:
-                            errmsg = 'flopy.map.plot_pathline travel_time ' + \
-                                     'variable cannot be parsed. ' + \
-                                     'Acceptable logical variables are , ' + \
-                                     '<=, <, >=, and >. ' + \
-                                     'You passed {}'.format(travel_time)
-                            raise Exception(errmsg)
-                else:
-                    time = float(travel_time)
-                    idx = (p['time'] <= time)
-                tp = p[idx]
-
-            # transform data!
-            x0r, y0r = geometry.transform(tp['x'], tp['y'],
-                                          self.mg.xoffset,
-                                          self.mg.yoffset,
-                                          self.mg.angrot_radians)
-            # build polyline array
-            arr = np.vstack((x0r, y0r)).T
-            # select based on layer
-            if kon >= 0:
-                kk = p['k'].copy().reshape(p.shape[0], 1)
-                kk = np.repeat(kk, 2, axis=1)
-                arr = np.ma.masked_where((kk != kon), arr)
-            else:
-                arr = np.ma.asarray(arr)
-            # append line to linecol if there is some unmasked segment
-            if not arr.mask.all():
-                linecol.append(arr)
-                if not arr.mask.all():
-                    linecol.append(arr)
-                    if marker is not None:
-                        for xy in arr[::markerevery]:
-                            if not xy.mask:
-                                markers.append(xy)
+        tp, xy, lineid = self._particle_points(pl, travel_time)
+        # select based on layer
+        select = None
+        if kon >= 0:
+            select = tp['k'] == kon
+        if marker is None:
+            markerevery = None
+        linecol, markers = plotutil.particle_lines(xy, lineid, select=select,
+                                                   markerevery=markerevery,
+                                                   decimate=decimate)
+
         # create line collection
         lc = None
         if len(linecol) > 0:
             lc = LineCollection(linecol, **kwargs)
             ax.add_collection(lc)
             if marker is not None:
-                markers = np.array(markers)
                 ax.plot(markers[:, 0], markers[:, 1], lw=0, marker=marker,
                         color=markercolor, ms=markersize)
         return lc
@@ -1019,7 +1009,8 @@ class PlotMapView(object):
             rec array or list of rec arrays is data returned from
             modpathfile TimeseriesFile get_data() or get_alldata()
             methods. Data in rec array is 'x', 'y', 'z', 'time',
-            'k', and 'particleid'.
+            'k', and 'particleid'. A single rec array can contain
+            many timeseries if the points of each particle are contiguous.
         travel_time : float or str
             travel_time is a travel time selection for the displayed
             pathlines. If a float is passed then pathlines with times
@@ -1030,26 +1021,59 @@ class PlotMapView(object):
             >. For example, to select all pathlines less than 10000 days
             travel_time='< 10000' would be passed to plot_pathline.
             (default is None)
-        kwargs : layer, ax, colors.  The remaining kwargs are passed
-            into the LineCollection constructor. If layer='all',
-            pathlines are output for all layers
+        kwargs : layer, ax, color, decimate.  The remaining kwargs are
+            passed into the matplotlib plot method. If layer='all',
+            pathlines are output for all layers. decimate is described
+            in plot_pathline.
 
         Returns
         -------
             lo : list of Line2D objects
+                All of the timeseries are drawn with a single Line2D object
         """
 
-        # make sure timeseries is a list
-        if not isinstance(ts, list):
-            ts = [ts]
+        kon = self._particle_layer(kwargs)
+
+        if 'ax' in kwargs:
+            ax = kwargs.pop('ax')
+
+        else:
+            ax = self.ax
+
+        decimate = self._particle_decimate(kwargs.pop('decimate', None), ax)
 
+        if 'color' not in kwargs:
+            kwargs['color'] = 'red'
+
+        tp, xy, lineid = self._particle_points(ts, travel_time)
+        # select based on layer
+        select = None
+        if kon >= 0:
+            select = tp['k'] == kon
+        linecol, markers = plotutil.particle_lines(xy, lineid, select=select,
+                                                   minpoints=1,
+                                                   decimate=decimate)
+
+        # plot timeseries data, lines are separated by nan
+        lo = []
+        if len(linecol) > 0:
+            ends = np.cumsum([len(line) for line in linecol])[:-1]
+            arr = np.insert(np.concatenate(linecol), ends, np.nan, axis=0)
+            lo += ax.plot(arr[:, 0], arr[:, 1], **kwargs)
+
+        return lo
+
+    def _particle_layer(self, kwargs):
+        """
+        Pop the layer kwarg of the particle plotting methods. Returns -1
+        if particles in all layers are plotted.
+
+        """
         if 'layer' in kwargs:
             kon = kwargs.pop('layer')
-
             if sys.version_info[0] > 2:
                 if isinstance(kon, bytes):
                     kon = kon.decode()
-
             if isinstance(kon, str):
                 if kon.lower() == 'all':
                     kon = -1
@@ -1057,78 +1081,63 @@ class PlotMapView(object):
                     kon = self.layer
         else:
             kon = self.layer
+        return kon
 
-        if 'ax' in kwargs:
-            ax = kwargs.pop('ax')
-
-        else:
-            ax = self.ax
-
-        if 'color' not in kwargs:
-            kwargs['color'] = 'red'
+    def _particle_decimate(self, decimate, ax):
+        """
+        Pixel size, in model units, used to decimate particle points.
 
-        linecol = []
-        for t in ts:
-            if travel_time is None:
-                tp = t.copy()
+        """
+        if decimate is True:
+            bbox = ax.get_window_extent()
+            xmin, xmax, ymin, ymax = self.extent
+            decimate = max((xmax - xmin) / max(bbox.width, 1.),
+                           (ymax - ymin) / max(bbox.height, 1.))
+        elif decimate is False:
+            decimate = None
+        return decimate
+
+    def _particle_points(self, pl, travel_time=None):
+        """
+        Combine MODPATH pathline or timeseries data into a single rec
+        array, apply the travel time selection and transform the points
+        to model coordinates.
 
-            else:
-                if isinstance(travel_time, str):
-                    if '<=' in travel_time:
-                        time = float(travel_time.replace('<=', ''))
-                        idx = (t['time'] <= time)
-                    elif '<' in travel_time:
-                        time = float(travel_time.replace('<', ''))
-                        idx = (t['time'] < time)
-                    elif '>=' in travel_time:
-                        time = float(travel_time.replace('>=', ''))
-                        idx = (t['time'] >= time)
-                    elif '<' in travel_time:
-                        time = float(travel_time.replace('>', ''))
-                        idx = (t['time'] > time)
-                    else:
-                        try:
-                            time = float(travel_time)
-                            idx = (t['time'] <= time)
-                        except:
-                            errmsg = 'flopy.map.plot_pathline travel_time ' + \
-                                     'variable cannot be parsed. ' + \
-                                     'Acceptable logical variables are , ' + \
-                                     '<=, <, >=, and >. ' + \
-                                     'You passed {}'.format(travel_time)
-                            raise Exception(errmsg)
-                else:
-                    time = float(travel_time)
-                    idx = (t['time'] <= time)
-                tp = ts[idx]
-
-            x0r, y0r = geometry.transform(tp['x'], tp['y'],
-                                          self.mg.xoffset,
-                                          self.mg.yoffset,
-                                          self.mg.angrot_radians)
-
-            # build polyline array
-            arr = np.vstack((x0r, y0r)).T
-            # select based on layer
-            if kon >= 0:
-                kk = t['k'].copy().reshape(t.shape[0], 1)
-                kk = np.repeat(kk, 2, axis=1)
-                arr = np.ma.masked_where((kk != kon), arr)
+        Returns
+        -------
+        tp : np.recarray
+            selected particle points
+        xy : np.ndarray
+            transformed x, y-coordinates of the points
+        lineid : np.ndarray
+            line number of each point
 
+        """
+        if isinstance(pl, list):
+            if len(pl) > 0:
+                lineid = np.repeat(np.arange(len(pl)),
+                                   [p.shape[0] for p in pl])
+                pl = np.concatenate(pl)
             else:
-                arr = np.ma.asarray(arr)
+                lineid = np.zeros(0, dtype=int)
+                pl = np.zeros(0, dtype=[('x', float), ('y', float),
+                                        ('time', float), ('k', int)])
+        else:
+            pl = np.asarray(pl).ravel()
+            lineid = pl['particleid']
 
-            # append line to linecol if there is some unmasked segment
-            if not arr.mask.all():
-                linecol.append(arr)
+        if travel_time is not None:
+            idx = plotutil.travel_time_mask(pl['time'], travel_time)
+            pl = pl[idx]
+            lineid = lineid[idx]
 
-        # plot timeseries data
-        lo = []
-        for lc in linecol:
-            if not lc.mask.all():
-                lo += ax.plot(lc[:, 0], lc[:, 1], **kwargs)
-
-        return lo
+        # transform data!
+        x0r, y0r = geometry.transform(pl['x'], pl['y'],
+                                      self.mg.xoffset,
+                                      self.mg.yoffset,
+                                      self.mg.angrot_radians)
+        xy = np.column_stack((x0r, y0r))
+        return pl, xy, lineid
 
     def plot_endpoint(self, ep, direction='ending',
                       selection=None, selection_direction=None, **kwargs):
@@ -1168,7 +1177,6 @@ class PlotMapView(object):
         sp : matplotlib.pyplot.scatter
 
         """
-        ep = ep.copy()
         direction = direction.lower()
         if direction == 'starting':
             xp, yp = 'x0', 'y0'
@@ -1230,7 +1238,7 @@ class PlotMapView(object):
                 raise Exception(errmsg)
         # all endpoints
         else:
-            tep = ep.copy()
+            tep = ep
 
         if 'ax' in kwargs:
             ax = kwargs.pop('ax')
@@ -1241,8 +1249,7 @@ class PlotMapView(object):
         if 'c' not in kwargs:
             c = tep['time'] - tep['time0']
         else:
-            c = np.empty((tep.shape[0]), dtype="S30")
-            c.fill(kwargs.pop('c'))
+            c = kwargs.pop('c')
 
         s = 50
         if 's' in kwargs:
@@ -1268,11 +1275,8 @@ class PlotMapView(object):
                                       self.mg.xoffset,
                                       self.mg.yoffset,
                                       self.mg.angrot_radians)
-        # build array to plot
-        arr = np.vstack((x0r, y0r)).T
-
         # plot the end point data
-        sp = ax.scatter(arr[:, 0], arr[:, 1], c=c, s=s, **kwargs)
+        sp = ax.scatter(x0r, y0r, c=c, s=s, **kwargs)
 
         # add a colorbar for travel times
         if createcb:
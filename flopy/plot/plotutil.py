@@ -7,9 +7,10 @@ shapefiles are also included.
 from __future__ import print_function
 import os
 import sys
-import math
 import numpy as np
 from ..utils import Util3d
+from ..utils.utils_def import pool_imap
+from ..discretization.grid import Grid, CellIndex
 from ..datbase import DataType, DataInterface
 
 try:
@@ -1544,78 +1545,55 @@ class PlotUtilities(object):
         Parameters
         ----------
         head : numpy.ndarray
-            head array
+            head array of shape (nlay, nrow, ncol), (nlay, ncpl) or
+            (nodes,) for unstructured grids
         top : numpy.ndarray
-            top array of shape (nrow, ncol)
+            top array of shape (nrow, ncol) or (ncpl,), or the top of every
+            node for unstructured grids
         botm : numpy.ndarray
-            botm array of shape (nlay, nrow, ncol)
+            botm array of shape (nlay, nrow, ncol) or (nlay, ncpl), or the
+            bottom of every node for unstructured grids
         laytyp : numpy.ndarray
-            confined (0) or convertible (1) of shape (nlay)
+            confined (0) or convertible (1) of shape (nlay) or of the
+            shape of head
         mask_values : list of floats
             If head is one of these values, then set sat to top - bot
 
         Returns
         -------
         sat_thk : numpy.ndarray
-            Saturated thickness of shape (nlay, nrow, ncol).
+            Saturated thickness of the shape of head.
 
         """
-        if head.ndim == 3:
-            head = np.copy(head)
-            nlay, nrow, ncol = head.shape
-            ncpl = nrow * ncol
-            head.shape = (nlay, ncpl)
-            top.shape = (ncpl,)
-            botm.shape = (nlay, ncpl)
-            if laytyp.ndim == 3:
-                laytyp.shape = (nlay, ncpl)
-
+        head = np.asarray(head)
+        shape = head.shape
+        if head.ndim == 1:
+            head = head.reshape((1, -1))
+            tops = np.asarray(top).reshape((1, -1))
+            botm = np.asarray(botm).reshape((1, -1))
         else:
-            nrow, ncol = None, None
-            nlay, ncpl = head.shape
+            nlay = shape[0]
+            head = head.reshape((nlay, -1))
+            botm = np.asarray(botm).reshape((nlay, -1))
+            tops = np.concatenate((np.asarray(top).reshape((1, -1)),
+                                   botm[:-1]))
 
         # cast a laytyp flag for each cell if modflow-2005 based,
         # which makes it consistent with the mf6 iconvert array
-        if laytyp.ndim == 1:
-            t = np.zeros(head.shape)
-            for ix, _ in enumerate(laytyp):
-                t[ix, :] = laytyp[ix]
-            laytyp = t
-            del t
-
-        sat_thk_conf = np.empty(head.shape, dtype=head.dtype)
-        sat_thk_unconf = np.empty(head.shape, dtype=head.dtype)
-
-        for k in range(nlay):
-            if k == 0:
-                t = top
-            else:
-                t = botm[k - 1, :]
-            sat_thk_conf[k, :] = t - botm[k, :]
-
-        for k in range(nlay):
-            dh = np.zeros((ncpl,), dtype=head.dtype)
-            s = sat_thk_conf[k, :]
-
-            for mv in mask_values:
-                idx = (head[k, :] == mv)
-                dh[idx] = s[idx]
-
-            if k == 0:
-                t = top
-            else:
-                t = botm[k - 1, :]
+        laytyp = np.asarray(laytyp)
+        if laytyp.ndim == 1 and len(shape) > 1:
+            laytyp = laytyp.reshape((-1, 1))
+        else:
+            laytyp = laytyp.reshape(head.shape)
 
-            t = np.where(head[k, :] > t, t, head[k, :])
-            dh = np.where(dh == 0, t - botm[k, :], dh)
-            sat_thk_unconf[k, :] = dh[:]
+        sat_thk_conf = tops - botm
+        sat_thk_unconf = np.minimum(head, tops) - botm
+        if mask_values is not None:
+            masked = np.isin(head, mask_values)
+            sat_thk_unconf[masked] = sat_thk_conf[masked]
 
         sat_thk = np.where(laytyp != 0, sat_thk_unconf, sat_thk_conf)
-
-        if nrow is not None and ncol is not None:
-            sat_thk.shape = (nlay, nrow, ncol)
-
-        return sat_thk
+        return sat_thk.astype(head.dtype, copy=False).reshape(shape)
 
     @staticmethod
     def centered_specific_discharge(Qx, Qy, Qz, delr, delc, sat_thk):
@@ -1649,17 +1627,18 @@ class PlotUtilities(object):
         qx = None
         qy = None
         qz = None
+        delr = np.asarray(delr)
+        delc = np.asarray(delc)
 
         if Qx is not None:
 
             nlay, nrow, ncol = Qx.shape
             qx = np.zeros(Qx.shape, dtype=Qx.dtype)
 
-            for k in range(nlay):
-                for j in range(ncol - 1):
-                    area = delc[:] * 0.5 * (sat_thk[k, :, j] + sat_thk[k, :, j + 1])
-                    idx = area > 0.
-                    qx[k, idx, j] = Qx[k, idx, j] / area[idx]
+            area = delc.reshape((1, nrow, 1)) * 0.5 * \
+                   (sat_thk[:, :, :-1] + sat_thk[:, :, 1:])
+            np.divide(Qx[:, :, :-1], area, out=qx[:, :, :-1],
+                      where=area > 0.)
 
             qx[:, :, 1:] = 0.5 * (qx[:, :, 0:ncol - 1] + qx[:, :, 1:ncol])
             qx[:, :, 0] = 0.5 * qx[:, :, 0]
@@ -1669,23 +1648,19 @@ class PlotUtilities(object):
             nlay, nrow, ncol = Qy.shape
             qy = np.zeros(Qy.shape, dtype=Qy.dtype)
 
-            for k in range(nlay):
-                for i in range(nrow - 1):
-                    area = delr[:] * 0.5 * (sat_thk[k, i, :] + sat_thk[k, i + 1, :])
-                    idx = area > 0.
-                    qy[k, i, idx] = Qy[k, i, idx] / area[idx]
+            area = delr.reshape((1, 1, ncol)) * 0.5 * \
+                   (sat_thk[:, :-1, :] + sat_thk[:, 1:, :])
+            np.divide(Qy[:, :-1, :], area, out=qy[:, :-1, :],
+                      where=area > 0.)
 
             qy[:, 1:, :] = 0.5 * (qy[:, 0:nrow - 1, :] + qy[:, 1:nrow, :])
             qy[:, 0, :] = 0.5 * qy[:, 0, :]
             qy = -qy
 
         if Qz is not None:
-            qz = np.zeros(Qz.shape, dtype=Qz.dtype)
-            dr = delr.reshape((1, delr.shape[0]))
-            dc = delc.reshape((delc.shape[0], 1))
-            area = dr * dc
-            for k in range(nlay):
-                qz[k, :, :] = Qz[k, :, :] / area[:, :]
+            nlay = Qz.shape[0]
+            area = delc.reshape((1, -1, 1)) * delr.reshape((1, 1, -1))
+            qz = (Qz / area).astype(Qz.dtype, copy=False)
             qz[1:, :, :] = 0.5 * (qz[0:nlay - 1, :, :] + qz[1:nlay, :, :])
             qz[0, :, :] = 0.5 * qz[0, :, :]
             qz = -qz
@@ -1704,8 +1679,8 @@ class UnstructuredPlotUtilities(object):
         """
         Uses cross product method to find which cells intersect with the
         line and then uses the parameterized line equation to caluculate
-        intersection x, y vertex points. Should be quite fast for large model
-        grids!
+        intersection x, y vertex points. The crossings of each line
+        segment with all of the cell edges are found with array operations.
 
         Parameters
         ----------
@@ -1728,108 +1703,65 @@ class UnstructuredPlotUtilities(object):
             ygrid = np.array(ygrid)
 
         npts = len(ptsin)
+        nvert = xgrid.shape[1]
+
+        # cell edges go from vertex j (x3, y3) to vertex j + 1 (x4, y4)
+        x3 = xgrid
+        y3 = ygrid
+        x4 = np.roll(xgrid, -1, axis=1)
+        y4 = np.roll(ygrid, -1, axis=1)
 
         # use a vector cross product to find which
         # cells intersect the line
         vdict = {}
         for ix in range(1, npts):
-            xmin = np.min([ptsin[ix - 1][0], ptsin[ix][0]])
-            xmax = np.max([ptsin[ix - 1][0], ptsin[ix][0]])
-            ymin = np.min([ptsin[ix - 1][1], ptsin[ix][1]])
-            ymax = np.max([ptsin[ix - 1][1], ptsin[ix][1]])
-            x1 = np.ones(xgrid.shape) * ptsin[ix - 1][0]
-            y1 = np.ones(ygrid.shape) * ptsin[ix - 1][1]
-            x2 = np.ones(xgrid.shape) * ptsin[ix][0]
-            y2 = np.ones(ygrid.shape) * ptsin[ix][1]
-            x3 = xgrid
-            y3 = ygrid
-            x4 = np.zeros(xgrid.shape)
-            y4 = np.zeros(ygrid.shape)
-            x4[:, :-1] = xgrid[:, 1:]
-            x4[:, -1] = xgrid[:, 0]
-            y4[:, :-1] = ygrid[:, 1:]
-            y4[:, -1] = ygrid[:, 0]
+            x1, y1 = ptsin[ix - 1][0], ptsin[ix - 1][1]
+            x2, y2 = ptsin[ix][0], ptsin[ix][1]
+            xmin, xmax = min(x1, x2), max(x1, x2)
+            ymin, ymax = min(y1, y2), max(y1, y2)
 
             # find where intersection is
-            v1 = [x2 - x1, y2 - y1]
-            v2 = [x2 - x3, y2 - y3]
-            xp = v1[0] * v2[1] - v1[1] * v2[0]
-
-            # loop finds which edges the line intersects
-            cells = []
-            cell_vertex_ix = []
-            for cell, cpv in enumerate(xp):
-                if np.all([t < 0 for t in cpv]):
-                    continue
-                elif np.all([t > 0 for t in cpv]):
-                    continue
-
-                else:
-                    # only cycle through the cells that intersect
-                    # the infinite line
-                    cvert_ix = []
-                    for ix in range(len(cpv)):
-                        if cpv[ix - 1] < 0 and cpv[ix] > 0:
-                            cvert_ix.append(ix - 1)
-                        elif cpv[ix -1] > 0 and cpv[ix] < 0:
-                            cvert_ix.append(ix - 1)
-                        elif cpv[ix - 1] == 0 and cpv[ix] == 0:
-                            cvert_ix += [ix - 1, ix]
-                        else:
-                            pass
-
-                    if cvert_ix:
-                        cells.append(cell)
-                        cell_vertex_ix.append(cvert_ix)
+            xp = (x2 - x1) * (y2 - y3) - (y2 - y1) * (x2 - x3)
+
+            # edges that cross the infinite line, where the cross
+            # product changes sign from the previous vertex, and edges
+            # on the line
+            xp0 = np.roll(xp, 1, axis=1)
+            cross = ((xp0 < 0) & (xp > 0)) | ((xp0 > 0) & (xp < 0))
+            online = (xp0 == 0) & (xp == 0)
+            cells, ivert = np.nonzero(cross | online)
+            if len(cells) == 0:
+                continue
+            isonline = online[cells, ivert]
+            cells = np.concatenate((cells, cells[isonline]))
+            iedge = np.concatenate(((ivert - 1) % nvert, ivert[isonline]))
+            order = np.concatenate((2 * ivert, 2 * ivert[isonline] + 1))
+            isort = np.lexsort((order, cells))
+            cells, iedge = cells[isort], iedge[isort]
 
             # find interesection vertices
-            numa = (x4 - x3) * (y1 - y3) - (y4 - y3) * (x1 - x3)
-            numb = (x2 - x1) * (y1 - y3) - (y2 - y1) * (x1 - x3)
-            denom = (y4 - y3) * (x2 - x1) - (x4 - x3) * (y2 - y1)
-            ua = numa / denom
-            # ub = numb / denom
-            del numa
-            del numb
-            del denom
-
+            dx3 = x4[cells, iedge] - x3[cells, iedge]
+            dy3 = y4[cells, iedge] - y3[cells, iedge]
+            numa = dx3 * (y1 - y3[cells, iedge]) - \
+                dy3 * (x1 - x3[cells, iedge])
+            denom = dy3 * (x2 - x1) - dx3 * (y2 - y1)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                ua = numa / denom
             x = x1 + ua * (x2 - x1)
             y = y1 + ua * (y2 - y1)
 
-            for ix, cell in enumerate(cells):
-                xc = x[cell]
-                yc = y[cell]
-                verts = [(xt, yt) for xt, yt in
-                         zip(xc[cell_vertex_ix[ix]],
-                             yc[cell_vertex_ix[ix]])]
+            # finally check that verts are
+            # within the line segment range
+            idx = ~((x < xmin) | (x > xmax) | (y < ymin) | (y > ymax))
+            cells, x, y = cells[idx], x[idx], y[idx]
 
+            for cell, xt, yt in zip(cells.tolist(), x, y):
+                i = (xt, yt)
                 if cell in vdict:
-                    for i in verts:
-                        # finally check that verts are
-                        # within the line segment range
-                        if i[0] < xmin or i[0] > xmax:
-                            continue
-                        elif i[1] < ymin or i[1] > ymax:
-                            continue
-                        elif i in vdict[cell]:
-                            continue
-                        else:
-                            vdict[cell].append(i)
+                    if i not in vdict[cell]:
+                        vdict[cell].append(i)
                 else:
-                    # finally check that verts are
-                    # within the line segment range
-                    t = []
-                    for i in verts:
-                        if i[0] < xmin or i[0] > xmax:
-                            continue
-                        elif i[1] < ymin or i[1] > ymax:
-                            continue
-                        elif i in t:
-                            continue
-                        else:
-                            t.append(i)
-
-                    if t:
-                        vdict[cell] = t
+                    vdict[cell] = [i]
 
         return vdict
 
@@ -1866,7 +1798,7 @@ class UnstructuredPlotUtilities(object):
         for xv in xverts:
             if len(xv) < max_verts:
                 n = max_verts - len(xv)
-                adj_xverts.append(xv + [xv[-1]] * n)
+                adj_xverts.append(list(xv) + [xv[-1]] * n)
             else:
                 adj_xverts.append(xv)
 
@@ -1874,7 +1806,7 @@ class UnstructuredPlotUtilities(object):
         for yv in yverts:
             if len(yv) < max_verts:
                 n = max_verts - len(yv)
-                adj_yverts.append(yv + [yv[-1]] * n)
+                adj_yverts.append(list(yv) + [yv[-1]] * n)
             else:
                 adj_yverts.append(yv)
 
@@ -1995,6 +1927,262 @@ class SwiConcentration():
             return conc[layer, :, :]
 
 
+class FrameRenderer(object):
+    """
+    Render arrays on a model grid into a sequence of images. The figure,
+    the array collection, the grid lines and the colorbar are built for
+    the first frame only, later frames only update the array values
+    (set_array) and the title.
+
+    Parameters
+    ----------
+    modelgrid : flopy.discretization.Grid
+        model grid of the arrays
+    layer : int
+        zero-based layer plotted for three-dimensional arrays
+        (default is 0)
+    vmin : float
+        minimum of the color scale of all frames. If vmin is None, the
+        minimum of the first frame is used. (default is None)
+    vmax : float
+        maximum of the color scale of all frames. If vmax is None, the
+        maximum of the first frame is used. (default is None)
+    masked_values : list
+        values that are not plotted (default is None)
+    grid : bool
+        plot the grid lines (default is False)
+    colorbar : bool
+        add a colorbar (default is True)
+    colorbar_label : str
+        label of the colorbar (default is None)
+    figsize : tuple
+        figure size in inches (default is None)
+    dpi : int
+        resolution of the frames (default is 100)
+    kwargs : dict
+        keyword arguments passed to PlotMapView.plot_array
+        (cmap, alpha, ...)
+
+    Examples
+    --------
+    >>> import flopy
+    >>> hdobj = flopy.utils.HeadFile('test.hds')
+    >>> renderer = flopy.plot.plotutil.FrameRenderer(hdobj.mg)
+    >>> for i, kstpkper in enumerate(hdobj.get_kstpkper()):
+    ...     renderer.save(hdobj.get_data(kstpkper=kstpkper),
+    ...                   'head{:05d}.png'.format(i))
+
+    """
+    def __init__(self, modelgrid, layer=0, vmin=None, vmax=None,
+                 masked_values=None, grid=False, colorbar=True,
+                 colorbar_label=None, figsize=None, dpi=100, **kwargs):
+        self.modelgrid = modelgrid
+        self.layer = layer
+        self.vmin = vmin
+        self.vmax = vmax
+        if masked_values is None:
+            masked_values = []
+        self.masked_values = list(masked_values)
+        self.grid = grid
+        self.colorbar = colorbar
+        self.colorbar_label = colorbar_label
+        self.figsize = figsize
+        self.dpi = dpi
+        self.kwargs = kwargs
+        self._artists = None
+
+    def __getstate__(self):
+        # matplotlib artists are built again by each worker process
+        state = self.__dict__.copy()
+        state['_artists'] = None
+        return state
+
+    def set_clim(self, a):
+        """
+        Set the undefined limits of the color scale from the range of
+        array a.
+
+        """
+        if self.vmin is not None and self.vmax is not None:
+            return
+        a = np.ma.masked_invalid(np.asarray(a, dtype=float))
+        for mval in self.masked_values:
+            a = np.ma.masked_equal(a, mval)
+        if a.count() == 0:
+            return
+        if self.vmin is None:
+            self.vmin = float(a.min())
+        if self.vmax is None:
+            self.vmax = float(a.max())
+
+    def _build(self, a):
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from .map import PlotMapView
+        self.set_clim(a)
+        fig = Figure(figsize=self.figsize)
+        FigureCanvasAgg(fig)
+        ax = fig.add_subplot(1, 1, 1, aspect='equal')
+        pmv = PlotMapView(modelgrid=self.modelgrid, ax=ax, layer=self.layer)
+        quadmesh = pmv.plot_array(a, masked_values=self.masked_values,
+                                  vmin=self.vmin, vmax=self.vmax,
+                                  **self.kwargs)
+        if self.grid:
+            pmv.plot_grid(lw=0.5)
+        if self.colorbar:
+            cb = fig.colorbar(quadmesh, ax=ax, shrink=0.5)
+            if self.colorbar_label is not None:
+                cb.set_label(self.colorbar_label)
+        title = ax.set_title('')
+        self._artists = (fig, pmv, quadmesh, title)
+
+    def render(self, a, title=None):
+        """
+        Plot array a on the figure of the renderer.
+
+        Parameters
+        ----------
+        a : numpy.ndarray
+            array to plot
+        title : str
+            title of the frame (default is None)
+
+        Returns
+        -------
+        fig : matplotlib.figure.Figure
+
+        """
+        if self._artists is None:
+            self._build(a)
+        else:
+            fig, pmv, quadmesh, _ = self._artists
+            pmv.update_array(quadmesh, a, masked_values=self.masked_values)
+        fig, pmv, quadmesh, text = self._artists
+        if title is not None:
+            text.set_text(title)
+        return fig
+
+    def save(self, a, filename, title=None):
+        """
+        Plot array a and save the frame to filename.
+
+        Returns
+        -------
+        filename : str
+
+        """
+        fig = self.render(a, title=title)
+        fig.savefig(filename, dpi=self.dpi)
+        return filename
+
+
+_frame_renderer = None
+
+
+def _init_frame_worker(renderer):
+    global _frame_renderer
+    _frame_renderer = renderer
+
+
+def _save_frame(args):
+    a, filename, title = args
+    return _frame_renderer.save(a, filename, title=title)
+
+
+def plot_array_frames(frames, modelgrid, filename_base=None, animation=None,
+                      nproc=None, file_extension='png', fps=5, **kwargs):
+    """
+    Plot a sequence of arrays (for example, the heads of all time steps
+    in a HeadFile) on a model grid. The grid is drawn once and only the
+    array values change from frame to frame. Frames are written to image
+    files, in nproc worker processes if nproc is greater than one, or to
+    an animation.
+
+    Parameters
+    ----------
+    frames : iterable
+        (title, array) tuples. A generator reads one array at a time.
+    modelgrid : flopy.discretization.Grid
+        model grid of the arrays
+    filename_base : str
+        frames are saved to filename_base_00000.png,
+        filename_base_00001.png, ... (default is None)
+    animation : str
+        file name of an animation (.gif files are written with pillow,
+        other formats with ffmpeg). Used if filename_base is None.
+        (default is None)
+    nproc : int
+        number of worker processes that save image files
+        (default is None)
+    file_extension : str
+        file extension of the image files (default is 'png')
+    fps : int
+        frames per second of the animation (default is 5)
+    kwargs : dict
+        keyword arguments passed to FrameRenderer (layer, vmin, vmax,
+        masked_values, grid, colorbar, colorbar_label, figsize, dpi,
+        cmap, ...)
+
+    Returns
+    -------
+    filenames : list or str
+        file names of the frames, or the file name of the animation
+
+    Examples
+    --------
+    >>> import flopy
+    >>> hdobj = flopy.utils.HeadFile('test.hds')
+    >>> frames = (('totim {}'.format(t), hdobj.get_data(totim=t))
+    ...           for t in hdobj.get_times())
+    >>> flopy.plot.plotutil.plot_array_frames(frames, hdobj.mg,
+    ...                                       filename_base='head',
+    ...                                       nproc=4)
+
+    """
+    import itertools
+
+    if filename_base is None and animation is None:
+        raise ValueError('filename_base or animation must be specified')
+
+    renderer = FrameRenderer(modelgrid, **kwargs)
+    frames = iter(frames)
+    try:
+        first = next(frames)
+    except StopIteration:
+        return []
+    # the color scale of all frames follows the first frame
+    renderer.set_clim(first[1])
+    frames = itertools.chain([first], frames)
+
+    if filename_base is None:
+        from matplotlib import animation as manimation
+        if animation.lower().endswith('.gif'):
+            writer = manimation.PillowWriter(fps=fps)
+        else:
+            writer = manimation.FFMpegWriter(fps=fps)
+        fig = renderer.render(first[1], title=first[0])
+        with writer.saving(fig, animation, renderer.dpi):
+            for title, a in frames:
+                renderer.render(a, title=title)
+                writer.grab_frame()
+        return animation
+
+    fext = file_extension.replace('.', '')
+    args = ((a, '{}_{:05d}.{}'.format(filename_base, i, fext), title)
+            for i, (title, a) in enumerate(frames))
+    filenames = []
+    if nproc is not None and nproc > 1:
+        # a few frames per worker at a time keeps arrays that have not
+        # been plotted out of memory
+        filenames = list(pool_imap(_save_frame, args, nproc,
+                                   initializer=_init_frame_worker,
+                                   initargs=(renderer,)))
+    else:
+        for a, filename, title in args:
+            filenames.append(renderer.save(a, filename, title=title))
+    return filenames
+
+
 def shapefile_extents(shp):
     """
     Determine the extents of a shapefile
@@ -2247,20 +2435,18 @@ def cvfd_to_patch_collection(verts, iverts):
     iverts : list of lists
         should be of len(ncells) with a list of vertex numbers for each cell
 
+    Returns
+    -------
+    pc : matplotlib.collections.PolyCollection
+
     """
-    from matplotlib.patches import Polygon
-    from matplotlib.collections import PatchCollection
-    ptchs = []
-    for ivertlist in iverts:
-        points = []
-        for iv in ivertlist:
-            points.append((verts[iv, 0], verts[iv, 1]))
-        # close the polygon, if necessary
-        if ivertlist[0] != ivertlist[-1]:
-            iv = ivertlist[0]
-            points.append((verts[iv, 0], verts[iv, 1]))
-        ptchs.append(Polygon(points))
-    pc = PatchCollection(ptchs)
+    from matplotlib.collections import PolyCollection
+    verts = np.asarray(verts, dtype=float)
+    offsets, ivs = Grid._get_csr(iverts)
+    # a single array of closed polygons, padded with the first vertex
+    xv, yv = CellIndex._pad_vertices(verts[ivs, 0], verts[ivs, 1],
+                                     offsets=offsets)
+    pc = PolyCollection(np.stack((xv, yv), axis=-1), closed=False)
     return pc
 
 
@@ -2395,7 +2581,9 @@ def findrowcolumn(pt, xedge, yedge):
     Parameters
     ----------
     pt : list or tuple
-        A list or tuple containing a x- and y- coordinate
+        A list or tuple containing a x- and y- coordinate. The x- and y-
+        coordinates can also be arrays, in which case the rows and columns
+        of all of the points are returned.
     xedge : numpy.ndarray
         x-coordinate of the edge of each MODFLOW column. xedge is dimensioned
         to NCOL + 1. If xedge is not a numpy.ndarray it is converted to a
@@ -2409,6 +2597,9 @@ def findrowcolumn(pt, xedge, yedge):
     -------
     irow, jcol : int
         Row and column location containing x- and y- point passed to function.
+        Points east of the last column (south of the last row) are
+        assigned -100 and points west of the first column (north of the
+        first row) are assigned -1.
 
     Examples
     --------
@@ -2423,19 +2614,18 @@ def findrowcolumn(pt, xedge, yedge):
     if not isinstance(yedge, np.ndarray):
         yedge = np.array(yedge)
 
-    # find column
-    jcol = -100
-    for jdx, xmf in enumerate(xedge):
-        if xmf > pt[0]:
-            jcol = jdx - 1
-            break
-
-    # find row
-    irow = -100
-    for jdx, ymf in enumerate(yedge):
-        if ymf < pt[1]:
-            irow = jdx - 1
-            break
+    x = np.asarray(pt[0])
+    y = np.asarray(pt[1])
+
+    # xedge increases and yedge decreases, so the column (row) is one less
+    # than the first edge greater (less) than the point
+    jcol = np.searchsorted(xedge, x, side='right') - 1
+    jcol = np.where(jcol == len(xedge) - 1, -100, jcol)
+    irow = np.searchsorted(-yedge, -y, side='right') - 1
+    irow = np.where(irow == len(yedge) - 1, -100, irow)
+
+    if irow.ndim == 0 and jcol.ndim == 0:
+        return int(irow), int(jcol)
     return irow, jcol
 
 
@@ -2478,96 +2668,134 @@ def line_intersect_grid(ptsin, xedge, yedge, returnvertices=False):
     >>> ptsout = flopy.plotutil.line_intersect_grid(ptsin, xedge, yedge)
 
     """
+    return line_intersect_grid_batch([ptsin], xedge, yedge,
+                                     returnvertices=returnvertices)[0]
 
-    small_value = 1.0e-4
 
-    # make sure xedge and yedge are numpy arrays
-    if not isinstance(xedge, np.ndarray):
-        xedge = np.array(xedge)
-    if not isinstance(yedge, np.ndarray):
-        yedge = np.array(yedge)
+def line_intersect_grid_batch(lines, xedge, yedge, returnvertices=False):
+    """
+    Intersect several polylines with a rectilinear MODFLOW grid. The
+    crossings of all of the polyline segments with all of the grid
+    lines are computed at once, so this is much faster than calling
+    line_intersect_grid for each polyline when many cross-sections are
+    created on the same grid.
+
+    For every polyline segment, points are returned at the start of the
+    segment, a small distance before and after every crossing of a
+    row or column edge, and at the end of the segment, so that
+    consecutive pairs of points fall in the same cell. Points outside of
+    the grid are discarded.
 
-    # build list of points along current line
-    pts = []
-    npts = len(ptsin)
-    dlen = 0.
-    for idx in range(1, npts):
-        x0 = ptsin[idx - 1][0]
-        x1 = ptsin[idx][0]
-        y0 = ptsin[idx - 1][1]
-        y1 = ptsin[idx][1]
-        a = x1 - x0
-        b = y1 - y0
-        c = math.sqrt(math.pow(a, 2.) + math.pow(b, 2.))
-        # find cells with (x0, y0) and (x1, y1)
-        irow0, jcol0 = findrowcolumn((x0, y0), xedge, yedge)
-        irow1, jcol1 = findrowcolumn((x1, y1), xedge, yedge)
-        # determine direction to go in the x- and y-directions
-        jx = 0
-        incx = abs(small_value * a / c)
-        iy = 0
-        incy = -abs(small_value * b / c)
-        if a == 0.:
-            incx = 0.
-        # go to the right
-        elif a > 0.:
-            jx = 1
-            incx *= -1.
-        if b == 0.:
-            incy = 0.
-        # go down
-        elif b < 0.:
-            iy = 1
-            incy *= -1.
-        # process data
-        if irow0 >= 0 and jcol0 >= 0:
-            iadd = True
-            if idx > 1 and returnvertices:
-                iadd = False
-            if iadd:
-                pts.append((x0, y0, dlen))
-        icnt = 0
-        while True:
-            icnt += 1
-            dx = xedge[jcol0 + jx] - x0
-            dlx = 0.
-            if a != 0.:
-                dlx = c * dx / a
-            dy = yedge[irow0 + iy] - y0
-            dly = 0.
-            if b != 0.:
-                dly = c * dy / b
-            if dlx != 0. and dly != 0.:
-                if abs(dlx) < abs(dly):
-                    dy = dx * b / a
-                else:
-                    dx = dy * a / b
-            xt = x0 + dx + incx
-            yt = y0 + dy + incy
-            dl = math.sqrt(math.pow((xt - x0), 2.) + math.pow((yt - y0), 2.))
-            dlen += dl
-            if not returnvertices:
-                pts.append((xt, yt, dlen))
-            x0, y0 = xt, yt
-            xt = x0 - 2. * incx
-            yt = y0 - 2. * incy
-            dl = math.sqrt(math.pow((xt - x0), 2.) + math.pow((yt - y0), 2.))
-            dlen += dl
-            x0, y0 = xt, yt
-            irow0, jcol0 = findrowcolumn((x0, y0), xedge, yedge)
-            if irow0 >= 0 and jcol0 >= 0:
-                if not returnvertices:
-                    pts.append((xt, yt, dlen))
-            elif irow1 < 0 or jcol1 < 0:
-                dl = math.sqrt(math.pow((x1 - x0), 2.) + math.pow((y1 - y0), 2.))
-                dlen += dl
-                break
-            if irow0 == irow1 and jcol0 == jcol1:
-                dl = math.sqrt(math.pow((x1 - x0), 2.) + math.pow((y1 - y0), 2.))
-                dlen += dl
-                pts.append((x1, y1, dlen))
-                break
-    return np.array(pts)
+    Parameters
+    ----------
+    lines : list
+        list of polylines, each a list of x, y points defining the vertices
+        of a polyline that will be intersected with the rectilinear
+        MODFLOW grid
+    xedge : numpy.ndarray
+        x-coordinate of the edge of each MODFLOW column. xedge is dimensioned
+        to NCOL + 1.
+    yedge : numpy.ndarray
+        y-coordinate of the edge of each MODFLOW row. yedge is dimensioned
+        to NROW + 1.
+    returnvertices: bool
+        Return the polyline vertices that are in the grid instead of the
+        intersection points (default is False).
+
+    Returns
+    -------
+    ptsout : list of numpy.ndarray
+        (x, y, dlen) array for each polyline, where dlen is the distance
+        along the polyline.
+
+    Examples
+    --------
+    >>> import flopy
+    >>> ptsout = flopy.plotutil.line_intersect_grid_batch([line0, line1],
+    ...                                                   xedge, yedge)
+
+    """
+
+    small_value = 1.0e-4
+
+    xedge = np.asarray(xedge, dtype=np.float64)
+    yedge = np.asarray(yedge, dtype=np.float64)
+
+    # polyline segments
+    lines = [np.asarray(pts, dtype=np.float64)[:, :2]
+             if len(pts) > 0 else np.zeros((0, 2)) for pts in lines]
+    nseg = np.array([max(len(pts) - 1, 0) for pts in lines], dtype=int)
+    iline = np.repeat(np.arange(len(lines)), nseg)
+    p0 = np.concatenate([pts[:-1] for pts in lines] + [np.zeros((0, 2))])
+    p1 = np.concatenate([pts[1:] for pts in lines] + [np.zeros((0, 2))])
+    x0, y0 = p0.T
+    x1, y1 = p1.T
+    a = x1 - x0
+    b = y1 - y0
+    c = np.sqrt(a ** 2 + b ** 2)
+
+    # distance along the polyline at the start of each segment
+    cumlen = np.cumsum(c)
+    first = np.cumsum(nseg) - nseg
+    dstart = cumlen - c
+    dstart -= np.repeat(dstart[first[nseg > 0]], nseg[nseg > 0])
+
+    if returnvertices:
+        # start of the first segment and end of every segment
+        iseg = np.arange(len(c))
+        s = np.column_stack((np.zeros(len(c)), c)).ravel()
+        iseg = np.repeat(iseg, 2)
+        keep = np.ones(len(s), dtype=bool)
+        keep[::2] = False
+        keep[2 * first[nseg > 0]] = True
+        iseg, s = iseg[keep], s[keep]
+    else:
+        # distance to the crossings of every segment with the grid lines
+        iseg, s = [], []
+        for d, edge, e0 in ((a, xedge, x0), (b, yedge, y0)):
+            with np.errstate(divide='ignore', invalid='ignore'):
+                t = (edge[None, :] - e0[:, None]) / d[:, None]
+            idx = np.nonzero((t > 0.) & (t < 1.))
+            iseg.append(idx[0])
+            s.append(t[idx] * c[idx[0]])
+        iseg = np.concatenate(iseg)
+        s = np.concatenate(s)
+        isort = np.lexsort((s, iseg))
+        iseg, s = iseg[isort], s[isort]
+        # crossings of a row and column edge (a cell corner) at the same
+        # place are a single crossing
+        keep = np.ones(len(s), dtype=bool)
+        keep[1:] = (iseg[1:] != iseg[:-1]) | (np.diff(s) > small_value)
+        iseg, s = iseg[keep], s[keep]
+
+        # segment start, points on either side of each crossing, and
+        # segment end
+        nseg_all = len(c)
+        iseg = np.concatenate((np.arange(nseg_all), np.repeat(iseg, 2),
+                               np.arange(nseg_all)))
+        s = np.concatenate((np.zeros(nseg_all),
+                            (s[:, None] + [-small_value,
+                                           small_value]).ravel(),
+                            c))
+        isort = np.argsort(iseg, kind='mergesort')
+        iseg, s = iseg[isort], s[isort]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        frac = np.where(c[iseg] > 0., s / c[iseg], 0.)
+    xt = x0[iseg] + frac * a[iseg]
+    yt = y0[iseg] + frac * b[iseg]
+    # use the exact polyline vertices at the ends of the segments
+    isend = s == c[iseg]
+    xt[isend], yt[isend] = x1[iseg[isend]], y1[iseg[isend]]
+    isstart = s == 0.
+    xt[isstart], yt[isstart] = x0[iseg[isstart]], y0[iseg[isstart]]
+    dlen = dstart[iseg] + s
+
+    irow, jcol = findrowcolumn((xt, yt), xedge, yedge)
+    inside = (irow >= 0) & (jcol >= 0)
+    ptsout = np.column_stack((xt, yt, dlen))[inside]
+    split = np.searchsorted(iline[iseg[inside]], np.arange(1, len(lines)))
+    return np.split(ptsout, split)
 
 
 def cell_value_points(pts, xedge, yedge, vdata):
@@ -2616,18 +2844,138 @@ def cell_value_points(pts, xedge, yedge, vdata):
     if not isinstance(vdata, np.ndarray):
         vdata = np.array(vdata)
 
-    vcell = []
-    for (xt, yt, _) in pts:
-        # find the modflow cell containing point
-        irow, jcol = findrowcolumn((xt, yt), xedge, yedge)
-        if irow >= 0 and jcol >= 0:
-            if np.isnan(vdata[irow, jcol]):
-                vcell.append(np.nan)
-            else:
-                v = np.asarray(vdata[irow, jcol])
-                vcell.append(v)
+    pts = np.asarray(pts, dtype=np.float64).reshape(-1, 3)
+    if len(pts) == 0:
+        return np.array([])
+
+    # find the modflow cells containing the points
+    irow, jcol = findrowcolumn((pts[:, 0], pts[:, 1]), xedge, yedge)
+    idx = (irow >= 0) & (jcol >= 0)
+    return np.asarray(vdata)[irow[idx], jcol[idx]]
+
+
+def travel_time_mask(time, travel_time):
+    """
+    Boolean mask of the particle points selected by a travel time
+    constraint.
+
+    Parameters
+    ----------
+    time : numpy.ndarray
+        Particle times
+    travel_time : float or str
+        If a float is passed then points with times less than or equal
+        to the passed time are selected. If a string is passed a logical
+        constraint (<=, <, >=, or >) can be added in front of the time
+        value (for example, '< 10000').
+
+    Returns
+    -------
+    idx : numpy.ndarray
+        boolean array with the shape of time
+
+    """
+    time = np.asarray(time)
+    if isinstance(travel_time, str):
+        for key, op in (('<=', np.less_equal), ('>=', np.greater_equal),
+                        ('<', np.less), ('>', np.greater)):
+            if key in travel_time:
+                return op(time, float(travel_time.replace(key, '')))
+        try:
+            return time <= float(travel_time)
+        except:
+            errmsg = 'flopy.map.plot_pathline travel_time ' + \
+                     'variable cannot be parsed. ' + \
+                     'Acceptable logical variables are , ' + \
+                     '<=, <, >=, and >. ' + \
+                     'You passed {}'.format(travel_time)
+            raise Exception(errmsg)
+    return time <= float(travel_time)
+
+
+def particle_lines(xy, lineid, select=None, minpoints=2, markerevery=None,
+                   decimate=None):
+    """
+    Split the points of many particles into a list of polylines that can
+    be passed to a matplotlib LineCollection.
 
-    return np.array(vcell)
+    Parameters
+    ----------
+    xy : numpy.ndarray
+        x, y-coordinates of the points with a shape of (npoints, 2).
+        The points of each particle are contiguous.
+    lineid : numpy.ndarray
+        particle id of each point. A new line is started where lineid
+        changes.
+    select : numpy.ndarray
+        boolean array of the points to plot (for example, the points in a
+        layer). Unselected points break a line. (default is None)
+    minpoints : int
+        minimum number of points in a returned line (default is 2)
+    markerevery : int
+        return the location of every markerevery point of each particle
+        (default is None)
+    decimate : float
+        consecutive points of a line in the same decimate by decimate
+        square are reduced to one point (the first and last point of each
+        line are retained). Setting decimate to the size of a screen pixel
+        in model units reduces the number of vertices drawn without
+        changing the plot. (default is None)
+
+    Returns
+    -------
+    lines : list of numpy.ndarray
+        polyline vertices
+    markers : numpy.ndarray
+        marker locations with a shape of (nmarkers, 2). None if
+        markerevery is None.
+
+    """
+    xy = np.asarray(xy, dtype=float).reshape(-1, 2)
+    lineid = np.asarray(lineid)
+    npts = xy.shape[0]
+    if select is None:
+        select = np.ones(npts, dtype=bool)
+    else:
+        select = np.asarray(select, dtype=bool)
+
+    # first point of each particle and position of each point in it
+    start = np.ones(npts, dtype=bool)
+    start[1:] = lineid[1:] != lineid[:-1]
+    istart = np.flatnonzero(start)
+    pos = np.arange(npts) - np.repeat(istart,
+                                      np.diff(np.append(istart, npts)))
+
+    markers = None
+    if markerevery is not None:
+        markers = xy[select & (pos % markerevery == 0)]
+
+    # lines are broken at particle boundaries and unselected points
+    brk = start.copy()
+    brk[1:] |= ~select[:-1]
+    run = np.cumsum(brk)
+
+    keep = select.copy()
+    if decimate is not None and decimate > 0. and npts > 1:
+        pix = np.floor(xy / decimate)
+        same = np.zeros(npts, dtype=bool)
+        same[1:] = (pix[1:] == pix[:-1]).all(axis=1) & ~brk[1:]
+        last = np.append(brk[1:] | ~select[1:], True)
+        keep &= ~same | last
+
+    run = run[keep]
+    xy = xy[keep]
+    count = np.bincount(run)
+    idx = count[run] >= minpoints
+    run = run[idx]
+    xy = xy[idx]
+    # slicing is much faster than np.split for many short lines
+    bounds = np.flatnonzero(run[1:] != run[:-1]) + 1
+    bounds = np.concatenate(([0], bounds, [run.shape[0]]))
+    if run.shape[0] == 0:
+        bounds = bounds[:1]
+    lines = [xy[i0:i1] for i0, i1 in zip(bounds[:-1], bounds[1:])]
+    return lines, markers
 
 
 def _set_coord_info(mg, xul, yul, xll, yll, rotation):
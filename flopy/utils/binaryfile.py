@@ -393,6 +393,48 @@ class BinaryLayerFile(LayerFile):
             istat += 1
         return result
 
+    def get_memmap(self):
+        """
+        Get a read-only, memory-mapped view of all of the data in the file.
+        The data are read from disk when they are accessed, so that time
+        series or subsets of large files can be processed without reading
+        the file into memory. Requires a file in which every time has one
+        record of the same shape for every layer, in layer order.
+
+        Returns
+        ----------
+        data : numpy array
+            Memory-mapped array of size (ntimes, nlay, nrow, ncol).
+
+        Examples
+        --------
+        >>> import flopy
+        >>> hdobj = flopy.utils.HeadFile('model.hds')
+        >>> heads = hdobj.get_memmap()
+        >>> ts = heads[:, 0, 10, 20]
+
+        """
+        ntimes = len(self.times)
+        nrecords = self.recordarray.shape[0]
+        rdt = np.dtype([('header', self.header_dtype),
+                        ('data', self.realtype, (self.nrow, self.ncol))])
+        regular = nrecords == ntimes * self.nlay and \
+                  np.all(self.recordarray['nrow'] == self.nrow) and \
+                  np.all(self.recordarray['ncol'] == self.ncol) and \
+                  np.array_equal(self.recordarray['ilay'],
+                                 np.tile(np.arange(1, self.nlay + 1),
+                                         ntimes)) and \
+                  np.array_equal(self.iposarray,
+                                 self.header_dtype.itemsize +
+                                 np.arange(nrecords) * rdt.itemsize)
+        if not regular:
+            raise ValueError('the records in {} do not have the same shape '
+                             'for every layer and time and cannot be memory '
+                             'mapped'.format(self.filename))
+        data = np.memmap(self.filename, dtype=rdt, mode='r',
+                         shape=(ntimes, self.nlay))
+        return data['data']
+
 
 class HeadFile(BinaryLayerFile):
     """
@@ -624,6 +666,9 @@ class CellBudgetFile(object):
         # read through the file and build the pointer index
         self._build_index()
 
+        # cell centered specific discharge for each time step
+        self._spdis = {}
+
         # allocate the value array
         # self.value = np.empty((self.nlay, self.nrow, self.ncol),
         #                      dtype=self.realtype)
@@ -1463,6 +1508,175 @@ class CellBudgetFile(object):
         """
         return self.times
 
+    def plot_frames(self, text, filename_base=None, animation=None,
+                    mflay=0, kstpkper=None, modelgrid=None, nproc=None,
+                    **kwargs):
+        """
+        Plot a layer of a budget term for many time steps into image
+        files or an animation. The model grid is drawn once and only the
+        array values change from frame to frame. The records are read
+        one at a time and records of the same term (for example, two
+        well packages) are added.
+
+        Parameters
+        ----------
+        text : str
+            The text identifier of the budget term (for example,
+            'RIVER LEAKAGE').
+        filename_base : str
+            Base file name of the image files. The frames are saved to
+            filename_base_00000.png, filename_base_00001.png, ...
+            (default is None)
+        animation : str
+            File name of an animation (for example, 'riv.gif'). Only used
+            if filename_base is None. (default is None)
+        mflay : int
+            MODFLOW zero-based layer number to plot. (default is 0)
+        kstpkper : list of tuples
+            The zero-based time steps and stress periods to plot. If None,
+            all time steps in the file are plotted. (default is None)
+        modelgrid : flopy.discretization.Grid
+            Model grid of the budget terms. If None, the grid of the model
+            or a grid with unit cell sizes is used. (default is None)
+        nproc : int
+            Number of worker processes that save the image files.
+            (default is None)
+        **kwargs : dict
+            Keyword arguments passed to
+            flopy.plot.plotutil.plot_array_frames (vmin, vmax,
+            masked_values, grid, colorbar, cmap, file_extension, fps,
+            dpi, ...)
+
+        Returns
+        ----------
+        filenames : list or str
+            file names of the frames, or the file name of the animation
+
+        Examples
+        --------
+        >>> import flopy
+        >>> cbb = flopy.utils.CellBudgetFile('mymodel.cbb')
+        >>> cbb.plot_frames('RIVER LEAKAGE', animation='riv.gif')
+
+        """
+        from flopy.plot.plotutil import plot_array_frames
+
+        if modelgrid is None:
+            model = getattr(self, 'model', None)
+            if model is not None:
+                modelgrid = model.modelgrid
+            else:
+                from ..discretization import StructuredGrid
+                modelgrid = StructuredGrid(delc=np.ones((self.nrow,)),
+                                           delr=np.ones(self.ncol, ),
+                                           xoff=0., yoff=0., angrot=0.)
+        if kstpkper is None:
+            kstpkper = self.get_kstpkper()
+
+        def frames():
+            for kk in kstpkper:
+                data = self.get_data(kstpkper=kk, text=text, full3D=True)
+                if len(data) == 0:
+                    continue
+                a = np.ma.array(data[0])
+                for d in data[1:]:
+                    a = a + np.ma.array(d)
+                yield ('Layer {} - kstp {} kper {}'.format(mflay + 1,
+                                                          kk[0] + 1,
+                                                          kk[1] + 1), a)
+
+        return plot_array_frames(frames(), modelgrid,
+                                 filename_base=filename_base,
+                                 animation=animation, nproc=nproc,
+                                 layer=mflay, **kwargs)
+
+    def get_specific_discharge(self, kstpkper=None, totim=None, grb=None,
+                               head=None):
+        """
+        Get the cell centered specific discharge of a MODFLOW 6 model for
+        one time step. The DATA-SPDIS record is used if it was saved,
+        otherwise the specific discharge is calculated from the
+        FLOW-JA-FACE record and the binary grid file, which works for
+        DIS, DISV and DISU grids. Results calculated without heads are
+        cached for each time step and grid shape, and copies of the cached
+        arrays are returned.
+
+        Parameters
+        ----------
+        kstpkper : tuple of ints
+            A tuple containing the time step and stress period (kstp, kper).
+            The kstp and kper values are zero based. If kstpkper and totim
+            are None, the last time step is used. (default is None)
+        totim : float
+            The simulation time. (default is None)
+        grb : flopy.utils.MfGrdFile object
+            Binary grid file of the model. Required if the budget file
+            does not contain DATA-SPDIS records. (default is None)
+        head : np.ndarray
+            Heads of the same time step, used to calculate the saturated
+            thickness of convertible cells. (default is None)
+
+        Returns
+        ----------
+        (qx, qy, qz) : tuple of np.ndarrays
+            Specific discharge arrays of the shape of the model grid (or
+            of length nodes if DATA-SPDIS is used without a grb), in model
+            coordinates, with qz positive in the upward direction.
+
+        See Also
+        --------
+        flopy.utils.postprocessing.get_specific_discharge
+
+        Examples
+        --------
+        >>> import flopy
+        >>> cbb = flopy.utils.CellBudgetFile('mymodel.cbc',
+        ...                                  precision='double')
+        >>> grb = flopy.utils.MfGrdFile('mymodel.dis.grb')
+        >>> qx, qy, qz = cbb.get_specific_discharge(kstpkper=(0, 0),
+        ...                                         grb=grb)
+
+        """
+        from .postprocessing import get_specific_discharge
+
+        if kstpkper is None and totim is None:
+            kstpkper = self.get_kstpkper()[-1]
+        if kstpkper is not None:
+            kstpkper = tuple(int(k) for k in kstpkper)
+        # results with heads are not cached, they depend on the values of
+        # the heads
+        key = (kstpkper, totim, None if grb is None else grb.shape)
+        if head is None and key in self._spdis:
+            return tuple(a.copy() for a in self._spdis[key])
+
+        if 'DATA-SPDIS'.rjust(16).encode() in self.textlist:
+            spdis = self.get_data(kstpkper=kstpkper, totim=totim,
+                                  text='DATA-SPDIS')[0]
+            node = spdis['node'] - 1
+            if grb is not None:
+                nodes, shape = grb.nodes, grb.shape
+            else:
+                nodes = node.max() + 1
+                shape = (nodes,)
+            q = []
+            for name in ('qx', 'qy', 'qz'):
+                a = np.zeros(nodes, dtype=spdis[name].dtype)
+                a[node] = spdis[name]
+                q.append(a.reshape(shape))
+            q = tuple(q)
+        else:
+            if grb is None:
+                raise ValueError('a binary grid file (grb) is required to '
+                                 'calculate the specific discharge from '
+                                 'FLOW-JA-FACE')
+            flowja = self.get_data(kstpkper=kstpkper, totim=totim,
+                                   text='FLOW-JA-FACE')[0]
+            q = get_specific_discharge(flowja, grb, head=head)
+        if head is None:
+            self._spdis[key] = q
+            q = tuple(a.copy() for a in q)
+        return q
+
     def get_nrecords(self):
         """
         Return the number of records in the file
@@ -1,4 +1,3 @@
-from collections import OrderedDict
 import numpy as np
 
 
@@ -133,89 +132,148 @@ def to_cvfd(vertdict, nodestart=None, nodestop=None,
         nodestop = len(vertdict)
     ncells = nodestop - nodestart
 
-    # First create vertexdict {(x1, y1): ivert1, (x2, y2): ivert2, ...} and
-    # vertexlist [[ivert1, ivert2, ...], [ivert9, ivert10, ...], ...]
-    # In the process, filter out any duplicate vertices
-    vertexdict = OrderedDict()
-    vertexlist = []
-    xcyc = np.empty((ncells, 2), dtype=np.float)
-    iv = 0
-    nvertstart = 0
+    # Flat array of the vertices of all cells, the vertices of cell
+    # nodestart + n are xy[offsets[n]:offsets[n + 1]]
     if verbose:
         print('Converting vertdict to cvfd representation.')
         print('Number of cells in vertdict is: {}'.format(len(vertdict)))
         print('Cell {} up to {} (but not including) will be processed.'
               .format(nodestart, nodestop))
-    for icell in range(nodestart, nodestop):
-        points = vertdict[icell]
-        nvertstart += len(points)
-        xc, yc = centroid_of_polygon(points)
-        xcyc[icell, 0] = xc
-        xcyc[icell, 1] = yc
-        ivertlist = []
-        for p in points:
-            pt = tuple(p)
-            if pt in vertexdict:
-                ivert = vertexdict[pt]
-            else:
-                vertexdict[pt] = iv
-                ivert = iv
-                iv += 1
-            ivertlist.append(ivert)
-        if ivertlist[0] != ivertlist[-1]:
-            raise Exception('Cell {} not closed'.format(icell))
-        vertexlist.append(ivertlist)
-
-    # next create vertex_cell_dict = {}; for each vertex, store list of cells
-    # that use it
-    nvert = len(vertexdict)
+    counts = np.array([len(vertdict[icell])
+                       for icell in range(nodestart, nodestop)], dtype=int)
+    offsets = np.zeros(ncells + 1, dtype=int)
+    np.cumsum(counts, out=offsets[1:])
+    xy = np.array([p[:2] for icell in range(nodestart, nodestop)
+                   for p in vertdict[icell]], dtype=float).reshape(-1, 2)
+    nvertstart = xy.shape[0]
+
+    # Filter out duplicate vertices and number the vertices in the order
+    # they are first used
+    ivert, ifirst = _unique_vertices(xy)
+    verts = xy[ifirst]
+    nvert = verts.shape[0]
+    notclosed = ivert[offsets[:-1]] != ivert[offsets[1:] - 1]
+    if np.any(notclosed):
+        icell = nodestart + np.where(notclosed)[0][0]
+        raise Exception('Cell {} not closed'.format(icell))
     if verbose:
         print('Started with {} vertices.'.format(nvertstart))
         print('Ended up with {} vertices.'.format(nvert))
         print('Reduced total number of vertices by {}'.format(nvertstart -
                                                               nvert))
-        print('Creating dict of vertices with their associated cells')
-    vertex_cell_dict = OrderedDict()
-    for icell in range(nodestart, nodestop):
-        ivertlist = vertexlist[icell]
-        for ivert in ivertlist:
-            if ivert in vertex_cell_dict:
-                vertex_cell_dict[ivert].append(icell)
-            else:
-                vertex_cell_dict[ivert] = [icell]
-
-    # Now, go through each vertex and look at the cells that use the vertex.
+
     # For quadtree-like grids, there may be a need to add a new hanging node
     # vertex to the larger cell.
-    if verbose:
-        print('Done creating dict of vertices with their associated cells')
-        print('Checking for hanging nodes.')
-    vertexdict_keys = list(vertexdict.keys())
-    for ivert, cell_list in vertex_cell_dict.items():
-        for icell1 in cell_list:
-            for icell2 in cell_list:
-
-                # skip if same cell
-                if icell1 == icell2:
-                    continue
-
-                # skip if share face already
-                ivertlist1 = vertexlist[icell1]
-                ivertlist2 = vertexlist[icell2]
-                if shared_face(ivertlist1, ivertlist2):
-                    continue
-
-                # don't share a face, so need to segment if necessary
-                segment_face(ivert, ivertlist1, ivertlist2, vertexdict_keys)
-    if verbose:
-        print('Done checking for hanging nodes.')
-
-    verts = np.array(vertexdict_keys)
-    iverts = vertexlist
+    nhang = np.zeros(nvertstart, dtype=int)
+    if not skip_hanging_node_check and nvertstart > 0:
+        if verbose:
+            print('Checking for hanging nodes.')
+        nhang, hang = _hanging_nodes(verts, ivert, offsets)
+        if verbose:
+            print('Done checking for hanging nodes.')
+
+    # Insert the hanging nodes after the first vertex of their edge
+    iverts = ivert
+    if nhang.sum() > 0:
+        size = nhang + 1
+        start = np.cumsum(size) - size
+        iverts = np.empty(size.sum(), dtype=int)
+        iverts[start] = ivert
+        ipos = np.repeat(start + 1, nhang) + \
+               np.arange(nhang.sum()) - np.repeat(np.cumsum(nhang) - nhang,
+                                                  nhang)
+        iverts[ipos] = hang
+        offsets = np.append(start, iverts.shape[0])[offsets]
+    iverts = iverts.tolist()
+    iverts = [iverts[i0:i1] for i0, i1 in zip(offsets[:-1], offsets[1:])]
 
     return verts, iverts
 
 
+def _unique_vertices(xy, decimals=9):
+    """
+    Vertex number of each point of xy, after merging points with the same
+    coordinates (rounded to decimals), with the vertices numbered in the
+    order they first appear, and the index of the first appearance of
+    each vertex.
+
+    """
+    # adding zero makes -0. and 0. the same
+    key = np.round(xy, decimals) + 0.
+    order = np.lexsort((key[:, 1], key[:, 0]))
+    key = key[order]
+    new = np.ones(order.shape[0], dtype=bool)
+    new[1:] = np.any(key[1:] != key[:-1], axis=1)
+    group = np.cumsum(new) - 1
+    # first appearance of each group (lexsort is stable)
+    ifirst = order[new]
+    rank = np.empty(ifirst.shape[0], dtype=int)
+    rank[np.argsort(ifirst)] = np.arange(ifirst.shape[0])
+    ivert = np.empty(order.shape[0], dtype=int)
+    ivert[order] = rank[group]
+    return ivert, np.sort(ifirst)
+
+
+def _hanging_nodes(verts, ivert, offsets, decimals=9):
+    """
+    Find the vertices that lie on the edges of the cells (hanging nodes).
+
+    The edges are grouped by the line they are on, and the vertices of each
+    line are sorted along the line, so that the hanging nodes of an edge
+    are the vertices between its end points in the sorted list.
+
+    Returns the number of hanging nodes of the edge that starts at each
+    vertex of ivert and the hanging nodes of all edges, in order.
+
+    """
+    nvertstart = ivert.shape[0]
+    # edges from each vertex to the next vertex of the cell
+    last = np.zeros(nvertstart, dtype=bool)
+    last[offsets[1:] - 1] = True
+    iedge = np.where(~last)[0]
+    iedge = iedge[ivert[iedge] != ivert[iedge + 1]]
+    iva, ivb = ivert[iedge], ivert[iedge + 1]
+    d = verts[ivb] - verts[iva]
+    d /= np.sqrt(np.sum(d * d, axis=1))[:, np.newaxis]
+    # one direction for both orientations of a line
+    flip = (d[:, 0] < 0.) | ((d[:, 0] == 0.) & (d[:, 1] < 0.))
+    d[flip] *= -1.
+
+    # line of each edge, from its direction and distance to the origin
+    scale = max(np.abs(verts).max(), 1.)
+    dist = (d[:, 0] * verts[iva, 1] - d[:, 1] * verts[iva, 0]) / scale
+    key = np.round(np.column_stack((d, dist)), decimals) + 0.
+    order = np.lexsort((key[:, 2], key[:, 1], key[:, 0]))
+    new = np.ones(order.shape[0], dtype=bool)
+    new[1:] = np.any(key[order][1:] != key[order][:-1], axis=1)
+    line = np.empty(order.shape[0], dtype=int)
+    line[order] = np.cumsum(new) - 1
+
+    # unique vertices of each line, sorted along the line
+    lv = np.concatenate((line, line))
+    iv = np.concatenate((iva, ivb))
+    dv = np.concatenate((d, d))
+    t = np.sum(dv * verts[iv], axis=1)
+    order = np.lexsort((iv, t, lv))
+    new = np.ones(order.shape[0], dtype=bool)
+    new[1:] = (lv[order][1:] != lv[order][:-1]) | \
+              (iv[order][1:] != iv[order][:-1])
+    pos = np.empty(order.shape[0], dtype=int)
+    pos[order] = np.cumsum(new) - 1
+    linevert = iv[order][new]
+    nedge = iedge.shape[0]
+    posa, posb = pos[:nedge], pos[nedge:]
+
+    # the vertices between the end points of an edge are its hanging nodes
+    n = np.abs(posb - posa) - 1
+    step = np.where(posb > posa, 1, -1)
+    k = np.arange(n.sum()) - np.repeat(np.cumsum(n) - n, n)
+    hang = linevert[np.repeat(posa, n) + np.repeat(step, n) * (k + 1)]
+    nhang = np.zeros(nvertstart, dtype=int)
+    nhang[iedge] = n
+    return nhang, hang
+
+
 def shapefile_to_cvfd(shp, **kwargs):
     import shapefile
     print('Translating shapefile ({}) into cvfd format'.format(shp))
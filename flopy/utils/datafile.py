@@ -324,6 +324,68 @@ class LayerFile(object):
                                                 modelgrid=self.mg,
                                                 **kwargs)
 
+    def plot_frames(self, filename_base=None, animation=None, mflay=0,
+                    totim=None, nproc=None, **kwargs):
+        """
+        Plot a layer of the data of many times into image files or an
+        animation. The model grid is drawn once and only the array values
+        change from frame to frame. The records are read one at a time.
+
+        Parameters
+        ----------
+        filename_base : str
+            Base file name of the image files. The frames are saved to
+            filename_base_00000.png, filename_base_00001.png, ...
+            (default is None)
+        animation : str
+            File name of an animation (for example, 'heads.gif' or
+            'heads.mp4'). Only used if filename_base is None.
+            (default is None)
+        mflay : int
+            MODFLOW zero-based layer number to plot. (default is 0)
+        totim : list of floats
+            The simulation times to plot. If None, all times in the file
+            are plotted. (default is None)
+        nproc : int
+            Number of worker processes that save the image files.
+            (default is None)
+        **kwargs : dict
+            Keyword arguments passed to
+            flopy.plot.plotutil.plot_array_frames (vmin, vmax,
+            masked_values, grid, colorbar, cmap, file_extension, fps,
+            dpi, ...). The color scale of all frames is the range of the
+            first frame unless vmin and vmax are specified.
+
+        Returns
+        ----------
+        filenames : list or str
+            file names of the frames, or the file name of the animation
+
+        Examples
+        --------
+        >>> import flopy
+        >>> hdobj = flopy.utils.HeadFile('test.hds')
+        >>> hdobj.plot_frames(filename_base='head', nproc=4)
+
+        """
+        from flopy.plot.plotutil import plot_array_frames
+
+        masked_values = list(kwargs.pop("masked_values", []))
+        if self.model is not None:
+            if self.model.bas6 is not None:
+                masked_values.append(self.model.bas6.hnoflo)
+        kwargs["masked_values"] = masked_values
+
+        if totim is None:
+            totim = self.get_times()
+
+        frames = (('Layer {} - totim {:g}'.format(mflay + 1, t),
+                   self.get_data(totim=t)) for t in totim)
+        return plot_array_frames(frames, self.mg,
+                                 filename_base=filename_base,
+                                 animation=animation, nproc=nproc,
+                                 layer=mflay, **kwargs)
+
     def _build_index(self):
         """
         Build the recordarray and iposarray, which maps the header information
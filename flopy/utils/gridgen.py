@@ -7,6 +7,7 @@ import subprocess
 from ..modflow.mfdisu import ModflowDisU
 from ..mf6.modflow import ModflowGwfdis
 from .util_array import Util2d  # read1d,
+from .gridintersect import GridIntersect
 from ..export.shapefile_utils import shp2recarray
 from ..mbase import which
 from ..export.shapefile_utils import import_shapefile, shapefile_version
@@ -28,12 +29,12 @@ def read1d(f, a):
     than the read1d function in util_array
 
     """
-    dtype = a.dtype.type
-    lines = f.readlines()
-    l = []
-    for line in lines:
-        l += [dtype(i) for i in line.strip().split()]
-    a[:] = np.array(l, dtype=dtype)
+    values = f.read().split()
+    if a.dtype.kind == 'f':
+        # parse as double and round, like dtype(value) does
+        a[:] = np.array(values, dtype=np.float64)
+    else:
+        a[:] = np.array(values, dtype=a.dtype)
     return a
 
 
@@ -159,6 +160,8 @@ class Gridgen(object):
         self.nja = 0
         self.nodelay = np.zeros((self.nlay), dtype=np.int)
         self._vertdict = {}
+        self._intersectors = {}
+        self._gridprops = None
         self.model_ws = model_ws
         exe_name = which(exe_name)
         if exe_name is None:
@@ -380,6 +383,8 @@ class Gridgen(object):
 
         # Create a dictionary that relates nodenumber to vertices
         self._mkvertdict()
+        self._intersectors = {}
+        self._gridprops = None
 
         # read and save nodelay array to self
         fname = os.path.join(self.model_ws, 'qtg.nodesperlay.dat')
@@ -588,12 +593,8 @@ class Gridgen(object):
                  itmuni=4, lenuni=2):
 
         # nodes, nlay, ivsd, itmuni, lenuni, idsymrd, laycbd
-        fname = os.path.join(self.model_ws, 'qtg.nod')
-        f = open(fname, 'r')
-        line = f.readline()
-        ll = line.strip().split()
-        nodes = int(ll.pop(0))
-        f.close()
+        gp = self._load_gridprops()
+        nodes = gp['nodes']
         nlay = self.nlay
         ivsd = 0
         idsymrd = 0
@@ -603,107 +604,50 @@ class Gridgen(object):
         self.nodes = nodes
 
         # nodelay
-        nodelay = np.empty((nlay), dtype=np.int)
-        fname = os.path.join(self.model_ws, 'qtg.nodesperlay.dat')
-        f = open(fname, 'r')
-        nodelay = read1d(f, nodelay)
-        f.close()
+        nodelay = gp['nodelay'].copy()
 
-        # top
+        # top, bot and area of each layer
         top = [0] * nlay
-        for k in range(nlay):
-            fname = os.path.join(self.model_ws,
-                                 'quadtreegrid.top{}.dat'.format(k + 1))
-            f = open(fname, 'r')
-            tpk = np.empty((nodelay[k]), dtype=np.float32)
-            tpk = read1d(f, tpk)
-            f.close()
-            if tpk.min() == tpk.max():
-                tpk = tpk.min()
-            else:
-                tpk = Util2d(model, (nodelay[k],), np.float32,
-                             np.reshape(tpk, (nodelay[k],)),
-                             name='top {}'.format(k + 1))
-            top[k] = tpk
-
-        # bot
         bot = [0] * nlay
-        for k in range(nlay):
-            fname = os.path.join(self.model_ws,
-                                 'quadtreegrid.bot{}.dat'.format(k + 1))
-            f = open(fname, 'r')
-            btk = np.empty((nodelay[k]), dtype=np.float32)
-            btk = read1d(f, btk)
-            f.close()
-            if btk.min() == btk.max():
-                btk = btk.min()
-            else:
-                btk = Util2d(model, (nodelay[k],), np.float32,
-                             np.reshape(btk, (nodelay[k],)),
-                             name='bot {}'.format(k + 1))
-            bot[k] = btk
-
-        # area
         area = [0] * nlay
-        fname = os.path.join(self.model_ws, 'qtg.area.dat')
-        f = open(fname, 'r')
-        anodes = np.empty((nodes), dtype=np.float32)
-        anodes = read1d(f, anodes)
-        f.close()
         istart = 0
         for k in range(nlay):
             istop = istart + nodelay[k]
-            ark = anodes[istart: istop]
-            if ark.min() == ark.max():
-                ark = ark.min()
-            else:
-                ark = Util2d(model, (nodelay[k],), np.float32,
-                             np.reshape(ark, (nodelay[k],)),
-                             name='area layer {}'.format(k + 1))
-            area[k] = ark
+            for name, layarrays in [('top', top), ('bot', bot),
+                                    ('area', area)]:
+                ak = gp[name][istart:istop]
+                if ak.min() == ak.max():
+                    ak = ak.min()
+                else:
+                    if name == 'area':
+                        aname = 'area layer {}'.format(k + 1)
+                    else:
+                        aname = '{} {}'.format(name, k + 1)
+                    ak = Util2d(model, (nodelay[k],), np.float32, ak.copy(),
+                                name=aname)
+                layarrays[k] = ak
             istart = istop
 
         # iac
-        iac = np.empty((nodes), dtype=np.int)
-        fname = os.path.join(self.model_ws, 'qtg.iac.dat')
-        f = open(fname, 'r')
-        iac = read1d(f, iac)
-        f.close()
+        iac = gp['iac'].copy()
 
         # Calculate njag and save as nja to self
         njag = iac.sum()
         self.nja = njag
 
         # ja
-        ja = np.empty((njag), dtype=np.int)
-        fname = os.path.join(self.model_ws, 'qtg.ja.dat')
-        f = open(fname, 'r')
-        ja = read1d(f, ja)
-        f.close()
+        ja = gp['ja'].copy()
 
         # ivc
-        fldr = np.empty((njag), dtype=np.int)
-        fname = os.path.join(self.model_ws, 'qtg.fldr.dat')
-        f = open(fname, 'r')
-        fldr = read1d(f, fldr)
-        ivc = np.where(abs(fldr) == 3, 1, 0)
-        f.close()
+        ivc = self.get_ivc(fldr=gp['fldr'])
 
         cl1 = None
         cl2 = None
         # cl12
-        cl12 = np.empty((njag), dtype=np.float32)
-        fname = os.path.join(self.model_ws, 'qtg.c1.dat')
-        f = open(fname, 'r')
-        cl12 = read1d(f, cl12)
-        f.close()
+        cl12 = gp['cl12'].copy()
 
         # fahl
-        fahl = np.empty((njag), dtype=np.float32)
-        fname = os.path.join(self.model_ws, 'qtg.fahl.dat')
-        f = open(fname, 'r')
-        fahl = read1d(f, fahl)
-        f.close()
+        fahl = gp['fahl'].copy()
 
         # create dis object instance
         disu = ModflowDisU(model, nodes=nodes, nlay=nlay, njag=njag, ivsd=ivsd,
@@ -717,6 +661,67 @@ class Gridgen(object):
         # return dis object instance
         return disu
 
+    def _load_gridprops(self):
+        """
+        Read the grid properties written by gridgen (the qtg.* and
+        quadtreegrid.top/bot files) in a single pass and keep them, so
+        that the get methods do not read the files again.
+
+        Returns
+        -------
+        gridprops : dict
+            nodes, nodelay, and the top, bot, area, iac, ja, fldr, cl12
+            and fahl arrays
+
+        """
+        if self._gridprops is not None:
+            return self._gridprops
+
+        def read(fname, a):
+            with open(os.path.join(self.model_ws, fname), 'r') as f:
+                return read1d(f, a)
+
+        gp = {}
+        with open(os.path.join(self.model_ws, 'qtg.nod'), 'r') as f:
+            nodes = int(f.readline().strip().split()[0])
+        gp['nodes'] = nodes
+        nodelay = read('qtg.nodesperlay.dat',
+                       np.empty((self.nlay), dtype=np.int))
+        gp['nodelay'] = nodelay
+        for name in ['top', 'bot']:
+            a = np.empty((nodes), dtype=np.float32)
+            istart = 0
+            for k in range(self.nlay):
+                istop = istart + nodelay[k]
+                read('quadtreegrid.{}{}.dat'.format(name, k + 1),
+                     a[istart:istop])
+                istart = istop
+            gp[name] = a
+        gp['area'] = read('qtg.area.dat', np.empty((nodes), dtype=np.float32))
+        iac = read('qtg.iac.dat', np.empty((nodes), dtype=np.int))
+        gp['iac'] = iac
+        njag = iac.sum()
+        gp['ja'] = read('qtg.ja.dat', np.empty((njag), dtype=np.int))
+        gp['fldr'] = read('qtg.fldr.dat', np.empty((njag), dtype=np.int))
+        gp['cl12'] = read('qtg.c1.dat', np.empty((njag), dtype=np.float32))
+        gp['fahl'] = read('qtg.fahl.dat', np.empty((njag), dtype=np.float32))
+        self._gridprops = gp
+        return gp
+
+    def _get_cell_vertices(self):
+        """
+        Get the four corners of every cell as an (nodes, 4, 2) array, from
+        the vertex dictionary.
+
+        """
+        gp = self._load_gridprops()
+        if 'cellvertices' not in gp:
+            nodes = len(self._vertdict)
+            gp['cellvertices'] = np.array(
+                [self._vertdict[n][:4] for n in range(nodes)],
+                dtype=np.float).reshape(nodes, 4, 2)
+        return gp['cellvertices']
+
     def get_nodes(self):
         """
         Get the number of nodes
@@ -726,13 +731,7 @@ class Gridgen(object):
         nodes : int
 
         """
-        fname = os.path.join(self.model_ws, 'qtg.nod')
-        f = open(fname, 'r')
-        line = f.readline()
-        ll = line.strip().split()
-        nodes = int(ll.pop(0))
-        f.close()
-        return nodes
+        return self._load_gridprops()['nodes']
 
     def get_nlay(self):
         """
@@ -756,13 +755,7 @@ class Gridgen(object):
             Number of nodes in each layer
 
         """
-        nlay = self.get_nlay()
-        nodelay = np.empty((nlay), dtype=np.int)
-        fname = os.path.join(self.model_ws, 'qtg.nodesperlay.dat')
-        f = open(fname, 'r')
-        nodelay = read1d(f, nodelay)
-        f.close()
-        return nodelay
+        return self._load_gridprops()['nodelay'].copy()
 
     def get_top(self):
         """
@@ -774,22 +767,7 @@ class Gridgen(object):
             A 1D vector of cell top elevations of size nodes
 
         """
-        nodes = self.get_nodes()
-        nlay = self.get_nlay()
-        nodelay = self.get_nodelay()
-        top = np.empty((nodes), dtype=np.float32)
-        istart = 0
-        for k in range(nlay):
-            istop = istart + nodelay[k]
-            fname = os.path.join(self.model_ws,
-                                 'quadtreegrid.top{}.dat'.format(k + 1))
-            f = open(fname, 'r')
-            tpk = np.empty((nodelay[k]), dtype=np.float32)
-            tpk = read1d(f, tpk)
-            f.close()
-            top[istart:istop] = tpk
-            istart = istop
-        return top
+        return self._load_gridprops()['top'].copy()
 
     def get_bot(self):
         """
@@ -801,22 +779,7 @@ class Gridgen(object):
             A 1D vector of cell bottom elevations of size nodes
 
         """
-        nodes = self.get_nodes()
-        nlay = self.get_nlay()
-        nodelay = self.get_nodelay()
-        bot = np.empty((nodes), dtype=np.float32)
-        istart = 0
-        for k in range(nlay):
-            istop = istart + nodelay[k]
-            fname = os.path.join(self.model_ws,
-                                 'quadtreegrid.bot{}.dat'.format(k + 1))
-            f = open(fname, 'r')
-            btk = np.empty((nodelay[k]), dtype=np.float32)
-            btk = read1d(f, btk)
-            f.close()
-            bot[istart:istop] = btk
-            istart = istop
-        return bot
+        return self._load_gridprops()['bot'].copy()
 
     def get_area(self):
         """
@@ -828,13 +791,7 @@ class Gridgen(object):
             A 1D vector of cell areas of size nodes
 
         """
-        nodes = self.get_nodes()
-        fname = os.path.join(self.model_ws, 'qtg.area.dat')
-        f = open(fname, 'r')
-        area = np.empty((nodes), dtype=np.float32)
-        area = read1d(f, area)
-        f.close()
-        return area
+        return self._load_gridprops()['area'].copy()
 
     def get_iac(self):
         """
@@ -846,13 +803,7 @@ class Gridgen(object):
             A 1D vector of the number of connections (plus 1) for each cell
 
         """
-        nodes = self.get_nodes()
-        iac = np.empty((nodes), dtype=np.int)
-        fname = os.path.join(self.model_ws, 'qtg.iac.dat')
-        f = open(fname, 'r')
-        iac = read1d(f, iac)
-        f.close()
-        return iac
+        return self._load_gridprops()['iac'].copy()
 
     def get_ja(self, nja=None):
         """
@@ -870,15 +821,10 @@ class Gridgen(object):
             A 1D vector of the cell connectivity (one-based)
 
         """
-        if nja is None:
-            iac = self.get_iac()
-            nja = iac.sum()
-        ja = np.empty((nja), dtype=np.int)
-        fname = os.path.join(self.model_ws, 'qtg.ja.dat')
-        f = open(fname, 'r')
-        ja = read1d(f, ja)
-        f.close()
-        return ja
+        ja = self._load_gridprops()['ja']
+        if nja is not None:
+            ja = ja[:nja]
+        return ja.copy()
 
     def get_fldr(self):
         """
@@ -892,14 +838,7 @@ class Gridgen(object):
             x, y, and z directions.
 
         """
-        iac = self.get_iac()
-        njag = iac.sum()
-        fldr = np.empty((njag), dtype=np.int)
-        fname = os.path.join(self.model_ws, 'qtg.fldr.dat')
-        f = open(fname, 'r')
-        fldr = read1d(f, fldr)
-        f.close()
-        return fldr
+        return self._load_gridprops()['fldr'].copy()
 
     def get_ivc(self, fldr=None):
         """
@@ -963,14 +902,7 @@ class Gridgen(object):
             center of cell n to its shared face will cell m
 
         """
-        iac = self.get_iac()
-        njag = iac.sum()
-        cl12 = np.empty((njag), dtype=np.float32)
-        fname = os.path.join(self.model_ws, 'qtg.c1.dat')
-        f = open(fname, 'r')
-        cl12 = read1d(f, cl12)
-        f.close()
-        return cl12
+        return self._load_gridprops()['cl12'].copy()
 
     def get_fahl(self):
         """
@@ -984,14 +916,7 @@ class Gridgen(object):
             connection
 
         """
-        iac = self.get_iac()
-        njag = iac.sum()
-        fahl = np.empty((njag), dtype=np.float32)
-        fname = os.path.join(self.model_ws, 'qtg.fahl.dat')
-        f = open(fname, 'r')
-        fahl = read1d(f, fahl)
-        f.close()
-        return fahl
+        return self._load_gridprops()['fahl'].copy()
 
     def get_hwva(self, ja=None, ihc=None, fahl=None, top=None, bot=None):
         """
@@ -1021,7 +946,7 @@ class Gridgen(object):
             connection
 
         """
-        iac = self.get_iac()
+        iac = self._load_gridprops()['iac']
         nodes = iac.shape[0]
 
         if ja is None:
@@ -1036,20 +961,18 @@ class Gridgen(object):
             bot = self.get_bot()
 
         hwva = fahl.copy()
-        ipos = 0
-        for n in range(nodes):
-            for j in range(iac[n]):
-                if j == 0:
-                    pass
-                elif ihc[ipos] == 0:
-                    pass
-                else:
-                    m = ja[ipos] - 1
-                    dzn = top[n] - bot[n]
-                    dzm = top[m] - bot[m]
-                    dzavg = 0.5 * (dzn + dzm)
-                    hwva[ipos] = hwva[ipos] / dzavg
-                ipos += 1
+        # cell n of each connection, skipping the first entry of each cell
+        # (the cell itself) and vertical connections
+        n = np.repeat(np.arange(nodes), iac)
+        first = np.zeros(n.shape[0], dtype=bool)
+        first[np.cumsum(iac) - iac] = True
+        idx = np.where(~first & (ihc != 0))[0]
+        n = n[idx]
+        m = ja[idx] - 1
+        dzn = top[n] - bot[n]
+        dzm = top[m] - bot[m]
+        dzavg = 0.5 * (dzn + dzm)
+        hwva[idx] = hwva[idx] / dzavg
         return hwva
 
     def get_angldegx(self, fldr=None):
@@ -1118,11 +1041,10 @@ class Gridgen(object):
             x and y cell centers.  Shape is (ncells, 2)
 
         """
-        cellxy = np.empty((ncells, 2), dtype=np.float)
-        for n in range(ncells):
-            x, y = self.get_center(n)
-            cellxy[n, 0] = x
-            cellxy[n, 1] = y
+        vts = self._get_cell_vertices()[:ncells]
+        cellxy = np.empty((vts.shape[0], 2), dtype=np.float)
+        cellxy[:, 0] = (vts[:, 0, 0] + vts[:, 1, 0]) * 0.5
+        cellxy[:, 1] = (vts[:, 2, 1] + vts[:, 0, 1]) * 0.5
         return cellxy
 
     def get_gridprops(self):
@@ -1249,23 +1171,18 @@ class Gridgen(object):
 
         # vertices -- not optimized for redundant vertices yet
         nvert = nodes * 4
-        vertices = []
-        ivert = 0
-        for n in range(nodes):
-            vs = self.get_vertices(n)
-            for x, y in vs[:-1]:  # do not include last vertex
-                vertices.append([ivert, x, y])
-                ivert += 1
+        vts = self._get_cell_vertices()[:nodes].reshape(nvert, 2)
+        vertices = [list(v) for v in zip(range(nvert), vts[:, 0].tolist(),
+                                         vts[:, 1].tolist())]
         gridprops['nvert'] = nvert
         gridprops['vertices'] = vertices
 
         # cell2d information
-        cell2d = []
-        iv = 1
-        for n in range(nodes):
-            xc, yc = self.get_center(n)
-            cell2d.append([n, xc, yc, 4, iv, iv + 1, iv + 2, iv + 3])
-            iv += 4
+        cellxy = self.get_cellxy(nodes)
+        iv = np.arange(nodes) * 4 + 1
+        cell2d = [[n, xc, yc, 4, i, i + 1, i + 2, i + 3] for n, xc, yc, i in
+                  zip(range(nodes), cellxy[:, 0].tolist(),
+                      cellxy[:, 1].tolist(), iv.tolist())]
         gridprops['cell2d'] = cell2d
 
         return gridprops
@@ -1362,13 +1279,8 @@ class Gridgen(object):
         gridprops['ncpl'] = ncpl
 
         # top
-        top = np.empty(ncpl, dtype=np.float32)
-        k = 0
-        fname = os.path.join(self.model_ws,
-                             'quadtreegrid.top{}.dat'.format(k + 1))
-        f = open(fname, 'r')
-        top = read1d(f, top)
-        f.close()
+        gp = self._load_gridprops()
+        top = gp['top'][:ncpl].copy()
         gridprops['top'] = top
 
         # botm
@@ -1376,13 +1288,7 @@ class Gridgen(object):
         istart = 0
         for k in range(nlay):
             istop = istart + nodelay[k]
-            fname = os.path.join(self.model_ws,
-                                 'quadtreegrid.bot{}.dat'.format(k + 1))
-            f = open(fname, 'r')
-            btk = np.empty((nodelay[k]), dtype=np.float32)
-            btk = read1d(f, btk)
-            f.close()
-            botm.append(btk)
+            botm.append(gp['bot'][istart:istop].copy())
             istart = istop
         gridprops['botm'] = botm
 
@@ -1393,13 +1299,15 @@ class Gridgen(object):
         verts, iverts = self.get_verts_iverts(ncpl)
 
         nvert = verts.shape[0]
-        vertices = [[i, verts[i, 0], verts[i, 1]] for i in range(nvert)]
+        vertices = [list(v) for v in zip(range(nvert), verts[:, 0].tolist(),
+                                         verts[:, 1].tolist())]
         gridprops['nvert'] = nvert
         gridprops['vertices'] = vertices
 
         # cell2d information
-        cell2d = [[n, cellxy[n, 0], cellxy[n, 1], len(ivs)] + ivs
-                  for n, ivs in enumerate(iverts)]
+        cell2d = [[n, xc, yc, len(ivs)] + ivs for n, xc, yc, ivs in
+                  zip(range(ncpl), cellxy[:, 0].tolist(),
+                      cellxy[:, 1].tolist(), iverts)]
         gridprops['cell2d'] = cell2d
 
         return gridprops
@@ -1483,8 +1391,9 @@ class Gridgen(object):
         if verbose:
             print('writing cell2d.')
         f.write('BEGIN CELL2D\n')
+        cellxy = self.get_cellxy(ncpl)
         for icell, icellverts in enumerate(iverts):
-            xc, yc = self.get_center(icell)
+            xc, yc = cellxy[icell]
             s = '  {} {} {} {}'.format(icell + 1, xc, yc, len(icellverts))
             for iv in icellverts:
                 s += ' {}'.format(iv + 1)
@@ -1496,7 +1405,7 @@ class Gridgen(object):
         f.close()
         return
 
-    def intersect(self, features, featuretype, layer):
+    def intersect(self, features, featuretype, layer, native=True):
         """
         Parameters
         ----------
@@ -1507,6 +1416,11 @@ class Gridgen(object):
             Must be either 'point', 'line', or 'polygon'
         layer : int
             Layer (zero based) to intersect with.  Zero based.
+        native : bool
+            If True, the features are intersected with the cells of the
+            layer in-process by flopy.utils.gridintersect.GridIntersect.
+            If False, the features are written to a shapefile and
+            intersected by the gridgen executable. (default is True)
 
         Returns
         -------
@@ -1514,6 +1428,9 @@ class Gridgen(object):
             Recarray of the intersection properties.
 
         """
+        if native:
+            return self._intersect_native(features, featuretype, layer)
+
         ifname = 'intersect_feature'
         if isinstance(features, list):
             ifname_w_path = os.path.join(self.model_ws, ifname)
@@ -1568,6 +1485,41 @@ class Gridgen(object):
         result['nodenumber'] -= 1
         return result
 
+    def _intersect_native(self, features, featuretype, layer):
+        """
+        Intersect features with the cells of a layer using GridIntersect.
+        The cell polygons of the layer are indexed on first use and kept
+        for later intersections.
+        """
+        featuretype = featuretype.lower()
+        if featuretype not in ['point', 'line', 'polygon']:
+            raise Exception('Unrecognized feature type: {}'.format(
+                featuretype))
+        if not isinstance(features, list):
+            sn = os.path.join(self.model_ws, features + '.shp')
+            assert os.path.isfile(sn), \
+                'Shapefile does not exist: {}'.format(sn)
+            sf = shapefile.Reader(sn)
+            features = []
+            for shape in sf.shapes():
+                if featuretype == 'point':
+                    features.append(shape.points[0])
+                else:
+                    parts = list(shape.parts) + [len(shape.points)]
+                    features.append([shape.points[i0:i1] for i0, i1 in
+                                     zip(parts[:-1], parts[1:])])
+            sf = None
+
+        if layer not in self._intersectors:
+            istart = self.nodelay[:layer].sum()
+            nodes = np.arange(istart, istart + self.nodelay[layer])
+            # drop the closing vertex of the cell polygons
+            xv = [[v[0] for v in self._vertdict[n][:-1]] for n in nodes]
+            yv = [[v[1] for v in self._vertdict[n][:-1]] for n in nodes]
+            self._intersectors[layer] = GridIntersect.from_vertices(
+                xv, yv, nodenumbers=nodes)
+        return self._intersectors[layer].intersect(features, featuretype)
+
     def _intersection_block(self, shapefile, featuretype, layer):
         s = ''
         s += 'BEGIN GRID_INTERSECTION intersect' + '\n'
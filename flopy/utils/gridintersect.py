@@ -0,0 +1,504 @@
+"""
+Module to intersect point, line and polygon features with the cells of
+a model grid without writing shapefiles or running external programs.
+
+"""
+import numpy as np
+
+from ..discretization.grid import CellIndex
+
+
+def _as_parts(feature):
+    """
+    Return a feature as a list of (npts, 2) arrays, one for each part of a
+    multipart line or each ring of a polygon.
+    """
+    if np.ndim(feature[0]) == 1:
+        feature = [feature]
+    return [np.asarray(part, dtype=float)[:, :2] for part in feature]
+
+
+def _crossings(xv, yv, px, py):
+    """
+    Strict (even-odd) point in polygon test by ray casting in the +x
+    direction. xv and yv are (n, nv + 1) closed polygons, px and py are
+    (n, m) points, returns (n, m) booleans.
+    """
+    xa, xb = xv[:, np.newaxis, :-1], xv[:, np.newaxis, 1:]
+    ya, yb = yv[:, np.newaxis, :-1], yv[:, np.newaxis, 1:]
+    px = px[:, :, np.newaxis]
+    py = py[:, :, np.newaxis]
+    crosses = (ya > py) != (yb > py)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        xcross = xa + (xb - xa) * (py - ya) / (yb - ya)
+    crosses &= px < xcross
+    return np.sum(crosses, axis=2) % 2 == 1
+
+
+def _segment_params(x0, y0, x1, y1, xa, ya, xb, yb):
+    """
+    Parameters t along segments (x0, y0)-(x1, y1) and u along edges
+    (xa, ya)-(xb, yb) of their intersection; nan if the segment and the
+    edge do not cross (or are parallel).
+    """
+    dx, dy = x1 - x0, y1 - y0
+    ex, ey = xb - xa, yb - ya
+    den = dx * ey - dy * ex
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t = ((xa - x0) * ey - (ya - y0) * ex) / den
+        u = ((xa - x0) * dy - (ya - y0) * dx) / den
+    # extra splits are harmless, so edges are extended by a small
+    # tolerance to keep crossings at their end points
+    valid = (den != 0.) & (u >= -1e-7) & (u <= 1. + 1e-7) & (t > 0.) & \
+            (t < 1.)
+    return np.where(valid, t, np.nan), np.where(valid, u, np.nan)
+
+
+def _split_intervals(t):
+    """
+    Sort the (n, m) split parameters t (nan for none) together with 0 and
+    1 and return the start and end of the (n, m + 1) intervals, with
+    nan for intervals that do not exist.
+    """
+    n = t.shape[0]
+    t = np.sort(np.column_stack((np.zeros(n), t, np.ones(n))), axis=1)
+    # nan's sort to the end, so the 1 is followed only by nan's
+    ta, tb = t[:, :-1], t[:, 1:]
+    valid = ~np.isnan(tb) & (tb > ta)
+    return np.where(valid, ta, np.nan), np.where(valid, tb, np.nan)
+
+
+class GridIntersect(object):
+    """
+    Intersect point, line and polygon features with the cells of a model
+    grid in-process.
+
+    Cells are found with the spatial index (CellIndex) of the grid, which
+    is cached with the grid geometry, and all of the feature and cell pairs
+    are intersected with array operations. The results are recarrays with
+    the same fields as the intersection files of gridgen:
+
+    * points: nodenumber, pointid, SHAPEID
+    * lines: nodenumber, arcid, length, starting_distance,
+      ending_distance, SHAPEID
+    * polygons: nodenumber, polyid, totalarea, SHAPEID
+
+    where nodenumber is the zero-based cell number in a layer, pointid,
+    arcid and polyid are the zero-based feature numbers and, for lines,
+    the distances are measured along the line. Lines on a cell edge are
+    assigned to the cell on their left, or to the cell on their right on
+    the outer boundary of the grid.
+
+    Parameters
+    ----------
+    mfgrid : flopy.discretization.Grid
+        structured, vertex or unstructured model grid. Features are in the
+        real-world coordinates of the grid.
+    cell_index : flopy.discretization.grid.CellIndex
+        spatial index of the cell polygons, used instead of mfgrid
+        (default is None)
+    nodenumbers : ndarray
+        node numbers of the cells of cell_index (default is None, the cell
+        numbers)
+
+    Examples
+    --------
+    >>> from flopy.utils.gridintersect import GridIntersect
+    >>> ix = GridIntersect(m.modelgrid)
+    >>> wells = ix.intersect_point([(100., 250.), (300., 80.)])
+    >>> river = ix.intersect_line([[(0., 0.), (500., 300.), (800., 300.)]])
+    >>> cells = ix.intersect_polygon([[(0, 0), (0, 500), (600, 0), (0, 0)]])
+
+    """
+
+    def __init__(self, mfgrid=None, cell_index=None, nodenumbers=None):
+        if cell_index is None:
+            if mfgrid is None:
+                raise ValueError('mfgrid or cell_index must be specified')
+            cell_index = mfgrid.cell_index
+        self.index = cell_index
+        if nodenumbers is None:
+            nodenumbers = np.arange(cell_index.ncells)
+        self.nodenumbers = np.asarray(nodenumbers)
+
+        # signed areas of the cells, to orient the cell edges
+        xv, yv = cell_index.xv, cell_index.yv
+        area = 0.5 * np.sum(xv[:, :-1] * yv[:, 1:] - xv[:, 1:] * yv[:, :-1],
+                            axis=1)
+        self.cell_area = np.abs(area)
+        self._cell_sign = np.where(area < 0., -1., 1.)
+
+    @classmethod
+    def from_vertices(cls, xvertices, yvertices, offsets=None,
+                      nodenumbers=None):
+        """
+        Create a GridIntersect from cell polygons
+
+        Parameters
+        ----------
+        xvertices : list of lists or ndarray
+            x-coordinates of the vertices of each cell
+        yvertices : list of lists or ndarray
+            y-coordinates of the vertices of each cell
+        offsets : ndarray
+            if specified, xvertices and yvertices are flat arrays of the
+            vertices of all cells, and the vertices of cell n are
+            xvertices[offsets[n]:offsets[n + 1]] (default is None)
+        nodenumbers : ndarray
+            node numbers of the cells (default is None, the cell numbers)
+
+        Returns
+        -------
+        GridIntersect
+
+        """
+        return cls(cell_index=CellIndex(xvertices, yvertices,
+                                        offsets=offsets),
+                   nodenumbers=nodenumbers)
+
+    def intersect(self, features, featuretype):
+        """
+        Intersect features with the grid
+
+        Parameters
+        ----------
+        features : list
+            list of points, lines, or polygons
+        featuretype : str
+            Must be 'point', 'line', or 'polygon'
+
+        Returns
+        -------
+        result : np.recarray
+            Recarray of the intersection properties.
+
+        """
+        featuretype = featuretype.lower()
+        if featuretype == 'point':
+            return self.intersect_point(features)
+        elif featuretype == 'line':
+            return self.intersect_line(features)
+        elif featuretype == 'polygon':
+            return self.intersect_polygon(features)
+        raise Exception('Unrecognized feature type: {}'.format(featuretype))
+
+    def intersect_point(self, points):
+        """
+        Find the cells containing points. Points on the edge of two cells
+        are assigned to the lowest cell number, points outside of the grid
+        are not in the result.
+
+        Parameters
+        ----------
+        points : list or ndarray
+            (x, y) points
+
+        Returns
+        -------
+        result : np.recarray
+            nodenumber, pointid and SHAPEID of each point in the grid
+
+        """
+        points = np.asarray(points, dtype=float).reshape(-1, 2)
+        icell = self.index.intersect(points[:, 0], points[:, 1])
+        pointid = np.where(icell >= 0)[0]
+        dtype = [('nodenumber', int), ('pointid', int), ('SHAPEID', int)]
+        result = np.empty(len(pointid), dtype=dtype)
+        result['nodenumber'] = self.nodenumbers[icell[pointid]]
+        result['pointid'] = pointid
+        result['SHAPEID'] = pointid
+        return result.view(np.recarray)
+
+    def intersect_line(self, lines):
+        """
+        Find the cells crossed by lines and the length of the lines in each
+        cell.
+
+        Parameters
+        ----------
+        lines : list
+            list of lines, each a list of (x, y) vertices or a list of parts
+            of (x, y) vertices
+
+        Returns
+        -------
+        result : np.recarray
+            nodenumber, arcid, length, starting_distance, ending_distance
+            and SHAPEID of each piece of a line in a cell, sorted by
+            arcid and starting_distance
+
+        """
+        # all segments of all lines
+        x0, y0, x1, y1, arcid = [], [], [], [], []
+        for i, line in enumerate(lines):
+            for part in _as_parts(line):
+                x0.append(part[:-1, 0])
+                y0.append(part[:-1, 1])
+                x1.append(part[1:, 0])
+                y1.append(part[1:, 1])
+                arcid.append(np.full(len(part) - 1, i, dtype=int))
+        x0, y0, x1, y1, arcid = [np.concatenate(v + [np.zeros(0)])
+                                 for v in (x0, y0, x1, y1, arcid)]
+        arcid = arcid.astype(int)
+        seglen = np.sqrt((x1 - x0) ** 2 + (y1 - y0) ** 2)
+        # distance along the line at the start of each segment
+        cumlen = np.cumsum(seglen)
+        first = np.searchsorted(arcid, arcid)
+        dstart = cumlen - seglen - (cumlen - seglen)[first]
+
+        iseg, icell, ta, tb = self._clip_segments(x0, y0, x1, y1,
+                                                    outer=True)
+        sd = dstart[iseg] + ta * seglen[iseg]
+        ed = dstart[iseg] + tb * seglen[iseg]
+        arc = arcid[iseg]
+
+        # join the pieces of a line that continue in the same cell
+        order = np.lexsort((sd, arc))
+        sd, ed, arc, icell = sd[order], ed[order], arc[order], icell[order]
+        tol = 1e-9 * max(1., seglen.max() if len(seglen) > 0 else 1.)
+        cont = np.zeros(len(sd), dtype=bool)
+        cont[1:] = (arc[1:] == arc[:-1]) & (icell[1:] == icell[:-1]) & \
+                   (np.abs(sd[1:] - ed[:-1]) <= tol)
+        group = np.cumsum(~cont) - 1
+        start = np.where(~cont)[0]
+        end = np.where(np.append(~cont[1:], True)[:len(sd)])[0]
+
+        dtype = [('nodenumber', int), ('arcid', int), ('length', float),
+                 ('starting_distance', float), ('ending_distance', float),
+                 ('SHAPEID', int)]
+        result = np.empty(len(start), dtype=dtype)
+        result['nodenumber'] = self.nodenumbers[icell[start]]
+        result['arcid'] = arc[start]
+        result['length'] = np.bincount(group, weights=ed - sd,
+                                       minlength=len(start))
+        result['starting_distance'] = sd[start]
+        result['ending_distance'] = ed[end]
+        result['SHAPEID'] = arc[start]
+        return result.view(np.recarray)
+
+    def intersect_polygon(self, polygons):
+        """
+        Find the cells overlapped by polygons and the area of the overlap.
+
+        Parameters
+        ----------
+        polygons : list
+            list of polygons, each a list of (x, y) vertices or a list of
+            rings (exterior and holes) of (x, y) vertices
+
+        Returns
+        -------
+        result : np.recarray
+            nodenumber, polyid, totalarea and SHAPEID of each cell
+            overlapped by a polygon, sorted by polyid and nodenumber
+
+        """
+        nodes, polyid, areas = [], [], []
+        for i, polygon in enumerate(polygons):
+            icell, area = self._polygon_areas(_as_parts(polygon))
+            nodes.append(icell)
+            areas.append(area)
+            polyid.append(np.full(len(icell), i, dtype=int))
+        icell = np.concatenate(nodes + [np.zeros(0, dtype=int)])
+        dtype = [('nodenumber', int), ('polyid', int), ('totalarea', float),
+                 ('SHAPEID', int)]
+        result = np.empty(len(icell), dtype=dtype)
+        result['nodenumber'] = self.nodenumbers[icell]
+        result['polyid'] = np.concatenate(polyid + [np.zeros(0, dtype=int)])
+        result['totalarea'] = np.concatenate(areas + [np.zeros(0)])
+        result['SHAPEID'] = result['polyid']
+        return result.view(np.recarray)
+
+    def _clip_segments(self, x0, y0, x1, y1, outer=False):
+        """
+        Pieces of segments inside of the cells. A piece on a cell edge is in
+        the cell if the cell is on its left or, if outer is True and there is
+        no cell on its left (on the outer boundary of the grid), on its
+        right.
+
+        Returns the segment, cell, and start and end parameters along the
+        segment of each piece.
+        """
+        iseg, icell = self.index.get_box_candidates(
+            np.minimum(x0, x1), np.maximum(x0, x1),
+            np.minimum(y0, y1), np.maximum(y0, y1))
+        nedge = self.index.xv.shape[1] - 1
+        result = [[], [], [], []]
+        right = [[], [], [], [], [], []]
+        chunk = max(1, 2 ** 20 // (nedge * (nedge + 1)))
+        for i0 in range(0, len(iseg), chunk):
+            s, c = iseg[i0:i0 + chunk], icell[i0:i0 + chunk]
+            xv, yv = self.index.xv[c], self.index.yv[c]
+            sx0, sy0 = x0[s][:, np.newaxis], y0[s][:, np.newaxis]
+            sx1, sy1 = x1[s][:, np.newaxis], y1[s][:, np.newaxis]
+            t, u = _segment_params(sx0, sy0, sx1, sy1, xv[:, :-1],
+                                   yv[:, :-1], xv[:, 1:], yv[:, 1:])
+            ta, tb = _split_intervals(t)
+            # test points just left and right of the middle of each interval
+            tm = 0.5 * (ta + tb)
+            dx, dy = sx1 - sx0, sy1 - sy0
+            eps = np.nan_to_num(1e-7 * (tb - ta))
+            mx = np.nan_to_num(sx0 + tm * dx)
+            my = np.nan_to_num(sy0 + tm * dy)
+            inside = _crossings(xv, yv, mx - eps * dy, my + eps * dx)
+            inside &= ~np.isnan(tm)
+            ipair, iint = np.nonzero(inside)
+            result[0].append(s[ipair])
+            result[1].append(c[ipair])
+            result[2].append(ta[ipair, iint])
+            result[3].append(tb[ipair, iint])
+            if outer:
+                # pieces on a cell edge with the cell on their right
+                onedge = _crossings(xv, yv, mx + eps * dy, my - eps * dx)
+                onedge &= ~inside & ~np.isnan(tm)
+                ipair, iint = np.nonzero(onedge)
+                right[0].append(s[ipair])
+                right[1].append(c[ipair])
+                right[2].append(ta[ipair, iint])
+                right[3].append(tb[ipair, iint])
+                right[4].append((mx - eps * dy)[ipair, iint])
+                right[5].append((my + eps * dx)[ipair, iint])
+        if outer:
+            right = [np.concatenate(r + [np.zeros(0, dtype=d)])
+                     for r, d in zip(right, (int, int) + 4 * (float,))]
+            keep = self.index.intersect(right[4], right[5]) < 0
+            for r, v in zip(result, right[:4]):
+                r.append(v[keep])
+        return [np.concatenate(r + [np.zeros(0, dtype=d)])
+                for r, d in zip(result, (int, int, float, float))]
+
+    def _polygon_areas(self, rings):
+        """
+        Areas of the overlap of a polygon with the cells, from the line
+        integral of x dy along the boundary of the overlap: the polygon
+        edges inside of a cell and the cell edges inside of the polygon.
+        """
+        # polygon edges, exterior rings counterclockwise and holes clockwise
+        pv = []
+        for i, ring in enumerate(rings):
+            if not np.allclose(ring[0], ring[-1]):
+                ring = np.vstack((ring, ring[:1]))
+            area = 0.5 * np.sum(ring[:-1, 0] * ring[1:, 1] -
+                                ring[1:, 0] * ring[:-1, 1])
+            others = [r for j, r in enumerate(rings) if j != i]
+            nin = sum(self._in_rings([r], ring[:1, 0], ring[:1, 1])[0]
+                      for r in others)
+            hole = nin % 2 == 1
+            if (area < 0.) != hole:
+                ring = ring[::-1]
+            pv.append(ring)
+        xa = np.concatenate([r[:-1, 0] for r in pv])
+        ya = np.concatenate([r[:-1, 1] for r in pv])
+        xb = np.concatenate([r[1:, 0] for r in pv])
+        yb = np.concatenate([r[1:, 1] for r in pv])
+        ncells = self.index.ncells
+        integral = np.zeros(ncells)
+
+        # polygon edges inside of the cells
+        iedge, icell, ta, tb = self._clip_segments(xa, ya, xb, yb)
+        dx, dy = (xb - xa)[iedge], (yb - ya)[iedge]
+        pxa, pya = xa[iedge] + ta * dx, ya[iedge] + ta * dy
+        pxb, pyb = xa[iedge] + tb * dx, ya[iedge] + tb * dy
+        integral += np.bincount(icell, weights=0.5 * (pxa + pxb) *
+                                (pyb - pya), minlength=ncells)
+        boundary = np.unique(icell)
+
+        # edges of the boundary cells inside of the polygon, split where
+        # polygon edges cross them
+        xv, yv = self.index.xv, self.index.yv
+        nedge = xv.shape[1] - 1
+        bcell = np.repeat(boundary, nedge)
+        k = np.tile(np.arange(nedge), len(boundary))
+        cxa, cya = xv[bcell, k], yv[bcell, k]
+        cxb, cyb = xv[bcell, k + 1], yv[bcell, k + 1]
+        # polygon edges whose bounding box overlaps the boundary cells
+        ipe, ic = self.index.get_box_candidates(
+            np.minimum(xa, xb), np.maximum(xa, xb),
+            np.minimum(ya, yb), np.maximum(ya, yb))
+        keep = np.isin(ic, boundary)
+        ipe, ic = ipe[keep], ic[keep]
+        row = np.searchsorted(boundary, ic)
+        # parameters along the cell edges of the crossings
+        ce = row[:, np.newaxis] * nedge + np.arange(nedge)
+        s, _ = _segment_params(cxa[ce], cya[ce], cxb[ce], cyb[ce],
+                               xa[ipe][:, np.newaxis], ya[ipe][:, np.newaxis],
+                               xb[ipe][:, np.newaxis], yb[ipe][:, np.newaxis])
+        valid = ~np.isnan(s)
+        splits = np.concatenate((np.zeros(len(bcell)), np.ones(len(bcell)),
+                                 s[valid]))
+        iedge = np.concatenate((np.arange(len(bcell)), np.arange(len(bcell)),
+                                ce[valid]))
+        order = np.lexsort((splits, iedge))
+        splits, iedge = splits[order], iedge[order]
+        same = iedge[1:] == iedge[:-1]
+        sa, sb, ie = splits[:-1][same], splits[1:][same], iedge[:-1][same]
+        piece = sb > sa
+        sa, sb, ie = sa[piece], sb[piece], ie[piece]
+        # pieces strictly inside of the polygon (on neither side of its
+        # boundary)
+        dx, dy = (cxb - cxa)[ie], (cyb - cya)[ie]
+        sm = 0.5 * (sa + sb)
+        mx, my = cxa[ie] + sm * dx, cya[ie] + sm * dy
+        eps = 1e-7 * (sb - sa)
+        inside = self._in_rings(pv, mx - eps * dy, my + eps * dx) & \
+                 self._in_rings(pv, mx + eps * dy, my - eps * dx)
+        sa, sb, ie = sa[inside], sb[inside], ie[inside]
+        dx, dy = dx[inside], dy[inside]
+        pxa, pya = cxa[ie] + sa * dx, cya[ie] + sa * dy
+        pxb, pyb = cxa[ie] + sb * dx, cya[ie] + sb * dy
+        integral += np.bincount(bcell[ie], weights=0.5 * (pxa + pxb) *
+                                (pyb - pya) * self._cell_sign[bcell[ie]],
+                                minlength=ncells)
+
+        # cells that are not crossed by the polygon boundary are entirely
+        # inside or outside of the polygon
+        _, cells = self.index.get_box_candidates(
+            np.array([xa.min()]), np.array([xa.max()]),
+            np.array([ya.min()]), np.array([ya.max()]))
+        cells = np.setdiff1d(cells, boundary)
+        nvert = np.sum((xv[cells, 1:] != xv[cells, :-1]) |
+                       (yv[cells, 1:] != yv[cells, :-1]), axis=1)
+        nvert = np.maximum(nvert, 1)
+        cx = np.sum(xv[cells, :-1] * (np.arange(nedge) <
+                                      nvert[:, np.newaxis]), axis=1) / nvert
+        cy = np.sum(yv[cells, :-1] * (np.arange(nedge) <
+                                      nvert[:, np.newaxis]), axis=1) / nvert
+        inside = self._in_rings(pv, cx, cy)
+        integral[cells[inside]] = self.cell_area[cells[inside]]
+
+        icell = np.where(integral > 1e-10 * self.cell_area)[0]
+        return icell, integral[icell]
+
+    @staticmethod
+    def _in_rings(rings, x, y):
+        """
+        Even-odd test of points x, y against all of the edges of closed
+        rings.
+        """
+        xr = np.concatenate([r[:, 0] if np.allclose(r[0], r[-1]) else
+                             np.append(r[:, 0], r[0, 0]) for r in rings] +
+                            [np.zeros(0)])
+        yr = np.concatenate([r[:, 1] if np.allclose(r[0], r[-1]) else
+                             np.append(r[:, 1], r[0, 1]) for r in rings] +
+                            [np.zeros(0)])
+        # edges between rings are made degenerate
+        nr = np.cumsum([len(r) + (0 if np.allclose(r[0], r[-1]) else 1)
+                        for r in rings])
+        brk = np.zeros(len(xr) - 1, dtype=bool) if len(xr) > 0 else \
+            np.zeros(0, dtype=bool)
+        brk[nr[:-1] - 1] = True
+        xa, xb = xr[:-1][~brk], xr[1:][~brk]
+        ya, yb = yr[:-1][~brk], yr[1:][~brk]
+        x = np.atleast_1d(x)
+        y = np.atleast_1d(y)
+        inside = np.zeros(len(x), dtype=bool)
+        chunk = max(1, 2 ** 20 // max(len(xa), 1))
+        for i0 in range(0, len(x), chunk):
+            px = x[i0:i0 + chunk, np.newaxis]
+            py = y[i0:i0 + chunk, np.newaxis]
+            crosses = (ya > py) != (yb > py)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                xcross = xa + (xb - xa) * (py - ya) / (yb - ya)
+            crosses &= px < xcross
+            inside[i0:i0 + chunk] = np.sum(crosses, axis=1) % 2 == 1
+        return inside
@@ -205,15 +205,24 @@ class Lgr(object):
             idomain array for the child model
 
         """
-        idomain = np.ones((self.nlay, self.nrow, self.ncol), dtype=np.int)
-        for kc in range(self.nlay):
-            for ic in range(self.nrow):
-                for jc in range(self.ncol):
-                    kp, ip, jp = self.get_parent_indices(kc, ic, jc)
-                    if self.idomain[kp, ip, jp] == 1:
-                        idomain[kc, ic, jc] = 0
+        kp, ip, jp = self._get_parent_index_arrays()
+        idomain = np.where(self.idomain[kp][:, ip][:, :, jp] == 1, 0, 1)
         return idomain
 
+    def _get_parent_index_arrays(self):
+        """
+        Parent layer of each child layer, parent row of each child row and
+        parent column of each child column (see get_parent_indices).
+
+        """
+        kp = np.zeros(self.nlay, dtype=int)
+        layers = np.arange(self.nplbeg, self.nplend + 1)
+        kplay = np.repeat(layers, self.ncppl[layers])[:self.nlay]
+        kp[:kplay.shape[0]] = kplay
+        ip = self.nprbeg + np.arange(self.nrow) // self.ncpp
+        jp = self.npcbeg + np.arange(self.ncol) // self.ncpp
+        return kp, ip, jp
+
     def get_parent_indices(self, kc, ic, jc):
         """
         Method returns the parent cell indices for this child.
@@ -280,20 +289,29 @@ class Lgr(object):
 
         return parentlist
 
-    def get_exchange_data(self, angldegx=False, cdist=False):
+    def get_exchange_data(self, angldegx=False, cdist=False, recarray=False):
         """
         Get the list of parent/child connections
 
         <cellidm1> <cellidm2> <ihc> <cl1> <cl2> <hwva> <angledegx>
 
+        Parameters
+        ----------
+        angldegx : bool
+            include the angle of the connections (default is False)
+        cdist : bool
+            include the distance between the cell centers (default is
+            False)
+        recarray : bool
+            return the connections as a recarray instead of a list
+            (default is False)
+
         Returns
         -------
-            exglist : list
+            exglist : list or np.recarray
                 list of connections between parent and child
 
         """
-
-        exglist = []
         nlayc = self.nlay
         nrowc = self.nrow
         ncolc = self.ncol
@@ -325,78 +343,100 @@ class Lgr(object):
 
         cidomain = self.get_idomain()
 
-        for kc in range(nlayc):
-            for ic in range(nrowc):
-                for jc in range(ncolc):
-                    plist = self.get_parent_connections(kc, ic, jc)
-                    for (kp, ip, jp), idir in plist:
-
-                        if cidomain[kc, ic, jc] == 0:
-                            continue
-
-                        # horizontal or vertical connection
-                        ihc = 1
-                        if self.ncppl[kp] > 1:
-                            ihc = 2
-                        if abs(idir) == 3:
-                            ihc = 0
-
-                        # angldegx
-                        angle = None
-                        if angldegx:
-                            angle = 180.  # -x, west
-                            if idir == 2:
-                                angle = 270.  # -y, south
-                            elif idir == -1:
-                                angle = 0.  # +x, east
-                            elif idir == -2:
-                                angle = 90.  # +y, north
-
-                        # vertical connection
-                        cl1 = None
-                        cl2 = None
-                        hwva = None
-
-                        tpp = topp[ip, jp]
-                        btp = botp[kp, ip, jp]
-                        if kp > 0:
-                            tpp = botp[kp - 1, ip, jp]
-
-                        tpc = topc[ic, jc]
-                        btc = botc[kc, ic, jc]
-                        if kc > 0:
-                            tpc = botc[kc - 1, ic, jc]
-
-                        if ihc == 0:
-                            cl1 = 0.5 * (tpp - btp)
-                            cl2 = 0.5 * (tpc - btc)
-                            hwva = delrc[jc] * delcc[ic]
-                        else:
-                            if abs(idir) == 1:
-                                cl1 = 0.5 * delrp[jp]
-                                cl2 = 0.5 * delrc[jc]
-                                hwva = delcc[ic]
-                            elif abs(idir) == 2:
-                                cl1 = 0.5 * delcp[ip]
-                                cl2 = 0.5 * delcc[ic]
-                                hwva = delrc[jc]
-
-                        # connection distance
-                        cd = None
-                        if cdist:
-                            if abs(idir) == 3:
-                                cd = cl1 + cl2
-                            else:
-                                x1 = xc[ic, jc]
-                                y1 = yc[ic, jc]
-                                x2 = xp[ip, jp]
-                                y2 = yp[ip, jp]
-                                cd = np.sqrt((x1 - x2) ** 2 + (y1 - y2) ** 2)
-
-                        exg = [(kp, ip, jp), (kc, ic, jc), ihc, cl1, cl2, hwva]
-                        if angldegx:
-                            exg.append(angle)
-                        if cdist:
-                            exg.append(cd)
-                        exglist.append(exg)
-        return exglist
+        # parent cell of every child cell, as (nlayc, nrowc, ncolc) arrays
+        kpl, ipr, jpc = self._get_parent_index_arrays()
+        shape = (nlayc, nrowc, ncolc)
+        kp = np.broadcast_to(kpl[:, np.newaxis, np.newaxis], shape)
+        ip = np.broadcast_to(ipr[np.newaxis, :, np.newaxis], shape)
+        jp = np.broadcast_to(jpc[np.newaxis, np.newaxis, :], shape)
+        kc = np.broadcast_to(np.arange(nlayc)[:, np.newaxis, np.newaxis],
+                             shape)
+        ic = np.broadcast_to(np.arange(nrowc)[np.newaxis, :, np.newaxis],
+                             shape)
+        jc = np.broadcast_to(np.arange(ncolc)[np.newaxis, np.newaxis, :],
+                             shape)
+
+        # connections to the parent cells to the left, right, back, front
+        # and bottom of the child cells on the faces of their parent cell,
+        # in the order of get_parent_connections
+        pidomain = np.pad(self.idomain, 1, mode='constant')
+        idirs = np.array([-1, 1, 2, -2, -3])
+        shifts = [(0, 0, -1), (0, 0, 1), (0, -1, 0), (0, 1, 0), (1, 0, 0)]
+        onface = [jc % self.ncpp == 0, (jc + 1) % self.ncpp == 0,
+                  ic % self.ncpp == 0, (ic + 1) % self.ncpp == 0,
+                  kc + 1 == self.ncppl[kp]]
+        mask = np.zeros(shape + (len(idirs),), dtype=bool)
+        for n, ((dk, di, dj), face) in enumerate(zip(shifts, onface)):
+            # the zero padding excludes parent cells outside of the grid
+            mask[..., n] = face & (cidomain != 0) & \
+                           (pidomain[kp + 1 + dk, ip + 1 + di,
+                                     jp + 1 + dj] != 0)
+        kc, ic, jc, idx = np.nonzero(mask)
+        idir = idirs[idx]
+        kp = kpl[kc] + np.array([s[0] for s in shifts])[idx]
+        ip = ipr[ic] + np.array([s[1] for s in shifts])[idx]
+        jp = jpc[jc] + np.array([s[2] for s in shifts])[idx]
+
+        # horizontal or vertical connection
+        ihc = np.where(self.ncppl[kp] > 1, 2, 1)
+        vertical = np.abs(idir) == 3
+        ihc[vertical] = 0
+
+        # cl1, cl2 and hwva
+        column = np.abs(idir) == 1
+        row = np.abs(idir) == 2
+        cl1 = np.empty(len(idir), dtype=float)
+        cl2 = np.empty(len(idir), dtype=float)
+        hwva = np.empty(len(idir), dtype=float)
+        cl1[column] = 0.5 * delrp[jp[column]]
+        cl2[column] = 0.5 * delrc[jc[column]]
+        hwva[column] = delcc[ic[column]]
+        cl1[row] = 0.5 * delcp[ip[row]]
+        cl2[row] = 0.5 * delcc[ic[row]]
+        hwva[row] = delrc[jc[row]]
+        k, i, j = kp[vertical], ip[vertical], jp[vertical]
+        tpp = np.where(k > 0, botp[k - 1, i, j], topp[i, j])
+        cl1[vertical] = 0.5 * (tpp - botp[k, i, j])
+        k, i, j = kc[vertical], ic[vertical], jc[vertical]
+        tpc = np.where(k > 0, botc[k - 1, i, j], topc[i, j])
+        cl2[vertical] = 0.5 * (tpc - botc[k, i, j])
+        hwva[vertical] = delrc[j] * delcc[i]
+
+        dtype = [('cellidm1', object), ('cellidm2', object), ('ihc', int),
+                 ('cl1', float), ('cl2', float), ('hwva', float)]
+        if angldegx:
+            dtype.append(('angldegx', float))
+        if cdist:
+            dtype.append(('cdist', float))
+        exgdata = np.recarray(len(idir), dtype=dtype)
+        exgdata['cellidm1'] = list(zip(kp.tolist(), ip.tolist(),
+                                       jp.tolist()))
+        exgdata['cellidm2'] = list(zip(kc.tolist(), ic.tolist(),
+                                       jc.tolist()))
+        exgdata['ihc'] = ihc
+        exgdata['cl1'] = cl1
+        exgdata['cl2'] = cl2
+        exgdata['hwva'] = hwva
+
+        # angldegx
+        if angldegx:
+            angle = np.full(len(idir), 180.)  # -x, west
+            angle[idir == 2] = 270.  # -y, south
+            angle[idir == -1] = 0.  # +x, east
+            angle[idir == -2] = 90.  # +y, north
+            exgdata['angldegx'] = angle
+
+        # connection distance
+        if cdist:
+            cd = cl1 + cl2
+            h = ~vertical
+            x1 = xc[ic[h], jc[h]]
+            y1 = yc[ic[h], jc[h]]
+            x2 = xp[ip[h], jp[h]]
+            y2 = yp[ip[h], jp[h]]
+            cd[h] = np.sqrt((x1 - x2) ** 2 + (y1 - y2) ** 2)
+            exgdata['cdist'] = cd
+
+        if recarray:
+            return exgdata
+        return [list(exg) for exg in exgdata.tolist()]
@@ -369,6 +369,258 @@ class MfGrdFile(FlopyBinaryData):
                 raise KeyError(msg)
         return
 
+    @property
+    def ia(self):
+        """
+        Zero-based index of the first connection of each cell in ja.
+
+        """
+        return self._datadict['IA'] - 1
+
+    @property
+    def ja(self):
+        """
+        Zero-based cell numbers of the connections of each cell. The first
+        connection of a cell is the cell itself.
+
+        """
+        return self._datadict['JA'] - 1
+
+    @property
+    def nodes(self):
+        """
+        Number of cells in the model grid.
+
+        """
+        return self._datadict['IA'].shape[0] - 1
+
+    @property
+    def shape(self):
+        """
+        Shape of the model grid: (nlay, nrow, ncol) for DIS grids,
+        (nlay, ncpl) for DISV grids and (nodes,) for DISU grids.
+
+        """
+        if self._grid == 'DIS':
+            return (self._datadict['NLAY'], self._datadict['NROW'],
+                    self._datadict['NCOL'])
+        elif self._grid == 'DISV':
+            return (self._datadict['NLAY'], self._datadict['NCPL'])
+        return (self.nodes,)
+
+    def get_cell_top_bottom(self):
+        """
+        Get the top and bottom elevation of every cell in the model grid.
+
+        Returns
+        -------
+        top, bot : np.ndarray
+            one-dimensional arrays of length nodes
+
+        """
+        if self._grid == 'DISU':
+            top = np.ravel(self._datadict['TOP']).astype(float)
+            bot = np.ravel(self._datadict['BOT']).astype(float)
+        else:
+            top = np.ravel(self._datadict['TOP']).astype(float)
+            bot = np.ravel(self._datadict['BOTM']).astype(float)
+            top = np.concatenate((top, bot[:-top.shape[0]]))
+        return top, bot
+
+    def _get_cell_polygons(self):
+        """
+        Get the cell polygons in model coordinates as compressed arrays.
+
+        Returns
+        -------
+        offsets : np.ndarray
+            start of the vertices of each polygon in x and y
+        x, y : np.ndarray
+            polygon vertices, without the closing vertex
+        icpl : np.ndarray
+            polygon number of every cell in the model grid
+
+        """
+        if self._grid == 'DIS':
+            nrow, ncol = self._datadict['NROW'], self._datadict['NCOL']
+            delr, delc = self._datadict['DELR'], self._datadict['DELC']
+            xe = np.append(0., np.cumsum(delr))
+            ye = np.append(0., np.cumsum(delc))
+            ye = ye[-1] - ye
+            i, j = np.divmod(np.arange(nrow * ncol), ncol)
+            x = np.column_stack((xe[j], xe[j + 1], xe[j + 1], xe[j]))
+            y = np.column_stack((ye[i], ye[i], ye[i + 1], ye[i + 1]))
+            offsets = np.arange(0, 4 * (nrow * ncol + 1), 4)
+            icpl = np.arange(self.nodes) % (nrow * ncol)
+            return offsets, x.ravel(), y.ravel(), icpl
+
+        iavert = self._datadict['IAVERT'] - 1
+        javert = self._datadict['JAVERT'] - 1
+        verts = self._datadict['VERTICES'].reshape(
+            self._recorddict['VERTICES'][2])
+        npoly = iavert.shape[0] - 1
+        # drop the closing vertex of closed polygons
+        keep = np.ones(javert.shape[0], dtype=bool)
+        first, last = iavert[:-1], iavert[1:] - 1
+        closed = (last > first) & (javert[last] == javert[first])
+        keep[last[closed]] = False
+        poly = np.repeat(np.arange(npoly), np.diff(iavert))
+        ivert = javert[keep]
+        offsets = np.append(0, np.cumsum(np.bincount(poly[keep],
+                                                     minlength=npoly)))
+        if self._grid == 'DISV':
+            icpl = np.arange(self.nodes) % npoly
+        else:
+            icpl = np.arange(self.nodes)
+        return offsets, verts[ivert, 0], verts[ivert, 1], icpl
+
+    def _get_cell_centers(self):
+        """
+        Get the x, y cell centers in model coordinates of every polygon.
+
+        """
+        if self._grid == 'DIS':
+            delr, delc = self._datadict['DELR'], self._datadict['DELC']
+            xc = np.cumsum(delr) - 0.5 * delr
+            yc = np.cumsum(delc) - 0.5 * delc
+            yc = delc.sum() - yc
+            xc, yc = np.meshgrid(xc, yc)
+            return xc.ravel(), yc.ravel()
+        return self._datadict['CELLX'], self._datadict['CELLY']
+
+    def get_connection_geometry(self, ihc=None):
+        """
+        Get the geometry of the cell connections in ja. The geometry is
+        derived from the cell polygons and elevations once and cached on
+        the MfGrdFile object. The width of horizontal connections is the
+        length of the polygon edges shared by the two cells (or the square
+        root of the smallest cell area if the cells do not share an edge)
+        and the area of vertical connections is the smallest of the two
+        cell areas. The direction of horizontal connections is normal to
+        the shared edges.
+
+        Parameters
+        ----------
+        ihc : array-like
+            connection type of every entry in ja (0 for vertical
+            connections), as specified in the DISU package. Only used for
+            DISU grids; if not specified, DISU connections between cells
+            that do not overlap in elevation or that have the same cell
+            center are vertical. (default is None)
+
+        Returns
+        -------
+        geom : np.recarray
+            recarray with one record per connection (excluding the
+            connection of a cell with itself) and fields ipos (position in
+            ja and in FLOW-JA-FACE records), node, conn (zero-based cell
+            numbers), ihc (0 for vertical connections), hwva (horizontal
+            width or vertical area) and ux, uy, uz (unit vector from node
+            towards conn in model coordinates)
+
+        Examples
+        --------
+        >>> import flopy
+        >>> gobj = flopy.utils.MfGrdFile('test.dis.grb')
+        >>> geom = gobj.get_connection_geometry()
+
+        """
+        if ihc is None and \
+                getattr(self, '_connection_geometry', None) is not None:
+            return self._connection_geometry
+
+        ia, ja = self.ia, self.ja
+        node = np.repeat(np.arange(self.nodes), np.diff(ia))
+        ipos = np.nonzero(node != ja)[0]
+        node, conn = node[ipos], ja[ipos]
+
+        top, bot = self.get_cell_top_bottom()
+        offsets, x, y, icpl = self._get_cell_polygons()
+        xc, yc = self._get_cell_centers()
+        pn, pm = icpl[node], icpl[conn]
+        if self._grid != 'DISU':
+            ihc = (pn != pm).astype(int)
+        elif ihc is not None:
+            ihc = (np.ravel(ihc)[ipos] != 0).astype(int)
+        else:
+            overlap = np.minimum(top[node], top[conn]) - \
+                      np.maximum(bot[node], bot[conn])
+            ihc = ((overlap > 0.) & ((xc[pn] != xc[pm]) |
+                                     (yc[pn] != yc[pm]))).astype(int)
+
+        npoly = offsets.shape[0] - 1
+        poly = np.repeat(np.arange(npoly), np.diff(offsets))
+        inext = np.arange(x.shape[0]) + 1
+        inext[offsets[1:] - 1] = offsets[:-1]
+
+        # polygon areas (shoelace) and outward normals of the edges, with
+        # the length of the edge
+        sarea = np.bincount(poly, x * y[inext] - x[inext] * y,
+                            minlength=npoly) / 2.
+        area = np.abs(sarea)
+        winding = np.where(sarea[poly] < 0., -1., 1.)
+        nx = winding * (y[inext] - y)
+        ny = winding * (x - x[inext])
+
+        # match the edges shared by two polygons
+        tol = 1e-9 * max(np.ptp(x), np.ptp(y), 1.)
+        xy0 = np.round(np.column_stack((x, y)) / tol).astype(np.int64)
+        xy1 = xy0[inext]
+        swap = (xy0[:, 0] > xy1[:, 0]) | ((xy0[:, 0] == xy1[:, 0]) &
+                                          (xy0[:, 1] > xy1[:, 1]))
+        edges = np.where(swap[:, None], np.hstack((xy1, xy0)),
+                         np.hstack((xy0, xy1)))
+        ok = np.any(xy0 != xy1, axis=1)
+        edges, nx, ny, epoly = edges[ok], nx[ok], ny[ok], poly[ok]
+        inv = np.unique(edges, axis=0, return_inverse=True)[1].ravel()
+        order = np.argsort(inv, kind='stable')
+        inv, epoly, nx, ny = inv[order], epoly[order], nx[order], ny[order]
+        shared = inv[1:] == inv[:-1]
+        pa, pb = epoly[:-1][shared], epoly[1:][shared]
+        # normals point from the lowest to the highest polygon number
+        sign = np.where(pa < pb, 1., -1.)
+        pairs = np.minimum(pa, pb) * npoly + np.maximum(pa, pb)
+        pairs, ipair = np.unique(pairs, return_inverse=True)
+        npair = pairs.shape[0]
+        widths = np.bincount(ipair, np.hypot(nx[:-1], ny[:-1])[shared],
+                             minlength=npair)
+        pnx = np.bincount(ipair, sign * nx[:-1][shared], minlength=npair)
+        pny = np.bincount(ipair, sign * ny[:-1][shared], minlength=npair)
+
+        # unit vectors from node towards conn, normal to the shared edges
+        # or along the line between the cell centers
+        dx, dy = xc[pm] - xc[pn], yc[pm] - yc[pn]
+        minarea = np.minimum(area[pn], area[pm])
+        width = np.sqrt(minarea)
+        if npair > 0:
+            key = np.minimum(pn, pm) * npoly + np.maximum(pn, pm)
+            idx = np.minimum(np.searchsorted(pairs, key), npair - 1)
+            found = pairs[idx] == key
+            idx = idx[found]
+            width[found] = widths[idx]
+            sign = np.where(pn < pm, 1., -1.)[found]
+            dx[found] = sign * pnx[idx]
+            dy[found] = sign * pny[idx]
+        hwva = np.where(ihc > 0, width, minarea)
+
+        dist = np.hypot(dx, dy)
+        dist[dist == 0.] = 1.
+        dz = 0.5 * (top[conn] + bot[conn] - top[node] - bot[node])
+        horizontal = ihc > 0
+        ux = np.where(horizontal, dx / dist, 0.)
+        uy = np.where(horizontal, dy / dist, 0.)
+        uz = np.where(horizontal, 0., np.sign(dz))
+
+        dtype = np.dtype([('ipos', int), ('node', int), ('conn', int),
+                          ('ihc', int), ('hwva', float), ('ux', float),
+                          ('uy', float), ('uz', float)])
+        geom = np.empty(node.shape[0], dtype=dtype)
+        for name, a in zip(dtype.names, (ipos, node, conn, ihc, hwva,
+                                         ux, uy, uz)):
+            geom[name] = a
+        self._connection_geometry = geom.view(np.recarray)
+        return self._connection_geometry
+
     def _set_spatialreference(self):
         """
         Define structured or unstructured spatial reference based on
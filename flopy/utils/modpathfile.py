@@ -18,6 +18,29 @@ from ..utils.flopy_io import loadtxt
 from ..utils.recarray_utils import ra_slice
 
 
+def _get_particle_data(data, outdtype, nid, totim=None, ge=True,
+                       to_recarray=False):
+    """
+    Sort pathline or timeseries data by particle id once and split it into
+    a recarray for each particle in nid.
+
+    """
+    if totim is not None:
+        if ge:
+            data = data[data['time'] >= totim]
+        else:
+            data = data[data['time'] <= totim]
+    # a stable sort keeps the order of the points in each particle
+    data = data[np.argsort(data['particleid'], kind='mergesort')]
+    ra = np.rec.fromarrays([data[name] for name in outdtype.names],
+                           dtype=outdtype)
+    if to_recarray:
+        return ra
+    i0 = np.searchsorted(ra['particleid'], nid, side='left')
+    i1 = np.searchsorted(ra['particleid'], nid, side='right')
+    return [ra[s:e] for s, e in zip(i0, i1)]
+
+
 class PathlineFile():
     """
     PathlineFile Class.
@@ -294,7 +317,7 @@ class PathlineFile():
         return np.rec.fromarrays((self._ta[name] for name in names),
                                  dtype=self.outdtype)
 
-    def get_alldata(self, totim=None, ge=True):
+    def get_alldata(self, totim=None, ge=True, to_recarray=False):
         """
         get pathline data from the pathline file for all pathlines and all times.
 
@@ -308,6 +331,11 @@ class PathlineFile():
             Boolean that determines if pathline times greater than or equal
             to or less than or equal to totim is used to create a subset
             of pathlines. Default is True.
+        to_recarray : bool
+            Boolean that controls returned plist. If to_recarray is True,
+            a single recarray with all of the pathlines sorted by
+            particleid is returned. The single recarray can be passed
+            directly to PlotMapView.plot_pathline(). Default is False.
 
         Returns
         ----------
@@ -330,11 +358,8 @@ class PathlineFile():
         >>> p = pthobj.get_alldata()
 
         """
-        # plist = []
-        # for partid in self.nid:
-        #     plist.append(self.get_data(partid=partid, totim=totim, ge=ge))
-        return [self.get_data(partid=partid, totim=totim, ge=ge)
-                for partid in self.nid]
+        return _get_particle_data(self._data, self.outdtype, self.nid,
+                                  totim=totim, ge=ge, to_recarray=to_recarray)
 
     def get_destination_pathline_data(self, dest_cells, to_recarray=False):
         """
@@ -1264,7 +1289,7 @@ class TimeseriesFile():
         return np.rec.fromarrays((self._ta[name] for name in names),
                                  dtype=self.outdtype)
 
-    def get_alldata(self, totim=None, ge=True):
+    def get_alldata(self, totim=None, ge=True, to_recarray=False):
         """
         get timeseries data from the timeseries file for all timeseries
         and all times.
@@ -1279,6 +1304,10 @@ class TimeseriesFile():
             Boolean that determines if timeseries times greater than or equal
             to or less than or equal to totim is used to create a subset
             of timeseries. Default is True.
+        to_recarray : bool
+            Boolean that controls returned tlist. If to_recarray is True,
+            a single recarray with all of the timeseries sorted by
+            particleid is returned. Default is False.
 
         Returns
         ----------
@@ -1301,8 +1330,8 @@ class TimeseriesFile():
         >>> ts = tsobj.get_alldata()
 
         """
-        return [self.get_data(partid=partid, totim=totim, ge=ge)
-                for partid in self.nid]
+        return _get_particle_data(self._data, self.outdtype, self.nid,
+                                  totim=totim, ge=ge, to_recarray=to_recarray)
 
     def get_destination_timeseries_data(self, dest_cells):
         """
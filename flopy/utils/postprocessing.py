@@ -1,4 +1,5 @@
 import numpy as np
+from .utils_def import RunningStats, pool_imap
 
 
 def get_transmissivities(heads, m,
@@ -38,6 +39,108 @@ def get_transmissivities(heads, m,
     T : 2D array of same shape as heads (nlay x n locations)
         Transmissivities in each layer at each location
 
+    """
+    r, c, hk, opentop, openbot = _get_open_intervals(m, r, c, x, y,
+                                                     sctop, scbot)
+
+    if heads.shape == (m.nlay, m.nrow, m.ncol):
+        heads = heads[:, r, c]
+
+    msg = 'Shape of heads array must be nlay x nhyd'
+    assert heads.shape == opentop.shape, msg
+
+    return _get_open_interval_transmissivities(heads, hk, opentop, openbot,
+                                               nodata)
+
+
+def get_transmissivities_batch(heads, m,
+                               r=None, c=None, x=None, y=None,
+                               sctop=None, scbot=None, nodata=-999,
+                               per_idx=None, fractions=False):
+    """
+    Computes transmissivity in each model layer at specified locations and
+    open intervals for many times, as get_transmissivities does for a
+    single time. The open interval of each location in each layer is
+    determined once and the heads of all times are processed at once.
+
+    Parameters
+    ----------
+    heads : 3D array OR 4D array
+        numpy array of shape ntimes by nlay by n locations (3D) OR complete
+        heads array of the model for all times (4D), for example the
+        memory-mapped array returned by HeadFile.get_memmap(), from which
+        only the heads at the locations are read
+    m : flopy.modflow.Modflow object
+        Must have dis, sr, and lpf or upw packages.
+    r : 1D array-like of ints, of length n locations
+        row indices (optional; alternately specify x, y)
+    c : 1D array-like of ints, of length n locations
+        column indices (optional; alternately specify x, y)
+    x : 1D array-like of floats, of length n locations
+        x locations in real world coordinates (optional)
+    y : 1D array-like of floats, of length n locations
+        y locations in real world coordinates (optional)
+    sctop : 1D array-like of floats, of length n locations
+        open interval tops (optional; default is model top)
+    scbot : 1D array-like of floats, of length n locations
+        open interval bottoms (optional; default is model bottom)
+    nodata : numeric
+        optional; locations where heads=nodata will be assigned T=0
+    per_idx : int or sequence of ints
+        times to return. If None, returns all times (default).
+    fractions : bool
+        If True, return the fraction of the transmissivity of the open
+        interval in each layer (for example, to distribute the pumping rate
+        of a well over the layers) instead of the transmissivities.
+        (default is False)
+
+    Returns
+    -------
+    T : 3D array of shape ntimes x nlay x n locations
+        Transmissivities (or transmissivity fractions) in each layer at each
+        location and time
+
+    """
+    r, c, hk, opentop, openbot = _get_open_intervals(m, r, c, x, y,
+                                                     sctop, scbot)
+    nlay, nloc = opentop.shape
+    if per_idx is None:
+        per_idx = np.arange(heads.shape[0])
+    else:
+        per_idx = np.array(per_idx, ndmin=1)
+
+    if heads.ndim == 4:
+        # read the heads at the locations only
+        k = np.arange(nlay)[:, None]
+        def get_heads(idx):
+            return heads[idx[:, None, None], k, r, c]
+    else:
+        def get_heads(idx):
+            return np.asarray(heads[idx])
+        msg = 'Shape of heads array must be ntimes x nlay x nhyd'
+        assert heads.shape[1:] == opentop.shape, msg
+
+    # process the times in chunks of about 1e7 values
+    T = np.empty((per_idx.shape[0], nlay, nloc), dtype=float)
+    nchunk = max(1, int(1e7 // max(nlay * nloc, 1)))
+    for i0 in range(0, per_idx.shape[0], nchunk):
+        i1 = min(i0 + nchunk, per_idx.shape[0])
+        T[i0:i1] = _get_open_interval_transmissivities(
+            get_heads(per_idx[i0:i1]), hk, opentop, openbot, nodata)
+
+    if fractions:
+        total = T.sum(axis=1, keepdims=True)
+        T = np.divide(T, total, out=np.zeros_like(T), where=total > 0.)
+    return T
+
+
+def _get_open_intervals(m, r=None, c=None, x=None, y=None,
+                        sctop=None, scbot=None):
+    """
+    Get the rows, columns, horizontal hydraulic conductivities and the
+    tops and bottoms of the open intervals in each model layer (nlay x n
+    locations) for get_transmissivities.
+
     """
     if r is not None and c is not None:
         pass
@@ -46,6 +149,8 @@ def get_transmissivities(heads, m,
         r, c = m.sr.get_ij(x, y)
     else:
         raise ValueError('Must specify row, column or x, y locations.')
+    r = np.atleast_1d(r)
+    c = np.atleast_1d(c)
 
     # get k-values and botms at those locations
     paklist = m.get_package_list()
@@ -58,12 +163,6 @@ def get_transmissivities(heads, m,
 
     botm = m.dis.botm.array[:, r, c]
 
-    if heads.shape == (m.nlay, m.nrow, m.ncol):
-        heads = heads[:, r, c]
-
-    msg = 'Shape of heads array must be nlay x nhyd'
-    assert heads.shape == botm.shape, msg
-
     # set open interval tops/bottoms to model top/bottom if None
     if sctop is None:
         sctop = m.dis.top.array[r, c]
@@ -75,39 +174,34 @@ def get_transmissivities(heads, m,
     tops[0, :] = m.dis.top.array[r, c]
     tops[1:, :] = botm[:-1]
 
-    # expand top and bottom arrays to be same shape as botm, thickness, etc.
-    # (so we have an open interval value for each layer)
-    sctoparr = np.zeros(botm.shape)
-    sctoparr[:] = sctop
-    scbotarr = np.zeros(botm.shape)
-    scbotarr[:] = scbot
+    # set tops above screen top to screen top and
+    # bottoms below screen bottom to screen bottom
+    opentop = np.minimum(tops, np.asarray(sctop, dtype=float))
+    openbot = np.maximum(botm, np.asarray(scbot, dtype=float)).astype(
+        botm.dtype)
+    return r, c, hk, opentop, openbot
 
-    # start with layer tops
-    # set tops above heads to heads
-    # set tops above screen top to screen top
-    # (we only care about the saturated open interval)
-    openinvtop = tops.copy()
-    openinvtop[openinvtop > heads] = heads[openinvtop > heads]
-    openinvtop[openinvtop > sctoparr] = sctoparr[openinvtop > sctop]
 
-    # start with layer bottoms
-    # set bottoms below screened interval to screened interval bottom
-    # set screen bottoms below bottoms to layer bottoms
-    openinvbotm = botm.copy()
-    openinvbotm[openinvbotm < scbotarr] = scbotarr[openinvbotm < scbot]
-    openinvbotm[scbotarr < botm] = botm[scbotarr < botm]
+def _get_open_interval_transmissivities(heads, hk, opentop, openbot,
+                                        nodata):
+    """
+    Compute the transmissivities of the saturated open intervals for heads
+    of shape (..., nlay, n locations).
 
-    # compute thickness of open interval in each layer
-    thick = openinvtop - openinvbotm
+    """
+    # set tops above heads to heads
+    # (we only care about the saturated open interval)
+    thick = np.fmin(opentop, heads) - openbot
 
     # assign open intervals above or below model to closest cell in column
-    not_in_layer = np.sum(thick < 0, axis=0)
-    not_in_any_layer = not_in_layer == thick.shape[0]
-    for i, n in enumerate(not_in_any_layer):
-        if n:
-            closest = np.argmax(thick[:, i])
-            thick[closest, i] = 1.
-    thick[thick < 0] = 0
+    not_in_any_layer = np.all(thick < 0, axis=-2)
+    if np.any(not_in_any_layer):
+        columns = np.moveaxis(thick, -2, -1)[not_in_any_layer]
+        closest = np.zeros_like(columns)
+        closest[np.arange(columns.shape[0]), np.argmax(columns, axis=1)] = 1.
+    np.maximum(thick, 0., out=thick)
+    if np.any(not_in_any_layer):
+        np.moveaxis(thick, -2, -1)[not_in_any_layer] = closest
     thick[heads == nodata] = 0  # exclude nodata cells
 
     # compute transmissivities
@@ -144,17 +238,7 @@ def get_water_table(heads, nodata, per_idx=None):
         per_idx = [per_idx]
     wt = []
     for per in per_idx:
-        wt_per = []
-        for i in range(nrow):
-            for j in range(ncol):
-                for k in range(nlay):
-                    if heads[per, k, i, j] != nodata:
-                        wt_per.append(heads[per, k, i, j])
-                        break
-                    elif k == nlay - 1:
-                        wt_per.append(nodata)
-        assert len(wt_per) == nrow * ncol
-        wt.append(np.reshape(wt_per, (nrow, ncol)))
+        wt.append(_get_water_table(heads[per], nodata))
     return np.squeeze(wt)
 
 
@@ -180,8 +264,7 @@ def get_saturated_thickness(heads, m, nodata, per_idx=None):
     sat_thickness : 3 or 4-D np.ndarray
         Array of saturated thickness
     """
-    # internal calculations done on a masked array
-    heads = np.ma.array(heads, ndmin=4, mask=heads == nodata)
+    heads = np.array(heads, ndmin=4)
     botm = m.dis.botm.array
     thickness = m.dis.thickness.array
     nper, nlay, nrow, ncol = heads.shape
@@ -192,12 +275,8 @@ def get_saturated_thickness(heads, m, nodata, per_idx=None):
 
     sat_thickness = []
     for per in per_idx:
-        hds = heads[per]
-        perthickness = hds - botm
-        conf = perthickness > thickness
-        perthickness[conf] = thickness[conf]
-        # convert to nan-filled array, as is expected(!?)
-        sat_thickness.append(perthickness.filled(np.nan))
+        sat_thickness.append(_get_saturated_thickness(heads[per], botm,
+                                                      thickness, nodata))
     return np.squeeze(sat_thickness)
 
 
@@ -223,8 +302,8 @@ def get_gradients(heads, m, nodata, per_idx=None):
     grad : 3 or 4-D np.ndarray
         Array of hydraulic gradients
     """
-    # internal calculations done on a masked array
-    heads = np.ma.array(heads, ndmin=4, mask=heads == nodata)
+    heads = np.array(heads, ndmin=4)
+    zcentroids = np.asarray(m.dis.zcentroids)
     nper, nlay, nrow, ncol = heads.shape
     if per_idx is None:
         per_idx = list(range(nper))
@@ -233,15 +312,308 @@ def get_gradients(heads, m, nodata, per_idx=None):
 
     grad = []
     for per in per_idx:
-        hds = heads[per]
-        zcnt_per = np.ma.array(m.dis.zcentroids, mask=hds.mask)
-        unsat = zcnt_per > hds
-        zcnt_per[unsat] = hds[unsat]
-
-        # apply .diff on data and mask components separately
-        diff_mask = np.diff(hds.mask, axis=0)
-        dz = np.ma.array(np.diff(zcnt_per.data, axis=0), mask=diff_mask)
-        dh = np.ma.array(np.diff(hds.data, axis=0), mask=diff_mask)
-        # convert to nan-filled array, as is expected(!?)
-        grad.append((dh / dz).filled(np.nan))
+        grad.append(_get_gradients(heads[per], zcentroids, nodata))
     return np.squeeze(grad)
+
+
+def iter_water_table(hdobj, nodata, per_idx=None, nproc=None):
+    """
+    Get the water table elevation for each time in a head file, one time
+    at a time, so that only the heads of a few times are in memory.
+
+    Parameters
+    ----------
+    hdobj : flopy.utils.HeadFile object
+        Head file.
+    nodata : real
+        HDRY value indicating dry cells.
+    per_idx : int or sequence of ints
+        zero-based indices of the times in the head file to process. If
+        None, all times are processed (default).
+    nproc : int
+        Number of worker processes that read and process the heads. If
+        None or 1, the times are processed in the calling process.
+        (default is None)
+
+    Yields
+    ------
+    totim, wt : float, 2-D np.ndarray
+        simulation time and water table elevations
+
+    Examples
+    --------
+    >>> import flopy
+    >>> from flopy.utils.postprocessing import iter_water_table, \
+    ...     get_summary_statistics
+    >>> hdobj = flopy.utils.HeadFile('model.hds')
+    >>> stats = get_summary_statistics(iter_water_table(hdobj, -1e30),
+    ...                                nodata=-1e30)
+
+    """
+    return _iter_head_results(hdobj, _get_water_table, (nodata,), per_idx,
+                              nproc)
+
+
+def iter_saturated_thickness(hdobj, m, nodata, per_idx=None, nproc=None):
+    """
+    Get the saturated thickness of each cell for each time in a head file,
+    one time at a time. See get_saturated_thickness.
+
+    Parameters
+    ----------
+    hdobj : flopy.utils.HeadFile object
+        Head file.
+    m : flopy.modflow.Modflow object
+        Must have a flopy.modflow.ModflowDis object attached.
+    nodata : real
+        HDRY value indicating dry cells.
+    per_idx : int or sequence of ints
+        zero-based indices of the times in the head file to process. If
+        None, all times are processed (default).
+    nproc : int
+        Number of worker processes that read and process the heads.
+        (default is None)
+
+    Yields
+    ------
+    totim, sat_thickness : float, 3-D np.ndarray
+        simulation time and saturated thickness
+
+    """
+    args = (m.dis.botm.array, m.dis.thickness.array, nodata)
+    return _iter_head_results(hdobj, _get_saturated_thickness, args,
+                              per_idx, nproc)
+
+
+def iter_gradients(hdobj, m, nodata, per_idx=None, nproc=None):
+    """
+    Get the vertical hydraulic gradients for each time in a head file, one
+    time at a time. See get_gradients.
+
+    Parameters
+    ----------
+    hdobj : flopy.utils.HeadFile object
+        Head file.
+    m : flopy.modflow.Modflow object
+        Must have a flopy.modflow.ModflowDis object attached.
+    nodata : real
+        HDRY value indicating dry cells.
+    per_idx : int or sequence of ints
+        zero-based indices of the times in the head file to process. If
+        None, all times are processed (default).
+    nproc : int
+        Number of worker processes that read and process the heads.
+        (default is None)
+
+    Yields
+    ------
+    totim, grad : float, 3-D np.ndarray
+        simulation time and hydraulic gradients
+
+    """
+    args = (np.asarray(m.dis.zcentroids), nodata)
+    return _iter_head_results(hdobj, _get_gradients, args, per_idx, nproc)
+
+
+def get_summary_statistics(results, nodata=None):
+    """
+    Reduce a sequence of arrays, such as the results of iter_water_table,
+    to the count, mean, standard deviation, minimum and maximum of each
+    cell. The arrays are added one at a time, so that the sequence is
+    never held in memory.
+
+    Parameters
+    ----------
+    results : iterable
+        arrays of the same shape, or (totim, array) tuples
+    nodata : real
+        value excluded from the statistics, in addition to nan
+        (default is None)
+
+    Returns
+    -------
+    stats : dict
+        count, mean, std, min and max arrays. Cells without values are nan
+        in all but the count array.
+
+    """
+    stats = RunningStats(nodata=nodata)
+    for a in results:
+        if isinstance(a, tuple):
+            a = a[1]
+        stats.add(a)
+
+    if stats.n == 0:
+        raise ValueError('no arrays to summarize')
+    return {'count': stats.count, 'mean': stats.mean, 'std': stats.std,
+            'min': stats.min, 'max': stats.max}
+
+
+def _get_water_table(hds, nodata):
+    """
+    Water table elevation, the head in the highest layer that is not nodata,
+    for heads of one time.
+
+    """
+    nlay, nrow, ncol = hds.shape
+    wet = hds != nodata
+    k = np.argmax(wet, axis=0)
+    wt = hds[k, np.arange(nrow)[:, None], np.arange(ncol)]
+    wt[~np.any(wet, axis=0)] = nodata
+    return wt
+
+
+def _get_saturated_thickness(hds, botm, thickness, nodata):
+    """
+    Saturated thickness of each cell for heads of one time.
+
+    """
+    # internal calculations done on a masked array
+    hds = np.ma.array(hds, mask=hds == nodata)
+    perthickness = hds - botm
+    conf = perthickness > thickness
+    perthickness[conf] = thickness[conf]
+    # convert to nan-filled array, as is expected(!?)
+    return perthickness.filled(np.nan)
+
+
+def _get_gradients(hds, zcentroids, nodata):
+    """
+    Vertical hydraulic gradients for heads of one time.
+
+    """
+    # internal calculations done on a masked array
+    hds = np.ma.array(hds, mask=hds == nodata)
+    zcnt_per = np.ma.array(zcentroids, mask=hds.mask, copy=True)
+    unsat = zcnt_per > hds
+    zcnt_per[unsat] = hds[unsat]
+
+    # apply .diff on data and mask components separately
+    diff_mask = np.diff(hds.mask, axis=0)
+    dz = np.ma.array(np.diff(zcnt_per.data, axis=0), mask=diff_mask)
+    dh = np.ma.array(np.diff(hds.data, axis=0), mask=diff_mask)
+    # convert to nan-filled array, as is expected(!?)
+    return (dh / dz).filled(np.nan)
+
+
+_head_worker = None
+
+
+def _init_head_worker(cls, filename, kwargs, func, args):
+    global _head_worker
+    _head_worker = (cls(filename, **kwargs), func, args)
+
+
+def _get_head_result(totim):
+    hdobj, func, args = _head_worker
+    return func(hdobj.get_data(totim=totim), *args)
+
+
+def _iter_head_results(hdobj, func, args, per_idx, nproc):
+    """
+    Apply func(heads, *args) to the heads of each time in a head file and
+    yield (totim, result). With nproc > 1 the head file is opened in each
+    worker process and a few times per worker are processed at a time.
+
+    """
+    times = hdobj.get_times()
+    if per_idx is not None:
+        times = [times[i] for i in np.atleast_1d(per_idx)]
+    if nproc is not None and nproc > 1:
+        kwargs = {'precision': hdobj.precision}
+        if getattr(hdobj, 'text', None) is not None:
+            kwargs['text'] = hdobj.text.decode()
+        results = pool_imap(_get_head_result, times, nproc,
+                            initializer=_init_head_worker,
+                            initargs=(type(hdobj), hdobj.filename, kwargs,
+                                      func, args))
+        for i, result in enumerate(results):
+            yield times[i], result
+    else:
+        for totim in times:
+            yield totim, func(hdobj.get_data(totim=totim), *args)
+
+
+def get_specific_discharge(flowja, grb, head=None, ihc=None):
+    """
+    Calculates the cell centered specific discharge from the MODFLOW 6
+    FLOW-JA-FACE budget record. The connections of every cell are taken
+    from the binary grid file. The horizontal components are the weighted
+    least squares fit of the specific discharge through the horizontal
+    faces of each cell (which is the average of the face values on
+    either side of a cell for regular grids) and the vertical component
+    is the average of the specific discharge through the top and bottom
+    faces. Works for DIS, DISV and DISU grids.
+
+    Parameters
+    ----------
+    flowja : np.ndarray
+        FLOW-JA-FACE budget record of length nja.
+    grb : flopy.utils.MfGrdFile object
+        Binary grid file of the model.
+    head : np.ndarray
+        Heads used to calculate the saturated thickness of convertible
+        cells. If None, the full cell thickness is used. (default is None)
+    ihc : array-like
+        Connection type of every entry in ja (0 for vertical connections)
+        for DISU grids, see MfGrdFile.get_connection_geometry.
+        (default is None)
+
+    Returns
+    -------
+    (qx, qy, qz) : tuple of np.ndarrays
+        Specific discharge arrays of the shape of the model grid, in model
+        coordinates, with qz positive in the upward direction.
+
+    """
+    geom = grb.get_connection_geometry(ihc=ihc)
+    nodes = grb.nodes
+    top, bot = grb.get_cell_top_bottom()
+    thk = top - bot
+    if head is not None:
+        head = np.ravel(head)
+        convertible = np.ones(nodes, dtype=bool)
+        if 'ICELLTYPE' in grb._datadict:
+            convertible = np.ravel(grb._datadict['ICELLTYPE']) != 0
+        satthk = np.clip(np.minimum(head, top) - bot, 0., None)
+        thk = np.where(convertible, satthk, thk)
+
+    # specific discharge out of node through each face
+    node, conn = geom.node, geom.conn
+    horizontal = geom.ihc != 0
+    area = np.where(horizontal,
+                    geom.hwva * 0.5 * (thk[node] + thk[conn]), geom.hwva)
+    active = area > 0.
+    q = np.zeros(area.shape, dtype=float)
+    q[active] = -np.ravel(flowja)[geom.ipos[active]] / area[active]
+
+    # horizontal faces, weighted by the face width
+    w = np.where(horizontal & active, geom.hwva, 0.)
+    ux, uy = geom.ux, geom.uy
+    axx = np.bincount(node, w * ux * ux, minlength=nodes)
+    axy = np.bincount(node, w * ux * uy, minlength=nodes)
+    ayy = np.bincount(node, w * uy * uy, minlength=nodes)
+    bx = np.bincount(node, w * q * ux, minlength=nodes)
+    by = np.bincount(node, w * q * uy, minlength=nodes)
+    trace = axx + ayy
+    det = axx * ayy - axy * axy
+    qx = np.zeros(nodes, dtype=float)
+    qy = np.zeros(nodes, dtype=float)
+    # cells with faces in a single direction are fit along that direction
+    solve = det > 1e-10 * trace * trace
+    single = ~solve & (trace > 0.)
+    qx[solve] = (ayy * bx - axy * by)[solve] / det[solve]
+    qy[solve] = (axx * by - axy * bx)[solve] / det[solve]
+    qx[single] = bx[single] / trace[single]
+    qy[single] = by[single] / trace[single]
+
+    # vertical faces, weighted by the face area
+    w = np.where(~horizontal & active, area, 0.)
+    azz = np.bincount(node, w * geom.uz * geom.uz, minlength=nodes)
+    bz = np.bincount(node, w * q * geom.uz, minlength=nodes)
+    qz = np.zeros(nodes, dtype=float)
+    idx = azz > 0.
+    qz[idx] = bz[idx] / azz[idx]
+
+    shape = grb.shape
+    return qx.reshape(shape), qy.reshape(shape), qz.reshape(shape)
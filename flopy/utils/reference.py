@@ -3,6 +3,7 @@ Module spatial referencing for flopy model objects
 
 """
 import json
+import hashlib
 import numpy as np
 import os
 import warnings
@@ -559,6 +560,7 @@ class SpatialReference(object):
         self._ycentergrid = None
         self._xcentergrid = None
         self._vertices = None
+        self._interp_cache = OrderedDict()
         return
 
     @property
@@ -1042,44 +1044,36 @@ class SpatialReference(object):
             keyword arguments to np.savetxt (ascii)
             rasterio.open (GeoTIFF)
             or flopy.export.shapefile_utils.write_grid_shapefile2
+            cellsize : pixel size of resampled Arc Ascii and GeoTIFF rasters
 
         Notes
         -----
-        Rotated grids will be either be unrotated prior to export,
-        using scipy.ndimage.rotate (Arc Ascii format) or rotation will be
-        included in their transform property (GeoTiff format). In either case
-        the pixels will be displayed in the (unrotated) projected geographic coordinate system,
-        so the pixels will no longer align exactly with the model grid
-        (as displayed from a shapefile, for example). A key difference between
-        Arc Ascii and GeoTiff (besides disk usage) is that the
-        unrotated Arc Ascii will have a different grid size, whereas the GeoTiff
-        will have the same number of rows and pixels as the original.
+        Rotated and non-uniform grids are resampled to a north-up raster
+        (Arc Ascii format), taking the value of the model cell containing
+        the center of each pixel (see flopy.export.utils.GridRaster).
+        Rotation of uniform grids is included in the transform property of
+        GeoTiffs, non-uniform grids are resampled. Resampled pixels are
+        displayed in the (unrotated) projected geographic coordinate
+        system, so they will no longer align exactly with the model grid
+        (as displayed from a shapefile, for example) and the raster will
+        have a different size than the grid.
 
         """
+        from ..export.utils import GridRaster, _is_uniform
 
         if filename.lower().endswith(".asc"):
-            if len(np.unique(self.delr)) != len(np.unique(self.delc)) != 1 \
-                    or self.delr[0] != self.delc[0]:
-                raise ValueError('Arc ascii arrays require a uniform grid.')
-
             xll, yll = self.xll, self.yll
             cellsize = self.delr[0] * self.length_multiplier
             fmt = kwargs.get('fmt', '%.18e')
             a = a.copy()
             a[np.isnan(a)] = nodata
-            if self.rotation != 0:
-                try:
-                    from scipy.ndimage import rotate
-                    a = rotate(a, self.rotation, cval=nodata)
-                    height_rot, width_rot = a.shape
-                    xmin, ymin, xmax, ymax = self.bounds
-                    dx = (xmax - xmin) / width_rot
-                    dy = (ymax - ymin) / height_rot
-                    cellsize = np.max((dx, dy))
-                    # cellsize = np.cos(np.radians(self.rotation)) * cellsize
-                    xll, yll = xmin, ymin
-                except ImportError:
-                    print('scipy package required to export rotated grid.')
+            pixelsize = kwargs.pop('cellsize', None)
+            if self.rotation != 0 or not _is_uniform(self) or \
+                    pixelsize is not None:
+                raster = GridRaster(self, cellsize=pixelsize)
+                a = raster.resample(a, nodata=nodata)
+                cellsize = raster.cellsize
+                xll, yll = raster.xll, raster.yll
 
             filename = '.'.join(
                 filename.split('.')[:-1]) + '.asc'  # enforce .asc ending
@@ -1099,22 +1093,27 @@ class SpatialReference(object):
             print('wrote {}'.format(filename))
 
         elif filename.lower().endswith(".tif"):
-            if len(np.unique(self.delr)) != len(np.unique(self.delc)) != 1 \
-                    or self.delr[0] != self.delc[0]:
-                raise ValueError('GeoTIFF export require a uniform grid.')
+            pixelsize = kwargs.pop('cellsize', None)
             try:
                 import rasterio
                 from rasterio import Affine
             except:
                 print('GeoTIFF export requires the rasterio package.')
                 return
-            dxdy = self.delc[0] * self.length_multiplier
-            trans = Affine.translation(self.xul, self.yul) * \
-                    Affine.rotation(self.rotation) * \
-                    Affine.scale(dxdy, -dxdy)
+            if _is_uniform(self) and pixelsize is None:
+                dxdy = self.delc[0] * self.length_multiplier
+                trans = Affine.translation(self.xul, self.yul) * \
+                        Affine.rotation(self.rotation) * \
+                        Affine.scale(dxdy, -dxdy)
+                a = a.copy()
+            else:
+                raster = GridRaster(self, cellsize=pixelsize)
+                a = raster.resample(a, nodata=nodata)
+                trans = Affine.translation(raster.xll, raster.yll +
+                                           raster.nrow * raster.cellsize) * \
+                        Affine.scale(raster.cellsize, -raster.cellsize)
 
             # third dimension is the number of bands
-            a = a.copy()
             if len(a.shape) == 2:
                 a = np.reshape(a, (1, a.shape[0], a.shape[1]))
             if a.dtype.name == 'int64':
@@ -1294,7 +1293,10 @@ class SpatialReference(object):
         """
         Use the griddata method to interpolate values from an array onto the
         points defined in xi.  For any values outside of the grid, use
-        'nearest' to find a value for them.
+        'nearest' to find a value for them.  The triangulation of the cell
+        centers and the interpolation weights of the xi points are cached,
+        so interpolating several arrays onto the same points only gathers
+        and weights the array values.
 
         Parameters
         ----------
@@ -1314,27 +1316,82 @@ class SpatialReference(object):
 
         """
         try:
-            from scipy.interpolate import griddata
+            from scipy.interpolate import CloughTocher2DInterpolator
         except:
             print('scipy not installed\ntry pip install scipy')
             return None
 
-        # Create a 2d array of points for the grid centers
-        points = np.empty((self.ncol * self.nrow, 2))
-        points[:, 0] = self.xcentergrid.flatten()
-        points[:, 1] = self.ycentergrid.flatten()
+        if isinstance(xi, tuple):
+            xi = np.stack(np.broadcast_arrays(*xi), axis=-1)
+        xi = np.asarray(xi, dtype=np.float64)
+        shape = xi.shape[:-1]
+        xi = xi.reshape(-1, 2)
+        values = np.ravel(a)
 
-        # Use the griddata function to interpolate to the xi points
-        b = griddata(points, a.flatten(), xi, method=method, fill_value=np.nan)
-
-        # if method is linear or cubic, then replace nan's with a value
-        # interpolated using nearest
-        if method != 'nearest':
-            bn = griddata(points, a.flatten(), xi, method='nearest')
+        weights = self._get_interpolation_weights(xi, method)
+        if method == 'nearest':
+            b = values[weights['nearest']]
+        else:
+            if method == 'linear':
+                b = np.full(len(xi), np.nan)
+                inside = weights['inside']
+                b[inside] = (values[weights['vertices']] *
+                             weights['weights']).sum(axis=1)
+            else:
+                b = CloughTocher2DInterpolator(self._interp_cache['tri'],
+                                               values,
+                                               fill_value=np.nan)(xi)
+            # replace nan's with a value interpolated using nearest
             idx = np.isnan(b)
-            b[idx] = bn[idx]
+            b[idx] = values[weights['nearest'][idx]]
+
+        return b.reshape(shape)
 
-        return b
+    def _get_interpolation_weights(self, xi, method):
+        """
+        Get the (cached) nearest cell centers and linear interpolation
+        weights of the xi points.
+        """
+        from scipy.spatial import cKDTree, Delaunay
+
+        if method not in ('nearest', 'linear', 'cubic'):
+            raise ValueError('Unknown interpolation method {}'.format(method))
+        cache = self._interp_cache
+        key = (method, xi.shape,
+               hashlib.md5(np.ascontiguousarray(xi)).hexdigest())
+        if key in cache:
+            return cache[key]
+
+        if 'tree' not in cache:
+            # Create a 2d array of points for the grid centers
+            points = np.empty((self.ncol * self.nrow, 2))
+            points[:, 0] = self.xcentergrid.flatten()
+            points[:, 1] = self.ycentergrid.flatten()
+            cache['points'] = points
+            cache['tree'] = cKDTree(points)
+        weights = {'nearest': cache['tree'].query(xi)[1]}
+        if method != 'nearest':
+            if 'tri' not in cache:
+                cache['tri'] = Delaunay(cache['points'])
+            tri = cache['tri']
+        if method == 'linear':
+            # barycentric coordinates in the triangles containing xi
+            simplex = tri.find_simplex(xi)
+            inside = simplex >= 0
+            trans = tri.transform[simplex[inside]]
+            bary = np.einsum('ijk,ik->ij', trans[:, :2, :],
+                             xi[inside] - trans[:, 2, :])
+            weights['inside'] = inside
+            weights['vertices'] = tri.simplices[simplex[inside]]
+            weights['weights'] = np.column_stack((bary,
+                                                  1. - bary.sum(axis=1)))
+
+        cache[key] = weights
+        # keep the weights of the most recent points only
+        nkeys = [k for k in cache if isinstance(k, tuple)]
+        for k in nkeys[:-8]:
+            cache.pop(k)
+        return weights
 
     def get_2d_vertex_connectivity(self):
         """
@@ -1239,6 +1239,7 @@ class Transient2d(DataInterface):
         else:
             self.ext_filename_base = self.name_base.replace(' ', '_')
         self.transient_2ds = self.build_transient_sequence()
+        self._binary_cache = None
         return
 
     @property
@@ -1480,13 +1481,92 @@ class Transient2d(DataInterface):
 
     @property
     def array(self):
-        arr = np.zeros((self._model.nper, 1, self.shape[0], self.shape[1]),
+        nper = self._model.nper
+        arr = np.zeros((nper, 1, self.shape[0], self.shape[1]),
                        dtype=self._dtype)
-        for kper in range(self._model.nper):
-            u2d = self[kper]
-            arr[kper, 0, :, :] = u2d.array
+        # the entry in effect for each stress period is the last entry
+        # at or before kper (-1 before the first entry: zeros)
+        kpers = sorted(self.transient_2ds.keys())
+        ientry = np.searchsorted(kpers, np.arange(nper), side='right') - 1
+        for ie, kper in enumerate(kpers):
+            idx = ientry == ie
+            if idx.any():
+                arr[idx, 0, :, :] = self.transient_2ds[kper].array
         return arr
 
+    def cache_to_binary(self, filename=None):
+        """
+        Pack the array-valued stress period entries into a single
+        memory-mapped .npy file. The Util2d entries are rebuilt as views
+        of the file so the arrays no longer need to be held in memory.
+        Constant entries and entries that reference an existing file are
+        left as is.
+
+        Parameters
+        ----------
+        filename : str
+            Name of the .npy file to write. If None, the file is written to
+            the model workspace as <name>.npy. If the file holds the current
+            cache, the entries are written to <name>_<n>.npy instead, since
+            a file that is mapped can not be replaced on all platforms.
+            (default is None)
+
+        Returns
+        ----------
+        cache : np.memmap
+            Memory-mapped array of shape (nentries, nrow, ncol), ordered by
+            stress period.
+
+        Examples
+        --------
+        >>> import flopy
+        >>> ml = flopy.modflow.Modflow.load('test.nam')
+        >>> cache = ml.rch.rech.cache_to_binary()
+
+        """
+        if filename is None:
+            filename = os.path.join(self._model.model_ws,
+                                    self.name_base.replace(' ', '_') +
+                                    '.npy')
+        oldname = None
+        if self._binary_cache is not None:
+            oldname = self._binary_cache.filename
+        if oldname is not None and \
+                os.path.abspath(filename) == os.path.abspath(oldname):
+            # the entries are views of the current cache
+            root, ext = os.path.splitext(filename)
+            n = 1
+            while os.path.exists('{}_{}{}'.format(root, n, ext)):
+                n += 1
+            filename = '{}_{}{}'.format(root, n, ext)
+        kpers = [kper for kper in sorted(self.transient_2ds.keys())
+                 if self.transient_2ds[kper].vtype == np.ndarray]
+        cache = np.lib.format.open_memmap(filename, mode='w+',
+                                          dtype=self._dtype,
+                                          shape=(len(kpers),) + self.shape)
+        for idx, kper in enumerate(kpers):
+            cache[idx] = self.transient_2ds[kper]._array
+        cache.flush()
+        for idx, kper in enumerate(kpers):
+            u2d = self.transient_2ds[kper]
+            # pass a plain ndarray view so Util2d does not copy it
+            self.transient_2ds[kper] = \
+                Util2d(self._model, self.shape, self._dtype,
+                       np.asarray(cache[idx]), name=u2d.name,
+                       fmtin=u2d.format.fortran, cnstnt=u2d.cnstnt,
+                       iprn=u2d.iprn, ext_filename=u2d.ext_filename,
+                       locat=u2d.locat, bin=u2d.format.binary, how=u2d.how,
+                       array_free_format=u2d.format.array_free_format)
+        self._binary_cache = cache
+        if oldname is not None and \
+                os.path.abspath(filename) != os.path.abspath(oldname):
+            try:
+                os.remove(oldname)
+            except OSError:
+                # the old cache may still be mapped (on Windows)
+                pass
+        return cache
+
     def export(self, f, **kwargs):
         from flopy import export
         return export.utils.transient2d_export(f, self, **kwargs)
@@ -2184,7 +2264,8 @@ class Util2d(DataInterface):
                                    self._array,
                                    fortran_format=self.format.fortran)
 
-            elif self.__value != self.python_file_path:
+            elif os.path.abspath(self.__value) != \
+                    os.path.abspath(self.python_file_path):
                 if os.path.exists(self.python_file_path):
                     # if the file already exists, remove it
                     if self._model.verbose:
@@ -2283,7 +2364,10 @@ class Util2d(DataInterface):
         """
         if self.vtype == str:
             if self.__value_built is None:
-                file_in = open(self.__value, 'r')
+                if self.format.binary:
+                    file_in = open(self.__value, 'rb')
+                else:
+                    file_in = open(self.__value, 'r')
 
                 if self.format.binary:
                     header, self.__value_built = Util2d.load_bin(self.shape,
@@ -2624,17 +2708,26 @@ class Util2d(DataInterface):
 
     @staticmethod
     def load(f_handle, model, shape, dtype, name, ext_unit_dict=None,
-             array_free_format=None, array_format="modflow"):
+             array_free_format=None, array_format="modflow", lazy=None):
         """
         functionality to load Util2d instance from an existing
         model input file.
         external and internal record types must be fully loaded
         if you are using fixed format record types,make sure
         ext_unit_dict has been initialized from the NAM file
+
+        if lazy is True (or lazy is None and model.lazy_array_load is True),
+        open/close arrays and external binary arrays that fill their unit
+        are not read.  The Util2d instance keeps the file path, format and
+        multiplier, the array is read the first time it is accessed, and
+        unmodified arrays are copied (not reformatted) when the model is
+        written.
         """
         if shape == (0, 0):
             raise IndexError('No information on model grid dimensions. '
                              'Need nrow, ncol to load a Util2d array.')
+        if lazy is None:
+            lazy = getattr(model, 'lazy_array_load', False)
         curr_unit = None
         if ext_unit_dict is not None:
             # determine the current file's unit number
@@ -2672,6 +2765,10 @@ class Util2d(DataInterface):
             # load_txt(shape, file_in, dtype, fmtin):
             assert os.path.exists(fname), "Util2d.load() error: open/close " + \
                                           "file " + str(fname) + " not found"
+            if lazy:
+                u2d = Util2d._load_lazy(model, shape, dtype, fname, name,
+                                        cr_dict, array_free_format)
+                return u2d
             if str('binary') not in str(cr_dict['fmtin'].lower()):
                 f = open(fname, 'r')
                 data = Util2d.load_txt(shape=shape,
@@ -2700,6 +2797,16 @@ class Util2d(DataInterface):
             if ext_unit.filehandle is None:
                 raise IOError('cannot read unit {0}, filename: {1}'
                               .format(cr_dict['nunit'], ext_unit.filename))
+            elif lazy and Util2d._is_whole_binary_file(shape, dtype,
+                                                       ext_unit, cr_dict):
+                # skip over the array so the unit is positioned as if it
+                # had been read
+                ext_unit.filehandle.seek(0, os.SEEK_END)
+                u2d = Util2d._load_lazy(model, shape, dtype,
+                                        ext_unit.filename, name, cr_dict,
+                                        array_free_format)
+                model.pop_key_list.append(cr_dict['nunit'])
+                return u2d
             elif 'binary' not in str(cr_dict['fmtin'].lower()):
                 assert cr_dict['nunit'] in list(ext_unit_dict.keys())
                 data = Util2d.load_txt(shape, ext_unit.filehandle,
@@ -2727,6 +2834,38 @@ class Util2d(DataInterface):
 
         return u2d
 
+    @staticmethod
+    def _load_lazy(model, shape, dtype, fname, name, cr_dict,
+                   array_free_format=None):
+        """
+        create a Util2d instance that references fname instead of holding
+        the array.  The fortran format from the control record is kept so
+        the file can be read on first access and re-used as is on write.
+        """
+        u2d = Util2d(model, shape, dtype, fname, name=name,
+                     iprn=cr_dict['iprn'], cnstnt=cr_dict['cnstnt'],
+                     array_free_format=array_free_format)
+        u2d.format = ArrayFormat(u2d, fortran=cr_dict['fmtin'],
+                                 array_free_format=array_free_format)
+        return u2d
+
+    @staticmethod
+    def _is_whole_binary_file(shape, dtype, ext_unit, cr_dict):
+        """
+        check if an external binary unit holds a single array that has
+        not been read from yet - only these can be referenced instead of
+        read, since text units (and binary units with several arrays) must
+        be read to position the unit for the next array.
+        """
+        if 'binary' not in str(cr_dict['fmtin']).lower():
+            return False
+        if ext_unit.filehandle.tell() != 0:
+            return False
+        nbytes = int(np.prod(shape)) * np.dtype(dtype).itemsize
+        if np.issubdtype(dtype, np.floating):
+            nbytes += BinaryHeader.set_dtype(bintype='Head').itemsize
+        return os.path.getsize(ext_unit.filename) == nbytes
+
     @staticmethod
     def parse_control_record(line, current_unit=None, dtype=np.float32,
                              ext_unit_dict=None, array_format=None):
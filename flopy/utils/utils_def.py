@@ -104,3 +104,141 @@ def totim_to_datetime(totim, start='1-1-1970', timeunit='D'):
         t = timedelta(**kwargs)
         out.append(start + t)
     return out
+
+
+class RunningStats(object):
+    """
+    Count, mean, (population) standard deviation, minimum and maximum of
+    each element of a sequence of arrays, updated one array at a time with
+    Welford's algorithm, so that the sequence is never held in memory.
+    nan and nodata values are excluded from the statistics.
+
+    Parameters
+    ----------
+    nodata : real
+        value excluded from the statistics, in addition to nan
+        (default is None)
+
+    Attributes
+    ----------
+    n : int
+        number of arrays added
+    count : np.ndarray
+        number of values of each element
+
+    Examples
+    --------
+    >>> from flopy.utils.utils_def import RunningStats
+    >>> stats = RunningStats(nodata=-1e30)
+    >>> for a in arrays:
+    ...     stats.add(a)
+    >>> mean, std = stats.mean, stats.std
+
+    """
+
+    def __init__(self, nodata=None):
+        self.nodata = nodata
+        self.n = 0
+        self.count = None
+        self._mean = None
+        self._m2 = None
+        self._min = None
+        self._max = None
+
+    def add(self, a):
+        """
+        Add an array to the statistics.
+
+        Parameters
+        ----------
+        a : array-like
+            array of the same shape as the arrays added before
+
+        """
+        a = np.array(a, dtype=np.float64)
+        valid = ~np.isnan(a)
+        if self.nodata is not None:
+            valid &= a != self.nodata
+        a[~valid] = np.nan
+        if self.count is None:
+            self.count = np.zeros(a.shape, dtype=int)
+            self._mean = np.zeros(a.shape)
+            self._m2 = np.zeros(a.shape)
+            self._min = a.copy()
+            self._max = a.copy()
+        else:
+            self._min = np.fmin(self._min, a)
+            self._max = np.fmax(self._max, a)
+        self.n += 1
+        self.count += valid
+        delta = np.where(valid, a - self._mean, 0.)
+        self._mean += delta / np.maximum(self.count, 1)
+        self._m2 += np.where(valid, delta * (a - self._mean), 0.)
+
+    def _empty(self, a):
+        a = a.copy()
+        a[self.count == 0] = np.nan
+        return a
+
+    @property
+    def mean(self):
+        """Mean of each element, nan for elements without values."""
+        return self._empty(self._mean)
+
+    @property
+    def std(self):
+        """
+        Population standard deviation of each element, nan for elements
+        without values.
+        """
+        return self._empty(np.sqrt(self._m2 / np.maximum(self.count, 1)))
+
+    @property
+    def min(self):
+        """Minimum of each element, nan for elements without values."""
+        return self._min.copy()
+
+    @property
+    def max(self):
+        """Maximum of each element, nan for elements without values."""
+        return self._max.copy()
+
+
+def pool_imap(func, iterable, nproc, initializer=None, initargs=()):
+    """
+    Apply func to the items of iterable in a pool of nproc worker
+    processes and yield the results in order. The items are submitted in
+    batches of a few items per worker, so that only a batch of items and
+    results is held in memory at a time.
+
+    Parameters
+    ----------
+    func : callable
+        module level function of one argument
+    iterable : iterable
+        arguments of func, for example a generator that reads one array
+        at a time
+    nproc : int
+        number of worker processes
+    initializer : callable
+        function called with initargs when a worker process starts
+        (default is None)
+    initargs : tuple
+        arguments of initializer (default is ())
+
+    """
+    import itertools
+    import multiprocessing as mp
+
+    iterable = iter(iterable)
+    pool = mp.Pool(nproc, initializer=initializer, initargs=initargs)
+    try:
+        while True:
+            batch = list(itertools.islice(iterable, 4 * nproc))
+            if len(batch) == 0:
+                break
+            for result in pool.map(func, batch):
+                yield result
+    finally:
+        pool.close()
+        pool.join()